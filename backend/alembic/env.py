@@ -5,12 +5,11 @@ from logging.config import fileConfig
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 
-# Import models module to ensure all models are registered with Base
-import backend.app.models.database  # noqa: F401 - needed for model registration
-from backend.app.core.config import settings
-
-# Import Base and ensure all models are loaded
-from backend.app.core.database import Base
+# Same module paths as the app (prepend_sys_path = . puts backend/ on sys.path):
+# importing the models under backend.app.* declares them twice on the same Base and
+# breaks the mappers when migrations run in-process (app/core/schema.py)
+from app.core.config import settings
+from app.models.database import Base
 
 # Alembic Config object
 config = context.config
@@ -42,6 +41,14 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    # Uygulama içinden (DB_SCHEMA_BOOTSTRAP, bkz. app/core/schema.py) bağlantı verilir
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
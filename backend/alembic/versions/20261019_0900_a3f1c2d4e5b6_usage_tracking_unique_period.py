@@ -0,0 +1,93 @@
+"""usage_tracking unique period and merge heads
+
+Revision ID: a3f1c2d4e5b6
+Revises: 20260111_1750, 6c6b303caa39
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f1c2d4e5b6"
+down_revision: Union[str, Sequence[str], None] = ("20260111_1750", "6c6b303caa39")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _usage_columns() -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns("usage_tracking")}
+
+
+def upgrade() -> None:
+    # Model column is extra_data ("metadata" is reserved on declarative models)
+    if "metadata" in _usage_columns():
+        with op.batch_alter_table("usage_tracking") as batch_op:
+            batch_op.alter_column("metadata", new_column_name="extra_data")
+
+    # Collapse duplicate rows so the constraint can be created: the kept row (MIN(id))
+    # takes the group's total first, then the others are deleted. Derived tables keep
+    # the subqueries valid on MySQL (no direct reads of the UPDATE/DELETE target).
+    op.execute(
+        """
+        UPDATE usage_tracking
+        SET count = (
+            SELECT total FROM (
+                SELECT user_id, resource_type, period_start, SUM(count) AS total
+                FROM usage_tracking
+                GROUP BY user_id, resource_type, period_start
+            ) AS totals
+            WHERE totals.user_id = usage_tracking.user_id
+              AND totals.resource_type = usage_tracking.resource_type
+              AND totals.period_start = usage_tracking.period_start
+        )
+        WHERE id IN (
+            SELECT keep_id FROM (
+                SELECT MIN(id) AS keep_id
+                FROM usage_tracking
+                GROUP BY user_id, resource_type, period_start
+                HAVING COUNT(*) > 1
+            ) AS duplicated
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM usage_tracking
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MIN(id) AS keep_id
+                FROM usage_tracking
+                GROUP BY user_id, resource_type, period_start
+            ) AS keepers
+        )
+        """
+    )
+
+    # create_all databases from the current models already have it
+    inspector = sa.inspect(op.get_bind())
+    if "uq_usage_tracking_user_resource_period" in {
+        constraint["name"] for constraint in inspector.get_unique_constraints("usage_tracking")
+    }:
+        return
+
+    # One counter row per (user, resource, period): required by the atomic usage counter
+    with op.batch_alter_table("usage_tracking") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_usage_tracking_user_resource_period",
+            ["user_id", "resource_type", "period_start"],
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("usage_tracking") as batch_op:
+        batch_op.drop_constraint("uq_usage_tracking_user_resource_period", type_="unique")
+
+    if "extra_data" in _usage_columns():
+        with op.batch_alter_table("usage_tracking") as batch_op:
+            batch_op.alter_column("extra_data", new_column_name="metadata")
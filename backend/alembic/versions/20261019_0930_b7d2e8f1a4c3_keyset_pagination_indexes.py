@@ -0,0 +1,69 @@
+"""keyset pagination indexes
+
+Revision ID: b7d2e8f1a4c3
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e8f1a4c3"
+down_revision: Union[str, None] = "a3f1c2d4e5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) for keyset pagination on (user_id, sort column, id)
+KEYSET_INDEXES = [
+    ("ix_analyses_user_created_id", "analyses", ["user_id", "created_at", "id"]),
+    ("ix_analyses_created_id", "analyses", ["created_at", "id"]),
+    ("ix_feedbacks_user_created_id", "feedbacks", ["user_id", "created_at", "id"]),
+    ("ix_chat_sessions_user_updated_id", "chat_sessions", ["user_id", "updated_at", "id"]),
+    ("ix_daily_pulses_user_created_id", "daily_pulses", ["user_id", "created_at", "id"]),
+]
+
+
+def _existing_indexes(inspector, table: str) -> set[str]:
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    # chat_sessions / daily_pulses may only exist via create_all (dcc1b80f1ed7 is empty)
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "chat_sessions" in tables:
+        # Sessions are listed by updated_at; fill it for sessions without messages
+        op.execute("UPDATE chat_sessions SET updated_at = created_at WHERE updated_at IS NULL")
+        with op.batch_alter_table("chat_sessions") as batch_op:
+            batch_op.alter_column(
+                "updated_at",
+                existing_type=sa.DateTime(timezone=True),
+                server_default=sa.text("CURRENT_TIMESTAMP"),
+            )
+
+    for name, table, columns in KEYSET_INDEXES:
+        if table in tables and name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for name, table, _ in reversed(KEYSET_INDEXES):
+        if table in tables and name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
+
+    if "chat_sessions" in tables:
+        with op.batch_alter_table("chat_sessions") as batch_op:
+            batch_op.alter_column(
+                "updated_at",
+                existing_type=sa.DateTime(timezone=True),
+                server_default=None,
+            )
@@ -0,0 +1,55 @@
+"""analysis report blobs
+
+Revision ID: c4e9a1b2d3f5
+Revises: b7d2e8f1a4c3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+import json
+import zlib
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e9a1b2d3f5"
+down_revision: Union[str, None] = "b7d2e8f1a4c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_all databases from the current models already have it
+    if "analysis_report_blobs" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    # Compressed storage for large analyses.full_report payloads
+    op.create_table(
+        "analysis_report_blobs",
+        sa.Column("analysis_id", sa.Integer(), nullable=False),
+        sa.Column("codec", sa.String(length=20), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("raw_size", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True
+        ),
+        sa.ForeignKeyConstraint(["analysis_id"], ["analyses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("analysis_id"),
+    )
+
+
+def downgrade() -> None:
+    # Move compressed reports back into analyses.full_report before dropping the table
+    bind = op.get_bind()
+    analyses = sa.table("analyses", sa.column("id", sa.Integer), sa.column("full_report", sa.JSON))
+    rows = bind.execute(sa.text("SELECT analysis_id, data FROM analysis_report_blobs")).fetchall()
+    for analysis_id, data in rows:
+        report = json.loads(zlib.decompress(data).decode("utf-8"))
+        bind.execute(
+            analyses.update().where(analyses.c.id == analysis_id).values(full_report=report)
+        )
+
+    op.drop_table("analysis_report_blobs")
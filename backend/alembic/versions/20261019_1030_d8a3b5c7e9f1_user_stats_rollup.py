@@ -0,0 +1,45 @@
+"""user stats rollup
+
+Revision ID: d8a3b5c7e9f1
+Revises: c4e9a1b2d3f5
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8a3b5c7e9f1"
+down_revision: Union[str, None] = "c4e9a1b2d3f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_all databases from the current models already have it
+    if "user_stats" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    # Rows are filled lazily on first read or by scripts/backfill_user_stats.py
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total_analyses", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("daily_scores", sa.JSON(), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_active_date", sa.Date(), nullable=True),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_stats")
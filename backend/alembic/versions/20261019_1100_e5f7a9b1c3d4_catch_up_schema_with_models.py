@@ -0,0 +1,234 @@
+"""catch up schema with models
+
+Revision ID: e5f7a9b1c3d4
+Revises: d8a3b5c7e9f1
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f7a9b1c3d4"
+down_revision: Union[str, None] = "d8a3b5c7e9f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables, columns and indexes the models gained while the schema was created by create_all
+# (dcc1b80f1ed7 is empty). Generated with --autogenerate against `upgrade d8a3b5c7e9f1`;
+# every step is skipped when it already exists, so create_all databases stamped at the
+# pre-series heads upgrade cleanly. ix_subscriptions_stripe_customer_id (20260111_1750)
+# is now declared on the model too.
+
+
+def _created_at() -> sa.Column:
+    return sa.Column(
+        "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True
+    )
+
+
+def _users_fk() -> sa.ForeignKeyConstraint:
+    return sa.ForeignKeyConstraint(["user_id"], ["users.id"])
+
+
+def _tables() -> list[tuple[str, list]]:
+    # Fresh objects per call: alembic attaches them to a Table. Parents first.
+    return [
+        (
+            "app_settings",
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("user_id", sa.Integer(), nullable=False),
+                sa.Column("data_masking_enabled", sa.Boolean(), nullable=True),
+                sa.Column("local_storage_only", sa.Boolean(), nullable=True),
+                sa.Column("auto_delete_after_days", sa.Integer(), nullable=True),
+                sa.Column("theme", sa.String(length=20), nullable=True),
+                sa.Column("language", sa.String(length=10), nullable=True),
+                sa.Column("notifications_enabled", sa.Boolean(), nullable=True),
+                sa.Column("default_analysis_depth", sa.String(length=20), nullable=True),
+                sa.Column("auto_summarize_long_chats", sa.Boolean(), nullable=True),
+                sa.Column("settings_json", sa.JSON(), nullable=True),
+                _created_at(),
+                sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+                _users_fk(),
+            ],
+        ),
+        (
+            "coaching_status",
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("user_id", sa.Integer(), nullable=False),
+                sa.Column("current_focus_area", sa.String(length=100), nullable=True),
+                sa.Column("week_start_date", sa.DateTime(timezone=True), nullable=True),
+                sa.Column("completed_tasks", sa.JSON(), nullable=True),
+                sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+                _users_fk(),
+                sa.UniqueConstraint("user_id"),
+            ],
+        ),
+        (
+            "daily_pulses",
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("user_id", sa.Integer(), nullable=False),
+                sa.Column("date", sa.DateTime(), nullable=False),
+                sa.Column("mood_score", sa.Integer(), nullable=False),
+                sa.Column("connection_score", sa.Integer(), nullable=False),
+                sa.Column("note", sa.Text(), nullable=True),
+                _created_at(),
+                _users_fk(),
+            ],
+        ),
+        (
+            "love_language_tests",
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("user_id", sa.Integer(), nullable=False),
+                sa.Column("primary_language", sa.String(length=50), nullable=False),
+                sa.Column("secondary_language", sa.String(length=50), nullable=True),
+                sa.Column("scores", sa.JSON(), nullable=False),
+                sa.Column("test_version", sa.String(length=20), nullable=True),
+                sa.Column("answers", sa.JSON(), nullable=True),
+                _created_at(),
+                _users_fk(),
+            ],
+        ),
+        (
+            "user_goals",
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("user_id", sa.Integer(), nullable=False),
+                sa.Column("goal_type", sa.String(length=100), nullable=False),
+                sa.Column("description", sa.Text(), nullable=True),
+                sa.Column("priority", sa.String(length=20), nullable=True),
+                sa.Column("status", sa.String(length=20), nullable=True),
+                sa.Column("progress_percentage", sa.Integer(), nullable=True),
+                sa.Column("milestones", sa.JSON(), nullable=True),
+                _created_at(),
+                sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+                sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+                _users_fk(),
+            ],
+        ),
+        (
+            "chat_sessions",
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("user_id", sa.Integer(), nullable=False),
+                sa.Column("analysis_id", sa.Integer(), nullable=True),
+                sa.Column("title", sa.String(length=255), nullable=True),
+                _created_at(),
+                # Sessions are listed by updated_at (see b7d2e8f1a4c3)
+                sa.Column(
+                    "updated_at",
+                    sa.DateTime(timezone=True),
+                    server_default=sa.text("CURRENT_TIMESTAMP"),
+                    nullable=True,
+                ),
+                _users_fk(),
+                sa.ForeignKeyConstraint(["analysis_id"], ["analyses.id"]),
+            ],
+        ),
+        (
+            "chat_messages",
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("session_id", sa.Integer(), nullable=False),
+                sa.Column("role", sa.String(length=50), nullable=False),
+                sa.Column("content", sa.Text(), nullable=False),
+                _created_at(),
+                sa.ForeignKeyConstraint(["session_id"], ["chat_sessions.id"]),
+            ],
+        ),
+    ]
+
+
+def _new_columns() -> list[tuple[str, sa.Column]]:
+    # (table, column) added to existing tables
+    return [
+        ("feedbacks", sa.Column("category", sa.String(length=50), nullable=True)),
+        ("users", sa.Column("verification_code", sa.String(length=6), nullable=True)),
+        (
+            "users",
+            sa.Column("verification_code_expires_at", sa.DateTime(timezone=True), nullable=True),
+        ),
+        ("users", sa.Column("is_pro", sa.Boolean(), nullable=True)),
+        ("users", sa.Column("subscription_end_date", sa.DateTime(timezone=True), nullable=True)),
+        ("users", sa.Column("onboarding_completed", sa.Boolean(), nullable=True)),
+        ("users", sa.Column("goals", sa.JSON(), nullable=True)),
+        ("users", sa.Column("love_language", sa.String(length=50), nullable=True)),
+        ("users", sa.Column("conflict_resolution_style", sa.String(length=50), nullable=True)),
+    ]
+
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ("ix_app_settings_id", "app_settings", ["id"], False),
+    ("ix_app_settings_user_id", "app_settings", ["user_id"], True),
+    ("ix_coaching_status_id", "coaching_status", ["id"], False),
+    ("ix_daily_pulses_id", "daily_pulses", ["id"], False),
+    ("ix_daily_pulses_user_created_id", "daily_pulses", ["user_id", "created_at", "id"], False),
+    ("ix_love_language_tests_id", "love_language_tests", ["id"], False),
+    ("ix_love_language_tests_user_id", "love_language_tests", ["user_id"], False),
+    ("ix_user_goals_id", "user_goals", ["id"], False),
+    ("ix_user_goals_user_id", "user_goals", ["user_id"], False),
+    ("ix_chat_sessions_id", "chat_sessions", ["id"], False),
+    ("ix_chat_sessions_user_updated_id", "chat_sessions", ["user_id", "updated_at", "id"], False),
+    ("ix_chat_messages_id", "chat_messages", ["id"], False),
+    ("ix_refresh_tokens_id", "refresh_tokens", ["id"], False),
+    ("ix_subscriptions_id", "subscriptions", ["id"], False),
+    ("ix_subscriptions_stripe_customer_id", "subscriptions", ["stripe_customer_id"], False),
+    ("ix_usage_tracking_id", "usage_tracking", ["id"], False),
+]
+
+
+def _columns(inspector, table: str) -> set[str]:
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def _existing_indexes(inspector, table: str) -> set[str]:
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    for table, elements in _tables():
+        if table not in tables:
+            op.create_table(table, *elements)
+
+    # Inspector caches reflection: re-create it after DDL
+    inspector = sa.inspect(op.get_bind())
+    for table, column in _new_columns():
+        if column.name not in _columns(inspector, table):
+            op.add_column(table, column)
+
+    for name, table, columns, unique in INDEXES:
+        if name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    created = [table for table, _ in _tables()]
+
+    # Indexes on the dropped tables go with them
+    for name, table, _, _ in reversed(INDEXES):
+        if table not in created and name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
+
+    for table in ["users", "feedbacks"]:
+        existing = _columns(inspector, table)
+        with op.batch_alter_table(table) as batch_op:
+            for owner, column in _new_columns():
+                if owner == table and column.name in existing:
+                    batch_op.drop_column(column.name)
+
+    for table in reversed(created):
+        if table in tables:
+            op.drop_table(table)
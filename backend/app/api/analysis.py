@@ -1,16 +1,19 @@
 """Analiz API Endpoints"""
 
 import logging
+from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from app.api.auth import get_optional_current_user
-from app.core.database import get_db
+from app.api.auth import get_optional_principal
+from app.core.database import get_db, release_connection
+from app.core.dependencies import get_async_analysis_repository
 from app.core.features import FREE_TIER_DAILY_ANALYSIS_LIMIT, PRO_ONLY_FEATURES
 from app.core.limiter import limiter
-from app.models.database import Analysis, User
+from app.core.pagination import next_cursor
+from app.repositories import AsyncAnalysisRepository
 from app.schemas.analysis import (
     AnalysisRequest,
     AnalysisResponse,
@@ -21,6 +24,9 @@ from app.schemas.analysis import (
 )
 from app.services.analysis_service import get_analysis_service
 from app.services.crud import AnalysisCRUD
+from app.services.principal_cache import Principal
+from app.services.usage_buffer import usage_buffer
+from app.services.usage_counter import RESOURCE_ANALYSIS, RESOURCE_EXPORT, usage_counter
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -46,7 +52,7 @@ async def analyze_text(
     analysis_request: AnalysisRequest,
     db: Session = Depends(get_db),
     save_to_db: bool = True,
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """
     İlişki analizi endpoint'i
@@ -58,46 +64,6 @@ async def analyze_text(
     """
     service = get_analysis_service()
 
-    # Feature Gating: Daily Limit for Free Users
-    from datetime import datetime
-
-    from sqlalchemy import func
-
-    from app.services.cache_service import cache_service
-
-    if current_user and not current_user.is_pro:
-        today = datetime.now(timezone.utc).date()
-
-        # Cache key for daily count (per user, per day)
-        cache_key = f"daily_analysis_count:{current_user.id}:{today.isoformat()}"
-
-        # Try to get from cache first
-        daily_count = cache_service.get(cache_key)
-
-        if daily_count is None:
-            # Cache miss - query database
-            daily_count = (
-                db.query(Analysis)
-                .filter(
-                    Analysis.user_id == current_user.id, func.date(Analysis.created_at) == today
-                )
-                .count()
-            )
-
-            # Cache for 5 minutes (300 seconds)
-            cache_service.set(cache_key, daily_count, ttl_seconds=300)
-            logger.debug(f"Cached daily count for user {current_user.id}: {daily_count}")
-        else:
-            logger.debug(
-                f"Retrieved daily count from cache for user {current_user.id}: {daily_count}"
-            )
-
-        if daily_count >= FREE_TIER_DAILY_ANALYSIS_LIMIT:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Ücretsiz planda günlük analiz limiti {FREE_TIER_DAILY_ANALYSIS_LIMIT} adettir. Sınırsız analiz için Pro'ya yükseltin.",
-            )
-
     # Validasyon
     is_valid, error_msg = service.validate_text(analysis_request.text)
     if not is_valid:
@@ -113,15 +79,39 @@ async def analyze_text(
             detail=error_msg,
         )
 
+    # Feature Gating: Daily Limit for Free Users
+    # Tek atomik artır-ve-kontrol et; eşzamanlı isteklerde limit aşılamaz
+    quota_consumed = False
+    if current_user and not current_user.is_pro:
+        allowed, daily_count = usage_counter.try_consume(
+            db, current_user.id, RESOURCE_ANALYSIS, FREE_TIER_DAILY_ANALYSIS_LIMIT
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Ücretsiz planda günlük analiz limiti {FREE_TIER_DAILY_ANALYSIS_LIMIT} adettir. Sınırsız analiz için Pro'ya yükseltin.",
+            )
+        quota_consumed = True
+        logger.debug(f"Daily analysis usage for user {current_user.id}: {daily_count}")
+
     # Analiz yap
-    result = service.analyze_text(
-        text=analysis_request.text,
-        format_type=analysis_request.format_type,
-        privacy_mode=analysis_request.privacy_mode,
-    )
+    try:
+        result = service.analyze_text(
+            text=analysis_request.text,
+            format_type=analysis_request.format_type,
+            privacy_mode=analysis_request.privacy_mode,
+        )
+    except Exception:
+        # Beklenmeyen hata da kotadan düşülmez
+        if quota_consumed:
+            usage_counter.release(db, current_user.id, RESOURCE_ANALYSIS)
+        raise
 
     # Hata kontrolü
     if result.get("status") == "error":
+        # Başarısız analiz kotadan düşülmez
+        if quota_consumed:
+            usage_counter.release(db, current_user.id, RESOURCE_ANALYSIS)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=result.get("message", "Analiz başarısız"),
@@ -241,13 +231,26 @@ async def get_supported_formats():
 async def get_analysis_history(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    repo: AsyncAnalysisRepository = Depends(get_async_analysis_repository),
 ):
-    """Son analizleri getir"""
-    analyses = AnalysisCRUD.get_recent_analyses(db, skip=skip, limit=limit)
+    """
+    Son analizleri getir
 
-    return {
+    - **cursor**: Önceki yanıttaki `next_cursor` (verilirse skip yok sayılır)
+    """
+    from app.services.cache_service import ANALYSES_LIST_TAG, cache_service
+
+    cache_key = f"analysis_history:{cursor or skip}:{limit}"
+    cached = cache_service.get(cache_key)
+    if cached is not None:
+        return cached
+
+    analyses = await repo.get_all(skip=skip, limit=limit, cursor=cursor)
+
+    response = {
         "total": len(analyses),
+        "next_cursor": next_cursor(analyses, limit),
         "analyses": [
             {
                 "id": a.id,
@@ -259,6 +262,8 @@ async def get_analysis_history(
             for a in analyses
         ],
     }
+    cache_service.set(cache_key, response, ttl_seconds=3600, tags=[ANALYSES_LIST_TAG])
+    return response
 
 
 @router.get(
@@ -268,10 +273,17 @@ async def get_analysis_history(
 )
 async def get_analysis_detail(
     analysis_id: int,
-    db: Session = Depends(get_db),
+    repo: AsyncAnalysisRepository = Depends(get_async_analysis_repository),
 ):
     """Analiz detayını getir"""
-    analysis = AnalysisCRUD.get_analysis_by_id(db, analysis_id)
+    from app.services.cache_service import analysis_tag, cache_service
+
+    cache_key = f"analysis_detail:{analysis_id}"
+    cached = cache_service.get(cache_key)
+    if cached is not None:
+        return cached
+
+    analysis = await repo.get_by_id(analysis_id, with_report=True)
 
     if not analysis:
         raise HTTPException(
@@ -279,7 +291,7 @@ async def get_analysis_detail(
             detail="Analiz bulunamadı",
         )
 
-    return {
+    response = {
         "id": analysis.id,
         "overall_score": analysis.overall_score,
         "metrics": {
@@ -292,6 +304,40 @@ async def get_analysis_detail(
         "full_report": analysis.full_report,
         "created_at": analysis.created_at.isoformat() if analysis.created_at else None,
     }
+    cache_service.set(cache_key, response, ttl_seconds=86400, tags=[analysis_tag(analysis_id)])
+    return response
+
+
+@router.get(
+    "/history/{analysis_id}/heatmap",
+    summary="Tarih Aralığında Tansiyon",
+    description="Kayıtlı heatmap zaman çizelgesinden seçilen tarih aralığının tansiyonunu döndürür",
+)
+async def get_analysis_heatmap_range(
+    analysis_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    repo: AsyncAnalysisRepository = Depends(get_async_analysis_repository),
+):
+    """Tarih aralığı sorgusu (mesajlar yeniden taranmaz, kümülatif dizilerden dilimlenir)"""
+    from app.services.heatmap_service import TensionTimeline
+
+    analysis = await repo.get_by_id(analysis_id, with_report=True)
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analiz bulunamadı",
+        )
+
+    heatmap = (analysis.full_report or {}).get("heatmap") or {}
+    if not heatmap.get("timeline"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bu analiz için tarihli tansiyon verisi yok",
+        )
+
+    timeline = TensionTimeline.from_dict(heatmap["timeline"])
+    return timeline.range_summary(start, end)
 
 
 @router.get(
@@ -302,7 +348,7 @@ async def get_analysis_detail(
 async def export_pdf(
     analysis_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """Analizi PDF olarak indir"""
 
@@ -314,7 +360,7 @@ async def export_pdf(
         )
 
     # 2. Analizi Getir
-    analysis = AnalysisCRUD.get_analysis_by_id(db, analysis_id)
+    analysis = AnalysisCRUD.get_analysis_by_id(db, analysis_id, with_report=True)
     if not analysis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -345,6 +391,7 @@ async def export_pdf(
     }
 
     pdf_bytes = report_service.generate_pdf_report(analysis_data, user_name=current_user.full_name)
+    usage_buffer.record_usage(current_user.id, RESOURCE_EXPORT)
 
     # 4. Dosyayı Döndür
     return StreamingResponse(
@@ -362,14 +409,14 @@ async def export_pdf(
 async def export_html(
     analysis_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """Analizi HTML olarak indir"""
     from fastapi.responses import HTMLResponse
 
     from app.services.report_service import get_report_service
 
-    analysis = AnalysisCRUD.get_analysis_by_id(db, analysis_id)
+    analysis = AnalysisCRUD.get_analysis_by_id(db, analysis_id, with_report=True)
     if not analysis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -436,7 +483,7 @@ async def delete_analysis(
     description="Verilen mesajı belirtilen tonda yeniden yazar (Mock/Rule-based for MVP)",
 )
 async def rewrite_message(
-    request: RewriteRequest, current_user: Optional[User] = Depends(get_optional_current_user)
+    request: RewriteRequest, current_user: Optional[Principal] = Depends(get_optional_principal)
 ):
     """
     Mesaj tonu değiştirme endpoint'i.
@@ -488,7 +535,7 @@ async def rewrite_message(
 async def analyze_screenshot(
     request: Request,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """
     Screenshot analizi endpoint'i (V2.0)
@@ -615,7 +662,7 @@ async def analyze_screenshot(
 async def analyze_v2(
     request: Request,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """
     V2.0 Analiz endpoint'i - Gottman-based structured report
@@ -649,6 +696,9 @@ async def analyze_v2(
                 detail=error_msg,
             )
 
+        # AI aşamasında havuzdan bağlantı tutma (önceki sorgular varsa bırakılır)
+        release_connection(db)
+
         # Run basic analysis first
         basic_result = service.analyze_text(
             text=text,
@@ -663,8 +713,8 @@ async def analyze_v2(
         heatmap_data = None
         try:
             parser = ConversationParser()
-            parsed = parser.parse(text, format_type=format_type)
-            messages = parsed.get("messages", [])
+            # Sütunlu tablo: heatmap timestamp'leri yeniden parse etmez
+            messages = parser.parse_table(text, format_type=format_type)
 
             if messages:
                 heatmap_service = get_heatmap_service()
@@ -673,8 +723,10 @@ async def analyze_v2(
             logger.warning(f"Heatmap generation failed: {e}")
 
         # 2. Psychological Profile (Attachment Style + Love Language)
+        from app.services.ai_service import get_ai_service
         from app.services.psychology_service import get_psychology_service
 
+        ai_service = get_ai_service()
         psychology_profile = None
         try:
             psych_service = get_psychology_service()
@@ -711,7 +763,7 @@ async def analyze_v2(
             "psychology_profile": psychology_profile,
         }
 
-        # Save to database
+        # Save to database (bağlantı burada yeniden alınır)
         if current_user:
             try:
                 db_analysis = AnalysisCRUD.create_analysis(
@@ -764,7 +816,7 @@ async def analyze_v2(
 )
 async def generate_heatmap(
     request: Request,
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """Conversation heatmap endpoint"""
     from app.services.heatmap_service import get_heatmap_service
@@ -792,7 +844,7 @@ async def generate_heatmap(
 @limiter.limit("10/minute")
 async def shift_message_tone(
     request: Request,
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """Tone shifter endpoint (Pro only)"""
     from app.services.tone_shifter import get_tone_shifter
@@ -812,7 +864,7 @@ async def shift_message_tone(
 @limiter.limit("3/minute")
 async def project_future(
     request: Request,
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """Future projection endpoint (Pro only)"""
     from app.services.ai_projection import get_ai_projection
@@ -837,7 +889,7 @@ async def project_future(
 @limiter.limit("10/minute")
 async def response_assistant(
     request: Request,
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """
     Yanıt Asistanı endpoint'i (Shadowing Feature)
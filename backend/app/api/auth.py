@@ -5,17 +5,19 @@ from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
-from app.core.dependencies import get_user_repository
+from app.core.database import get_async_db
+from app.core.dependencies import get_async_user_repository, get_user_repository
 from app.core.limiter import limiter
-from app.core.security import create_access_token, get_password_hash, verify_password
-from app.models.database import User
-from app.repositories import UserRepository
+from app.core.security import create_access_token, password_hasher
+from app.models.database import RefreshToken, User
+from app.repositories import AsyncUserRepository, UserRepository
 from app.schemas.user import Token, TokenData, UserCreate, UserResponse, UserVerify
 from app.services.email_service import email_service
+from app.services.principal_cache import Principal, principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +27,11 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
 @router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, repo: UserRepository = Depends(get_user_repository)):
+async def register(
+    user: UserCreate, repo: AsyncUserRepository = Depends(get_async_user_repository)
+):
     # Check if email already exists
-    if repo.email_exists(user.email):
+    if await repo.email_exists(user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
@@ -36,7 +40,8 @@ async def register(user: UserCreate, repo: UserRepository = Depends(get_user_rep
     verification_code = "".join([str(random.randint(0, 9)) for _ in range(6)])
     verification_expires = datetime.now(timezone.utc) + timedelta(minutes=15)
 
-    hashed_password = get_password_hash(user.password)
+    # Argon2 is CPU-bound; keep it off the event loop (429 when the pool is saturated)
+    hashed_password = await password_hasher.hash(user.password)
 
     # Create user entity
     new_user = User(
@@ -49,7 +54,7 @@ async def register(user: UserCreate, repo: UserRepository = Depends(get_user_rep
     )
 
     # Save via repository
-    created_user = repo.create(new_user)
+    created_user = await repo.create(new_user)
 
     # Send verification email
     await email_service.send_verification_email(created_user.email, verification_code)
@@ -58,12 +63,14 @@ async def register(user: UserCreate, repo: UserRepository = Depends(get_user_rep
 
 
 @router.post("/verify")
-def verify_email(verify_data: UserVerify, repo: UserRepository = Depends(get_user_repository)):
+async def verify_email(
+    verify_data: UserVerify, repo: AsyncUserRepository = Depends(get_async_user_repository)
+):
     try:
         logger.info(f"Verify request for: {verify_data.email}")
 
         # Find user by email
-        user = repo.get_by_email(verify_data.email)
+        user = await repo.get_by_email(verify_data.email)
         if not user:
             logger.warning("User not found")
             raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
@@ -88,7 +95,7 @@ def verify_email(verify_data: UserVerify, repo: UserRepository = Depends(get_use
         user.is_verified = True
         user.verification_code = None
         user.verification_code_expires_at = None
-        repo.update(user)
+        await repo.update(user)
         logger.info(f"Verification success for {verify_data.email}")
 
         return {"message": "Email başarıyla doğrulandı"}
@@ -106,15 +113,15 @@ def verify_email(verify_data: UserVerify, repo: UserRepository = Depends(get_use
 
 @router.post("/login", response_model=Token)
 @limiter.limit("5/minute")
-def login(
+async def login(
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    repo: UserRepository = Depends(get_user_repository),
-    db: Session = Depends(get_db),
+    repo: AsyncUserRepository = Depends(get_async_user_repository),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # OAuth2PasswordRequestForm uses 'username' field, but we treat it as email
-    user = repo.get_by_email(form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await repo.get_by_email(form_data.username)
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -133,7 +140,6 @@ def login(
 
     # Create refresh token
     from app.core.security import create_refresh_token, hash_token
-    from app.models.database import RefreshToken
 
     refresh_token = create_refresh_token(user.id)
     refresh_token_hash = hash_token(refresh_token)
@@ -150,7 +156,7 @@ def login(
         ip_address=request.client.host if request.client else None,
     )
     db.add(db_refresh_token)
-    db.commit()
+    await db.commit()
 
     return {
         "access_token": access_token,
@@ -159,32 +165,87 @@ def login(
     }
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    repo: UserRepository = Depends(get_user_repository),
-):
-    from jose import JWTError, jwt
-
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> dict:
+    """Decode the access token claims or raise 401"""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+def _token_data(token: str) -> TokenData:
+    return TokenData(email=_decode_token(token)["sub"])
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    repo: UserRepository = Depends(get_user_repository),
+):
+    """Current user on the sync session (endpoints that modify it with get_db)"""
+    token_data = _token_data(token)
 
     user = repo.get_by_email(token_data.email)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    repo: AsyncUserRepository = Depends(get_async_user_repository),
+):
+    """Current user on the async session (read-mostly async handlers)"""
+    token_data = _token_data(token)
+
+    user = await repo.get_by_email(token_data.email)
+    if user is None:
+        raise _credentials_exception()
     return user
 
 
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    repo: AsyncUserRepository = Depends(get_async_user_repository),
+) -> Principal:
+    """
+    Current user snapshot (id, is_pro, ...) for handlers that do not modify the user
+
+    Cache hit: no jwt.decode and no users lookup.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    claims = _decode_token(token)
+    user = await repo.get_by_email(claims["sub"])
+    if user is None:
+        raise _credentials_exception()
+    return principal_cache.put(token, claims, Principal.from_user(user))
+
+
+async def require_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    """Admin-only endpoints: e-mail must be listed in ADMIN_EMAILS"""
+    if principal.email.lower() not in settings.ADMIN_EMAIL_SET:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return principal
+
+
 # Correct implementation:
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="api/auth/login", auto_error=False)
 
@@ -201,33 +262,56 @@ async def get_optional_current_user(
         return None
 
 
+async def get_optional_current_user_async(
+    token: Annotated[Optional[str], Depends(oauth2_scheme_optional)],
+    repo: AsyncUserRepository = Depends(get_async_user_repository),
+):
+    if not token:
+        return None
+    try:
+        return await get_current_user_async(token, repo)
+    except HTTPException:
+        return None
+
+
+async def get_optional_principal(
+    token: Annotated[Optional[str], Depends(oauth2_scheme_optional)],
+    repo: AsyncUserRepository = Depends(get_async_user_repository),
+) -> Optional[Principal]:
+    if not token:
+        return None
+    try:
+        return await get_current_principal(token, repo)
+    except HTTPException:
+        return None
+
+
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: Annotated[User, Depends(get_current_user)]):
+async def read_users_me(current_user: Annotated[User, Depends(get_current_user_async)]):
     return current_user
 
 
 @router.post("/refresh", response_model=Token)
-def refresh_access_token(
+async def refresh_access_token(
     refresh_token: str,
-    db: Session = Depends(get_db),
-    repo: UserRepository = Depends(get_user_repository),
+    db: AsyncSession = Depends(get_async_db),
+    repo: AsyncUserRepository = Depends(get_async_user_repository),
 ):
     """Refresh access token using refresh token"""
     from app.core.security import create_access_token, hash_token
-    from app.models.database import RefreshToken
 
     # Hash the provided token
     token_hash = hash_token(refresh_token)
 
     # Find the refresh token in database
-    db_token = (
-        db.query(RefreshToken)
-        .filter(
+    db_token = await db.scalar(
+        select(RefreshToken)
+        .where(
             RefreshToken.token_hash == token_hash,
             RefreshToken.is_revoked == False,  # noqa: E712
             RefreshToken.expires_at > datetime.now(timezone.utc),
         )
-        .first()
+        .limit(1)
     )
 
     if not db_token:
@@ -237,7 +321,7 @@ def refresh_access_token(
         )
 
     # Get user
-    user = repo.get_by_id(db_token.user_id)
+    user = await repo.get_by_id(db_token.user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -252,32 +336,34 @@ def refresh_access_token(
 
 
 @router.post("/logout")
-def logout(
+async def logout(
     refresh_token: str,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Session = Depends(get_db),
+    current_user: Annotated[Principal, Depends(get_current_principal)],
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Logout by revoking refresh token"""
     from app.core.security import hash_token
-    from app.models.database import RefreshToken
 
     # Hash the provided token
     token_hash = hash_token(refresh_token)
 
     # Find and revoke the refresh token
-    db_token = (
-        db.query(RefreshToken)
-        .filter(
+    db_token = await db.scalar(
+        select(RefreshToken)
+        .where(
             RefreshToken.token_hash == token_hash,
             RefreshToken.user_id == current_user.id,
             RefreshToken.is_revoked == False,  # noqa: E712
         )
-        .first()
+        .limit(1)
     )
 
     if db_token:
         db_token.is_revoked = True
         db_token.revoked_at = datetime.now(timezone.utc)
-        db.commit()
+        await db.commit()
+
+    # Cached access tokens of this user must authenticate against the DB again
+    principal_cache.invalidate_user(current_user.id)
 
     return {"message": "Successfully logged out"}
@@ -1,14 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, undefer
 
-from app.api.auth import get_current_user
+from app.api.auth import get_current_principal
 from app.core.database import get_db
-from app.models.database import Analysis, ChatMessage, ChatSession, User
+from app.core.pagination import apply_keyset, set_next_cursor_header
+from app.models.database import Analysis, ChatMessage, ChatSession
 from app.services.ai_service import AIService
+from app.services.principal_cache import Principal
+from app.services.usage_buffer import usage_buffer
+from app.services.usage_counter import RESOURCE_CHAT
 
 router = APIRouter()
 
@@ -54,7 +58,7 @@ class ChatSessionResponse(BaseModel):
 def create_session(
     session_in: ChatSessionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Start a new chat session"""
     # Free tier limit check
@@ -99,26 +103,30 @@ def create_session(
 
 @router.get("/sessions", response_model=list[ChatSessionResponse])
 def get_sessions(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """List user's chat sessions"""
-    sessions = (
-        db.query(ChatSession)
-        .filter(ChatSession.user_id == current_user.id)
-        .order_by(ChatSession.updated_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    """List user's chat sessions (most recently active first)"""
+    query = apply_keyset(
+        db.query(ChatSession).filter(ChatSession.user_id == current_user.id),
+        ChatSession.updated_at,
+        ChatSession.id,
+        cursor,
     )
+    if skip and not cursor:
+        query = query.offset(skip)
+    sessions = query.limit(limit).all()
+    set_next_cursor_header(response, sessions, limit, sort_attr="updated_at")
     return sessions
 
 
 @router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
 def get_session(
-    session_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    session_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)
 ):
     session = (
         db.query(ChatSession)
@@ -135,7 +143,7 @@ def send_message(
     session_id: int,
     message_in: ChatMessageCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Send a message to the coach"""
     session = (
@@ -154,7 +162,12 @@ def send_message(
     # Build context
     context = None
     if session.analysis_id:
-        analysis = db.query(Analysis).filter(Analysis.id == session.analysis_id).first()
+        analysis = (
+            db.query(Analysis)
+            .options(undefer(Analysis.full_report_json), selectinload(Analysis.report_blob))
+            .filter(Analysis.id == session.analysis_id)
+            .first()
+        )
         if analysis and analysis.full_report:
             context = analysis.full_report
 
@@ -190,4 +203,6 @@ def send_message(
     db.commit()
     db.refresh(ai_msg)
 
+    usage_buffer.record_usage(current_user.id, RESOURCE_CHAT)
+
     return ai_msg
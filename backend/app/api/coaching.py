@@ -3,17 +3,19 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.api.auth import get_current_user
+from app.api.auth import get_current_principal
 from app.core.database import get_db
-from app.models.database import CoachingStatus, User
+from app.models.database import CoachingStatus
 from app.schemas.coaching import CoachingStatusResponse, CoachingStatusUpdate
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
 
 @router.get("/status", response_model=CoachingStatusResponse)
 async def get_coaching_status(
-    current_user: Annotated[User, Depends(get_current_user)], db: Session = Depends(get_db)
+    current_user: Annotated[Principal, Depends(get_current_principal)],
+    db: Session = Depends(get_db),
 ):
     status = db.query(CoachingStatus).filter(CoachingStatus.user_id == current_user.id).first()
 
@@ -32,7 +34,7 @@ async def get_coaching_status(
 @router.patch("/status", response_model=CoachingStatusResponse)
 async def update_coaching_status(
     update_data: CoachingStatusUpdate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_principal)],
     db: Session = Depends(get_db),
 ):
     status = db.query(CoachingStatus).filter(CoachingStatus.user_id == current_user.id).first()
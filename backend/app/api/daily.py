@@ -1,13 +1,16 @@
 from datetime import date, datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.auth import get_current_user
-from app.core.database import get_db
-from app.models.database import DailyPulse, User
+from app.api.auth import get_current_principal
+from app.core.database import get_async_db
+from app.core.pagination import apply_keyset, set_next_cursor_header
+from app.models.database import DailyPulse
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
@@ -39,7 +42,10 @@ class DailyStatusResponse(BaseModel):
 
 
 @router.get("/status", response_model=DailyStatusResponse)
-def get_daily_status(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_daily_status(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
     """Check if daily pulse is completed for today"""
     today = date.today()
     # Filter by truncated date or range. Since we store date as DateTime in DB (maybe),
@@ -50,14 +56,14 @@ def get_daily_status(db: Session = Depends(get_db), current_user: User = Depends
     start_of_day = datetime.combine(today, datetime.min.time())
     end_of_day = datetime.combine(today, datetime.max.time())
 
-    pulse = (
-        db.query(DailyPulse)
-        .filter(
+    pulse = await db.scalar(
+        select(DailyPulse)
+        .where(
             DailyPulse.user_id == current_user.id,
             DailyPulse.created_at >= start_of_day,
             DailyPulse.created_at <= end_of_day,
         )
-        .first()
+        .limit(1)
     )
 
     if pulse:
@@ -66,24 +72,24 @@ def get_daily_status(db: Session = Depends(get_db), current_user: User = Depends
 
 
 @router.post("/checkin", response_model=DailyPulseResponse)
-def submit_checkin(
+async def submit_checkin(
     pulse_in: DailyPulseCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     # Check if already done
     today = date.today()
     start_of_day = datetime.combine(today, datetime.min.time())
     end_of_day = datetime.combine(today, datetime.max.time())
 
-    existing = (
-        db.query(DailyPulse)
-        .filter(
+    existing = await db.scalar(
+        select(DailyPulse)
+        .where(
             DailyPulse.user_id == current_user.id,
             DailyPulse.created_at >= start_of_day,
             DailyPulse.created_at <= end_of_day,
         )
-        .first()
+        .limit(1)
     )
 
     if existing:
@@ -97,20 +103,25 @@ def submit_checkin(
         note=pulse_in.note,
     )
     db.add(new_pulse)
-    db.commit()
-    db.refresh(new_pulse)
+    await db.commit()
+    await db.refresh(new_pulse)
     return new_pulse
 
 
 @router.get("/history", response_model=list[DailyPulseResponse])
-def get_history(
-    limit: int = 30, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+async def get_history(
+    response: Response,
+    limit: int = 30,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    pulses = (
-        db.query(DailyPulse)
-        .filter(DailyPulse.user_id == current_user.id)
-        .order_by(DailyPulse.created_at.desc())
-        .limit(limit)
-        .all()
+    stmt = apply_keyset(
+        select(DailyPulse).where(DailyPulse.user_id == current_user.id),
+        DailyPulse.created_at,
+        DailyPulse.id,
+        cursor,
     )
+    pulses = list(await db.scalars(stmt.limit(limit)))
+    set_next_cursor_header(response, pulses, limit)
     return pulses
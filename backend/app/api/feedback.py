@@ -3,13 +3,15 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel, Field
 
-from .auth import get_current_user
+from .auth import get_current_principal
 from ..core.dependencies import get_feedback_repository
-from ..models.database import Feedback, User
+from ..core.pagination import set_next_cursor_header
+from ..models.database import Feedback
 from ..repositories import FeedbackRepository
+from ..services.principal_cache import Principal
 
 router = APIRouter()
 
@@ -42,7 +44,7 @@ class FeedbackResponse(BaseModel):
 @router.post("/", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
 async def create_feedback(
     feedback_data: FeedbackCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     repo: FeedbackRepository = Depends(get_feedback_repository),
 ):
     """
@@ -77,9 +79,11 @@ async def create_feedback(
 
 @router.get("/my-feedback", response_model=list[FeedbackResponse])
 async def get_my_feedback(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     repo: FeedbackRepository = Depends(get_feedback_repository),
 ):
     """
@@ -87,14 +91,17 @@ async def get_my_feedback(
 
     - **skip**: Number of records to skip (pagination)
     - **limit**: Maximum number of records to return
+    - **cursor**: `X-Next-Cursor` header of the previous page (replaces skip)
     """
     # Get user's feedback via repository
-    return repo.get_by_user(user_id=current_user.id, skip=skip, limit=limit)
+    feedback = repo.get_by_user(user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor_header(response, feedback, limit)
+    return feedback
 
 
 @router.get("/stats", response_model=dict)
 async def get_feedback_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     repo: FeedbackRepository = Depends(get_feedback_repository),
 ):
     """
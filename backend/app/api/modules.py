@@ -5,10 +5,10 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.database import User
+from app.api.auth import get_current_principal
 from app.services.ai_service import get_ai_service
 from app.services.love_language_service import get_love_language_service
+from app.services.principal_cache import Principal
 
 router = APIRouter(prefix="/modules", tags=["modules"])
 
@@ -57,7 +57,7 @@ class LoveLanguageResult(BaseModel):
 @router.post("/tone-shift", response_model=ToneShiftResponse)
 async def shift_tone(
     request: ToneShiftRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Rewrite message in a different tone (Tone Shifter)
     
@@ -80,7 +80,7 @@ async def shift_tone(
 @router.post("/conflict-action", response_model=ConflictActionResponse)
 async def suggest_conflict_action(
     request: ConflictActionRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get immediate action suggestion for conflict resolution"""
     ai_service = get_ai_service()
@@ -103,7 +103,7 @@ async def get_love_language_questions():
 async def calculate_love_language(
     request: LoveLanguageAnswers,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Calculate love language from test answers and save to database"""
     service = get_love_language_service()
@@ -131,7 +131,7 @@ async def calculate_love_language(
 @router.get("/love-language/history")
 async def get_love_language_history(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get user's love language test history"""
     from app.models.database import LoveLanguageTest
@@ -1,20 +1,22 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.auth import get_current_user
-from app.core.database import get_db
-from app.models.database import User
-from app.services.crud import AnalysisCRUD
+from app.api.auth import get_current_principal
+from app.core.database import get_async_db
+from app.services.principal_cache import Principal
+from app.services.user_stats import user_stats_service
 
 router = APIRouter()
 
 
 @router.get("/user-stats", summary="Kullanıcı İstatistikleri")
 async def get_user_stats(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Kullanıcının haftalık skoru, serisi ve toplam analiz sayısını getirir.
     """
-    stats = AnalysisCRUD.get_user_stats(db, current_user.id)
-    return stats
+    # UserStats özeti analiz ekle/sil ile güncellenir; cache gerekmez
+    user_id = current_user.id
+    return await db.run_sync(lambda session: user_stats_service.get_stats(session, user_id))
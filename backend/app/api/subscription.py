@@ -5,7 +5,7 @@ from app.api.auth import get_current_user
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.database import User
-from app.services.payment import StripeService
+from app.services.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -25,10 +25,14 @@ def create_checkout_session(
         current_user.stripe_customer_id = "cus_mock_12345"
         current_user.stripe_subscription_id = "sub_mock_123456"
         db.commit()
+        principal_cache.invalidate_user(current_user.id)
 
         # Return success URL directly
         return {"url": f"{settings.FRONTEND_URL}/dashboard?checkout_success=true"}
 
+    # stripe SDK'sı ağır: sadece gerçek ödeme akışında yüklenir
+    from app.services.payment import StripeService
+
     try:
         # Create user in Stripe if not exists
         if not current_user.stripe_customer_id:
@@ -60,8 +64,11 @@ def customer_portal(current_user: User = Depends(get_current_user), db: Session
         current_user.is_pro = False
         current_user.stripe_subscription_id = None
         db.commit()
+        principal_cache.invalidate_user(current_user.id)
         return {"url": f"{settings.FRONTEND_URL}/subscription?downgraded=true"}
 
+    from app.services.payment import StripeService
+
     try:
         session = StripeService.create_portal_session(
             customer_id=current_user.stripe_customer_id,
@@ -76,6 +83,8 @@ def customer_portal(current_user: User = Depends(get_current_user), db: Session
 async def webhook(
     request: Request, stripe_signature: str = Header(None), db: Session = Depends(get_db)
 ):
+    from app.services.payment import StripeService
+
     payload = await request.body()
     try:
         event = StripeService.construct_event(
@@ -110,6 +119,7 @@ def handle_checkout_completed(session, db: Session):
         user.is_pro = True
         user.stripe_subscription_id = subscription_id
         db.commit()
+        principal_cache.invalidate_user(user.id)
 
 
 def handle_subscription_updated(subscription, db: Session):
@@ -123,6 +133,7 @@ def handle_subscription_updated(subscription, db: Session):
         else:
             user.is_pro = False
         db.commit()
+        principal_cache.invalidate_user(user.id)
 
 
 def handle_subscription_deleted(subscription, db: Session):
@@ -133,3 +144,4 @@ def handle_subscription_deleted(subscription, db: Session):
         user.is_pro = False
         user.stripe_subscription_id = None
         db.commit()
+        principal_cache.invalidate_user(user.id)
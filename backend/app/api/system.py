@@ -1,10 +1,26 @@
 """Sistem durumu ve AI yapılandırma endpoint'leri"""
 
+from typing import Optional
+
 import httpx
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
 
+from app.api.auth import require_admin
 from app.core.config import settings
+from app.core.database import get_pool_stats
+from app.core.performance import (
+    HISTOGRAM_BUCKET_COUNT,
+    HISTOGRAM_BUCKETS_PER_DOUBLING,
+    HISTOGRAM_MIN_SECONDS,
+    perf_monitor,
+)
+from app.core.profiling import PROFILE_TOKEN_HEADER, request_profiler
+from app.core.security import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.usage_buffer import usage_buffer
 
 router = APIRouter()
 
@@ -13,7 +29,18 @@ router = APIRouter()
 # Şemalar
 # ─────────────────────────────────────────────────────────────────────────────
 
-VALID_PROVIDERS = {"openai", "anthropic", "gemini", "ollama", "none"}
+VALID_PROVIDERS = {"openai", "anthropic", "gemini", "ollama", "mock", "none"}
+
+
+class MockLLMOptions(BaseModel):
+    """Mock provider ayarları; boş alanlar MOCK_LLM_* ayarlarından gelir"""
+
+    latency_ms: Optional[float] = Field(None, ge=0)
+    latency_sigma: Optional[float] = Field(None, ge=0)
+    error_rate: Optional[float] = Field(None, ge=0, le=1)
+    rate_limit_rate: Optional[float] = Field(None, ge=0, le=1)
+    stream_chunk_ms: Optional[float] = Field(None, ge=0)
+    seed: Optional[int] = None
 
 
 class AIProviderUpdate(BaseModel):
@@ -21,6 +48,7 @@ class AIProviderUpdate(BaseModel):
     api_key: str = ""          # Cloud provider'lar için (opsiyonel)
     ollama_model: str = ""     # Ollama için model adı (opsiyonel)
     ollama_url: str = ""       # Ollama için base URL (opsiyonel)
+    mock: Optional[MockLLMOptions] = None  # Mock provider için (opsiyonel)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -44,7 +72,7 @@ async def system_status():
         except Exception:
             ollama_running = False
 
-    return {
+    status = {
         "ai_enabled": settings.AI_ENABLED,
         "ai_provider": ai_service.provider,           # Singleton'dan oku (runtime değişebilir)
         "ai_available": ai_service._is_available(),
@@ -52,8 +80,80 @@ async def system_status():
         "ollama_url": settings.OLLAMA_BASE_URL,
         "ollama_model": settings.OLLAMA_MODEL,
         "database": "connected",
+        "usage_buffer": usage_buffer.stats(),  # lag_seconds: DB'ye henüz yazılmamış en eski sayaç
+        "db_pool": get_pool_stats(),  # checkout_wait: havuzdan bağlantı bekleme süresi
+        "principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
         "version": settings.APP_VERSION,
     }
+    if ai_service.mock_client is not None:
+        # Yük testi: çağrı / enjekte edilen hata / 429 sayıları
+        status["mock_llm"] = ai_service.mock_client.stats()
+    return status
+
+
+@router.get("/performance", dependencies=[Depends(require_admin)])
+async def performance_stats(include_histograms: bool = False):
+    """
+    Operasyon süreleri (saniye): count, avg, min, max, p50, p95, p99
+
+    include_histograms=true: ham kovalar da döner; farklı worker'ların çıktıları
+    PerformanceMonitor.merge_snapshot ile birleştirilebilir.
+    """
+    response = {
+        "operations": perf_monitor.get_all_stats(),
+        "histogram_layout": {
+            "min_seconds": HISTOGRAM_MIN_SECONDS,
+            "buckets_per_doubling": HISTOGRAM_BUCKETS_PER_DOUBLING,
+            "bucket_count": HISTOGRAM_BUCKET_COUNT,
+        },
+    }
+    if include_histograms:
+        response["histograms"] = perf_monitor.snapshot()
+    return response
+
+
+@router.post("/profiling", dependencies=[Depends(require_admin)])
+async def arm_request_profiling():
+    """
+    Tek kullanımlık profil token'ı üret.
+
+    Token'ı "X-Profile-Token" header'ıyla gönderilen istek örnekleyici profiler
+    ve tracemalloc altında çalışır; yanıttaki X-Profile-Id ile sonuç okunur.
+    """
+    return {
+        "token": request_profiler.issue_token(),
+        "header": PROFILE_TOKEN_HEADER,
+        "expires_in": request_profiler.token_ttl,
+    }
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """Kayıtlı profiller (en yenisi önce)"""
+    return {"profiles": await run_in_threadpool(request_profiler.store.list)}
+
+
+@router.get("/profiles/{request_id}", dependencies=[Depends(require_admin)])
+async def get_profile(request_id: str):
+    """Profil özeti: süre, örnek sayısı, bellek zirvesi ve en çok ayıran satırlar"""
+    summary = await run_in_threadpool(request_profiler.store.summary, request_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profil bulunamadı")
+    return summary
+
+
+@router.get(
+    "/profiles/{request_id}/flamegraph",
+    dependencies=[Depends(require_admin)],
+    response_class=PlainTextResponse,
+)
+async def get_profile_flamegraph(request_id: str):
+    """Collapsed stack çıktısı (flamegraph.pl / speedscope ile açılır)"""
+    folded = await run_in_threadpool(request_profiler.store.folded, request_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profil bulunamadı")
+    return PlainTextResponse(folded)
 
 
 @router.post("/ai-provider")
@@ -63,6 +163,7 @@ async def switch_ai_provider(payload: AIProviderUpdate):
 
     - Cloud provider'lar için API key gereklidir.
     - Ollama için API key gerekmez; sadece Ollama'nın çalışıyor olması yeterlidir.
+    - Mock: sabit yanıtlar + ayarlanabilir gecikme/hata/429 (yük testi, production'da kapalı).
     - Değişiklik sadece çalışır süreçte geçerlidir (.env dosyasını değiştirmez).
       Kalıcı yapmak için .env dosyasını manuel güncelleyin.
     """
@@ -71,6 +172,8 @@ async def switch_ai_provider(payload: AIProviderUpdate):
             status_code=400,
             detail=f"Geçersiz provider: {payload.provider}. Desteklenenler: {VALID_PROVIDERS}",
         )
+    if payload.provider == "mock" and settings.ENVIRONMENT == "production":
+        raise HTTPException(status_code=400, detail="Mock provider production'da kullanılamaz")
 
     from app.services.ai_service import get_ai_service
 
@@ -82,6 +185,7 @@ async def switch_ai_provider(payload: AIProviderUpdate):
             api_key=payload.api_key or None,
             ollama_model=payload.ollama_model or None,
             ollama_url=payload.ollama_url or None,
+            mock_options=payload.mock.model_dump(exclude_none=True) if payload.mock else None,
         )
         return {
             "success": True,
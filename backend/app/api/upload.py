@@ -6,15 +6,15 @@ from typing import Optional
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 
-from app.api.auth import get_optional_current_user
-from app.core.database import get_db
+from app.api.auth import get_optional_principal
+from app.core.database import get_db, release_connection
 from app.core.file_utils import FileValidator, WhatsAppFileParser
-from app.models.database import User
 from app.schemas.analysis import AnalysisResponse, V2AnalysisResult
 from app.schemas.file import FileUploadResponse
 from app.services.ai_service import get_ai_service
 from app.services.analysis_service import get_analysis_service
 from app.services.crud import AnalysisCRUD
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
@@ -84,7 +84,7 @@ async def upload_and_analyze(
     privacy_mode: bool = True,
     save_to_db: bool = True,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """
     Dosya yükle ve direkt analiz et.
@@ -206,7 +206,7 @@ async def upload_and_analyze_v2(
     model_preference: str = "fast",
     save_to_db: bool = True,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_principal),
 ):
     """
     Dosya yükle ve V2 analizi yap.
@@ -255,6 +255,9 @@ async def upload_and_analyze_v2(
             text = WhatsAppFileParser.clean_whatsapp_metadata(text)
 
     # 2. V2 Analiz İşlemleri
+    # Parsing ve AI aşamasında havuzdan bağlantı tutma (önceki sorgular varsa bırakılır)
+    user_id = current_user.id if current_user else None
+    release_connection(db)
 
     # a. Heatmap & Parsing
     from app.services.heatmap_service import get_heatmap_service
@@ -263,8 +266,8 @@ async def upload_and_analyze_v2(
     heatmap_data = None
     try:
         parser = ConversationParser()
-        parsed = parser.parse(text, format_type=format_detected)
-        messages = parsed.get("messages", [])
+        # Sütunlu tablo: heatmap timestamp'leri yeniden parse etmez
+        messages = parser.parse_table(text, format_type=format_detected)
 
         if messages:
             heatmap_service = get_heatmap_service()
@@ -309,10 +312,9 @@ async def upload_and_analyze_v2(
         "heatmap": heatmap_data,
     }
 
-    # 4. Veritabanına Kaydet
+    # 4. Veritabanına Kaydet (bağlantı burada yeniden alınır)
     if save_to_db:
         try:
-            user_id = current_user.id if current_user else None
             db_analysis = AnalysisCRUD.create_analysis(
                 db=db,
                 report=v2_result,
@@ -7,6 +7,7 @@ from app.api.auth import get_current_user
 from app.core.database import get_db
 from app.models.database import User
 from app.schemas.user import UserOnboardingUpdate, UserResponse
+from app.services.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -41,6 +42,7 @@ async def update_onboarding_status(
         current_user.full_name = update_data.full_name
 
     db.commit()
+    principal_cache.invalidate_user(current_user.id)
     db.refresh(current_user)
 
     return current_user
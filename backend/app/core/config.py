@@ -27,6 +27,10 @@ class Settings(BaseSettings):
     # Default to SQLite for local development if not overridden by env var (e.g. Docker)
     DATABASE_URL: str = "sqlite:///./iliski_analiz.db"
 
+    @property
+    def ADMIN_EMAIL_SET(self) -> set[str]:
+        return {e.strip().lower() for e in self.ADMIN_EMAILS.split(",") if e.strip()}
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         # If DATABASE_URL is explicitly set (by env var or default), use it
@@ -70,7 +74,7 @@ class Settings(BaseSettings):
     LOG_JSON_FORMAT: bool = False  # Enable JSON logging for production
 
     # AI Settings
-    AI_PROVIDER: str = "gemini"  # openai, anthropic, gemini, ollama, none
+    AI_PROVIDER: str = "gemini"  # openai, anthropic, gemini, ollama, mock, none
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o-mini"
     ANTHROPIC_API_KEY: str = ""
@@ -80,9 +84,17 @@ class Settings(BaseSettings):
     # Ollama — Yerel AI (internet bağlantısı gerekmez)
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3"  # veya "mistral", "llama3.1" vb.
+    OLLAMA_KEEP_ALIVE: str = ""  # örn. "30m": model bellekte tutulur, warm-up'ta yüklenir
     AI_ENABLED: bool = True  # AI özelliklerini aç/kapat
     AI_MAX_TOKENS_INSIGHTS: int = 1000
     AI_MAX_TOKENS_RECOMMENDATIONS: int = 800
+    # Mock LLM (AI_PROVIDER=mock) — offline yük/gecikme testi, sabit yanıtlar
+    MOCK_LLM_LATENCY_MS: float = 800.0  # Log-normal gecikmenin medyanı
+    MOCK_LLM_LATENCY_SIGMA: float = 0.5  # 0 = sabit gecikme
+    MOCK_LLM_ERROR_RATE: float = 0.0  # 500 benzeri hata oranı (0-1)
+    MOCK_LLM_RATE_LIMIT_RATE: float = 0.0  # 429 oranı (0-1)
+    MOCK_LLM_STREAM_CHUNK_MS: float = 20.0  # Streaming: token başına süre
+    MOCK_LLM_SEED: int | None = None
 
     # Email Settings
     EMAIL_ENABLED: bool = False  # Email servisi aktif mi?
@@ -100,8 +112,64 @@ class Settings(BaseSettings):
     FRONTEND_URL: str = "http://localhost:3000"
     MOCK_PAYMENTS: bool = True  # Enable mock payments for testing/demo
 
-    # Redis Cache (Optional - falls back to in-memory if not configured)
+    # Redis Cache (Optional - falls back to disk/in-memory if not configured)
     REDIS_URL: str = ""  # e.g., "redis://localhost:6379/0"
+    CACHE_BACKEND: str = "auto"  # auto (Redis → disk), redis, disk, memory
+    # Redis'siz masaüstü sürümü için kalıcı cache (göreli yol backend/ dizinine göre)
+    CACHE_DISK_PATH: str = "data/cache/cache.db"
+    CACHE_DISK_MAX_MB: int = 256  # Aşılınca önce süresi dolan, sonra LRU kayıtlar silinir
+
+    # Analysis reports: JSON larger than this is stored zlib-compressed in a separate table
+    ANALYSIS_REPORT_BLOB_MIN_BYTES: int = 0  # 0 = kapalı (rapor analyses.full_report'ta kalır)
+
+    # SQLite profile (desktop): WAL, single writer connection, pooled readers
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # WAL ile NORMAL güvenli; FULL her commit'te fsync yapar
+    SQLITE_CACHE_SIZE_KB: int = 20000  # Bağlantı başına sayfa cache'i
+    SQLITE_MMAP_SIZE_MB: int = 128  # 0 = memory-mapped I/O kapalı
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Başka süreç (alembic, script) yazarken bekleme
+    SQLITE_READ_POOL_SIZE: int = 5  # Okuyucu bağlantı sayısı
+    SQLITE_WRITER_TIMEOUT_SECONDS: float = 30.0  # Yazıcı bağlantısını bekleme üst sınırı
+
+    # Password hashing pool (Argon2 runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4  # Aynı anda çalışan hash/verify sayısı
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Çalışan + kuyrukta bekleyen; aşılınca 429
+
+    # Auth principal cache (token digest -> user snapshot), 0 = kapalı
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Usage counters (write-behind)
+    USAGE_FLUSH_INTERVAL_SECONDS: float = 5.0  # Tamponlanan sayaçların DB'ye yazılma aralığı
+    USAGE_FLUSH_MAX_PENDING: int = 500  # Bu kadar anahtar birikince beklemeden yaz
+    USAGE_FLUSH_MAX_RETRIES: int = 3  # Art arda hata sonrası satır satır yaz, bozukları at
+
+    # Admin endpoints (/api/system/performance ...): virgülle ayrılmış e-posta listesi
+    ADMIN_EMAILS: str = ""
+
+    # Prometheus /metrics (production'da METRICS_TOKEN zorunlu)
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""  # Doluysa scrape "Authorization: Bearer <token>" ister
+    METRICS_MULTIPROC_DIR: str = ""  # Çoklu worker: snapshot dizini (boş = tek süreç)
+    METRICS_SNAPSHOT_INTERVAL_SECONDS: float = 5.0
+
+    # Request tracing
+    SERVER_TIMING_ENABLED: bool = False  # Aşama süreleri Server-Timing header'ında döner
+    OTEL_EXPORTER_OTLP_ENDPOINT: str = ""  # örn. http://otel-collector:4318 (boş = kapalı)
+    OTEL_SERVICE_NAME: str = "iliski-analiz-api"
+
+    # Admin request profiling (X-Profile-Token, bkz. app/core/profiling.py)
+    PROFILING_DIR: str = "data/profiles"
+    PROFILING_MAX_PROFILES: int = 20  # Daha eski profiller silinir
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILING_TOKEN_TTL_SECONDS: int = 600
+    PROFILING_TOP_ALLOCATIONS: int = 25
+
+    # Startup schema check: alembic_version kodun head revision'ı ile karşılaştırılır.
+    # True: sürümsüz DB'de create_all + stamp, geride kalan DB'de migration (tek süreç)
+    DB_SCHEMA_BOOTSTRAP: bool = False
+
+    # Startup warm-up (analyzer, NLP modelleri, AI client); durum /ready'de
+    WARMUP_ENABLED: bool = True
 
     # Observability
     SENTRY_DSN: str = ""  # Sentry error tracking DSN
@@ -175,6 +243,10 @@ class Settings(BaseSettings):
                     "Please set GEMINI_API_KEY in your .env file or set AI_PROVIDER='none'."
                 )
             # ollama: API key gerekmez, bağlantı hatası runtime'da yakalanacak
+            elif self.AI_PROVIDER == "mock" and self.ENVIRONMENT == "production":
+                raise ValueError(
+                    "❌ AI_PROVIDER 'mock' is for load testing only and not allowed in production!"
+                )
 
         # CORS origins validation
         if self.ENVIRONMENT == "production":
@@ -184,6 +256,13 @@ class Settings(BaseSettings):
                     "Please specify exact allowed origins."
                 )
 
+        # /metrics iç yapıyı (endpoint'ler, pool, kuyruklar) açık eder
+        if self.ENVIRONMENT == "production" and self.METRICS_ENABLED and not self.METRICS_TOKEN:
+            raise ValueError(
+                "❌ CRITICAL: METRICS_ENABLED requires METRICS_TOKEN in production! "
+                "Set METRICS_TOKEN (scrapers send 'Authorization: Bearer <token>')."
+            )
+
         # Database URL validation
         if self.ENVIRONMENT == "production" and "sqlite" in self.DATABASE_URL.lower():
             raise ValueError(
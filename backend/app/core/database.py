@@ -1,11 +1,38 @@
 """Database connection ve session yönetimi"""
 
+import time
+from collections.abc import AsyncIterator
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.performance import perf_monitor
+from app.core.sqlite_profile import SQLiteRoutingSession, apply_sqlite_profile, is_file_database
+
+# perf_monitor operation for time spent waiting on a pooled connection
+POOL_WAIT_METRIC = "db_pool_checkout_wait"
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            perf_monitor.record(POOL_WAIT_METRIC, time.perf_counter() - start)
+
 
 # Database engine with optimized connection pooling
 engine_kwargs = {
@@ -16,7 +43,7 @@ engine_kwargs = {
 if "postgresql" in settings.DATABASE_URL:
     engine_kwargs.update(
         {
-            "poolclass": QueuePool,
+            "poolclass": InstrumentedQueuePool,
             "pool_size": 20,  # Number of persistent connections
             "max_overflow": 40,  # Additional connections when needed
             "pool_pre_ping": True,  # Verify connection health before use
@@ -26,10 +53,41 @@ if "postgresql" in settings.DATABASE_URL:
         }
     )
 
-engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
+SQLITE_PROFILE = is_file_database(settings.DATABASE_URL)
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if SQLITE_PROFILE:
+    # Tek yazıcı bağlantısı: yazmalar süreç içinde sıralanır (SQLITE_BUSY yerine kuyruk)
+    engine = create_engine(
+        settings.DATABASE_URL,
+        **engine_kwargs,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITER_TIMEOUT_SECONDS,
+    )
+    # WAL: okuyucular yazıcıyı beklemez
+    read_engine = create_engine(
+        settings.DATABASE_URL,
+        **engine_kwargs,
+        poolclass=QueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=settings.SQLITE_READ_POOL_SIZE,
+    )
+    apply_sqlite_profile(engine)
+    apply_sqlite_profile(read_engine)
+
+    SessionLocal = sessionmaker(
+        class_=SQLiteRoutingSession,
+        autocommit=False,
+        autoflush=False,
+        info={"writer": engine, "reader": read_engine},
+    )
+else:
+    engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
+    read_engine = engine
+
+    # Session factory
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
@@ -43,3 +101,99 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def release_connection(db: Session) -> None:
+    """
+    Uzun DB dışı işlerden (LLM çağrıları) önce bağlantıyı havuza geri ver.
+
+    Session ilk sorguda yeniden bağlantı alır; yüklenmiş nesneler (ör. current_user)
+    okunabilir kalır. Bekleyen değişiklikler önce commit edilmelidir.
+    """
+    db.close()
+
+
+def _pool_stats(pool) -> dict:
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "idle": pool.checkedin(),
+            }
+        )
+    return stats
+
+
+def get_pool_stats() -> dict:
+    """
+    Sync engine pool durumu ve checkout bekleme süreleri (metrics için)
+
+    SQLite profilinde ana havuz tek yazıcı bağlantısıdır; checkout_wait yazma kuyruğunu gösterir.
+    """
+    stats = _pool_stats(engine.pool)
+    if read_engine is not engine:
+        stats["read_pool"] = _pool_stats(read_engine.pool)
+    stats["checkout_wait"] = perf_monitor.get_stats(POOL_WAIT_METRIC)
+    return stats
+
+
+# Async engine (request path): asyncpg for PostgreSQL, aiosqlite for SQLite
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_async_database_url(url: str) -> str:
+    """Map the sync DATABASE_URL onto its async driver"""
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_async_engine() -> AsyncEngine:
+    """Async engine singleton (driver is imported on first use)"""
+    global _async_engine
+    if _async_engine is None:
+        async_kwargs = {k: v for k, v in engine_kwargs.items() if k != "poolclass"}
+        if "sqlite" in settings.DATABASE_URL:
+            async_kwargs["connect_args"] = {}
+        _async_engine = create_async_engine(
+            get_async_database_url(settings.DATABASE_URL), **async_kwargs
+        )
+        if SQLITE_PROFILE:
+            apply_sqlite_profile(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Async session factory singleton"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        # expire_on_commit=False: returned ORM objects stay readable after commit (no lazy IO)
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async database session dependency"""
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (shutdown)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
@@ -1,10 +1,18 @@
 """Repository dependency injection helpers"""
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.repositories import AnalysisRepository, FeedbackRepository, UserRepository
+from app.core.database import get_async_db, get_db
+from app.repositories import (
+    AnalysisRepository,
+    AsyncAnalysisRepository,
+    AsyncFeedbackRepository,
+    AsyncUserRepository,
+    FeedbackRepository,
+    UserRepository,
+)
 
 
 def get_analysis_repository(db: Session = Depends(get_db)) -> AnalysisRepository:
@@ -51,3 +59,25 @@ def get_feedback_repository(db: Session = Depends(get_db)) -> FeedbackRepository
         FeedbackRepository instance
     """
     return FeedbackRepository(db)
+
+
+# Async variants (AsyncSession per request, for async def handlers)
+
+
+def get_async_analysis_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncAnalysisRepository:
+    """Dependency injection for AsyncAnalysisRepository."""
+    return AsyncAnalysisRepository(db)
+
+
+def get_async_user_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncUserRepository:
+    """Dependency injection for AsyncUserRepository."""
+    return AsyncUserRepository(db)
+
+
+def get_async_feedback_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncFeedbackRepository:
+    """Dependency injection for AsyncFeedbackRepository."""
+    return AsyncFeedbackRepository(db)
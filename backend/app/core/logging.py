@@ -7,7 +7,7 @@ import json
 import logging
 import sys
 from contextvars import ContextVar
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
 from app.core.config import settings
@@ -47,6 +47,8 @@ class JSONFormatter(logging.Formatter):
             log_data["duration_ms"] = record.duration_ms
         if hasattr(record, "status_code"):
             log_data["status_code"] = record.status_code
+        if hasattr(record, "spans"):
+            log_data["spans"] = record.spans
 
         return json.dumps(log_data)
 
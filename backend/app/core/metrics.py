@@ -0,0 +1,378 @@
+"""Prometheus metrics - in-process counters/histograms, text exposition format
+
+İstek yolunda yalnızca kilitli bir dict güncellemesi yapılır. Havuz, cache
+gibi anlık değerler scrape sırasında collector'lardan okunur.
+
+Çoklu worker (gunicorn/uvicorn --workers): METRICS_MULTIPROC_DIR ayarlıysa her
+worker kendi snapshot'ını periyodik olarak bu dizine yazar; /metrics hangi
+worker'a düşerse düşsün tüm dosyaları birleştirir. Counter ve histogram'lar
+ölen worker'lardan da toplanır, gauge'lar yalnızca yaşayan worker'lardan.
+Dizin deploy sırasında temizlenmelidir.
+"""
+
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye cinsinden histogram sınırları (le)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Metric names
+HTTP_REQUESTS = "http_requests_total"
+HTTP_DURATION = "http_request_duration_seconds"
+LLM_REQUESTS = "llm_requests_total"
+LLM_DURATION = "llm_request_duration_seconds"
+
+LabelKey = tuple[tuple[str, str], ...]
+# Collector output: (metric name, labels, value)
+Sample = tuple[str, dict[str, str], float]
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _encode(metrics: dict[str, dict[LabelKey, Any]]) -> dict[str, list]:
+    """JSON form: name -> [[labels as [k, v] pairs, value], ...]"""
+    return {
+        name: [[list(map(list, key)), value] for key, value in series.items()]
+        for name, series in metrics.items()
+    }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Counters, histograms and scrape-time collectors for one process"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # name -> (type, help)
+        self._meta: dict[str, tuple[str, str]] = {}
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        # name -> labels -> [count per bucket..., +Inf count, sum]
+        self._histograms: dict[str, dict[LabelKey, list[float]]] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """kind: counter, gauge or histogram"""
+        self._meta[name] = (kind, help_text)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Scrape-time samples (gauges or counters kept elsewhere, e.g. cache hits)"""
+        self._collectors.append(collector)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)  # value <= le
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            row = series.get(key)
+            if row is None:
+                row = series[key] = [0.0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable state of this process, collectors included"""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: list(row) for key, row in series.items()}
+                for name, series in self._histograms.items()
+            }
+
+        gauges: dict[str, dict[LabelKey, float]] = {}
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    kind = self._meta.get(name, ("gauge", ""))[0]
+                    target = counters if kind == "counter" else gauges
+                    target.setdefault(name, {})[_label_key(labels)] = float(value)
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+
+        return {
+            "pid": os.getpid(),
+            "buckets": list(self.buckets),
+            "counters": _encode(counters),
+            "gauges": _encode(gauges),
+            "histograms": _encode(histograms),
+        }
+
+    def render(self, snapshot: dict[str, Any]) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        buckets = snapshot["buckets"]
+        lines: list[str] = []
+
+        def header(name: str, default_kind: str) -> None:
+            kind, help_text = self._meta.get(name, (default_kind, ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for section, kind in (("counters", "counter"), ("gauges", "gauge")):
+            for name, series in sorted(snapshot[section].items()):
+                header(name, kind)
+                for key, value in sorted(series, key=lambda item: item[0]):
+                    key = tuple(map(tuple, key))
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        for name, series in sorted(snapshot["histograms"].items()):
+            header(name, "histogram")
+            for key, row in sorted(series, key=lambda item: item[0]):
+                key = tuple(map(tuple, key))
+                cumulative = 0.0
+                for bound, count in zip(list(buckets) + [math.inf], row[:-1], strict=True):
+                    cumulative += count
+                    le = ("le", "+Inf" if math.isinf(bound) else repr(bound))
+                    lines.append(
+                        f"{name}_bucket{_format_labels(key, le)} {_format_value(cumulative)}"
+                    )
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(row[-1])}")
+                lines.append(f"{name}_count{_format_labels(key)} {_format_value(cumulative)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: list[dict[str, Any]]) -> dict[str, Any]:
+    """Sum counters and histograms of all workers; gauges only from live workers"""
+    merged: dict[str, dict[str, dict[LabelKey, Any]]] = {
+        "counters": {},
+        "gauges": {},
+        "histograms": {},
+    }
+    buckets = snapshots[0]["buckets"] if snapshots else list(DEFAULT_BUCKETS)
+    current = os.getpid()
+
+    for snap in snapshots:
+        if snap["buckets"] != buckets:
+            logger.warning(f"Skipping metrics snapshot of pid {snap['pid']}: bucket layout differs")
+            continue
+        live = snap["pid"] == current or _pid_alive(snap["pid"])
+        for section in ("counters", "gauges", "histograms"):
+            if section == "gauges" and not live:
+                continue
+            for name, series in snap[section].items():
+                target = merged[section].setdefault(name, {})
+                for key, value in series:
+                    key = tuple(map(tuple, key))
+                    if section == "histograms":
+                        row = target.setdefault(key, [0.0] * len(value))
+                        for i, v in enumerate(value):
+                            row[i] += v
+                    else:
+                        target[key] = target.get(key, 0.0) + value
+
+    return {
+        "pid": current,
+        "buckets": buckets,
+        **{section: _encode(series) for section, series in merged.items()},
+    }
+
+
+class MetricsExporter:
+    """Per-worker snapshot files + merged rendering for /metrics"""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: Optional[str] = None,
+        interval: Optional[float] = None,
+    ):
+        self.registry = registry
+        directory = settings.METRICS_MULTIPROC_DIR if directory is None else directory
+        self.directory = Path(directory) if directory else None
+        self.interval = interval or settings.METRICS_SNAPSHOT_INTERVAL_SECONDS
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write_snapshot(self, snapshot: Optional[dict[str, Any]] = None) -> None:
+        """Atomically replace this worker's snapshot file"""
+        if self.directory is None:
+            return
+        snapshot = snapshot or self.registry.snapshot()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"worker-{snapshot['pid']}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def collect(self) -> dict[str, Any]:
+        own = self.registry.snapshot()
+        if self.directory is None:
+            return own
+        self.write_snapshot(own)
+
+        snapshots = [own]
+        for path in self.directory.glob("worker-*.json"):
+            if path.name == f"worker-{own['pid']}.json":
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable metrics snapshot {path.name}: {e}")
+        return merge_snapshots(snapshots)
+
+    def render(self) -> str:
+        return self.registry.render(self.collect())
+
+    def start(self) -> None:
+        """Background thread that keeps this worker's snapshot file fresh"""
+        if self.directory is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        # Son değerler (counter'lar) worker kapandıktan sonra da toplanır
+        try:
+            self.write_snapshot()
+        except OSError as e:
+            logger.warning(f"Final metrics snapshot failed: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write_snapshot()
+            except Exception as e:
+                logger.warning(f"Metrics snapshot write failed: {e}")
+
+
+# Singleton instances
+metrics = MetricsRegistry()
+metrics.describe(HTTP_REQUESTS, "counter", "HTTP requests by method, route template and status")
+metrics.describe(HTTP_DURATION, "histogram", "HTTP request latency in seconds by route template")
+metrics.describe(LLM_REQUESTS, "counter", "LLM provider calls by provider, call type and outcome")
+metrics.describe(LLM_DURATION, "histogram", "LLM provider call latency in seconds")
+metrics_exporter = MetricsExporter(metrics)
+
+
+def track_llm_call(call: str):
+    """Count and time an AIService method per provider (self.provider)"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            provider = self.provider
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(self, *args, **kwargs)
+                outcome = "success"
+                return result
+            except Exception as e:
+                # SDK'ların RateLimitError'ları ve mock provider status_code=429 taşır
+                if getattr(e, "status_code", None) == 429:
+                    outcome = "rate_limited"
+                raise
+            finally:
+                metrics.inc(LLM_REQUESTS, provider=provider, call=call, outcome=outcome)
+                metrics.observe(
+                    LLM_DURATION, time.perf_counter() - start, provider=provider, call=call
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def install_default_collectors(registry: MetricsRegistry = metrics) -> None:
+    """DB pool, caches and the password hashing pool, read at scrape time"""
+    from app.core.database import engine, read_engine
+    from app.core.security import password_hasher
+    from app.services.cache_service import cache_service
+    from app.services.principal_cache import principal_cache
+    from app.services.usage_buffer import usage_buffer
+
+    registry.describe("db_pool_connections", "gauge", "Pooled DB connections by pool and state")
+    registry.describe("cache_requests_total", "counter", "Cache lookups by cache and result")
+    registry.describe("worker_pool_in_flight", "gauge", "Jobs running or queued in a worker pool")
+    registry.describe("worker_pool_capacity", "gauge", "Max jobs a worker pool accepts")
+    registry.describe("worker_pool_rejected_total", "counter", "Jobs rejected by a full pool")
+    registry.describe("usage_buffer_pending", "gauge", "Usage counters not yet written to the DB")
+
+    def db_pool() -> Iterable[Sample]:
+        pools = {"main": engine.pool}
+        if read_engine is not engine:
+            pools["read"] = read_engine.pool
+        for name, pool in pools.items():
+            if not hasattr(pool, "checkedout"):
+                continue
+            yield "db_pool_connections", {"pool": name, "state": "checked_out"}, pool.checkedout()
+            yield "db_pool_connections", {"pool": name, "state": "idle"}, pool.checkedin()
+            yield "db_pool_connections", {"pool": name, "state": "overflow"}, max(
+                pool.overflow(), 0
+            )
+
+    def caches() -> Iterable[Sample]:
+        for name, cache in (("response", cache_service), ("principal", principal_cache)):
+            yield "cache_requests_total", {"cache": name, "result": "hit"}, cache.hits
+            yield "cache_requests_total", {"cache": name, "result": "miss"}, cache.misses
+
+    def worker_pools() -> Iterable[Sample]:
+        stats = password_hasher.stats()
+        labels = {"pool": "password_hash"}
+        yield "worker_pool_in_flight", labels, stats["in_flight"]
+        yield "worker_pool_capacity", labels, stats["max_pending"]
+        yield "worker_pool_rejected_total", labels, stats["rejected"]
+
+    def buffers() -> Iterable[Sample]:
+        yield "usage_buffer_pending", {}, usage_buffer.pending
+
+    for collector in (db_pool, caches, worker_pools, buffers):
+        registry.register_collector(collector)
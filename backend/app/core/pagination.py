@@ -0,0 +1,134 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listeler `ORDER BY <zaman> DESC, id DESC` ile sıralanır; sonraki sayfa
+OFFSET yerine son kaydın (zaman, id) değerinden sonra başlar, böylece
+derin sayfalar da (user_id, zaman, id) indeksinde sayfa boyu kadar satır okur.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from fastapi import Response
+from sqlalchemy import Select, String, case, literal, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import ColumnElement
+
+
+# Liste döndüren endpoint'lerde sonraki sayfanın cursor'ı bu header ile gelir
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Cursor could not be decoded"""
+
+
+def encode_cursor(sort_value: datetime, id: int) -> str:
+    """Opaque cursor for the position after (sort_value, id)"""
+    raw = f"{sort_value.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor; raises InvalidCursorError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_raw, id_raw = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(sort_raw), int(id_raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+class CursorTimestamp(ColumnElement):
+    """
+    Cursor zamanı, kolonun sakladığı biçimde bağlanır.
+
+    SQLite'ta DateTime metin olarak saklanır ve karşılaştırma string'dir:
+    server_default=func.now() `YYYY-MM-DD HH:MM:SS`, SQLAlchemy ise
+    `YYYY-MM-DD HH:MM:SS.ffffff` yazar. Parametre tek biçimde bağlanırsa satır
+    kendi cursor'ından "küçük" kalır ve sayfa ilerlemez (ya da satır atlanır).
+    """
+
+    inherit_cache = False
+
+    def __init__(self, sort_column, id_column, value: datetime, last_id: int):
+        self.sort_column = sort_column.expression
+        self.id_column = id_column.expression
+        self.value = value
+        self.last_id = last_id
+        self.type = self.sort_column.type
+
+
+@compiles(CursorTimestamp)
+def _compile_cursor_timestamp(element: CursorTimestamp, compiler, **kw):
+    return compiler.process(literal(element.value, element.type), **kw)
+
+
+@compiles(CursorTimestamp, "sqlite")
+def _compile_cursor_timestamp_sqlite(element: CursorTimestamp, compiler, **kw):
+    stored = element.value.strftime("%Y-%m-%d %H:%M:%S")
+    with_micro = f"{stored}.{element.value.microsecond:06d}"
+    if element.value.microsecond:
+        # Mikrosaniyeli değeri yalnızca SQLAlchemy yazmış olabilir
+        return compiler.process(literal(with_micro, String()), **kw)
+    # Tam saniye: cursor satırı hangi biçimde saklanmışsa o (PK ile tek satır okuma)
+    table = element.sort_column.table.alias()
+    server_default_form = (
+        select(literal(1))
+        .where(
+            table.c[element.id_column.key] == element.last_id,
+            table.c[element.sort_column.key] == literal(stored, String()),
+        )
+        .exists()
+    )
+    bound = case(
+        (server_default_form, literal(stored, String())),
+        else_=literal(with_micro, String()),
+    )
+    return compiler.process(bound, **kw)
+
+
+def apply_keyset(
+    query: Union[Query, Select], sort_column, id_column, cursor: Optional[str] = None
+) -> Union[Query, Select]:
+    """
+    Order newest first and start after the cursor position.
+
+    Args:
+        query: ORM Query or select() already filtered (e.g. by user_id)
+        sort_column: Timestamp column (created_at, updated_at)
+        id_column: Primary key column, tie-breaker for equal timestamps
+        cursor: Value from next_cursor() of the previous page
+
+    Returns:
+        Query ordered by (sort_column, id_column) descending
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        # Row-value comparison is a single index range scan
+        bound = CursorTimestamp(sort_column, id_column, sort_value, last_id)
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(bound, last_id))
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+
+def next_cursor(items: list[Any], limit: int, sort_attr: str = "created_at") -> Optional[str]:
+    """Cursor for the following page, None when this page was not full"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    sort_value = getattr(last, sort_attr)
+    if sort_value is None:
+        return None
+    return encode_cursor(sort_value, last.id)
+
+
+def set_next_cursor_header(
+    response: Response, items: list[Any], limit: int, sort_attr: str = "created_at"
+) -> None:
+    """Expose the next page cursor on list endpoints (body stays a plain list)"""
+    cursor = next_cursor(items, limit, sort_attr)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
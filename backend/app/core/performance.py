@@ -2,62 +2,202 @@
 Performance optimization utilities for the analysis service.
 """
 
+import bisect
+import functools
+import inspect
+import itertools
 import logging
+import math
+import threading
 import time
 from functools import lru_cache
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Log-bucketed histogram layout: 1 µs .. ~1 saat, kova başına 2^(1/8) büyüme
+# (~%4 göreli hata). Tüm histogramlar aynı düzende, bu yüzden birleştirilebilir.
+HISTOGRAM_MIN_SECONDS = 1e-6
+HISTOGRAM_BUCKETS_PER_DOUBLING = 8
+HISTOGRAM_BUCKET_COUNT = 256
+
+SLOW_OPERATION_SECONDS = 1.0
+
+
+def bucket_index(duration: float) -> int:
+    """Histogram bucket for a duration (0 = at or below HISTOGRAM_MIN_SECONDS)"""
+    if duration <= HISTOGRAM_MIN_SECONDS:
+        return 0
+    index = int(math.log2(duration / HISTOGRAM_MIN_SECONDS) * HISTOGRAM_BUCKETS_PER_DOUBLING) + 1
+    return min(index, HISTOGRAM_BUCKET_COUNT - 1)
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Exclusive upper bound (seconds) of a bucket; the last bucket is open-ended"""
+    if index >= HISTOGRAM_BUCKET_COUNT - 1:
+        return math.inf
+    return HISTOGRAM_MIN_SECONDS * 2 ** (index / HISTOGRAM_BUCKETS_PER_DOUBLING)
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram; not thread-safe on its own (monitor holds the lock)"""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        self.counts[bucket_index(duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: geometric middle of the bucket, clamped to [min, max]"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        # İlk kümülatif sayısı rank'e ulaşan kova
+        i = bisect.bisect_left(list(itertools.accumulate(self.counts)), rank)
+        # Alt ve üst taşma kovalarında gerçek uç değer kullanılır
+        if i == 0:
+            return self.min
+        if i == HISTOGRAM_BUCKET_COUNT - 1:
+            return self.max
+        value = HISTOGRAM_MIN_SECONDS * 2 ** ((i - 0.5) / HISTOGRAM_BUCKETS_PER_DOUBLING)
+        return min(max(value, self.min), self.max)
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable form (sparse buckets) for shipping to another worker"""
+        return {
+            "buckets": {i: c for i, c in enumerate(self.counts) if c},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        for i, c in data["buckets"].items():
+            histogram.counts[int(i)] = int(c)
+        histogram.count = int(data["count"])
+        histogram.total = float(data["total"])
+        histogram.min = float(data["min"]) if histogram.count else math.inf
+        histogram.max = float(data["max"])
+        return histogram
+
 
 class PerformanceMonitor:
-    """Monitor and log performance metrics."""
+    """Monitor and log performance metrics (bounded histograms, thread-safe)."""
 
     def __init__(self):
-        self.metrics: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.metrics: dict[str, LatencyHistogram] = {}
 
     def record(self, operation: str, duration: float):
         """Record operation duration."""
-        if operation not in self.metrics:
-            self.metrics[operation] = []
-        self.metrics[operation].append(duration)
+        with self._lock:
+            histogram = self.metrics.get(operation)
+            if histogram is None:
+                histogram = self.metrics[operation] = LatencyHistogram()
+            histogram.record(duration)
 
     def get_stats(self, operation: str) -> dict[str, float]:
         """Get statistics for an operation."""
-        if operation not in self.metrics or not self.metrics[operation]:
-            return {}
-
-        durations = self.metrics[operation]
-        return {
-            "count": len(durations),
-            "avg": sum(durations) / len(durations),
-            "min": min(durations),
-            "max": max(durations),
-            "total": sum(durations),
-        }
+        with self._lock:
+            histogram = self.metrics.get(operation)
+            if histogram is None or not histogram.count:
+                return {}
+            return self._stats(histogram)
 
     def get_all_stats(self) -> dict[str, dict[str, float]]:
         """Get statistics for all operations."""
-        return {op: self.get_stats(op) for op in self.metrics.keys()}
+        with self._lock:
+            return {op: self._stats(h) for op, h in sorted(self.metrics.items()) if h.count}
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Serializable copy of every histogram (merge_snapshot ile başka worker'da toplanır)"""
+        with self._lock:
+            return {op: h.snapshot() for op, h in self.metrics.items()}
+
+    def merge_snapshot(self, snapshot: dict[str, dict[str, Any]]) -> None:
+        """Add another worker's snapshot into this monitor"""
+        incoming = {op: LatencyHistogram.from_snapshot(data) for op, data in snapshot.items()}
+        with self._lock:
+            for op, histogram in incoming.items():
+                self.metrics.setdefault(op, LatencyHistogram()).merge(histogram)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.metrics.clear()
+
+    @staticmethod
+    def _stats(histogram: LatencyHistogram) -> dict[str, float]:
+        return {
+            "count": histogram.count,
+            "avg": histogram.total / histogram.count,
+            "min": histogram.min,
+            "max": histogram.max,
+            "total": histogram.total,
+            "p50": histogram.quantile(0.50),
+            "p95": histogram.quantile(0.95),
+            "p99": histogram.quantile(0.99),
+        }
 
 
 # Global performance monitor
 perf_monitor = PerformanceMonitor()
 
 
+def _finish(operation_name: str, start_time: float) -> None:
+    duration = time.perf_counter() - start_time
+    perf_monitor.record(operation_name, duration)
+    if duration > SLOW_OPERATION_SECONDS:  # Log slow operations
+        logger.warning(f"Slow operation: {operation_name} took {duration:.2f}s")
+
+
 def time_operation(operation_name: str):
-    """Decorator to time and log operations."""
+    """Decorator to time and log operations (sync and async functions)."""
 
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _finish(operation_name, start_time)
+
+            return async_wrapper
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
-                result = func(*args, **kwargs)
-                return result
+                return func(*args, **kwargs)
             finally:
-                duration = time.time() - start_time
-                perf_monitor.record(operation_name, duration)
-                if duration > 1.0:  # Log slow operations
-                    logger.warning(f"Slow operation: {operation_name} took {duration:.2f}s")
+                _finish(operation_name, start_time)
 
         return wrapper
 
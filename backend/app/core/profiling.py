@@ -0,0 +1,303 @@
+"""Opt-in request profiling for administrators
+
+Gerçek müşteri export'larıyla oluşan yavaşlıkları ham metni saklamadan
+incelemek için tek bir istek profil altında çalıştırılabilir:
+
+  1. Admin POST /api/system/profiling ile tek kullanımlık bir token alır
+  2. Profillenecek istek "X-Profile-Token: <token>" header'ıyla gönderilir
+  3. İstek süresince örnekleyici (sampling) profiler ve tracemalloc çalışır
+
+Çıktılar request id ile PROFILING_DIR altına yazılır; ham içerik değil yalnızca
+kod konumları saklanır:
+
+  - <request_id>.folded: collapsed stack formatı (flamegraph.pl, speedscope)
+  - <request_id>.json: süre, örnek sayısı, bellek zirvesi, en çok ayıran satırlar
+
+Aynı anda tek bir istek profillenir (tracemalloc süreç genelindedir); en fazla
+PROFILING_MAX_PROFILES profil tutulur, eskiler silinir.
+"""
+
+import json
+import logging
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Bekleyen thread'lerin yaprak frame'leri (dosya, fonksiyon); örneklere katılmaz
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+# Bellek zirvesi takibi: traced bellek son snapshot'ın bu katına ulaşınca yeni snapshot
+_PEAK_SNAPSHOT_GROWTH = 1.5
+
+_BACKEND_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_BACKEND_ROOT):
+        return filename[len(_BACKEND_ROOT) :]
+    parts = Path(filename).parts
+    return "/".join(parts[-2:])
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    # co_qualname: Python 3.11+ (3.10'da yalnızca fonksiyon adı)
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """Samples the stacks of busy threads from a background thread"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        # tracemalloc zirvesindeki snapshot (sampler thread'i alır)
+        self.peak_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+            if tracemalloc.is_tracing():
+                self._track_peak()
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude or _is_idle(frame):
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _track_peak(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self._peak_bytes * _PEAK_SNAPSHOT_GROWTH:
+            self._peak_bytes = current
+            self.peak_snapshot = tracemalloc.take_snapshot()
+
+
+def _top_allocations(snapshot: Optional[tracemalloc.Snapshot], limit: int) -> list[dict]:
+    if snapshot is None:
+        return []
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    return [
+        {
+            "location": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+class ProfileSession:
+    """Profiler + tracemalloc for one request; finish() writes the results"""
+
+    def __init__(self, owner: "RequestProfiler", request_id: str):
+        self.owner = owner
+        self.request_id = request_id
+        self.profiler = SamplingProfiler(owner.interval)
+        # PYTHONTRACEMALLOC ile zaten açıksa kapatılmaz
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.started = time.perf_counter()
+        self.profiler.start()
+
+    def finish(self, status_code: Optional[int] = None) -> dict[str, Any]:
+        """Stop sampling and store the profile (blocking: call off the event loop)"""
+        try:
+            duration = time.perf_counter() - self.started
+            stacks = self.profiler.stop()
+            try:
+                retained = tracemalloc.take_snapshot()
+                _, peak_bytes = tracemalloc.get_traced_memory()
+            finally:
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+
+            limit = settings.PROFILING_TOP_ALLOCATIONS
+            summary = {
+                "request_id": self.request_id,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "status_code": status_code,
+                "duration_ms": round(duration * 1000, 1),
+                "sample_interval_ms": round(self.owner.interval * 1000, 3),
+                "samples": self.profiler.samples,
+                "peak_traced_bytes": peak_bytes,
+                # Zirve anındaki canlı bellek ve istek sonunda hâlâ tutulan bellek
+                "peak_allocations": _top_allocations(self.profiler.peak_snapshot, limit),
+                "retained_allocations": _top_allocations(retained, limit),
+            }
+            self.owner.store.save(self.request_id, stacks, summary)
+            return summary
+        finally:
+            self.owner._release()
+
+
+_UNSAFE_ID_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def profile_key(request_id: str) -> str:
+    """File-safe key for a (client supplied) request id"""
+    return _UNSAFE_ID_CHARS.sub("_", request_id)[:64] or "request"
+
+
+class ProfileStore:
+    """Profiles on disk, keyed by request id, newest max_profiles kept"""
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, request_id: str, stacks: Counter[str], summary: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        key = profile_key(request_id)
+        folded = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        (self.directory / f"{key}.folded").write_text(folded, encoding="utf-8")
+        (self.directory / f"{key}.json").write_text(json.dumps(summary, indent=2), "utf-8")
+        self.prune()
+
+    def prune(self) -> None:
+        summaries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in summaries[: max(0, len(summaries) - self.max_profiles)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".folded").unlink(missing_ok=True)
+
+    def list(self) -> list[dict[str, Any]]:
+        """Summaries without allocation tables, newest first"""
+        if not self.directory.is_dir():
+            return []
+        paths = sorted(
+            self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True
+        )
+        profiles = []
+        for path in paths:
+            try:
+                summary = json.loads(path.read_text("utf-8"))
+            except (OSError, ValueError):
+                continue
+            profiles.append(
+                {k: v for k, v in summary.items() if not k.endswith("_allocations")}
+            )
+        return profiles
+
+    def summary(self, request_id: str) -> Optional[dict[str, Any]]:
+        path = self.directory / f"{profile_key(request_id)}.json"
+        if not path.is_file():
+            return None
+        return json.loads(path.read_text("utf-8"))
+
+    def folded(self, request_id: str) -> Optional[str]:
+        path = self.directory / f"{profile_key(request_id)}.folded"
+        if not path.is_file():
+            return None
+        return path.read_text("utf-8")
+
+
+class RequestProfiler:
+    """One-shot profile tokens and the single active profiling session"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_profiles: int,
+        interval: float,
+        token_ttl: float,
+    ):
+        self.store = ProfileStore(directory, max_profiles)
+        self.interval = interval
+        self.token_ttl = token_ttl
+        self._tokens: dict[str, float] = {}  # token -> expiry (monotonic)
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def issue_token(self) -> str:
+        token = secrets.token_urlsafe(24)
+        now = time.monotonic()
+        with self._lock:
+            self._tokens = {t: exp for t, exp in self._tokens.items() if exp > now}
+            self._tokens[token] = now + self.token_ttl
+        return token
+
+    def begin(self, token: str, request_id: str) -> Optional[ProfileSession]:
+        """Start profiling if the token is valid and no other request is profiled
+
+        Token yalnızca profil gerçekten başlarsa tüketilir.
+        """
+        with self._lock:
+            expiry = self._tokens.get(token)
+            if expiry is None or expiry <= time.monotonic():
+                self._tokens.pop(token, None)
+                return None
+            if not self._active.acquire(blocking=False):
+                return None
+            del self._tokens[token]
+        try:
+            return ProfileSession(self, request_id)
+        except BaseException:
+            self._active.release()
+            raise
+
+    def _release(self) -> None:
+        self._active.release()
+
+
+request_profiler = RequestProfiler(
+    directory=settings.PROFILING_DIR,
+    max_profiles=settings.PROFILING_MAX_PROFILES,
+    interval=settings.PROFILING_SAMPLE_INTERVAL_MS / 1000,
+    token_ttl=settings.PROFILING_TOKEN_TTL_SECONDS,
+)
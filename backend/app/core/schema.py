@@ -0,0 +1,158 @@
+"""
+Startup schema check (Alembic revision).
+
+Her süreç başlangıcında create_all tüm tabloları inceliyordu; çok worker'lı
+uzak PostgreSQL'de bu başlangıcı yavaşlatır. Artık tek bir sorgu ile
+alembic_version okunur ve kodun beklediği head revision'larla karşılaştırılır.
+Şema geride ise uygulama açık bir mesajla başlamaz (`alembic upgrade head`).
+
+DB_SCHEMA_BOOTSTRAP=true (masaüstü / geliştirme, tek süreç):
+  - boş veritabanı: create_all + head'e stamp
+  - tabloları olan sürümsüz veritabanı (eski create_all): CREATE_ALL_REVISIONS'a
+    stamp + upgrade; unique constraint, backfill ve index migration'ları atlanmaz
+  - geride kalan veritabanı: migration'lar süreç içinde çalıştırılır
+"""
+
+import logging
+from pathlib import Path
+
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+UP_TO_DATE = "up to date"
+BOOTSTRAPPED = "bootstrapped"
+UPGRADED = "upgraded"
+
+# Alembic'ten önce create_all ile oluşturulan veritabanlarının karşılığı olan head'ler
+CREATE_ALL_REVISIONS = ("20260111_1750", "6c6b303caa39")
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Database revision does not match the migrations shipped with the code"""
+
+
+def expected_heads(script_location: Path = ALEMBIC_DIR) -> set[str]:
+    """Head revision(s) of the migration scripts"""
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(str(script_location)).get_heads())
+
+
+def current_revisions(connection: Connection) -> set[str]:
+    """Revision(s) stamped in alembic_version; boş küme = sürümsüz veritabanı"""
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def ensure_schema(
+    engine: Engine,
+    metadata: MetaData,
+    bootstrap: bool = False,
+    script_location: Path = ALEMBIC_DIR,
+    create_all_revisions: tuple[str, ...] = CREATE_ALL_REVISIONS,
+) -> str:
+    """
+    Veritabanı revision'ını kontrol et; bootstrap modunda şemayı oluştur/yükselt.
+
+    Returns UP_TO_DATE, BOOTSTRAPPED or UPGRADED; raises SchemaOutOfDateError.
+    """
+    if not script_location.is_dir():
+        if not bootstrap:
+            raise SchemaOutOfDateError(
+                f"Alembic scripts not found at {script_location}; cannot verify the "
+                "database schema. Set DB_SCHEMA_BOOTSTRAP=true to create tables on startup."
+            )
+        # Migration'ları içermeyen paketler (PyInstaller binary): eski davranış
+        logger.warning(f"Alembic scripts not found at {script_location}, running create_all")
+        metadata.create_all(bind=engine)
+        return BOOTSTRAPPED
+
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory(str(script_location))
+    heads = set(script.get_heads())
+    with engine.connect() as connection:
+        current = current_revisions(connection)
+    if current == heads:
+        return UP_TO_DATE
+
+    unknown = current - {revision.revision for revision in script.walk_revisions()}
+    if unknown:
+        # Veritabanı daha yeni bir sürümle migrate edilmiş; bootstrap da düzeltemez
+        raise SchemaOutOfDateError(
+            f"Database is at unknown revision {_fmt(unknown)} (code expects {_fmt(heads)}). "
+            "Deploy the matching code version or downgrade the database."
+        )
+
+    if not bootstrap:
+        raise SchemaOutOfDateError(_behind_message(engine, current, heads))
+
+    from alembic.runtime.migration import MigrationContext
+
+    if not current and not _has_tables(engine):
+        metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            # env.py gerekmez: sadece alembic_version yazılır
+            MigrationContext.configure(connection).stamp(script, "heads")
+        logger.info(f"Database schema created and stamped at {_fmt(heads)}")
+        return BOOTSTRAPPED
+
+    with engine.begin() as connection:
+        if not current:
+            # Eski create_all şeması: sonraki migration'lar var olanı atlar
+            MigrationContext.configure(connection).stamp(script, create_all_revisions)
+            current = set(create_all_revisions)
+        _upgrade(connection, script_location)
+    logger.info(f"Database schema upgraded from {_fmt(current)} to {_fmt(heads)}")
+    return UPGRADED
+
+
+def _behind_message(engine: Engine, current: set[str], heads: set[str]) -> str:
+    if current:
+        return (
+            f"Database schema is at revision {_fmt(current)} but the code expects "
+            f"{_fmt(heads)}. Run `alembic upgrade head` (from backend/) before starting the app."
+        )
+    # alembic_version yok: boş veritabanı mı, yoksa create_all ile mi oluşturulmuş?
+    if _has_tables(engine):
+        hint = (
+            "If the tables were created by create_all, run "
+            f"`alembic stamp {' '.join(CREATE_ALL_REVISIONS)}` and then `alembic upgrade head`."
+        )
+    else:
+        hint = "Run `alembic upgrade head` (from backend/) to create the schema."
+    return (
+        f"Database has no Alembic revision (code expects {_fmt(heads)}). {hint} "
+        "For a local single-process setup, DB_SCHEMA_BOOTSTRAP=true creates it on startup."
+    )
+
+
+def _has_tables(engine: Engine) -> bool:
+    with engine.connect() as connection:
+        return bool(inspect(connection).get_table_names())
+
+
+def _alembic_config(connection: Connection, script_location: Path):
+    from alembic.config import Config
+
+    # ini dosyası yok: uygulamanın logging ayarları ezilmez
+    config = Config()
+    config.set_main_option("script_location", str(script_location))
+    config.attributes["connection"] = connection
+    return config
+
+
+def _upgrade(connection: Connection, script_location: Path) -> None:
+    from alembic import command
+
+    command.upgrade(_alembic_config(connection, script_location), "heads")
+
+
+def _fmt(revisions: set[str]) -> str:
+    return ", ".join(sorted(revisions)) or "<none>"
+
@@ -1,7 +1,10 @@
+import asyncio
 import hashlib
 import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -19,6 +22,89 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Every password hashing slot is taken (mapped to 429)"""
+
+
+class PasswordHasher:
+    """
+    Argon2 hash/verify on a dedicated bounded thread pool.
+
+    Async handler'lar event loop'u bloklamadan bekler. Havuzdaki + kuyruktaki
+    iş sayısı max_pending'e ulaşınca yeni istek beklemeden reddedilir; login
+    patlamaları diğer trafiği durdurmaz.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max_workers or settings.PASSWORD_HASH_WORKERS
+        self.max_pending = max_pending or settings.PASSWORD_HASH_MAX_PENDING
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on the pool; raises PasswordHasherBusyError when saturated"""
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusyError(
+                    f"Password hashing saturated ({self._in_flight} in flight)"
+                )
+            self._in_flight += 1
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # Slot is freed when the thread finishes, even if the request was cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Havuz durumu (metrics için)"""
+        return {
+            "workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
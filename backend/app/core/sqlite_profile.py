@@ -0,0 +1,113 @@
+"""
+SQLite engine profile (masaüstü sürümü).
+
+Her bağlantıda WAL ve performans pragma'ları uygulanır. Yazmalar tek bir
+yazıcı bağlantısında sıralanır, okumalar ayrı bir havuzdan yapılır; WAL
+sayesinde okuyucular yazıcıyı beklemez.
+"""
+
+from typing import Optional
+
+from sqlalchemy import TextClause, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# Execution option: read-modify-write okuması (ör. with_for_update) yazıcıda yapılsın.
+# Select'in FOR UPDATE bilgisi public değil; diğer dialect'ler bu seçeneği yok sayar.
+WRITER_OPTION = "sqlite_writer"
+
+
+def is_file_database(url: str) -> bool:
+    """True for on-disk SQLite URLs (in-memory databases keep a single engine)"""
+    if not url.startswith("sqlite"):
+        return False
+    path = url.partition("://")[2].lstrip("/")
+    return bool(path) and ":memory:" not in path and "mode=memory" not in path
+
+
+def sqlite_pragmas() -> list[str]:
+    """PRAGMA statements run on every new connection"""
+    synchronous = settings.SQLITE_SYNCHRONOUS.upper()
+    if synchronous not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {settings.SQLITE_SYNCHRONOUS}")
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={synchronous}",
+        # Negative value = size in KiB instead of pages
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+    ]
+
+
+def apply_sqlite_profile(engine: Engine) -> None:
+    """Run the profile pragmas whenever the engine opens a DBAPI connection"""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):  # noqa: ARG001
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    if clause.is_dml:
+        return True
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip().upper().startswith(_WRITE_KEYWORDS)
+    return False
+
+
+class SQLiteRoutingSession(Session):
+    """
+    Okumaları okuyucu havuzuna, yazmaları tek yazıcı bağlantısına yönlendirir.
+
+    Transaction ilk yazmadan sonra commit/rollback'e kadar yazıcıda kalır,
+    böylece kendi yazdığını (flush edilmiş satırlar) okur.
+    Engine'ler sessionmaker(info={"writer": ..., "reader": ...}) ile verilir.
+    """
+
+    _writer_bound = False
+
+    def get_bind(
+        self, mapper=None, *, clause=None, bind: Optional[Engine] = None, **kw  # noqa: ARG002
+    ):
+        if bind is not None:
+            return bind
+        if self._writer_bound or _is_write(clause):
+            self._writer_bound = True
+            return self.info["writer"]
+        return self.info["reader"]
+
+
+@event.listens_for(SQLiteRoutingSession, "before_flush")
+def _bind_writer_for_flush(
+    session: SQLiteRoutingSession, flush_context, instances  # noqa: ARG001
+) -> None:
+    # Flush yazar: transaction'ın geri kalanı (kendi yazdığını okuma) yazıcıda
+    session._writer_bound = True
+
+
+@event.listens_for(SQLiteRoutingSession, "do_orm_execute")
+def _bind_writer_on_request(state) -> None:
+    # execution_options(sqlite_writer=True): okuma, ardından gelen yazmayla sıralanır
+    if state.execution_options.get(WRITER_OPTION):
+        state.session._writer_bound = True
+
+
+@event.listens_for(SQLiteRoutingSession, "after_transaction_end")
+def _release_writer(session: SQLiteRoutingSession, transaction) -> None:
+    # Outermost transaction finished: next statement may read from the pool again
+    if transaction.parent is None:
+        session._writer_bound = False
@@ -0,0 +1,214 @@
+"""Request tracing - stage spans, Server-Timing header and optional OpenTelemetry
+
+Yavaş bir /analyze-v2 isteğinde süre hangi aşamada geçti (parse, preprocess,
+metrics, heatmap, psychology, Map-Reduce, Gottman LLM) görülebilsin diye
+aşamalar span(...) / @traced(...) ile işaretlenir. Span'ler RequestIDMiddleware'in
+başlattığı istek izine (request id) eklenir; yanıtta Server-Timing header'ı
+olarak döner ve istek sonunda tek bir yapılandırılmış log satırına yazılır.
+
+OTEL_EXPORTER_OTLP_ENDPOINT ayarlı ve opentelemetry-sdk kuruluysa aynı
+span'ler OpenTelemetry'ye de aktarılır. İstek dışında (script, test) ve OTel
+kapalıyken span() neredeyse maliyetsizdir.
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+@dataclass
+class Span:
+    """One timed stage of a request"""
+
+    name: str
+    start: float  # time.perf_counter()
+    duration: float
+    parent: Optional[str] = None
+    error: bool = False
+
+
+class RequestTrace:
+    """Spans of one request; thread-safe (stages may run in the threadpool)"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def totals(self) -> dict[str, float]:
+        """Seconds per span name (repeated stages summed), in first-seen order"""
+        totals: dict[str, float] = {}
+        with self._lock:
+            for span in sorted(self.spans, key=lambda s: s.start):
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def server_timing(self) -> str:
+        """Server-Timing value: "parse;dur=12.3, heatmap;dur=4.1, total;dur=130.2" (ms)"""
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.totals().items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_log(self) -> list[dict[str, Any]]:
+        """Span list for structured logs (offsets relative to request start)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [
+            {
+                "name": s.name,
+                "parent": s.parent,
+                "start_ms": round((s.start - self.started) * 1000, 1),
+                "duration_ms": round(s.duration * 1000, 1),
+                **({"error": True} if s.error else {}),
+            }
+            for s in spans
+        ]
+
+
+_trace_var: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+_span_var: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+# OpenTelemetry tracer (init_opentelemetry ile kurulur)
+_otel_tracer = None
+
+
+def start_trace(request_id: str) -> RequestTrace:
+    """Begin collecting spans for the current request context"""
+    trace = RequestTrace(request_id)
+    _trace_var.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _trace_var.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """Time a stage of the current request (no-op outside a request without OTel)"""
+    trace = _trace_var.get()
+    if trace is None and _otel_tracer is None:
+        yield
+        return
+
+    parent = _span_var.get()
+    token = _span_var.set(name)
+    start = time.perf_counter()
+    error = False
+    try:
+        with ExitStack() as stack:
+            if _otel_tracer is not None:
+                stack.enter_context(
+                    _otel_tracer.start_as_current_span(name, attributes=attributes or None)
+                )
+            yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _span_var.reset(token)
+        if trace is not None:
+            trace.add(Span(name, start, time.perf_counter() - start, parent, error))
+
+
+def traced(name: str):
+    """Decorator form of span() for sync and async functions"""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def log_trace(trace: RequestTrace, method: str, path: str, status_code: int) -> None:
+    """One structured log line per traced request"""
+    if not trace.spans:
+        return
+    duration_ms = round((time.perf_counter() - trace.started) * 1000, 1)
+    logger.info(
+        f"{method} {path} {status_code} {duration_ms}ms",
+        extra={
+            "request_id": trace.request_id,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "spans": trace.to_log(),
+        },
+    )
+
+
+def init_opentelemetry() -> bool:
+    """Export spans over OTLP/HTTP when configured; returns True if enabled"""
+    global _otel_tracer
+
+    if not settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        return False
+    try:
+        from opentelemetry import trace as otel_trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT set but OpenTelemetry SDK is not installed "
+            "(pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http)"
+        )
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME})
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            OTLPSpanExporter(endpoint=f"{settings.OTEL_EXPORTER_OTLP_ENDPOINT}/v1/traces")
+        )
+    )
+    otel_trace.set_tracer_provider(provider)
+    _otel_tracer = otel_trace.get_tracer("iliski-analiz")
+    logger.info(f"OpenTelemetry tracing enabled ({settings.OTEL_EXPORTER_OTLP_ENDPOINT})")
+    return True
+
+
+def shutdown_opentelemetry() -> None:
+    """Flush pending spans (shutdown)"""
+    global _otel_tracer
+
+    if _otel_tracer is None:
+        return
+    from opentelemetry import trace as otel_trace
+
+    provider = otel_trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+    _otel_tracer = None
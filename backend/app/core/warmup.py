@@ -0,0 +1,218 @@
+"""Background warm-up after startup
+
+Analyzer, spaCy modeli, heatmap/psikoloji servisleri ve AI provider SDK'sı lazy
+singleton'dır; ısıtılmazsa ilk analiz isteği bunların yüklenmesini bekler.
+Uygulama trafik almaya başladıktan sonra bir arka plan thread'i bileşenleri
+sırayla yükler ve küçük bir örnek konuşma üzerinde çalıştırır (regex'ler,
+sözlükler, spaCy pipeline'ı ilk çağrı maliyetini burada öder).
+
+/ready (bkz. main.py) bileşen durumlarını raporlar; tüm bileşenler bitene
+kadar 503 döner. Başarısız bir bileşen hazır olmayı engellemez (istek yolu
+lazy yüklemeyi yeniden dener), durum "degraded" olur.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+_DONE = (READY, SKIPPED, FAILED)
+
+# Parser'ın format tespiti, metrik sözlükleri ve çatışma/empati ifadelerine değen örnek
+SAMPLE_CONVERSATION = "\n".join(
+    [
+        "01.03.2024 20:15 - Ahmet: Bugün çok yoruldum, eve geç geleceğim",
+        "01.03.2024 20:16 - Ayşe: Seni anlıyorum canım, yemeği birlikte yapalım mı?",
+        "01.03.2024 20:20 - Ahmet: Harika olur, teşekkür ederim 😊",
+        "01.03.2024 22:05 - Ayşe: Yine mi geç kaldın? Hep böyle yapıyorsun!!",
+        "01.03.2024 22:07 - Ahmet: Haklısın, özür dilerim. Hafta sonu beraber gezelim",
+        "02.03.2024 09:30 - Ayşe: Tamam, seni seviyorum ❤️",
+    ]
+)
+
+
+class SkipWarmup(Exception):
+    """Raised by a component that does not apply to the current configuration"""
+
+
+@dataclass
+class Component:
+    name: str
+    run: Callable[[], Optional[str]]  # isteğe bağlı kısa açıklama döner
+
+
+class Warmup:
+    """Runs registered components once, in order, on a background thread"""
+
+    def __init__(self, components: Optional[list[Component]] = None):
+        self._components: list[Component] = list(components or [])
+        self._lock = threading.Lock()
+        self._status: dict[str, dict[str, Any]] = {
+            c.name: {"status": PENDING} for c in self._components
+        }
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._started = False
+
+    def start(self) -> None:
+        """Start warming up in the background (idempotent)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until all components finished; False on timeout"""
+        if self._thread:
+            self._thread.join(timeout)
+        return self.is_ready()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Skip components not started yet (shutdown); the running one finishes"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run(self) -> None:
+        started = time.perf_counter()
+        for component in self._components:
+            if self._stopping.is_set():
+                break
+            self._set(component.name, status=RUNNING)
+            component_started = time.perf_counter()
+            try:
+                detail = component.run()
+                status = READY
+            except SkipWarmup as e:
+                detail, status = str(e), SKIPPED
+            except Exception as e:
+                logger.warning(f"Warm-up failed: {component.name}: {e}")
+                detail, status = str(e), FAILED
+            entry: dict[str, Any] = {
+                "status": status,
+                "duration_ms": round((time.perf_counter() - component_started) * 1000, 1),
+            }
+            if detail:
+                entry["detail"] = detail
+            self._set(component.name, **entry)
+        logger.info(
+            "Warm-up complete",
+            extra={"duration_ms": round((time.perf_counter() - started) * 1000, 1)},
+        )
+
+    def status(self) -> dict[str, Any]:
+        """{'status': 'ready' | 'degraded' | 'warming' | 'disabled', 'components': {...}}"""
+        with self._lock:
+            components = {name: dict(entry) for name, entry in self._status.items()}
+            started = self._started
+        if not started:
+            # Warm-up kapalı: bileşenler ilk istekte lazy yüklenir
+            return {"status": "disabled", "components": components}
+        states = [entry["status"] for entry in components.values()]
+        if not all(state in _DONE for state in states):
+            overall = "warming"
+        elif FAILED in states:
+            overall = "degraded"
+        else:
+            overall = "ready"
+        return {"status": overall, "components": components}
+
+    def is_ready(self) -> bool:
+        return self.status()["status"] != "warming"
+
+    def _set(self, name: str, **entry: Any) -> None:
+        with self._lock:
+            self._status[name] = entry
+
+
+# ==================== Components ====================
+
+
+def _warm_analyzer() -> str:
+    from app.services.analysis_service import get_analysis_service
+
+    analyzer = get_analysis_service().analyzer
+    # Uygulamanın kullandığı singleton (backend.ml.analyzer): parser, preprocessor ve
+    # metrikler. analyze_text'in rapor adımı AI açıkken LLM'e gider; warm-up onu atlar.
+    parsed = analyzer.parser.parse(SAMPLE_CONVERSATION, "auto")
+    messages = parsed["messages"]
+    preprocessed = analyzer.preprocessor.preprocess(
+        " ".join(message["content"] for message in messages),
+        clean=True,
+        remove_pii=True,
+        remove_stop=False,
+    )
+    text = preprocessed.get("pii_masked", preprocessed.get("cleaned", ""))
+    metrics = analyzer.metrics_calculator
+    metrics.calculate_sentiment_score(text)
+    metrics.calculate_empathy_score(text)
+    metrics.calculate_conflict_score(text)
+    metrics.calculate_we_language_score(text)
+    metrics.calculate_communication_balance(analyzer.parser.split_by_participant(messages))
+    return "spacy" if analyzer.use_spacy else "simple preprocessor"
+
+
+def _warm_heatmap() -> None:
+    from app.services.heatmap_service import get_heatmap_service
+    from backend.ml.preprocessing.conversation_parser import ConversationParser
+
+    messages = ConversationParser().parse_table(SAMPLE_CONVERSATION)
+    get_heatmap_service().analyze_heatmap(messages)
+
+
+def _warm_psychology() -> None:
+    from app.services.psychology_service import get_psychology_service
+
+    # ai_service verilmez: LLM zenginleştirmesi çağrılmaz
+    get_psychology_service().analyze(conversation_text=SAMPLE_CONVERSATION)
+
+
+def _warm_ai_service() -> str:
+    # ReportGenerator'ın kullandığı singleton (backend.app...), app.services değil
+    from backend.app.services.ai_service import get_ai_service
+
+    # Provider SDK'sı client oluşturulurken import edilir (~1 sn)
+    return get_ai_service().provider
+
+
+def _warm_ollama() -> str:
+    from backend.app.services.ai_service import get_ai_service
+
+    ai_service = get_ai_service()
+    if ai_service.provider != "ollama" or not settings.OLLAMA_KEEP_ALIVE:
+        raise SkipWarmup("provider is not ollama or OLLAMA_KEEP_ALIVE is empty")
+    # Prompt'suz istek sadece modeli belleğe yükler ve keep_alive süresince tutar
+    response = httpx.post(
+        f"{ai_service.ollama_base_url}/api/generate",
+        json={"model": settings.OLLAMA_MODEL, "keep_alive": settings.OLLAMA_KEEP_ALIVE},
+        timeout=120.0,
+    )
+    response.raise_for_status()
+    return settings.OLLAMA_MODEL
+
+
+warmup = Warmup(
+    [
+        Component("analyzer", _warm_analyzer),
+        Component("heatmap", _warm_heatmap),
+        Component("psychology", _warm_psychology),
+        Component("ai_service", _warm_ai_service),
+        Component("ollama", _warm_ollama),
+    ]
+)
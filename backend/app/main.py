@@ -10,11 +10,13 @@ if str(backend_dir) not in sys.path:
     sys.path.insert(0, str(backend_dir))
 
 
+import hmac
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
@@ -22,12 +24,23 @@ from slowapi.middleware import SlowAPIMiddleware
 from .api import feedback  # NEW
 from .api import analysis, auth, chat, coaching, daily, modules, stats, subscription, system, upload, users
 from .core.config import settings
-from .core.database import Base, engine
+from .core.database import Base, dispose_async_engine, engine, get_pool_stats
 from .core.limiter import limiter
+from .core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .core.metrics import install_default_collectors, metrics_exporter
+from .core.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from .core.schema import ensure_schema
+from .core.security import PasswordHasherBusyError, password_hasher
+from .core.tracing import init_opentelemetry, shutdown_opentelemetry
+from .core.warmup import warmup
+from .middleware.metrics import MetricsMiddleware
+from .middleware.profiling import ProfilingMiddleware
 from .middleware.request_id import RequestIDMiddleware
 
 # Modelleri import et ki Base.metadata dolusun
 from .services.ai_service import get_ai_service
+from .services.principal_cache import principal_cache
+from .services.usage_buffer import usage_buffer
 
 
 # Lifespan manager for startup events
@@ -46,10 +59,27 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
     except ImportError:
         print("⚠️ Sentry SDK not installed, skipping error tracking setup")
 
-    # Startup: Tabloları oluştur
-    Base.metadata.create_all(bind=engine)
+    # Startup: Aşama span'lerini OTLP'ye aktar (OTEL_EXPORTER_OTLP_ENDPOINT)
+    init_opentelemetry()
+
+    # Startup: Şema revision kontrolü (tek sorgu); geride ise açık hata ile başlamaz
+    ensure_schema(engine, Base.metadata, bootstrap=settings.DB_SCHEMA_BOOTSTRAP)
+
+    # Startup: Kullanım sayaçlarını toplu yazan arka plan thread'i
+    usage_buffer.start()
+    # Startup: Çoklu worker metrics snapshot'ları (METRICS_MULTIPROC_DIR)
+    metrics_exporter.start()
+    # Startup: Modelleri arka planda ısıt; trafik bu sırada kabul edilir (/ready)
+    if settings.WARMUP_ENABLED:
+        warmup.start()
     yield
-    # Shutdown logic here if needed
+    warmup.stop()
+    # Shutdown: Bekleyen sayaçları yaz
+    usage_buffer.stop()
+    metrics_exporter.stop()
+    shutdown_opentelemetry()
+    password_hasher.shutdown()
+    await dispose_async_engine()
 
 
 app = FastAPI(
@@ -69,16 +99,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Admin request profiling (X-Profile-Token); RequestIDMiddleware'in içinde çalışır
+app.add_middleware(ProfilingMiddleware)
+
 # Request ID Middleware
 app.add_middleware(RequestIDMiddleware)
 
 # Rate Limiter
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request, exc: InvalidCursorError):  # noqa: ARG001
+    return JSONResponse(status_code=400, content={"detail": "Geçersiz sayfalama cursor'ı"})
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request, exc: PasswordHasherBusyError):  # noqa: ARG001
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Çok fazla giriş denemesi, lütfen biraz sonra tekrar deneyin"},
+        headers={"Retry-After": "1"},
+    )
+
 app.add_middleware(SlowAPIMiddleware)
 
+# Prometheus metrics (outermost: tüm middleware'ler dahil süre ölçülür)
+if settings.METRICS_ENABLED:
+    install_default_collectors()
+    app.add_middleware(MetricsMiddleware)
+
 
 # Security Headers Middleware
 @app.middleware("http")
@@ -112,6 +166,28 @@ async def health_check():
     )
 
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Warm-up durumu; load balancer için (ısınma bitene kadar 503)"""
+    status = warmup.status()
+    return JSONResponse(status_code=503 if status["status"] == "warming" else 200, content=status)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Prometheus text format; tüm worker'ların birleşik değerleri"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        provided = request.headers.get("authorization", "")
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    # Snapshot dosyaları okunur/yazılır: event loop'u bloklamamak için thread'de
+    body = await run_in_threadpool(metrics_exporter.render)
+    return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/api/system/status", tags=["System"])
 async def system_status():
     """Sistem durumunu kontrol et (AI, DB)"""
@@ -122,6 +198,10 @@ async def system_status():
         "ai_provider": settings.AI_PROVIDER,
         "ai_available": ai_service._is_available(),  # True if keys are valid
         "database": "connected",  # SQLAlchemy lazy connect, assumes active if no error yet
+        "usage_buffer": usage_buffer.stats(),
+        "db_pool": get_pool_stats(),
+        "principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
         "version": settings.APP_VERSION,
     }
 
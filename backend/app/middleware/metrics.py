@@ -0,0 +1,47 @@
+"""Metrics Middleware
+
+Request count and latency per route template (/api/analysis/history/{analysis_id}),
+not per raw path, so label cardinality stays bounded.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_DURATION, HTTP_REQUESTS, metrics
+
+# Eşleşmeyen yollar (404 taramaları) tek etikette toplanır
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware overhead)"""
+
+    def __init__(self, app: ASGIApp, exclude_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Router eşleşen route'u aynı scope dict'ine yazar
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            metrics.inc(HTTP_REQUESTS, method=method, route=route, status=status_code)
+            metrics.observe(
+                HTTP_DURATION, time.perf_counter() - start, method=method, route=route
+            )
@@ -0,0 +1,44 @@
+"""Profiling Middleware
+
+Runs a request under the sampling profiler + tracemalloc when it carries a
+valid one-shot X-Profile-Token (issued to admins by POST /api/system/profiling).
+"""
+
+import uuid
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.profiling import (
+    PROFILE_ID_HEADER,
+    PROFILE_TOKEN_HEADER,
+    profile_key,
+    request_profiler,
+)
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Middleware to profile single requests on demand"""
+
+    async def dispatch(self, request: Request, call_next):
+        token = request.headers.get(PROFILE_TOKEN_HEADER)
+        if not token:
+            return await call_next(request)
+
+        # RequestIDMiddleware dışta çalışır ve request id'yi state'e yazar
+        request_id = getattr(request.state, "request_id", None) or str(uuid.uuid4())
+        session = request_profiler.begin(token, request_id)
+        if session is None:
+            return await call_next(request)
+
+        status_code = 500
+        try:
+            response: Response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            # Snapshot alma ve dosya yazma event loop'u bloklamasın
+            await run_in_threadpool(session.finish, status_code)
+
+        response.headers[PROFILE_ID_HEADER] = profile_key(request_id)
+        return response
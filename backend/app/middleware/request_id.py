@@ -9,7 +9,9 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+from app.core.config import settings
 from app.core.logging import request_id_var
+from app.core.tracing import SERVER_TIMING_HEADER, log_trace, start_trace
 
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
@@ -30,10 +32,16 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         # Store in request state for access in endpoints
         request.state.request_id = request_id
 
+        # Aşama span'leri bu ize eklenir (context, call_next görevine kopyalanır)
+        trace = start_trace(request_id)
+
         # Process request
         response: Response = await call_next(request)
 
         # Add request ID to response headers
         response.headers["X-Request-ID"] = request_id
+        if settings.SERVER_TIMING_ENABLED:
+            response.headers[SERVER_TIMING_HEADER] = trace.server_timing()
+        log_trace(trace, request.method, request.url.path, response.status_code)
 
         return response
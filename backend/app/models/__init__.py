@@ -5,6 +5,7 @@
 from app.models.database import (
     Analysis,
     AnalysisHistory,
+    AnalysisReportBlob,
     APIKey,
     ChatMessage,
     ChatSession,
@@ -15,12 +16,14 @@ from app.models.database import (
     Subscription,
     UsageTracking,
     User,
+    UserStats,
 )
 
 __all__ = [
     "User",
     "Analysis",
     "AnalysisHistory",
+    "AnalysisReportBlob",
     "CoachingStatus",
     "Feedback",
     "ChatSession",
@@ -30,4 +33,5 @@ __all__ = [
     "Subscription",
     "UsageTracking",
     "RefreshToken",
+    "UserStats",
 ]
@@ -1,10 +1,31 @@
 """Database Models"""
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
+from app.core.config import settings
 from app.core.database import Base
+from app.utils.report_compression import (
+    CODEC_ZLIB,
+    compress_report,
+    decompress_report,
+    serialize_report,
+)
 
 
 class User(Base):
@@ -52,6 +73,12 @@ class User(Base):
     usage_tracking = relationship(
         "app.models.database.UsageTracking", back_populates="user", cascade="all, delete-orphan"
     )
+    stats = relationship(
+        "app.models.database.UserStats",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
     refresh_tokens = relationship(
         "app.models.database.RefreshToken", back_populates="user", cascade="all, delete-orphan"
     )
@@ -79,7 +106,12 @@ class Analysis(Base):
     """Analiz kayıtları"""
 
     __tablename__ = "analyses"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) < (?, ?)
+        Index("ix_analyses_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_analyses_created_id", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
@@ -99,8 +131,8 @@ class Analysis(Base):
     we_language_score = Column(Float)
     balance_score = Column(Float)
 
-    # Rapor (JSON)
-    full_report = Column(JSON)
+    # Rapor (JSON) - deferred: list/stat queries never load it, use full_report property
+    full_report_json = deferred(Column("full_report", JSON))
     summary = Column(Text)
 
     # Conversation stats
@@ -112,6 +144,59 @@ class Analysis(Base):
 
     # İlişkiler
     user = relationship("User", back_populates="analyses")
+    report_blob = relationship(
+        "app.models.database.AnalysisReportBlob",
+        uselist=False,
+        cascade="all, delete-orphan",
+        back_populates="analysis",
+    )
+
+    @property
+    def full_report(self):
+        """Report from the JSON column or, for large reports, the compressed blob"""
+        report = self.full_report_json
+        if report is not None:
+            return report
+        cached = self.__dict__.get("_decoded_report")
+        if cached is None and self.report_blob is not None:
+            cached = decompress_report(self.report_blob.data, self.report_blob.codec)
+            self.__dict__["_decoded_report"] = cached
+        return cached
+
+    @full_report.setter
+    def full_report(self, report):
+        self.store_report(report, settings.ANALYSIS_REPORT_BLOB_MIN_BYTES)
+
+    def store_report(self, report, min_bytes: int) -> bool:
+        """Write report to the JSON column, or compressed to the blob table if >= min_bytes"""
+        self.__dict__.pop("_decoded_report", None)
+        if report is not None and min_bytes > 0:
+            raw = serialize_report(report)
+            if len(raw) >= min_bytes:
+                self.full_report_json = None
+                self.report_blob = AnalysisReportBlob(
+                    codec=CODEC_ZLIB, data=compress_report(raw), raw_size=len(raw)
+                )
+                return True
+        self.full_report_json = report
+        self.report_blob = None
+        return False
+
+
+class AnalysisReportBlob(Base):
+    """Büyük analiz raporlarının sıkıştırılmış hali (analyses.full_report yerine)"""
+
+    __tablename__ = "analysis_report_blobs"
+    __table_args__ = {"extend_existing": True}
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String(20), nullable=False, default=CODEC_ZLIB)
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)  # Uncompressed JSON bytes
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    analysis = relationship("Analysis", back_populates="report_blob")
 
 
 class AnalysisHistory(Base):
@@ -136,7 +221,11 @@ class Feedback(Base):
     """Kullanıcı geri bildirimleri"""
 
     __tablename__ = "feedbacks"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) < (?, ?)
+        Index("ix_feedbacks_user_created_id", "user_id", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     analysis_id = Column(Integer, ForeignKey("analyses.id"), nullable=True)
@@ -155,7 +244,11 @@ class ChatSession(Base):
     """AI Koç ile sohbet oturumları"""
 
     __tablename__ = "chat_sessions"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (updated_at, id) < (?, ?)
+        Index("ix_chat_sessions_user_updated_id", "user_id", "updated_at", "id"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -163,7 +256,8 @@ class ChatSession(Base):
     title = Column(String(255), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set on insert too, so listings can page on (updated_at, id) without NULLs
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # İlişkiler
     messages = relationship(
@@ -192,7 +286,11 @@ class DailyPulse(Base):
     """Günlük ilişki nabzı/check-in"""
 
     __tablename__ = "daily_pulses"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) < (?, ?)
+        Index("ix_daily_pulses_user_created_id", "user_id", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -245,7 +343,7 @@ class Subscription(Base):
 
     # Stripe integration
     stripe_subscription_id = Column(String(255), unique=True, index=True, nullable=True)
-    stripe_customer_id = Column(String(255), nullable=True)
+    stripe_customer_id = Column(String(255), nullable=True, index=True)
 
     # Billing period
     current_period_start = Column(DateTime(timezone=True), nullable=True)
@@ -267,7 +365,16 @@ class UsageTracking(Base):
     """Track resource usage per user"""
 
     __tablename__ = "usage_tracking"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # One counter row per period; UsageCounter relies on it for atomic upserts
+        UniqueConstraint(
+            "user_id",
+            "resource_type",
+            "period_start",
+            name="uq_usage_tracking_user_resource_period",
+        ),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -293,6 +400,29 @@ class UsageTracking(Base):
     user = relationship("User", back_populates="usage_tracking")
 
 
+class UserStats(Base):
+    """Kullanıcı başına artımlı istatistik özeti (analiz ekle/sil ile güncellenir)"""
+
+    __tablename__ = "user_stats"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_analyses = Column(Integer, default=0, nullable=False)
+
+    # {"YYYY-MM-DD": [score_sum, count, scored_count]} for the last STATS_WINDOW_DAYS days (UTC)
+    # scored_count: analyses with a non-NULL overall_score (weekly average denominator)
+    daily_scores = Column(JSON, nullable=False, default=dict)
+
+    # Consecutive active days ending at last_active_date
+    current_streak = Column(Integer, default=0, nullable=False)
+    last_active_date = Column(Date, nullable=True)
+    last_activity_at = Column(DateTime(timezone=True), nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    user = relationship("User", back_populates="stats")
+
+
 class RefreshToken(Base):
     """Refresh tokens for secure token renewal"""
 
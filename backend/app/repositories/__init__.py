@@ -1,13 +1,17 @@
 """Repository package - Data access layer"""
 
-from app.repositories.analysis_repository import AnalysisRepository
-from app.repositories.base import IRepository
-from app.repositories.feedback_repository import FeedbackRepository
-from app.repositories.user_repository import UserRepository
+from app.repositories.analysis_repository import AnalysisRepository, AsyncAnalysisRepository
+from app.repositories.base import IAsyncRepository, IRepository
+from app.repositories.feedback_repository import AsyncFeedbackRepository, FeedbackRepository
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
 
 __all__ = [
     "IRepository",
+    "IAsyncRepository",
     "AnalysisRepository",
     "UserRepository",
     "FeedbackRepository",
+    "AsyncAnalysisRepository",
+    "AsyncUserRepository",
+    "AsyncFeedbackRepository",
 ]
@@ -3,10 +3,54 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, load_only, selectinload, undefer
 
+from app.core.pagination import apply_keyset
 from app.models.database import Analysis
-from app.repositories.base import IRepository
+from app.repositories.base import IAsyncRepository, IRepository
+from app.services.cache_service import ANALYSES_LIST_TAG, analysis_tag, cache_service, user_tag
+from app.services.user_stats import user_stats_service
+
+# History/list pages only need these columns (full_report is never read)
+ANALYSIS_LIST_COLUMNS = (
+    Analysis.id,
+    Analysis.user_id,
+    Analysis.overall_score,
+    Analysis.summary,
+    Analysis.format_type,
+    Analysis.created_at,
+)
+
+# Trend/stat views only need scores; full_report stays unloaded
+RECENT_COLUMNS = (
+    Analysis.id,
+    Analysis.user_id,
+    Analysis.overall_score,
+    Analysis.sentiment_score,
+    Analysis.empathy_score,
+    Analysis.conflict_score,
+    Analysis.we_language_score,
+    Analysis.created_at,
+)
+
+
+def invalidate_analysis_caches(user_id: Optional[int], analysis_id: Optional[int] = None) -> None:
+    """Analiz eklendi/silindi: geçmiş, istatistik ve günlük limit cache'lerini geçersiz kıl"""
+    tags = [ANALYSES_LIST_TAG]
+    if analysis_id is not None:
+        tags.append(analysis_tag(analysis_id))
+    if user_id is not None:
+        tags.append(user_tag(user_id))
+    cache_service.invalidate_tags(*tags)
+
+
+def record_user_stats(db: Session, analysis: Analysis, delta: int = 1) -> None:
+    """UserStats özetini analizle aynı transaction'da güncelle (commit çağırana ait)"""
+    if analysis.user_id is not None:
+        user_stats_service.record_analysis(
+            db, analysis.user_id, analysis.overall_score, analysis.created_at, delta=delta
+        )
 
 
 class AnalysisRepository(IRepository[Analysis]):
@@ -34,8 +78,10 @@ class AnalysisRepository(IRepository[Analysis]):
     def create(self, entity: Analysis) -> Analysis:
         """Create new analysis"""
         self.db.add(entity)
+        record_user_stats(self.db, entity)
         self.db.commit()
         self.db.refresh(entity)
+        invalidate_analysis_caches(entity.user_id)
         return entity
 
     def update(self, entity: Analysis) -> Analysis:
@@ -49,32 +95,38 @@ class AnalysisRepository(IRepository[Analysis]):
         analysis = self.get_by_id(id)
         if analysis:
             self.db.delete(analysis)
+            record_user_stats(self.db, analysis, delta=-1)
             self.db.commit()
+            invalidate_analysis_caches(analysis.user_id, id)
             return True
         return False
 
     # Custom queries specific to Analysis
 
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 10) -> list[Analysis]:
+    def get_by_user(
+        self, user_id: int, skip: int = 0, limit: int = 10, cursor: Optional[str] = None
+    ) -> list[Analysis]:
         """
         Get analyses for a specific user.
 
         Args:
             user_id: User ID
-            skip: Pagination offset
+            skip: Pagination offset (ignored when cursor is given)
             limit: Maximum results
+            cursor: Keyset cursor from the previous page
 
         Returns:
             List of user's analyses, ordered by date
         """
-        return (
-            self.db.query(Analysis)
-            .filter(Analysis.user_id == user_id)
-            .order_by(Analysis.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = apply_keyset(
+            self.db.query(Analysis).filter(Analysis.user_id == user_id),
+            Analysis.created_at,
+            Analysis.id,
+            cursor,
         )
+        if skip and not cursor:
+            query = query.offset(skip)
+        return query.limit(limit).all()
 
     def count_daily_analyses(self, user_id: int, date: datetime) -> int:
         """
@@ -138,7 +190,80 @@ class AnalysisRepository(IRepository[Analysis]):
 
         return (
             self.db.query(Analysis)
+            .options(load_only(*RECENT_COLUMNS))
             .filter(Analysis.user_id == user_id, Analysis.created_at >= cutoff_date)
             .order_by(Analysis.created_at.desc())
             .all()
         )
+
+
+class AsyncAnalysisRepository(IAsyncRepository[Analysis]):
+    """Async repository for Analysis entity (history and detail reads)"""
+
+    async def get_by_id(self, id: int, with_report: bool = False) -> Optional[Analysis]:
+        """Get analysis by ID (with_report: eager-load full_report, no lazy IO later)"""
+        stmt = select(Analysis).where(Analysis.id == id)
+        if with_report:
+            stmt = stmt.options(
+                undefer(Analysis.full_report_json), selectinload(Analysis.report_blob)
+            )
+        return await self.db.scalar(stmt)
+
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> list[Analysis]:
+        """Get all analyses, newest first (list columns only)"""
+        stmt = apply_keyset(
+            select(Analysis).options(load_only(*ANALYSIS_LIST_COLUMNS)),
+            Analysis.created_at,
+            Analysis.id,
+            cursor,
+        )
+        if skip and not cursor:
+            stmt = stmt.offset(skip)
+        result = await self.db.scalars(stmt.limit(limit))
+        return list(result)
+
+    async def create(self, entity: Analysis) -> Analysis:
+        """Create new analysis"""
+        self.db.add(entity)
+        # user_stats_service senkron: AsyncSession'ın altındaki Session ile çalışır
+        await self.db.run_sync(record_user_stats, entity)
+        await self.db.commit()
+        await self.db.refresh(entity)
+        invalidate_analysis_caches(entity.user_id)
+        return entity
+
+    async def update(self, entity: Analysis) -> Analysis:
+        """Update existing analysis"""
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+
+    async def delete(self, id: int) -> bool:
+        """Delete analysis by ID"""
+        analysis = await self.get_by_id(id)
+        if analysis:
+            await self.db.delete(analysis)
+            await self.db.run_sync(record_user_stats, analysis, -1)
+            await self.db.commit()
+            invalidate_analysis_caches(analysis.user_id, id)
+            return True
+        return False
+
+    async def get_by_user(
+        self, user_id: int, skip: int = 0, limit: int = 10, cursor: Optional[str] = None
+    ) -> list[Analysis]:
+        """Get analyses for a specific user (list columns only)"""
+        stmt = apply_keyset(
+            select(Analysis)
+            .options(load_only(*ANALYSIS_LIST_COLUMNS))
+            .where(Analysis.user_id == user_id),
+            Analysis.created_at,
+            Analysis.id,
+            cursor,
+        )
+        if skip and not cursor:
+            stmt = stmt.offset(skip)
+        result = await self.db.scalars(stmt.limit(limit))
+        return list(result)
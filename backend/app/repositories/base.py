@@ -3,6 +3,7 @@
 from abc import ABC, abstractmethod
 from typing import Generic, Optional, TypeVar
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 T = TypeVar("T")
@@ -90,3 +91,46 @@ class IRepository(ABC, Generic[T]):
             True if deleted, False if not found
         """
         pass
+
+
+class IAsyncRepository(ABC, Generic[T]):
+    """
+    Async counterpart of IRepository for the request path.
+
+    Same contract as IRepository, but every operation awaits an AsyncSession
+    so handlers do not block the event loop on database I/O.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize repository with async database session.
+
+        Args:
+            db: SQLAlchemy async session
+        """
+        self.db = db
+
+    @abstractmethod
+    async def get_by_id(self, id: int) -> Optional[T]:
+        """Get entity by ID"""
+        pass
+
+    @abstractmethod
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[T]:
+        """Get all entities with pagination"""
+        pass
+
+    @abstractmethod
+    async def create(self, entity: T) -> T:
+        """Create new entity"""
+        pass
+
+    @abstractmethod
+    async def update(self, entity: T) -> T:
+        """Update existing entity"""
+        pass
+
+    @abstractmethod
+    async def delete(self, id: int) -> bool:
+        """Delete entity by ID"""
+        pass
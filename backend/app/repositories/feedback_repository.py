@@ -2,10 +2,11 @@
 
 from typing import Optional
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 
+from app.core.pagination import apply_keyset
 from app.models.database import Feedback
-from app.repositories.base import IRepository
+from app.repositories.base import IAsyncRepository, IRepository
 
 
 class FeedbackRepository(IRepository[Feedback]):
@@ -54,26 +55,30 @@ class FeedbackRepository(IRepository[Feedback]):
 
     # Custom queries specific to Feedback
 
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 20) -> list[Feedback]:
+    def get_by_user(
+        self, user_id: int, skip: int = 0, limit: int = 20, cursor: Optional[str] = None
+    ) -> list[Feedback]:
         """
         Get feedback from a specific user.
 
         Args:
             user_id: User ID
-            skip: Pagination offset
+            skip: Pagination offset (ignored when cursor is given)
             limit: Maximum results
+            cursor: Keyset cursor from the previous page
 
         Returns:
             List of user's feedback
         """
-        return (
-            self.db.query(Feedback)
-            .filter(Feedback.user_id == user_id)
-            .order_by(Feedback.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = apply_keyset(
+            self.db.query(Feedback).filter(Feedback.user_id == user_id),
+            Feedback.created_at,
+            Feedback.id,
+            cursor,
         )
+        if skip and not cursor:
+            query = query.offset(skip)
+        return query.limit(limit).all()
 
     def get_by_analysis(self, analysis_id: int) -> list[Feedback]:
         """
@@ -132,3 +137,55 @@ class FeedbackRepository(IRepository[Feedback]):
             .order_by(Feedback.created_at.desc())
             .all()
         )
+
+
+class AsyncFeedbackRepository(IAsyncRepository[Feedback]):
+    """Async repository for Feedback entity"""
+
+    async def get_by_id(self, id: int) -> Optional[Feedback]:
+        """Get feedback by ID"""
+        return await self.db.get(Feedback, id)
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Feedback]:
+        """Get all feedback with pagination"""
+        result = await self.db.scalars(
+            select(Feedback).order_by(Feedback.created_at.desc()).offset(skip).limit(limit)
+        )
+        return list(result)
+
+    async def create(self, entity: Feedback) -> Feedback:
+        """Create new feedback"""
+        self.db.add(entity)
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+
+    async def update(self, entity: Feedback) -> Feedback:
+        """Update existing feedback"""
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+
+    async def delete(self, id: int) -> bool:
+        """Delete feedback by ID"""
+        feedback = await self.get_by_id(id)
+        if feedback:
+            await self.db.delete(feedback)
+            await self.db.commit()
+            return True
+        return False
+
+    async def get_by_user(
+        self, user_id: int, skip: int = 0, limit: int = 20, cursor: Optional[str] = None
+    ) -> list[Feedback]:
+        """Get feedback from a specific user (keyset cursor or offset)"""
+        stmt = apply_keyset(
+            select(Feedback).where(Feedback.user_id == user_id),
+            Feedback.created_at,
+            Feedback.id,
+            cursor,
+        )
+        if skip and not cursor:
+            stmt = stmt.offset(skip)
+        result = await self.db.scalars(stmt.limit(limit))
+        return list(result)
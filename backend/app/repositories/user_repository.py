@@ -2,8 +2,11 @@
 
 from typing import Optional
 
+from sqlalchemy import select
+
 from app.models.database import User
-from app.repositories.base import IRepository
+from app.repositories.base import IAsyncRepository, IRepository
+from app.services.principal_cache import principal_cache
 
 
 class UserRepository(IRepository[User]):
@@ -30,8 +33,10 @@ class UserRepository(IRepository[User]):
         return entity
 
     def update(self, entity: User) -> User:
-        """Update existing user"""
+        """Update existing user (drops cached auth snapshots)"""
+        user_id = entity.id
         self.db.commit()
+        principal_cache.invalidate_user(user_id)
         self.db.refresh(entity)
         return entity
 
@@ -41,6 +46,7 @@ class UserRepository(IRepository[User]):
         if user:
             self.db.delete(user)
             self.db.commit()
+            principal_cache.invalidate_user(id)
             return True
         return False
 
@@ -111,3 +117,51 @@ class UserRepository(IRepository[User]):
             True if exists, False otherwise
         """
         return self.db.query(User).filter(User.email == email).first() is not None
+
+
+class AsyncUserRepository(IAsyncRepository[User]):
+    """Async repository for User entity (auth and profile reads on the request path)"""
+
+    async def get_by_id(self, id: int) -> Optional[User]:
+        """Get user by ID"""
+        return await self.db.get(User, id)
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[User]:
+        """Get all users with pagination"""
+        result = await self.db.scalars(
+            select(User).order_by(User.created_at.desc()).offset(skip).limit(limit)
+        )
+        return list(result)
+
+    async def create(self, entity: User) -> User:
+        """Create new user"""
+        self.db.add(entity)
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+
+    async def update(self, entity: User) -> User:
+        """Update existing user (drops cached auth snapshots)"""
+        user_id = entity.id
+        await self.db.commit()
+        principal_cache.invalidate_user(user_id)
+        await self.db.refresh(entity)
+        return entity
+
+    async def delete(self, id: int) -> bool:
+        """Delete user by ID"""
+        user = await self.get_by_id(id)
+        if user:
+            await self.db.delete(user)
+            await self.db.commit()
+            principal_cache.invalidate_user(id)
+            return True
+        return False
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Get user by email address"""
+        return await self.db.scalar(select(User).where(User.email == email).limit(1))
+
+    async def email_exists(self, email: str) -> bool:
+        """Check if email already exists"""
+        return await self.db.scalar(select(User.id).where(User.email == email).limit(1)) is not None
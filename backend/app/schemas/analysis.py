@@ -93,6 +93,63 @@ class RelationshipReport(BaseModel):
 
 
 class AnalysisRequest(BaseModel):
+    """Request for /api/analysis/analyze (ML metrics + report)"""
+
+    text: str = Field(..., min_length=1, description="Konuşma veya düz metin")
+    format_type: str = Field(default="auto", description="auto, whatsapp, simple, plain")
+    privacy_mode: bool = Field(default=True, description="Kişisel bilgileri maskele")
+
+
+class AnalysisResponse(BaseModel):
+    """ReportGenerator report (+ analysis_id when saved)"""
+
+    status: str = "success"
+    overall_score: float
+    metrics: dict[str, dict[str, Any]]
+    summary: str
+    summary_enhanced: str | None = None
+    insights: list[dict[str, Any]] = []
+    recommendations: list[dict[str, Any]] = []
+    reply_suggestions: list[Any] | None = None
+    conversation_stats: dict[str, Any] = {}
+    metadata: dict[str, Any] = {}
+    version: str | None = None
+    generated_at: str | None = None
+    analysis_id: int | None = None
+    db_save_error: str | None = None
+
+
+class QuickScoreRequest(BaseModel):
+    """Request for /api/analysis/quick-score"""
+
+    text: str = Field(..., min_length=1)
+
+
+class QuickScoreResponse(BaseModel):
+    """Overall score only (0-100)"""
+
+    score: float
+    status: str
+
+
+class RewriteRequest(BaseModel):
+    """Request for /api/analysis/rewrite"""
+
+    text: str = Field(..., min_length=1)
+    target_tone: str = Field(
+        default="polite", description="polite, professional, romantic, assertive"
+    )
+
+
+class RewriteResponse(BaseModel):
+    """Rewritten message"""
+
+    original_text: str
+    rewritten_text: str
+    tone: str
+
+
+class V2AnalysisRequest(BaseModel):
     """Request for relationship analysis"""
 
     conversation_text: str = Field(..., min_length=50)
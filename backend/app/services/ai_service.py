@@ -8,16 +8,20 @@ import time
 from datetime import datetime
 from typing import Any, Optional
 
-import google.generativeai as genai
 import httpx
-from anthropic import Anthropic
-from openai import OpenAI
 from pydantic import ValidationError
 
 from app.core.config import settings
+from app.core.metrics import track_llm_call
+from app.core.performance import time_operation
+from app.core.tracing import traced
 from app.schemas.ai_responses import InsightsResponse, RecommendationsResponse
 from app.services.cache_service import cache_service
 from app.services.knowledge_base import format_knowledge_context, get_relevant_knowledge
+from app.services.mock_llm import MockLLMClient
+
+# Provider SDK'ları (openai, anthropic, google.generativeai) import'ta ~1-2 sn sürer;
+# soğuk başlangıcı yavaşlatmamak için sadece seçilen provider'ınki, ilk kullanımda yüklenir
 
 logger = logging.getLogger(__name__)
 
@@ -32,20 +36,27 @@ class AIService:
         self.anthropic_client = None
         self.gemini_client = None
         self.ollama_base_url = None
+        self.mock_client = None
         self.provider = settings.AI_PROVIDER
 
         # API anahtarlarını / bağlantıları kontrol et
         if self.provider == "openai":
             api_key = settings.OPENAI_API_KEY
             if api_key:
+                from openai import OpenAI
+
                 self.openai_client = OpenAI(api_key=api_key)
         elif self.provider == "anthropic":
             api_key = settings.ANTHROPIC_API_KEY
             if api_key:
+                from anthropic import Anthropic
+
                 self.anthropic_client = Anthropic(api_key=api_key)
         elif self.provider == "gemini":
             api_key = settings.GEMINI_API_KEY
             if api_key:
+                import google.generativeai as genai
+
                 genai.configure(api_key=api_key)
                 self.gemini_client = genai
         elif self.provider == "ollama":
@@ -55,6 +66,9 @@ class AIService:
                 "Ollama provider configured",
                 extra={"base_url": self.ollama_base_url, "model": settings.OLLAMA_MODEL},
             )
+        elif self.provider == "mock":
+            # Yük testi: API key / Ollama gerekmez (bkz. mock_llm.py)
+            self.mock_client = MockLLMClient.from_settings()
 
         # Structured logging
         if self._is_available():
@@ -78,15 +92,17 @@ class AIService:
         api_key: str | None = None,
         ollama_model: str | None = None,
         ollama_url: str | None = None,
+        mock_options: dict | None = None,
     ) -> dict:
         """
         Çalışma zamanında AI provider'ı değiştir (restart gerekmez).
 
         Args:
-            provider: 'openai' | 'anthropic' | 'gemini' | 'ollama' | 'none'
+            provider: 'openai' | 'anthropic' | 'gemini' | 'ollama' | 'mock' | 'none'
             api_key:  Cloud provider için API key (opsiyonel, boşsa mevcut .env key'i kullanılır)
             ollama_model: Ollama model adı (örn: 'llama3', 'mistral')
             ollama_url:   Ollama base URL (örn: 'http://localhost:11434')
+            mock_options: Mock provider ayarları (latency_ms, error_rate, rate_limit_rate ...)
 
         Returns:
             {'provider': str, 'available': bool, 'message': str}
@@ -98,10 +114,13 @@ class AIService:
         self.anthropic_client = None
         self.gemini_client = None
         self.ollama_base_url = None
+        self.mock_client = None
 
         if provider == "openai":
             key = api_key or settings.OPENAI_API_KEY
             if key:
+                from openai import OpenAI
+
                 self.openai_client = OpenAI(api_key=key)
                 msg = "OpenAI (Cloud) aktif"
             else:
@@ -110,6 +129,8 @@ class AIService:
         elif provider == "anthropic":
             key = api_key or settings.ANTHROPIC_API_KEY
             if key:
+                from anthropic import Anthropic
+
                 self.anthropic_client = Anthropic(api_key=key)
                 msg = "Anthropic Claude (Cloud) aktif"
             else:
@@ -118,6 +139,8 @@ class AIService:
         elif provider == "gemini":
             key = api_key or settings.GEMINI_API_KEY
             if key:
+                import google.generativeai as genai
+
                 genai.configure(api_key=key)
                 self.gemini_client = genai
                 msg = "Google Gemini (Cloud) aktif"
@@ -130,6 +153,10 @@ class AIService:
                 settings.OLLAMA_MODEL = ollama_model
             msg = f"Ollama (Yerel/Gizli) aktif — {self.ollama_base_url}"
 
+        elif provider == "mock":
+            self.mock_client = MockLLMClient.from_settings(**(mock_options or {}))
+            msg = "Mock LLM (yük testi) aktif — sabit yanıtlar"
+
         else:  # "none"
             msg = "AI devre dışı (fallback modu)"
 
@@ -334,7 +361,7 @@ class AIService:
                     chat_history.append({"role": role, "parts": [msg["content"]]})
 
                 # Create chat session
-                model = genai.GenerativeModel(
+                model = self.gemini_client.GenerativeModel(
                     model_name=settings.GEMINI_MODEL, system_instruction=system_prompt
                 )
                 chat = model.start_chat(history=chat_history)
@@ -342,13 +369,17 @@ class AIService:
                 # Send message
                 response = chat.send_message(
                     message,
-                    generation_config=genai.GenerationConfig(
+                    generation_config=self.gemini_client.GenerationConfig(
                         max_output_tokens=500,
                         temperature=0.7,
                     ),
                 )
                 return response.text
 
+            elif self.provider == "mock" and self.mock_client:
+                # Token streaming'i taklit eder (ilk token gecikmesi + token başına süre)
+                return "".join(self.mock_client.stream(message, max_tokens=500))
+
             # Default fallback
             return "AI sağlayıcı yapılandırması eksik."
 
@@ -531,8 +562,13 @@ Metrikler:
             return self.gemini_client is not None
         elif self.provider == "ollama":
             return self.ollama_base_url is not None
+        elif self.provider == "mock":
+            return self.mock_client is not None
         return False
 
+    @time_operation("llm.call")
+    @track_llm_call("text")
+    @traced("llm")
     def _call_llm(self, prompt: str, max_tokens: int, temperature: float = 0.7) -> str:
         """LLM çağrısı yap — OpenAI / Anthropic / Gemini / Ollama"""
         if self.provider == "openai" and self.openai_client:
@@ -560,10 +596,10 @@ Metrikler:
             return response.content[0].text.strip()
 
         elif self.provider == "gemini" and self.gemini_client:
-            model = genai.GenerativeModel(model_name=settings.GEMINI_MODEL)
+            model = self.gemini_client.GenerativeModel(model_name=settings.GEMINI_MODEL)
             response = model.generate_content(
                 prompt,
-                generation_config=genai.GenerationConfig(
+                generation_config=self.gemini_client.GenerationConfig(
                     max_output_tokens=max_tokens,
                     temperature=temperature,
                 ),
@@ -581,6 +617,8 @@ Metrikler:
                     "num_predict": max_tokens,
                 },
             }
+            if settings.OLLAMA_KEEP_ALIVE:
+                payload["keep_alive"] = settings.OLLAMA_KEEP_ALIVE
             try:
                 with httpx.Client(timeout=120.0) as client:
                     resp = client.post(
@@ -599,8 +637,14 @@ Metrikler:
                     "Ollama yanıt zaman aşımına uğradı (120s). Model yükleniyor olabilir."
                 )
 
+        elif self.provider == "mock" and self.mock_client:
+            return self.mock_client.complete(prompt, max_tokens)
+
         raise Exception("AI provider yapılandırılmamış")
 
+    @time_operation("llm.call_structured")
+    @track_llm_call("structured")
+    @traced("llm")
     def _call_llm_structured(
         self, prompt: str, response_model: type, max_tokens: int, max_retries: int = 2
     ):
@@ -680,9 +724,9 @@ Rules:
                     raw_response = response.content[0].text.strip()
 
                 elif self.provider == "gemini" and self.gemini_client:
-                    model = genai.GenerativeModel(
+                    model = self.gemini_client.GenerativeModel(
                         model_name=settings.GEMINI_MODEL,
-                        generation_config=genai.GenerationConfig(
+                        generation_config=self.gemini_client.GenerationConfig(
                             response_mime_type="application/json",
                             max_output_tokens=max_tokens,
                             temperature=0.7,
@@ -690,6 +734,9 @@ Rules:
                     )
                     response = model.generate_content(structured_prompt)
                     raw_response = response.text.strip()
+
+                elif self.provider == "mock" and self.mock_client:
+                    raw_response = self.mock_client.complete_structured(response_model)
                 else:
                     raise Exception("AI provider yapılandırılmamış")
 
@@ -864,6 +911,7 @@ Please fix the JSON structure and try again."""
             (self.openai_client is not None)
             or (self.anthropic_client is not None)
             or (self.gemini_client is not None)
+            or (self.mock_client is not None)
         )
 
     def _fallback_insights(self, metrics: dict[str, Any]) -> list[dict[str, str]]:
@@ -965,6 +1013,7 @@ Please fix the JSON structure and try again."""
 
         return recommendations
 
+    @traced("llm.gottman")
     def generate_relationship_report(
         self,
         conversation_text: str,
@@ -1312,6 +1361,45 @@ KURALLAR:
   ]
 }}"""
 
+    def _build_recommendations_prompt_v3(
+        self, metrics: dict[str, Any], insights: list[dict]
+    ) -> str:
+        """Öneri promptu oluştur (V3.0 - Strict JSON Schema)"""
+
+        # Context optimization: Top insights only
+        top_insights = insights[:4]
+
+        return f"""Sen bir ilişki koçusun. Aşağıdaki içgörü ve metriklere göre uygulanabilir öneriler üret.
+
+İÇGÖRÜLER:
+{json.dumps(top_insights, indent=2, ensure_ascii=False)}
+
+ZAYIF ALANLAR:
+- Empati skoru: {metrics.get('empathy', {}).get('score', 'N/A')}
+- Çatışma skoru: {metrics.get('conflict', {}).get('score', 'N/A')}
+- Biz-dili skoru: {metrics.get('we_language', {}).get('score', 'N/A')}
+
+GÖREV:
+3-5 adet somut, uygulanabilir öneri üret.
+
+KURALLAR:
+- category: sadece "İletişim", "Empati", "Çatışma Yönetimi" veya "Bağ Güçlendirme"
+- title: Max 50 karakter, eylem odaklı
+- description: 50-200 karakter arası, somut adımlar
+- difficulty: "Düşük", "Orta" veya "Yüksek"
+
+ÇIKTI FORMATI:
+{{
+  "recommendations": [
+    {{
+      "category": "İletişim",
+      "title": "Günlük Check-in Rutini",
+      "description": "Her gün 10 dakika telefonlar kapalı konuşun. Sadece dinleyin ve 'Anlıyorum' deyin.",
+      "difficulty": "Düşük"
+    }}
+  ]
+}}"""
+
     # ==================== Context Management (Map-Reduce) ====================
 
     CHUNK_SIZE_CHARS: int = 10_000  # ~2500 tokens per chunk
@@ -1421,6 +1509,7 @@ FINAL ÖZET:"""
             logger.warning("Reduce step failed, concatenating summaries", extra={"error": str(e)})
             return "\n\n".join(summaries)
 
+    @traced("map_reduce")
     def summarize_large_text(self, conversation_text: str) -> str:
         """Map-Reduce summarization for large conversation texts.
 
@@ -3,17 +3,54 @@
 import logging
 from typing import Any
 
+from app.core.performance import time_operation
+from app.core.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 from backend.ml.analyzer import get_analyzer
 
+# (analyzer bileşeni, metot, perf_monitor operasyonu, span): ml/ app'e bağımlı
+# olmadığı için aşama zamanlaması ve span'ler analyzer bileşenlerine burada bağlanır
+ANALYZER_STAGES = [
+    ("parser", "parse", "parser.parse", "parse"),
+    ("preprocessor", "preprocess", "preprocessing.preprocess", "preprocess"),
+    ("metrics_calculator", "calculate_sentiment_score", "metrics.sentiment", "metrics"),
+    ("metrics_calculator", "calculate_empathy_score", "metrics.empathy", "metrics"),
+    ("metrics_calculator", "calculate_conflict_score", "metrics.conflict", "metrics"),
+    ("metrics_calculator", "calculate_we_language_score", "metrics.we_language", "metrics"),
+    (
+        "metrics_calculator",
+        "calculate_communication_balance",
+        "metrics.communication_balance",
+        "metrics",
+    ),
+    ("report_generator", "generate_report", None, "report"),
+]
+
+
+def instrument_analyzer(analyzer) -> None:
+    """Analyzer aşamalarını perf_monitor'a ve istek izine bağla (tekrarı etkisiz)"""
+    for component, method, operation, span_name in ANALYZER_STAGES:
+        target = getattr(analyzer, component)
+        # Instance attribute: sınıf (ve ml testleri) değişmez; preprocessor paylaşılan
+        # singleton olduğundan zaten sarılmışsa tekrar sarılmaz
+        if method in vars(target):
+            continue
+        wrapped = traced(span_name)(getattr(target, method))
+        if operation:
+            wrapped = time_operation(operation)(wrapped)
+        setattr(target, method, wrapped)
+
 
 class AnalysisService:
     """İlişki analizi servisi"""
 
     def __init__(self):
         self.analyzer = get_analyzer()
+        instrument_analyzer(self.analyzer)
 
+    @traced("analysis")
     def analyze_text(
         self,
         text: str,
@@ -168,9 +205,16 @@ class AnalysisService:
         Returns:
             Analysis result or None
         """
+        from sqlalchemy.orm import selectinload, undefer
+
         from app.models.database import Analysis
 
-        analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+        analysis = (
+            db.query(Analysis)
+            .options(undefer(Analysis.full_report_json), selectinload(Analysis.report_blob))
+            .filter(Analysis.id == analysis_id)
+            .first()
+        )
         if not analysis:
             return None
 
@@ -203,8 +247,15 @@ class AnalysisService:
         """
         from app.models.database import Analysis
 
+        # Scalar projection: full_report is never read for a list page
         analyses = (
-            db.query(Analysis)
+            db.query(
+                Analysis.id,
+                Analysis.created_at,
+                Analysis.overall_score,
+                Analysis.summary,
+                Analysis.privacy_mode,
+            )
             .filter(Analysis.user_id == user_id)
             .order_by(Analysis.created_at.desc())
             .limit(limit)
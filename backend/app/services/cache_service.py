@@ -1,4 +1,8 @@
-"""Redis cache service for performance optimization"""
+"""Redis cache service for performance optimization
+
+Backend seçimi (CACHE_BACKEND=auto): Redis varsa Redis, yoksa SQLite tabanlı
+kalıcı disk cache (masaüstü sürümü), o da açılamazsa süreç içi dict.
+"""
 
 try:
     import redis
@@ -10,26 +14,82 @@ except ImportError:
 
 import json
 import logging
+from collections.abc import Iterable
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Any, Optional
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Tag index key prefix (Redis set of cache keys per tag)
+TAG_KEY_PREFIX = "cache_tag:"
+
+# SETEX + tag index kaydı tek atomik adımda. Tag index en uzun ömürlü üyesinden önce
+# silinmesin diye TTL yalnızca uzatılır; EXPIRE NX/GT (Redis >= 7.0) yerine TTL
+# karşılaştırması: Lua scriptleri destekleyen her sürümde (>= 2.6) çalışır.
+# KEYS[1] = cache key, KEYS[2..] = tag index key'leri; ARGV = ttl, value
+_SET_WITH_TAGS_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+redis.call('SETEX', KEYS[1], ttl, ARGV[2])
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    if redis.call('TTL', KEYS[i]) < ttl then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return 1
+"""
+
+# Göreli CACHE_DISK_PATH çalışma dizinine değil backend/ dizinine göre çözülür
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+
+def disk_cache_path(path: str) -> str:
+    """Absolute location of the disk cache file"""
+    return str(BACKEND_ROOT / Path(path).expanduser())
+
+
+def user_tag(user_id: int) -> str:
+    """Cache tag for everything derived from a user's data"""
+    return f"user:{user_id}"
+
+
+def analysis_tag(analysis_id: int) -> str:
+    """Cache tag for a single analysis"""
+    return f"analysis:{analysis_id}"
+
+
+# Tag for listings spanning all users (admin history etc.)
+ANALYSES_LIST_TAG = "analyses:list"
+
 
 class CacheService:
-    """Simple cache service with Redis (or in-memory fallback)"""
+    """Simple cache service with Redis (or disk / in-memory fallback)"""
 
     def __init__(self):
-        """Initialize Redis connection or fallback to dict"""
+        """Initialize Redis connection or fallback to disk cache / dict"""
         self.enabled = False
+        self.redis_client = None
+        self._set_with_tags_script = None  # Registered lazily (see _SET_WITH_TAGS_SCRIPT)
+        self.disk_cache = None  # Persistent fallback (DiskCache)
         self.cache = {}  # In-memory fallback
+        self.tags: dict[str, set[str]] = {}  # In-memory tag index: tag -> keys
+        self.hits = 0
+        self.misses = 0
+
+        backend = settings.CACHE_BACKEND
+        if backend in ("auto", "redis"):
+            self._init_redis()
+        if self.redis_client is None and backend in ("auto", "disk"):
+            self._init_disk_cache()
 
+    def _init_redis(self):
+        """Connect to Redis if the module is installed and REDIS_URL is set"""
         if not REDIS_AVAILABLE:
-            logger.warning("⚠️ Redis module not installed, using in-memory cache")
+            logger.warning("⚠️ Redis module not installed, falling back to local cache")
             logger.info("💡 To install: pip install redis")
-            self.redis_client = None
             return
 
         # Try Redis connection
@@ -43,19 +103,43 @@ class CacheService:
                 self.enabled = True
                 logger.info("✅ Redis cache enabled")
             else:
-                logger.warning("⚠️ REDIS_URL not configured, using in-memory cache")
-                self.redis_client = None
+                logger.warning("⚠️ REDIS_URL not configured, falling back to local cache")
         except Exception as e:
-            logger.warning(f"⚠️ Redis unavailable, using in-memory cache: {e}")
+            logger.warning(f"⚠️ Redis unavailable, falling back to local cache: {e}")
             self.redis_client = None
 
+    def _init_disk_cache(self):
+        """Open the SQLite disk cache (survives restarts of the desktop app)"""
+        from app.services.disk_cache import DiskCache
+
+        path = disk_cache_path(settings.CACHE_DISK_PATH)
+        try:
+            self.disk_cache = DiskCache(path, max_bytes=settings.CACHE_DISK_MAX_MB * 1024 * 1024)
+            self.enabled = True
+            logger.info(f"✅ Disk cache enabled at {path}")
+        except Exception as e:
+            logger.warning(f"⚠️ Disk cache unavailable, using in-memory cache: {e}")
+            self.disk_cache = None
+
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _get(self, key: str) -> Optional[Any]:
         try:
             if self.redis_client:
                 value = self.redis_client.get(key)
                 if value:
                     return json.loads(value) if value != "null" else None
+            elif self.disk_cache:
+                value = self.disk_cache.get(key)
+                if value is not None:
+                    return json.loads(value)
             else:
                 # In-memory fallback
                 item = self.cache.get(key)
@@ -69,17 +153,45 @@ class CacheService:
             logger.error(f"Cache get error for key {key}: {e}")
             return None
 
-    def set(self, key: str, value: Any, ttl_seconds: int = 300):
-        """Set value in cache with TTL (default 5 minutes)"""
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 300,
+        tags: Optional[Iterable[str]] = None,
+    ):
+        """
+        Set value in cache with TTL (default 5 minutes)
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl_seconds: Time to live
+            tags: Owner tags (e.g. user_tag(1)); invalidate_tags() drops every key under a tag
+        """
         try:
             if self.redis_client:
-                self.redis_client.setex(key, ttl_seconds, json.dumps(value))
+                if tags:
+                    if self._set_with_tags_script is None:
+                        self._set_with_tags_script = self.redis_client.register_script(
+                            _SET_WITH_TAGS_SCRIPT
+                        )
+                    self._set_with_tags_script(
+                        keys=[key, *(f"{TAG_KEY_PREFIX}{tag}" for tag in tags)],
+                        args=[ttl_seconds, json.dumps(value)],
+                    )
+                else:
+                    self.redis_client.setex(key, ttl_seconds, json.dumps(value))
+            elif self.disk_cache:
+                self.disk_cache.set(key, json.dumps(value), ttl_seconds, tags=tags)
             else:
                 # In-memory fallback
                 self.cache[key] = {
                     "value": value,
                     "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
                 }
+                for tag in tags or ():
+                    self.tags.setdefault(tag, set()).add(key)
                 # Simple cleanup: remove expired items if cache is too large
                 if len(self.cache) > 1000:
                     self._cleanup_expired()
@@ -91,17 +203,57 @@ class CacheService:
         try:
             if self.redis_client:
                 self.redis_client.delete(key)
+            elif self.disk_cache:
+                self.disk_cache.delete(key)
             else:
                 self.cache.pop(key, None)
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
 
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every cache entry registered under any of the given tags
+
+        Returns:
+            Number of keys removed
+        """
+        if not tags:
+            return 0
+        try:
+            if self.redis_client:
+                tag_keys = [f"{TAG_KEY_PREFIX}{tag}" for tag in tags]
+                keys: set[str] = set()
+                for tag_key in tag_keys:
+                    keys.update(self.redis_client.smembers(tag_key))
+                self.redis_client.delete(*keys, *tag_keys)
+                removed = len(keys)
+            elif self.disk_cache:
+                removed = self.disk_cache.invalidate_tags(*tags)
+            else:
+                keys = set()
+                for tag in tags:
+                    keys.update(self.tags.pop(tag, set()))
+                for key in keys:
+                    self.cache.pop(key, None)
+                removed = len(keys)
+            logger.debug(f"Invalidated {removed} cache entries for tags {tags}")
+            return removed
+        except Exception as e:
+            logger.error(f"Cache invalidate error for tags {tags}: {e}")
+            return 0
+
     def _cleanup_expired(self):
         """Remove expired items from in-memory cache"""
         now = datetime.now(timezone.utc)
         expired_keys = [k for k, v in self.cache.items() if v["expires_at"] <= now]
         for key in expired_keys:
             del self.cache[key]
+        if expired_keys:
+            expired = set(expired_keys)
+            for tag in list(self.tags):
+                self.tags[tag] -= expired
+                if not self.tags[tag]:
+                    del self.tags[tag]
         logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
 
 
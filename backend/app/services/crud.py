@@ -1,11 +1,19 @@
 """Database CRUD işlemleri"""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, selectinload, undefer
 
+from app.core.pagination import apply_keyset
 from app.models.database import Analysis, Feedback, User
+from app.repositories.analysis_repository import (
+    ANALYSIS_LIST_COLUMNS,
+    invalidate_analysis_caches,
+    record_user_stats,
+)
+from app.services.principal_cache import principal_cache
+from app.services.user_stats import user_stats_service
 
 
 class AnalysisCRUD:
@@ -39,38 +47,62 @@ class AnalysisCRUD:
             summary=report.get("summary", ""),
             message_count=conversation_stats.get("total_messages", 0),
             participant_count=conversation_stats.get("participant_count", 0),
+            created_at=datetime.now(timezone.utc),
         )
 
         db.add(analysis)
+        # Aynı transaction: özet ve analiz birlikte commit edilir
+        record_user_stats(db, analysis)
         db.commit()
         db.refresh(analysis)
+
+        # Kullanıcıya bağlı cache'leri (günlük limit, istatistik, geçmiş) geçersiz kıl
+        invalidate_analysis_caches(user_id)
         return analysis
 
     @staticmethod
-    def get_analysis_by_id(db: Session, analysis_id: int) -> Optional[Analysis]:
-        """ID'ye göre analiz getir"""
-        return db.query(Analysis).filter(Analysis.id == analysis_id).first()
+    def get_analysis_by_id(
+        db: Session, analysis_id: int, with_report: bool = False
+    ) -> Optional[Analysis]:
+        """ID'ye göre analiz getir (with_report: full_report tek sorguda yüklenir)"""
+        query = db.query(Analysis).filter(Analysis.id == analysis_id)
+        if with_report:
+            query = query.options(
+                undefer(Analysis.full_report_json), selectinload(Analysis.report_blob)
+            )
+        return query.first()
 
     @staticmethod
     def get_user_analyses(
-        db: Session, user_id: int, skip: int = 0, limit: int = 10
+        db: Session, user_id: int, skip: int = 0, limit: int = 10, cursor: Optional[str] = None
     ) -> list[Analysis]:
-        """Kullanıcının tüm analizlerini getir"""
-        return (
+        """Kullanıcının tüm analizlerini getir (cursor verilirse skip yok sayılır)"""
+        query = apply_keyset(
             db.query(Analysis)
-            .filter(Analysis.user_id == user_id)
-            .order_by(Analysis.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+            .options(load_only(*ANALYSIS_LIST_COLUMNS))
+            .filter(Analysis.user_id == user_id),
+            Analysis.created_at,
+            Analysis.id,
+            cursor,
         )
+        if skip and not cursor:
+            query = query.offset(skip)
+        return query.limit(limit).all()
 
     @staticmethod
-    def get_recent_analyses(db: Session, skip: int = 0, limit: int = 10) -> list[Analysis]:
+    def get_recent_analyses(
+        db: Session, skip: int = 0, limit: int = 10, cursor: Optional[str] = None
+    ) -> list[Analysis]:
         """Son analizleri getir (admin için)"""
-        return (
-            db.query(Analysis).order_by(Analysis.created_at.desc()).offset(skip).limit(limit).all()
+        query = apply_keyset(
+            db.query(Analysis).options(load_only(*ANALYSIS_LIST_COLUMNS)),
+            Analysis.created_at,
+            Analysis.id,
+            cursor,
         )
+        if skip and not cursor:
+            query = query.offset(skip)
+        return query.limit(limit).all()
 
     @staticmethod
     def delete_analysis(db: Session, analysis_id: int) -> bool:
@@ -78,64 +110,44 @@ class AnalysisCRUD:
         analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
         if analysis:
             db.delete(analysis)
+            record_user_stats(db, analysis, delta=-1)
             db.commit()
+            invalidate_analysis_caches(analysis.user_id, analysis_id)
             return True
         return False
 
     @staticmethod
-    def get_user_stats(db: Session, user_id: int) -> dict:
-        """Kullanıcı istatistiklerini hesapla"""
-        from datetime import datetime, timedelta
-
-        from sqlalchemy import func
-
-        # 1. Toplam Analiz Sayısı
-        total_analyses = db.query(Analysis).filter(Analysis.user_id == user_id).count()
-
-        # 2. Haftalık Ortalama Skor
-        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        weekly_score = (
-            db.query(func.avg(Analysis.overall_score))
-            .filter(Analysis.user_id == user_id, Analysis.created_at >= seven_days_ago)
-            .scalar()
-            or 0.0
-        )
-
-        # 3. Seri (Streak) Hesaplama (Basitleştirilmiş: Son analiz tarihinden geriye doğru)
-        # Gerçek bir streak için 'DailyPulse' veya günlük unique analiz günleri kontrol edilmeli.
-        # Burada basitçe son 7 günde kaç gün aktivite var onu sayalım (Weekly Consistency)
-
-        # Son 30 gündeki aktivite günlerini çek
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        active_days = (
-            db.query(func.date(Analysis.created_at))
-            .filter(Analysis.user_id == user_id, Analysis.created_at >= thirty_days_ago)
-            .group_by(func.date(Analysis.created_at))
-            .all()
-        )
-
-        streak = 0
-        current_date = datetime.now(timezone.utc).date()
-
-        # Basit streak mantığı: Bugün veya dün işlem yaptıysa seriyi koru
-        # active_days is list of tuples like [(date(2023,1,1)), ...]
-        active_dates = {day[0] for day in active_days}
-
-        if current_date in active_dates or (current_date - timedelta(days=1)) in active_dates:
-            # Geriye doğru say
-            check_date = current_date
-            if current_date not in active_dates:  # Eğer bugün yapmadıysa dünden başlat
-                check_date -= timedelta(days=1)
-
-            while check_date in active_dates:
-                streak += 1
-                check_date -= timedelta(days=1)
+    def offload_large_reports(db: Session, min_bytes: int, batch_size: int = 100) -> int:
+        """Mevcut büyük raporları sıkıştırılmış blob tablosuna taşı; taşınan sayısını döner"""
+        moved = 0
+        last_id = 0
+        while True:
+            batch = (
+                db.query(Analysis)
+                .options(
+                    load_only(Analysis.id),
+                    undefer(Analysis.full_report_json),
+                    selectinload(Analysis.report_blob),
+                )
+                .filter(Analysis.id > last_id, Analysis.full_report_json.isnot(None))
+                .order_by(Analysis.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                return moved
+
+            for analysis in batch:
+                if analysis.store_report(analysis.full_report_json, min_bytes):
+                    moved += 1
+            db.commit()
+            last_id = batch[-1].id
+            db.expunge_all()
 
-        return {
-            "total_analyses": total_analyses,
-            "weekly_score": round(weekly_score, 1),
-            "streak": streak,
-        }
+    @staticmethod
+    def get_user_stats(db: Session, user_id: int) -> dict:
+        """Kullanıcı istatistikleri (UserStats özetinden, tek PK okuması)"""
+        return user_stats_service.get_stats(db, user_id)
 
 
 class FeedbackCRUD:
@@ -214,5 +226,6 @@ class UserCRUD:
             user.is_pro = is_pro
             user.subscription_end_date = end_date
             db.commit()
+            principal_cache.invalidate_user(user_id)
             db.refresh(user)
         return user
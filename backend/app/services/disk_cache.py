@@ -0,0 +1,211 @@
+"""Disk-backed cache for the Redis-less desktop build
+
+SQLite tabanlı kalıcı cache: TTL'ler mutlak epoch zamanı olarak saklanır,
+böylece süreç yeniden başlatıldığında LLM raporları kaybolmaz.
+Toplam boyut sınırı aşıldığında önce süresi dolanlar, sonra en az
+kullanılanlar (LRU) silinir.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# accessed_at is only rewritten when older than this (avoids a write per read)
+ACCESS_UPDATE_INTERVAL_SECONDS = 60
+
+# After eviction the cache shrinks to this fraction of max_bytes
+EVICTION_TARGET_RATIO = 0.9
+
+
+class DiskCache:
+    """Size-bounded SQLite key/value store with TTLs and tag index"""
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite file path (parent directory is created)
+            max_bytes: Upper bound for the sum of stored value sizes
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at
+                ON cache_entries (expires_at);
+            CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at
+                ON cache_entries (accessed_at);
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (tag, key)
+            );
+            CREATE INDEX IF NOT EXISTS ix_cache_tags_key ON cache_tags (key);
+            """
+        )
+
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()[0]
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[str]:
+        """Serialized value or None if missing/expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at, accessed_at = row
+            if expires_at <= now:
+                self._delete_keys([key])
+                return None
+
+            if now - accessed_at > ACCESS_UPDATE_INTERVAL_SECONDS:
+                self._conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            return value
+
+    def set(
+        self, key: str, value: str, ttl_seconds: int, tags: Optional[Iterable[str]] = None
+    ) -> None:
+        """Store a serialized value; expiry survives process restarts"""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.debug(f"Disk cache value for {key} exceeds max size, skipping")
+            return
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                old = self._conn.execute(
+                    "SELECT size FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at, size) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, now + ttl_seconds, now, size),
+                )
+                if tags:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                        [(tag, key) for tag in tags],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        """Delete a single key"""
+        with self._lock:
+            self._delete_keys([key])
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key registered under the given tags"""
+        with self._lock:
+            placeholders = ",".join("?" for _ in tags)
+            keys = [
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT DISTINCT key FROM cache_tags WHERE tag IN ({placeholders})", tags
+                )
+            ]
+            self._delete_keys(keys)
+            self._conn.execute(f"DELETE FROM cache_tags WHERE tag IN ({placeholders})", tags)
+            return len(keys)
+
+    def purge_expired(self) -> int:
+        """Remove expired entries; returns number removed"""
+        with self._lock:
+            keys = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT key FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+                )
+            ]
+            self._delete_keys(keys)
+            return len(keys)
+
+    def stats(self) -> dict:
+        """Entry count and size (for diagnostics)"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        return {"entries": count, "bytes": self._total_bytes, "max_bytes": self.max_bytes}
+
+    def close(self) -> None:
+        """Close the SQLite connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _delete_keys(self, keys: list[str]) -> None:
+        """Delete entries and their tag rows (caller holds the lock)"""
+        if not keys:
+            return
+        # SQLite default limit for bound parameters is 999
+        for i in range(0, len(keys), 500):
+            batch = keys[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            freed = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE key IN ({placeholders})",
+                batch,
+            ).fetchone()[0]
+            self._conn.execute(f"DELETE FROM cache_entries WHERE key IN ({placeholders})", batch)
+            self._conn.execute(f"DELETE FROM cache_tags WHERE key IN ({placeholders})", batch)
+            self._total_bytes -= freed
+
+    def _evict(self) -> None:
+        """Drop expired, then least recently used entries until under budget"""
+        expired = [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT key FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+            )
+        ]
+        self._delete_keys(expired)
+
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+        if self._total_bytes <= target:
+            return
+
+        victims = []
+        to_free = self._total_bytes - target
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY accessed_at ASC"
+        ):
+            victims.append(key)
+            to_free -= size
+            if to_free <= 0:
+                break
+        self._delete_keys(victims)
+        logger.debug(f"Disk cache evicted {len(expired)} expired and {len(victims)} LRU entries")
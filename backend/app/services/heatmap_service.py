@@ -5,13 +5,205 @@ gerildiğini analiz eder ve sıcaklık haritası verisi üretir.
 """
 
 import logging
+import math
 import re
-from collections import defaultdict
-from datetime import datetime
-from typing import Any
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from app.core.performance import time_operation
+from app.core.tracing import traced
+from backend.ml.preprocessing.conversation_table import ConversationTable
 
 logger = logging.getLogger(__name__)
 
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DATE = _EPOCH.date()
+
+# İstemci zaman damgaları için makul pencere; dışındakiler tarihsiz sayılır
+MIN_EPOCH_SECONDS = (datetime(1990, 1, 1) - _EPOCH).total_seconds()
+MAX_EPOCH_SECONDS = (datetime(2100, 1, 1) - _EPOCH).total_seconds()
+
+# Yoğun günlük dizilerin üst sınırı (~20 yıl); daha uzun aralıklarda timeline
+# üretilmez, günlük/haftalık satırlar yalnızca mesaj olan günlerden hesaplanır
+MAX_TIMELINE_DAYS = 20 * 366
+
+
+@dataclass
+class MessageFeatures:
+    """Per-message feature table (one row per message, columnar numpy arrays)"""
+
+    tension: np.ndarray  # float, 0-100
+    epoch: np.ndarray  # float64, duvar saatiyle 1970'ten beri saniye, NaN = bilinmiyor
+    hour: np.ndarray  # int8, -1 = bilinmiyor
+    weekday: np.ndarray  # int8, 0 = Pazartesi, -1 = bilinmiyor
+    topic_hits: np.ndarray  # bool (mesaj x SENSITIVE_TOPICS)
+
+
+def _epoch_day(day: date) -> int:
+    return (day - _EPOCH_DATE).days
+
+
+def _day_date(epoch_day: int) -> date:
+    return _EPOCH_DATE + timedelta(days=int(epoch_day))
+
+
+def _week_start_day(epoch_day: np.ndarray) -> np.ndarray:
+    """Epoch day of the Monday starting each day's week (1970-01-01 bir Perşembe)"""
+    return epoch_day - (epoch_day + 3) % 7
+
+
+class TensionTimeline:
+    """
+    Günlük tansiyon toplamlarının kümülatif dizileri
+
+    Herhangi bir tarih aralığı iki indeks farkıyla (O(1)) cevaplanır; yıllarca
+    geçmiş olsa da mesajlar yeniden taranmaz. Rapora to_dict() ile gömülür,
+    from_dict() ile geri yüklenir.
+    """
+
+    def __init__(self, start_day: int, daily_sum: np.ndarray, daily_count: np.ndarray):
+        self.start_day = int(start_day)
+        self.daily_sum = np.asarray(daily_sum, dtype=float)
+        self.daily_count = np.asarray(daily_count, dtype=np.int64)
+        self.cumulative_sum = np.concatenate(([0.0], np.cumsum(self.daily_sum)))
+        self.cumulative_count = np.concatenate(([0], np.cumsum(self.daily_count)))
+
+    @classmethod
+    def from_features(cls, features: MessageFeatures) -> Optional["TensionTimeline"]:
+        """Dense per-day arrays from the epoch column
+
+        None without dated messages or when the span exceeds MAX_TIMELINE_DAYS.
+        """
+        dated = ~np.isnan(features.epoch)
+        if not dated.any():
+            return None
+        days = (features.epoch[dated] // SECONDS_PER_DAY).astype(np.int64)
+        start_day = int(days.min())
+        if int(days.max()) - start_day >= MAX_TIMELINE_DAYS:
+            return None
+        offsets = days - start_day
+        return cls(
+            start_day,
+            np.bincount(offsets, weights=features.tension[dated]),
+            np.bincount(offsets),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TensionTimeline":
+        start_day = _epoch_day(date.fromisoformat(data["start_date"]))
+        return cls(
+            start_day,
+            np.diff(np.asarray(data["cumulative_tension"], dtype=float)),
+            np.diff(np.asarray(data["cumulative_count"], dtype=np.int64)),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Compact form: client can slice ranges itself (sum[end+1] - sum[start])"""
+        return {
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "cumulative_tension": [round(float(v), 2) for v in self.cumulative_sum],
+            "cumulative_count": self.cumulative_count.tolist(),
+        }
+
+    @property
+    def start_date(self) -> date:
+        return _day_date(self.start_day)
+
+    @property
+    def end_date(self) -> date:
+        return _day_date(self.start_day + len(self.daily_count) - 1)
+
+    def _clamp(self, day: date) -> int:
+        return min(max(_epoch_day(day) - self.start_day, 0), len(self.daily_count))
+
+    def range_summary(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> dict[str, Any]:
+        """Tension over [start, end] (both inclusive) from the prefix sums"""
+        start = start or self.start_date
+        end = end or self.end_date
+        lo = self._clamp(start)
+        hi = self._clamp(end + timedelta(days=1)) if end >= start else lo
+
+        count = int(self.cumulative_count[hi] - self.cumulative_count[lo])
+        total = float(self.cumulative_sum[hi] - self.cumulative_sum[lo])
+        days = np.flatnonzero(self.daily_count[lo:hi]) + lo
+        return {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "message_count": count,
+            "tension": round(total / count, 2) if count else 0,
+            "active_days": len(days),
+            "daily_tension": self._day_rows(days),
+        }
+
+    def daily_rows(self) -> list[dict]:
+        return self._day_rows(np.flatnonzero(self.daily_count))
+
+    def _day_rows(self, offsets: np.ndarray) -> list[dict]:
+        counts = self.daily_count[offsets]
+        averages = self.daily_sum[offsets] / counts
+        return [
+            {
+                "date": _day_date(self.start_day + offset).isoformat(),
+                "tension": round(float(avg), 2),
+                "message_count": int(count),
+            }
+            for offset, avg, count in zip(offsets.tolist(), averages, counts, strict=True)
+        ]
+
+    def weekly_rows(self) -> list[dict]:
+        """Pazartesi başlangıçlı haftalar; yalnızca mesaj olan haftalar"""
+        days = np.arange(self.start_day, self.start_day + len(self.daily_count))
+        weeks = _week_start_day(days)
+        offsets = (weeks - weeks[0]) // 7
+        counts = np.bincount(offsets, weights=self.daily_count)
+        sums = np.bincount(offsets, weights=self.daily_sum)
+        return [
+            {
+                "week_start": _day_date(weeks[0] + 7 * w).isoformat(),
+                "tension": round(float(sums[w] / counts[w]), 2),
+                "message_count": int(counts[w]),
+            }
+            for w in np.flatnonzero(counts).tolist()
+        ]
+
+
+def _sparse_rows(keys: np.ndarray, tension: np.ndarray, key_name: str) -> list[dict]:
+    """Day/week rows only for keys that have messages (no dense range)"""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = np.bincount(inverse, weights=tension)
+    return [
+        {
+            key_name: _day_date(key).isoformat(),
+            "tension": round(float(total / count), 2),
+            "message_count": int(count),
+        }
+        for key, total, count in zip(unique.tolist(), sums, counts, strict=True)
+    ]
+
+
+def _top_k(values: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest values among candidates, highest first
+
+    Eşitlikte önceki mesaj önce gelir (stabil sıralama ile aynı sonuç).
+    """
+    if len(candidates) > k:
+        selected = values[candidates]
+        kth = np.partition(selected, len(selected) - k)[len(selected) - k]
+        above = candidates[selected > kth]
+        ties = candidates[selected == kth][: k - len(above)]
+        candidates = np.concatenate([above, ties])
+    order = np.lexsort((candidates, -values[candidates]))
+    return candidates[order]
+
 
 class ConversationHeatmap:
     """Conversation tension heatmap analyzer"""
@@ -47,15 +239,33 @@ class ConversationHeatmap:
         "😡", "🤬", "😤", "💢", "😠",
     ]
 
-    def __init__(self):
-        pass
+    NEGATIVE_EMOJIS = ["😡", "🤬", "😤", "💢", "😠", "😔", "😢", "😭"]
 
-    def analyze_heatmap(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+    # Kritik an eşiği ve döndürülen en yüksek an sayısı
+    PEAK_THRESHOLD = 70
+    PEAK_LIMIT = 5
+
+    def __init__(self):
+        self._topics = list(self.SENSITIVE_TOPICS)
+        self._topic_weights = np.array(
+            [self.SENSITIVE_TOPICS[t]["weight"] for t in self._topics], dtype=float
+        )
+        # Konu başına tek regex: any(keyword in content) ile aynı sonuç, tek taramada
+        self._topic_patterns = [
+            re.compile("|".join(map(re.escape, self.SENSITIVE_TOPICS[t]["keywords"])))
+            for t in self._topics
+        ]
+
+    @time_operation("heatmap.analyze")
+    @traced("heatmap")
+    def analyze_heatmap(
+        self, messages: Union[list[dict[str, Any]], ConversationTable]
+    ) -> dict[str, Any]:
         """
         Konuşmanın tansiyon haritasını oluştur
 
         Args:
-            messages: Parsed message list
+            messages: Parsed message list or ConversationTable
 
         Returns:
             Heatmap data with hourly tension, topic-based tension, peak moments
@@ -63,17 +273,27 @@ class ConversationHeatmap:
         if not messages:
             return self._empty_heatmap()
 
+        # Mesaj başına özellikler tek geçişte; tüm görünümler bu tablodan toplanır
+        features = self.build_feature_table(messages)
+
         # Saatlik tansiyon
-        hourly_tension = self._calculate_hourly_tension(messages)
+        hourly_tension = self._calculate_hourly_tension(features)
 
         # Konu bazlı tansiyon
-        topic_tension = self._calculate_topic_tension(messages)
+        topic_tension = self._calculate_topic_tension(features)
 
         # Kritik anlar (en yüksek tansiyon)
-        peak_moments = self._find_peak_moments(messages)
+        peak_moments = self._find_peak_moments(messages, features)
 
         # Genel tansiyon trendi
-        tension_trend = self._calculate_tension_trend(messages)
+        tension_trend = self._calculate_tension_trend(features)
+
+        # Haftanın günü x saat, günlük ve haftalık görünümler (epoch dizisinden)
+        timeline = TensionTimeline.from_features(features)
+        if timeline:
+            daily_tension, weekly_tension = timeline.daily_rows(), timeline.weekly_rows()
+        else:
+            daily_tension, weekly_tension = self._sparse_day_week_rows(features)
 
         return {
             "hourly_tension": hourly_tension,
@@ -81,129 +301,180 @@ class ConversationHeatmap:
             "peak_moments": peak_moments,
             "tension_trend": tension_trend,
             "overall_tension_score": self._calculate_overall_tension(hourly_tension),
+            "weekday_hour_tension": self._calculate_weekday_hour_tension(features),
+            "daily_tension": daily_tension,
+            "weekly_tension": weekly_tension,
+            "timeline": timeline.to_dict() if timeline else None,
         }
 
-    def _calculate_hourly_tension(self, messages: list[dict]) -> list[dict]:
-        """Saatlik tansiyon hesapla"""
-        hourly_data = defaultdict(lambda: {"count": 0, "tension_sum": 0})
-
-        for msg in messages:
-            content = msg.get("content", "").lower()
-            timestamp = msg.get("timestamp")
+    def build_feature_table(
+        self, messages: Union[list[dict[str, Any]], ConversationTable]
+    ) -> MessageFeatures:
+        """Her mesaj için tansiyon, saat, haftanın günü ve konu eşleşmelerini bir kez hesapla"""
+        n = len(messages)
+        if isinstance(messages, ConversationTable):
+            # Epoch ve küçük harfli içerik tabloda hazır; yeniden parse/lower yok
+            contents = messages.contents()
+            lowered_contents = messages.lowered_contents()
+            epoch = messages.epoch_seconds()
+            simple_hour = np.full(n, -1, dtype=np.int8)
+            for i, raw in messages.raw_timestamps.items():
+                extracted = self._extract_hour(raw)
+                if extracted is not None:
+                    simple_hour[i] = extracted
+        else:
+            contents = [msg.get("content", "") or "" for msg in messages]
+            lowered_contents = [content.lower() for content in contents]
+            epoch, simple_hour = self._timestamp_columns([msg.get("timestamp") for msg in messages])
+
+        tension = np.zeros(n, dtype=float)
+        topic_hits = np.zeros((n, len(self._topics)), dtype=bool)
+        for i, (content, lowered) in enumerate(zip(contents, lowered_contents, strict=True)):
+            tension[i] = self._calculate_message_tension(content, lowered)
+            for j, pattern in enumerate(self._topic_patterns):
+                if pattern.search(lowered):
+                    topic_hits[i, j] = True
+
+        # Pencere dışı damgalar tarihsiz sayılır (timeline boyutu istemciye bağlı kalmaz)
+        epoch = np.where((epoch >= MIN_EPOCH_SECONDS) & (epoch < MAX_EPOCH_SECONDS), epoch, np.nan)
+
+        # Saat ve haftanın günü epoch dizisinden tek seferde türetilir
+        dated = ~np.isnan(epoch)
+        seconds_of_day = np.mod(epoch, SECONDS_PER_DAY, where=dated, out=np.zeros(n))
+        days = np.floor_divide(epoch, SECONDS_PER_DAY, where=dated, out=np.zeros(n))
+        hour = np.where(dated, seconds_of_day // 3600, simple_hour).astype(np.int8)
+        weekday = np.where(dated, (days + 3) % 7, -1).astype(np.int8)
+
+        return MessageFeatures(
+            tension=tension, epoch=epoch, hour=hour, weekday=weekday, topic_hits=topic_hits
+        )
+
+    def _timestamp_columns(self, timestamps: list[Any]) -> tuple[np.ndarray, np.ndarray]:
+        """Epoch sütunu + yalnızca saat bilinen ("14:30") mesajlar için saat sütunu"""
+        epoch = np.full(len(timestamps), np.nan)
+        simple_hour = np.full(len(timestamps), -1, dtype=np.int8)
+        # Sohbetlerde aynı dakika damgası çok tekrarlanır; her biri bir kez parse edilir
+        parsed: dict[Any, float] = {}
+
+        for i, timestamp in enumerate(timestamps):
+            # İstemci JSON'u liste/sözlük gönderebilir: önbellek yalnızca string anahtarlar
+            cacheable = isinstance(timestamp, str)
+            seconds = parsed.get(timestamp) if cacheable else None
+            if seconds is None:
+                seconds = self._to_epoch(timestamp)
+                if cacheable:
+                    parsed[timestamp] = seconds
+            if math.isnan(seconds):
+                extracted = self._extract_hour(timestamp)
+                if extracted is not None:
+                    simple_hour[i] = extracted
+            else:
+                epoch[i] = seconds
+
+        return epoch, simple_hour
+
+    def _sparse_day_week_rows(self, features: MessageFeatures) -> tuple[list[dict], list[dict]]:
+        """Timeline çok uzunsa (veya yoksa) günlük/haftalık satırlar seyrek hesaplanır"""
+        dated = ~np.isnan(features.epoch)
+        if not dated.any():
+            return [], []
+        days = (features.epoch[dated] // SECONDS_PER_DAY).astype(np.int64)
+        tension = features.tension[dated]
+        return (
+            _sparse_rows(days, tension, "date"),
+            _sparse_rows(_week_start_day(days), tension, "week_start"),
+        )
+
+    def _calculate_weekday_hour_tension(self, features: MessageFeatures) -> dict:
+        """Haftanın günü (0 = Pazartesi) x saat ortalama tansiyon matrisi (7 x 24)"""
+        valid = (features.weekday >= 0) & (features.hour >= 0)
+        cells = features.weekday[valid].astype(np.intp) * 24 + features.hour[valid]
+        counts = np.bincount(cells, minlength=7 * 24)
+        sums = np.bincount(cells, weights=features.tension[valid], minlength=7 * 24)
+        averages = np.divide(sums, counts, out=np.zeros(7 * 24), where=counts > 0)
 
-            # Timestamp'ten saat çıkar
-            hour = self._extract_hour(timestamp)
-            if hour is None:
-                continue
+        return {
+            "tension": np.round(averages, 2).reshape(7, 24).tolist(),
+            "message_count": counts.reshape(7, 24).tolist(),
+        }
 
-            # Mesajın tansiyon skoru
-            tension_score = self._calculate_message_tension(content)
+    def _calculate_hourly_tension(self, features: MessageFeatures) -> list[dict]:
+        """Saatlik tansiyon hesapla"""
+        valid = features.hour >= 0
+        hours = features.hour[valid].astype(np.intp)
+        counts = np.bincount(hours, minlength=24)
+        sums = np.bincount(hours, weights=features.tension[valid], minlength=24)
+        averages = np.divide(sums, counts, out=np.zeros(24), where=counts > 0)
+
+        return [
+            {
+                "hour": hour,
+                "tension": round(float(averages[hour]), 2),
+                "message_count": int(counts[hour]),
+            }
+            for hour in range(24)
+        ]
 
-            hourly_data[hour]["count"] += 1
-            hourly_data[hour]["tension_sum"] += tension_score
+    def _calculate_topic_tension(self, features: MessageFeatures) -> list[dict]:
+        """Konu bazlı tansiyon hesapla"""
+        hits = features.topic_hits
+        counts = hits.sum(axis=0)
+        sums = (features.tension @ hits) * self._topic_weights
+        # Eşit tansiyonda konu ilk geçtiği mesaja göre sıralanır
+        first_seen = np.argmax(hits, axis=0)
 
-        # Saatlik ortalama hesapla
         result = []
-        for hour in range(24):
-            if hour in hourly_data:
-                avg_tension = hourly_data[hour]["tension_sum"] / hourly_data[hour]["count"]
-            else:
-                avg_tension = 0
-
+        for j in sorted(np.flatnonzero(counts), key=lambda j: first_seen[j]):
+            avg_tension = float(sums[j] / counts[j])
             result.append({
-                "hour": hour,
+                "topic": self._topics[j],
                 "tension": round(avg_tension, 2),
-                "message_count": hourly_data[hour]["count"],
+                "mention_count": int(counts[j]),
+                "risk_level": self._get_risk_level(avg_tension),
             })
 
-        return result
-
-    def _calculate_topic_tension(self, messages: list[dict]) -> list[dict]:
-        """Konu bazlı tansiyon hesapla"""
-        topic_scores = defaultdict(lambda: {"count": 0, "tension_sum": 0})
-
-        for msg in messages:
-            content = msg.get("content", "").lower()
-
-            # Her konu için kontrol et
-            for topic, data in self.SENSITIVE_TOPICS.items():
-                # Konu ile ilgili keyword var mı?
-                if any(keyword in content for keyword in data["keywords"]):
-                    tension = self._calculate_message_tension(content)
-                    weighted_tension = tension * data["weight"]
-
-                    topic_scores[topic]["count"] += 1
-                    topic_scores[topic]["tension_sum"] += weighted_tension
-
-        # Sonuçları formatla
-        result = []
-        for topic, scores in topic_scores.items():
-            if scores["count"] > 0:
-                avg_tension = scores["tension_sum"] / scores["count"]
-                result.append({
-                    "topic": topic,
-                    "tension": round(avg_tension, 2),
-                    "mention_count": scores["count"],
-                    "risk_level": self._get_risk_level(avg_tension),
-                })
-
         # En yüksek tansiyondan düşüğe sırala
         result.sort(key=lambda x: x["tension"], reverse=True)
 
         return result
 
-    def _find_peak_moments(self, messages: list[dict]) -> list[dict]:
-        """En yüksek tansiyonlu anları bul"""
+    def _find_peak_moments(self, messages: list[dict], features: MessageFeatures) -> list[dict]:
+        """En yüksek tansiyonlu anları bul (top-k, tam sıralama yok)"""
+        candidates = np.flatnonzero(features.tension > self.PEAK_THRESHOLD)
+        peaks = _top_k(features.tension, candidates, self.PEAK_LIMIT)
+
         peak_moments = []
+        for i in peaks:
+            msg = messages[i]
+            # Bağlam için önceki ve sonraki mesajları al
+            context_messages = messages[max(0, i - 2) : min(len(messages), i + 3)]
+
+            peak_moments.append({
+                "timestamp": msg.get("timestamp"),
+                "sender": msg.get("sender"),
+                "content_preview": (msg.get("content", "") or "").lower()[:100],
+                "tension_score": round(float(features.tension[i]), 2),
+                "context": [
+                    {
+                        "sender": m.get("sender"),
+                        "content": m.get("content", "")[:80],
+                    }
+                    for m in context_messages
+                ],
+            })
 
-        for i, msg in enumerate(messages):
-            content = msg.get("content", "").lower()
-            tension = self._calculate_message_tension(content)
-
-            # Yüksek tansiyon (>70)
-            if tension > 70:
-                # Bağlam için önceki ve sonraki mesajları al
-                context_start = max(0, i - 2)
-                context_end = min(len(messages), i + 3)
-                context_messages = messages[context_start:context_end]
-
-                peak_moments.append({
-                    "timestamp": msg.get("timestamp"),
-                    "sender": msg.get("sender"),
-                    "content_preview": content[:100],
-                    "tension_score": round(tension, 2),
-                    "context": [
-                        {
-                            "sender": m.get("sender"),
-                            "content": m.get("content", "")[:80],
-                        }
-                        for m in context_messages
-                    ],
-                })
-
-        # En yüksek 5 anı döndür
-        peak_moments.sort(key=lambda x: x["tension_score"], reverse=True)
-        return peak_moments[:5]
-
-    def _calculate_tension_trend(self, messages: list[dict]) -> str:
+        return peak_moments
+
+    def _calculate_tension_trend(self, features: MessageFeatures) -> str:
         """Tansiyon trendi (artıyor/azalıyor/stabil)"""
-        if len(messages) < 10:
+        n = len(features.tension)
+        if n < 10:
             return "yetersiz_veri"
 
         # İlk ve son %30'luk kısmı karşılaştır
-        chunk_size = max(1, len(messages) // 3)
-        first_chunk = messages[:chunk_size]
-        last_chunk = messages[-chunk_size:]
-
-        first_avg = sum(
-            self._calculate_message_tension(m.get("content", ""))
-            for m in first_chunk
-        ) / len(first_chunk)
-
-        last_avg = sum(
-            self._calculate_message_tension(m.get("content", ""))
-            for m in last_chunk
-        ) / len(last_chunk)
+        chunk_size = max(1, n // 3)
+        first_avg = features.tension[:chunk_size].mean()
+        last_avg = features.tension[-chunk_size:].mean()
 
         diff = last_avg - first_avg
 
@@ -214,13 +485,19 @@ class ConversationHeatmap:
         else:
             return "stabil"
 
-    def _calculate_message_tension(self, content: str) -> float:
-        """Tek bir mesajın tansiyon skorunu hesapla"""
+    def _calculate_message_tension(self, content: str, lowered: Optional[str] = None) -> float:
+        """
+        Tek bir mesajın tansiyon skorunu hesapla
+
+        Göstergeler küçük harfe çevrilmiş metinde, bağırma (büyük harf) orijinal metinde aranır.
+        """
+        if lowered is None:
+            lowered = content.lower()
         tension = 0
 
         # Gerginlik göstergeleri
         for indicator in self.TENSION_INDICATORS:
-            if indicator in content:
+            if indicator in lowered:
                 tension += 15
 
         # Büyük harf kullanımı (bağırma)
@@ -228,15 +505,14 @@ class ConversationHeatmap:
             tension += 25
 
         # Ünlem işareti
-        tension += content.count("!") * 5
+        tension += lowered.count("!") * 5
 
         # Soru işareti (çok fazla soru = kuşku)
-        tension += min(content.count("?") * 3, 15)
+        tension += min(lowered.count("?") * 3, 15)
 
         # Negatif emoji
-        negative_emojis = ["😡", "🤬", "😤", "💢", "😠", "😔", "😢", "😭"]
-        for emoji in negative_emojis:
-            if emoji in content:
+        for emoji in self.NEGATIVE_EMOJIS:
+            if emoji in lowered:
                 tension += 20
 
         # 0-100 arasına normalize et
@@ -255,8 +531,36 @@ class ConversationHeatmap:
 
         return round(total_tension / active_hours)
 
+    def _to_epoch(self, timestamp: Any) -> float:
+        """
+        Wall-clock seconds since 1970 (NaN when unknown)
+
+        Sayısal değerler Unix zamanı (UTC) kabul edilir; saniye olarak pencere
+        dışında kalıp milisaniye olarak içinde kalanlar (JS Date.now()) bölünür.
+        Saat dilimli ISO damgalarında mesajın kendi yerel saati korunur; böylece
+        saat/gün görünümleri kullanıcının gördüğü saatle aynı olur.
+        """
+        if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+            seconds = float(timestamp)
+            if seconds >= MAX_EPOCH_SECONDS and seconds / 1000 < MAX_EPOCH_SECONDS:
+                return seconds / 1000
+            return seconds
+        dt = self._parse_timestamp(timestamp)
+        if dt is None:
+            return math.nan
+        return (dt.replace(tzinfo=None) - _EPOCH).total_seconds()
+
+    def _parse_timestamp(self, timestamp: Optional[str]) -> Optional[datetime]:
+        """Parser çıktısı ("YYYY-MM-DD HH:MM") veya ISO timestamp"""
+        if not timestamp:
+            return None
+        try:
+            return datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            return None
+
     def _extract_hour(self, timestamp: str) -> int | None:
-        """Timestamp'ten saat çıkar"""
+        """Timestamp'ten saat çıkar (0-23 dışı: bilinmiyor)"""
         if not timestamp:
             return None
 
@@ -265,15 +569,16 @@ class ConversationHeatmap:
             if "T" in timestamp:
                 time_part = timestamp.split("T")[1]
                 hour = int(time_part.split(":")[0])
-                return hour
             # Simple format: 14:30
             elif ":" in timestamp:
                 hour = int(timestamp.split(":")[0])
-                return hour
+            else:
+                return None
         except Exception:
-            pass
+            return None
 
-        return None
+        # "24:00" / "300:00" int8 saat sütununa ve 24'lük görünümlere sığmaz
+        return hour if 0 <= hour < 24 else None
 
     def _get_risk_level(self, tension: float) -> str:
         """Tansiyon skorundan risk seviyesi"""
@@ -292,6 +597,13 @@ class ConversationHeatmap:
             "peak_moments": [],
             "tension_trend": "yetersiz_veri",
             "overall_tension_score": 0,
+            "weekday_hour_tension": {
+                "tension": [[0] * 24 for _ in range(7)],
+                "message_count": [[0] * 24 for _ in range(7)],
+            },
+            "daily_tension": [],
+            "weekly_tension": [],
+            "timeline": None,
         }
 
 
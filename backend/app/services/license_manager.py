@@ -11,6 +11,7 @@ from typing import Any
 from sqlalchemy.orm import Session
 
 from app.models.database import User
+from app.services.principal_cache import principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +83,7 @@ class LicenseManager:
             # user.license_key = license_key
 
             db.commit()
+            principal_cache.invalidate_user(user_id)
             return True
 
         except Exception as e:
@@ -0,0 +1,340 @@
+"""Mock LLM provider - offline load and latency testing
+
+AI_PROVIDER=mock (veya POST /api/system/ai-provider {"provider": "mock"}) ile
+tüm LLM yolları (_call_llm, _call_llm_structured, chat_with_coach, vision,
+audio) API key veya Ollama olmadan çalışır. Yanıtlar şemaya uygun sabit
+içeriklerdir (InsightsResponse, RecommendationsResponse, Gottman raporu).
+
+Gerçek bir sağlayıcıyı taklit etmek için:
+
+  - gecikme: log-normal dağılım (medyan MOCK_LLM_LATENCY_MS, yayılım MOCK_LLM_LATENCY_SIGMA)
+  - hata oranı: MOCK_LLM_ERROR_RATE oranında 500 benzeri hata
+  - 429: MOCK_LLM_RATE_LIMIT_RATE oranında rate limit hatası (status_code=429)
+  - streaming: ilk token gecikmeden sonra, token başına MOCK_LLM_STREAM_CHUNK_MS
+"""
+
+import json
+import random
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, Optional
+
+from app.core.config import settings
+
+# Yaklaşık token uzunluğu (ai_service._estimate_tokens ile aynı: 1 token ≈ 4 karakter)
+CHARS_PER_TOKEN = 4
+
+
+class MockLLMError(Exception):
+    """Injected provider failure (HTTP 500 equivalent)"""
+
+    status_code = 500
+
+
+class MockRateLimitError(MockLLMError):
+    """Injected rate limit (HTTP 429 equivalent)"""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__(f"Rate limit exceeded (mock), retry after {retry_after:g}s")
+        self.retry_after = retry_after
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Sabit yanıtlar
+# ─────────────────────────────────────────────────────────────────────────────
+
+INSIGHTS = {
+    "insights": [
+        {
+            "category": "Güçlü Yön",
+            "title": "Sıcak ve Destekleyici Dil",
+            "description": "Mesajlarda sevgi ve teşekkür ifadeleri sık geçiyor. Bu, "
+            "zor anlarda bile bağın güçlü kaldığını gösteriyor.",
+            "icon": "💝",
+        },
+        {
+            "category": "Gelişim Alanı",
+            "title": "Gecikmeli Yanıtlar",
+            "description": "Bazı önemli sorular saatlerce yanıtsız kalıyor. Kısa bir "
+            "'şu an müsait değilim' mesajı belirsizliği azaltır.",
+            "icon": "⏳",
+        },
+        {
+            "category": "Dikkat Noktası",
+            "title": "Genelleyici İfadeler",
+            "description": "Tartışmalarda 'hep' ve 'asla' gibi kelimeler öne çıkıyor. "
+            "Somut olaylardan bahsetmek savunmacılığı azaltır.",
+            "icon": "⚠️",
+        },
+    ]
+}
+
+RECOMMENDATIONS = {
+    "recommendations": [
+        {
+            "category": "İletişim",
+            "title": "Günlük Check-in Rutini",
+            "description": "Her akşam 10 dakika telefonlar kapalı konuşun. Gün içinde "
+            "sizi en çok ne yordu, birbirinize sorun ve sadece dinleyin.",
+            "difficulty": "Düşük",
+        },
+        {
+            "category": "Çatışma Yönetimi",
+            "title": "Mola Kuralı",
+            "description": "Gerginlik yükseldiğinde 20 dakika ara verin. Sakinleştikten "
+            "sonra 'ben' diliyle konuya geri dönün.",
+            "difficulty": "Orta",
+        },
+        {
+            "category": "Bağ Güçlendirme",
+            "title": "Haftalık Ortak Plan",
+            "description": "Haftada bir akşamı yalnızca ikinize ayırın. Planı sırayla "
+            "siz ve partneriniz yapsın, sürprizlere yer bırakın.",
+            "difficulty": "Düşük",
+        },
+    ]
+}
+
+
+def _component(score: int, status: str, explanation: str) -> dict[str, Any]:
+    return {"skor": score, "durum": status, "aciklama": explanation}
+
+
+# Hem app.schemas.analysis hem app.schemas.ai_responses RelationshipReport ile uyumlu
+# (meta_data'yı AIService._parse_relationship_report ekler)
+GOTTMAN_REPORT = {
+    "genel_karne": {
+        "iliskki_sagligi": 68,
+        "overall_score": 6.8,
+        "baskin_dinamik": "Destekleyici ama çatışmada savunmacı",
+        "risk_seviyesi": "Orta",
+        "love_language_guess": "Kaliteli Zaman",
+        "red_flags": ["Tartışmalarda genelleme"],
+        "positive_traits": ["Sık sevgi ifadesi", "Ortak plan yapma isteği"],
+    },
+    "gottman_bilesenleri": {
+        "sevgi_haritalari": _component(70, "İyi", "Birbirinizin gününü merak ediyorsunuz."),
+        "hayranlik_paylasimi": _component(75, "İyi", "Takdir ifadeleri düzenli."),
+        "yakinlasma_cabalari": _component(62, "Orta", "Bazı yakınlaşma çağrıları yanıtsız."),
+        "olumlu_perspektif": _component(66, "Orta", "Olumlu ton baskın, stres anları hariç."),
+        "catisma_yonetimi": _component(48, "Geliştirilmeli", "Eleştiri ve savunma döngüsü var."),
+        "hayat_hayalleri": _component(58, "Orta", "Gelecek planları az konuşuluyor."),
+        "ortak_anlam": _component(64, "Orta", "Ortak ritüeller oluşmaya başlamış."),
+    },
+    "duygusal_analiz": {
+        "iletisim_tonu": "Destekleyici",
+        "toksisite_seviyesi": 22,
+        "yakinlik": 71,
+        "duygu_ifadesi": "Açık",
+        "empati_puani": 67,
+    },
+    "tespit_edilen_kaliplar": [
+        {
+            "kalip": "Genelleme",
+            "ornekler": ["hep böyle yapıyorsun"],
+            "frekans": "Orta",
+            "etki": "Negatif",
+        },
+        {
+            "kalip": "Takdir",
+            "ornekler": ["teşekkür ederim canım"],
+            "frekans": "Yüksek",
+            "etki": "Pozitif",
+        },
+    ],
+    "aksiyon_onerileri": [
+        {
+            "baslik": "Yumuşak Başlangıç",
+            "ornek_cumle": "Bugün biraz yalnız hissettim, akşam konuşabilir miyiz?",
+            "oncelik": "Yüksek",
+            "kategori": "İletişim",
+        },
+        {
+            "baslik": "Takdiri Sürdürün",
+            "ornek_cumle": "Dün bana yardım etmen çok iyi geldi, teşekkür ederim.",
+            "oncelik": "Orta",
+            "kategori": "Bağ",
+        },
+    ],
+    "ozel_notlar": ["Mock sağlayıcı yanıtı (yük testi)"],
+}
+
+CONFLICT_ACTION = {
+    "action": "Mola Verin",
+    "reason": "Son mesajlarda gerginlik hızla yükseliyor.",
+    "how": "20 dakika ara verin, sonra 'ben' diliyle tek bir konuya dönün.",
+    "priority": "high",
+}
+
+REPLY_SUGGESTIONS = (
+    "1. Bu konuyu sakin bir anda birlikte konuşalım, ikimiz için de önemli.\n"
+    "2. Kırıldığını anlıyorum, ne hissettiğini bana anlatır mısın?\n"
+    "3. Bu şekilde konuşulmasını istemiyorum, sakinleşince devam edelim."
+)
+
+SUMMARY = (
+    "Konuşmada sevgi ve takdir ifadeleri ağırlıkta; gerginlik çoğunlukla geç yanıtlar ve "
+    "plan değişiklikleri etrafında yükseliyor. Taraflar çatışma sonrası genellikle "
+    "uzlaşmaya dönüyor, ancak genelleyici ifadeler savunmacılığı artırıyor. "
+)
+
+COACH_REPLY = (
+    "Anlattıkların için teşekkür ederim 💬 Bu durumda önce kendi duygunu 'ben' diliyle "
+    "ifade etmeni öneririm. Örneğin: 'Plan değişince kendimi önemsenmemiş hissettim.' "
+    "Sonra partnerinin bakış açısını sormak konuşmayı yumuşatır."
+)
+
+VISION_RESULT = {
+    "cikarilan_metin": "Ahmet: Akşam geliyor musun?\nAyşe: Biraz gecikeceğim, üzgünüm ❤️",
+    "mesaj_sayisi": 2,
+    "katilimcilar": ["Ahmet", "Ayşe"],
+    "duygusal_analiz": {
+        "emoji_kullanimi": "Az, sevgi odaklı",
+        "ton": "Sakin",
+        "dikkat_ceken_noktalar": ["Özür ve sevgi ifadesi birlikte kullanılmış"],
+    },
+    "iletisim_kaliplari": {
+        "mesaj_dengesi": "Dengeli",
+        "yanit_hizi": "Hızlı",
+        "mesaj_uzunlugu": "Kısa",
+    },
+    "oneriler": ["Gecikmelerde tahmini varış saatini paylaşmak belirsizliği azaltır"],
+}
+
+TRANSCRIPT = (
+    "Ahmet: Bugün toplantı uzadı, biraz geç kalacağım.\n"
+    "Ayşe: Tamam canım, yemeği birlikte hazırlarız.\n"
+    "Ahmet: Teşekkür ederim, seni seviyorum."
+)
+
+# (prompt içinde geçen ifade, yanıt) — ilk eşleşen kullanılır
+_TEXT_ROUTES = (
+    ("Gottman", json.dumps(GOTTMAN_REPORT, ensure_ascii=False)),
+    ('"action"', json.dumps(CONFLICT_ACTION, ensure_ascii=False)),
+    ("cevap seçeneği", REPLY_SUGGESTIONS),
+)
+
+_STRUCTURED_RESPONSES = {
+    "InsightsResponse": INSIGHTS,
+    "RecommendationsResponse": RECOMMENDATIONS,
+    "RelationshipReport": GOTTMAN_REPORT,
+}
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0]
+
+
+class MockLLMClient:
+    """Canned responses with injected latency, errors, 429s and token streaming"""
+
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        stream_chunk_ms: float = 20.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.stream_chunk_ms = stream_chunk_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {"calls": 0, "errors": 0, "rate_limited": 0}
+
+    @classmethod
+    def from_settings(cls, **overrides: Any) -> "MockLLMClient":
+        options = {
+            "latency_ms": settings.MOCK_LLM_LATENCY_MS,
+            "latency_sigma": settings.MOCK_LLM_LATENCY_SIGMA,
+            "error_rate": settings.MOCK_LLM_ERROR_RATE,
+            "rate_limit_rate": settings.MOCK_LLM_RATE_LIMIT_RATE,
+            "stream_chunk_ms": settings.MOCK_LLM_STREAM_CHUNK_MS,
+            "seed": settings.MOCK_LLM_SEED,
+        }
+        options.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**options)
+
+    # ── Provider API ─────────────────────────────────────────────────────
+
+    def complete(self, prompt: str, max_tokens: int) -> str:
+        """Text completion; JSON for prompts that ask for the Gottman report or an action"""
+        self._simulate_call()
+        for marker, response in _TEXT_ROUTES:
+            if marker in prompt:
+                return response
+        return _truncate(SUMMARY * 3, max_tokens).strip()
+
+    def complete_structured(self, response_model: type) -> str:
+        """JSON matching response_model (InsightsResponse, RecommendationsResponse, report)"""
+        self._simulate_call()
+        data = _STRUCTURED_RESPONSES.get(response_model.__name__)
+        if data is None:
+            raise MockLLMError(f"No canned response for {response_model.__name__}")
+        return json.dumps(data, ensure_ascii=False)
+
+    def stream(self, prompt: str, max_tokens: int) -> Iterator[str]:  # noqa: ARG002
+        """Token chunks of the coach reply; latency applies before the first token"""
+        self._simulate_call()
+        text = _truncate(COACH_REPLY, max_tokens)
+        for i in range(0, len(text), CHARS_PER_TOKEN):
+            if i and self.stream_chunk_ms > 0:
+                time.sleep(self.stream_chunk_ms / 1000)
+            yield text[i : i + CHARS_PER_TOKEN]
+
+    def analyze_image(self, image_data: bytes) -> str:  # noqa: ARG002
+        self._simulate_call()
+        return json.dumps(VISION_RESULT, ensure_ascii=False)
+
+    def transcribe(self, audio_data: bytes) -> str:  # noqa: ARG002
+        self._simulate_call()
+        return TRANSCRIPT
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "latency_ms": self.latency_ms,
+            "latency_sigma": self.latency_sigma,
+            "error_rate": self.error_rate,
+            "rate_limit_rate": self.rate_limit_rate,
+            "stream_chunk_ms": self.stream_chunk_ms,
+        }
+
+    # ── Simulation ───────────────────────────────────────────────────────
+
+    def _simulate_call(self) -> None:
+        with self._lock:
+            self._counts["calls"] += 1
+            latency = self._sample_latency()
+            roll = self._rng.random()
+
+        if latency > 0:
+            time.sleep(latency)
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self._counts["rate_limited"] += 1
+            raise MockRateLimitError()
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self._counts["errors"] += 1
+            raise MockLLMError("Internal server error (mock)")
+
+    def _sample_latency(self) -> float:
+        """Seconds; log-normal around the configured median"""
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return self._rng.lognormvariate(0.0, self.latency_sigma) * self.latency_ms / 1000
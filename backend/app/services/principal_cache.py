@@ -0,0 +1,153 @@
+"""Principal cache - authenticated user snapshots keyed by token digest
+
+Her authenticated istekte jwt.decode + users sorgusu yapmamak için, çözülmüş
+token claim'leri ve hafif bir kullanıcı özeti (Principal) kısa TTL ile süreç
+içinde tutulur. Kullanıcı güncellemesi, Pro durumu değişikliği (Stripe
+webhook, lisans) ve logout kullanıcının tüm kayıtlarını düşürür.
+
+Cache süreç içidir: birden fazla worker varsa diğer worker'lar değişikliği
+en geç TTL sonunda görür.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Lightweight snapshot of the authenticated user"""
+
+    id: int
+    email: str
+    full_name: Optional[str]
+    is_pro: bool
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_pro=bool(user.is_pro),
+            is_active=bool(user.is_active),
+        )
+
+
+@dataclass(frozen=True)
+class _Entry:
+    expires_at: float  # time.monotonic()
+    claims: dict[str, Any]
+    principal: Principal
+
+
+def token_digest(token: str) -> str:
+    """Raw tokens are never kept in memory as keys"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """TTL + LRU cache of token digest -> (claims, Principal)"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = (
+            settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self.max_entries = max_entries or settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # user_id -> token digests (invalidation)
+        self._by_user: dict[int, set[str]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Cached principal for a token, None on miss or expiry"""
+        if not self.enabled:
+            return None
+        digest = token_digest(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    self._remove(digest, entry)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry.principal
+
+    def put(self, token: str, claims: dict[str, Any], principal: Principal) -> Principal:
+        """Cache a verified token; never outlives the token's own exp claim"""
+        if not self.enabled:
+            return principal
+        ttl = self.ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            ttl = min(ttl, float(exp) - time.time())
+            if ttl <= 0:
+                return principal
+
+        digest = token_digest(token)
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None:
+                self._remove(digest, old)
+            self._entries[digest] = _Entry(time.monotonic() + ttl, claims, principal)
+            self._by_user.setdefault(principal.id, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                oldest, entry = self._entries.popitem(last=False)
+                self._unindex(oldest, entry)
+        return principal
+
+    def invalidate_user(self, user_id: int) -> int:
+        """Drop every cached token of a user; returns number of entries removed"""
+        with self._lock:
+            digests = self._by_user.pop(user_id, set())
+            for digest in digests:
+                self._entries.pop(digest, None)
+            return len(digests)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        """Cache durumu (metrics için)"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def _remove(self, digest: str, entry: _Entry) -> None:
+        """Caller holds self._lock"""
+        self._entries.pop(digest, None)
+        self._unindex(digest, entry)
+
+    def _unindex(self, digest: str, entry: _Entry) -> None:
+        digests = self._by_user.get(entry.principal.id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[entry.principal.id]
+
+
+# Singleton instance
+principal_cache = PrincipalCache()
@@ -12,6 +12,8 @@ Hibrit yaklaşım:
 import logging
 from typing import Any
 
+from app.core.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -380,6 +382,7 @@ class PsychologyService:
         self.attachment_analyzer = AttachmentStyleAnalyzer()
         self.love_language_inferrer = LoveLanguageInferrer()
 
+    @traced("psychology")
     def analyze(
         self,
         conversation_text: str,
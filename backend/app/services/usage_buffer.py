@@ -0,0 +1,325 @@
+"""Usage buffer service - write-behind batching for usage counters
+
+İstek başına sayaçlar (UsageTracking.count, APIKey.requests_count/last_used_at)
+hot path'te satır kilidi + commit yapmasın diye bellekte toplanır ve
+belirli aralıklarla / eşik aşıldığında toplu upsert ile yazılır.
+
+Limit kontrolü gereken kotalar (günlük analiz) UsageCounter ile senkron kalır;
+buradaki sayaçlar yalnızca ölçüm içindir.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import bindparam, case, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.performance import perf_monitor
+from app.models.database import APIKey, UsageTracking
+from app.services.usage_counter import period_bounds
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement (5 parameters each)
+UPSERT_CHUNK_SIZE = 150
+
+
+def _upsert_usage(db, rows: list[dict]) -> None:
+    """INSERT ... ON CONFLICT DO UPDATE count = count + excluded.count (PostgreSQL / SQLite)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        _update_or_insert_usage(db, rows)
+        return
+
+    # Multi-row VALUES: keep each statement under SQLite's bound parameter limit
+    for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = insert(UsageTracking).values(rows[i : i + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "resource_type", "period_start"],
+            set_={
+                "count": UsageTracking.count + stmt.excluded.count,
+                "updated_at": datetime.now(timezone.utc),
+            },
+        )
+        db.execute(stmt)
+
+
+def _update_or_insert_usage(db, rows: list[dict]) -> None:
+    """Portable fallback (ON CONFLICT yok): UPDATE, satır yoksa INSERT (UsageCounter gibi)"""
+    for row in rows:
+        # Second pass only runs when the INSERT lost a race with another writer
+        for attempt in range(2):
+            result = db.execute(
+                update(UsageTracking)
+                .where(
+                    UsageTracking.user_id == row["user_id"],
+                    UsageTracking.resource_type == row["resource_type"],
+                    UsageTracking.period_start == row["period_start"],
+                )
+                .values(
+                    count=UsageTracking.count + row["count"],
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+            if result.rowcount or attempt:
+                break
+            try:
+                with db.begin_nested():
+                    db.add(UsageTracking(**row))
+                break
+            except IntegrityError:
+                # Row already exists (uq_usage_tracking_user_resource_period)
+                pass
+
+
+def _update_api_keys(db, api_keys: dict[int, list]) -> None:
+    """requests_count += n, last_used_at = max(last_used_at, used_at) in one executemany"""
+    table = APIKey.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("key_id"))
+        .values(
+            requests_count=table.c.requests_count + bindparam("amount"),
+            last_used_at=case(
+                (table.c.last_used_at > bindparam("used_at"), table.c.last_used_at),
+                else_=bindparam("used_at"),
+            ),
+        )
+    )
+    # bind_arguments: routed sessions (SQLite profile) pick the writer for this UPDATE
+    db.connection(bind_arguments={"clause": stmt}).execute(
+        stmt,
+        [
+            {"key_id": key_id, "amount": count, "used_at": used_at}
+            for key_id, (count, used_at) in api_keys.items()
+        ],
+    )
+
+
+class UsageBuffer:
+    """Coalesces counter increments in memory and flushes them in batches"""
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        session_factory=SessionLocal,
+        max_retries: Optional[int] = None,
+    ):
+        self.flush_interval = flush_interval or settings.USAGE_FLUSH_INTERVAL_SECONDS
+        self.max_pending = max_pending or settings.USAGE_FLUSH_MAX_PENDING
+        self.session_factory = session_factory
+        # Consecutive failed batch flushes before falling back to per-row writes
+        self.max_retries = max_retries or settings.USAGE_FLUSH_MAX_RETRIES
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # (user_id, resource, period_start) -> count
+        self._usage: dict[tuple[int, str, datetime], int] = {}
+        # api_key_id -> [count, last_used_at]
+        self._api_keys: dict[int, list] = {}
+        # Monotonic time of the oldest increment not yet written
+        self._oldest_pending: Optional[float] = None
+
+        self.flushed_total = 0
+        self.flush_failures = 0
+        self.dropped_total = 0
+        self._consecutive_failures = 0
+        self.last_flush_at: Optional[datetime] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._usage) + len(self._api_keys)
+
+    def record_usage(
+        self, user_id: int, resource: str, amount: int = 1, when: Optional[datetime] = None
+    ) -> None:
+        """Kaynak kullanımını tamponla (commit yok)"""
+        when = when or datetime.now(timezone.utc)
+        period_start, _ = period_bounds(when.astimezone(timezone.utc).date())
+        key = (user_id, resource, period_start)
+
+        with self._lock:
+            self._usage[key] = self._usage.get(key, 0) + amount
+            self._mark_pending()
+
+    def record_api_key_use(self, api_key_id: int, when: Optional[datetime] = None) -> None:
+        """API key kullanımını tamponla (requests_count + last_used_at)"""
+        when = when or datetime.now(timezone.utc)
+
+        with self._lock:
+            entry = self._api_keys.get(api_key_id)
+            if entry is None:
+                self._api_keys[api_key_id] = [1, when]
+            else:
+                entry[0] += 1
+                entry[1] = max(entry[1], when)
+            self._mark_pending()
+
+    def _mark_pending(self) -> None:
+        """Caller holds self._lock"""
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        if self.pending >= self.max_pending:
+            # Flush on the background thread, never on the request path
+            self._wakeup.set()
+
+    def lag_seconds(self) -> float:
+        """Age of the oldest increment that is not yet in the database"""
+        oldest = self._oldest_pending
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    def stats(self) -> dict:
+        """Buffer durumu (metrics için)"""
+        return {
+            "pending": self.pending,
+            "lag_seconds": round(self.lag_seconds(), 3),
+            "flushed_total": self.flushed_total,
+            "flush_failures": self.flush_failures,
+            "dropped_total": self.dropped_total,
+            "last_flush_at": self.last_flush_at.isoformat() if self.last_flush_at else None,
+        }
+
+    def flush(self) -> int:
+        """Write buffered increments; returns number of rows touched"""
+        with self._flush_lock:
+            with self._lock:
+                usage, self._usage = self._usage, {}
+                api_keys, self._api_keys = self._api_keys, {}
+                oldest, self._oldest_pending = self._oldest_pending, None
+
+            if not usage and not api_keys:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                self._write(usage, api_keys)
+            except Exception as e:
+                self.flush_failures += 1
+                self._consecutive_failures += 1
+                if self._consecutive_failures < self.max_retries:
+                    logger.error(
+                        f"Usage buffer flush failed, keeping {len(usage) + len(api_keys)} "
+                        f"entries: {e}"
+                    )
+                    self._restore(usage, api_keys, oldest)
+                    return 0
+                # Tek bir bozuk satır tüm batch'i sonsuza dek bloklamasın
+                logger.error(
+                    f"Usage buffer flush failed {self._consecutive_failures} times, "
+                    f"writing rows one by one: {e}"
+                )
+                written = self._write_rows(usage, api_keys)
+            else:
+                written = len(usage) + len(api_keys)
+            self._consecutive_failures = 0
+
+            self.flushed_total += written
+            self.last_flush_at = datetime.now(timezone.utc)
+            perf_monitor.record("usage_buffer_flush", time.perf_counter() - start)
+            return written
+
+    def _write(self, usage: dict, api_keys: dict) -> None:
+        """One transaction for the given increments (rolls back on error)"""
+        db = None
+        try:
+            db = self.session_factory()
+            if usage:
+                _upsert_usage(
+                    db,
+                    [
+                        {
+                            "user_id": user_id,
+                            "resource_type": resource,
+                            "period_start": period_start,
+                            "period_end": period_bounds(period_start.date())[1],
+                            "count": count,
+                        }
+                        for (user_id, resource, period_start), count in usage.items()
+                    ],
+                )
+            if api_keys:
+                _update_api_keys(db, api_keys)
+            db.commit()
+        except Exception:
+            if db is not None:
+                db.rollback()
+            raise
+        finally:
+            if db is not None:
+                db.close()
+
+    def _write_rows(self, usage: dict, api_keys: dict) -> int:
+        """Per-row fallback: rows that still fail are logged and dropped"""
+        batches = [({key: count}, {}) for key, count in usage.items()]
+        batches += [({}, {key_id: entry}) for key_id, entry in api_keys.items()]
+
+        written = 0
+        for row_usage, row_api_keys in batches:
+            try:
+                self._write(row_usage, row_api_keys)
+                written += 1
+            except Exception as e:
+                self.dropped_total += 1
+                logger.error(f"Usage buffer dropped {row_usage or row_api_keys}: {e}")
+        return written
+
+    def _restore(self, usage: dict, api_keys: dict, oldest: Optional[float]) -> None:
+        """Merge a failed batch back so the next flush retries it"""
+        with self._lock:
+            for key, count in usage.items():
+                self._usage[key] = self._usage.get(key, 0) + count
+            for key_id, (count, used_at) in api_keys.items():
+                entry = self._api_keys.get(key_id)
+                if entry is None:
+                    self._api_keys[key_id] = [count, used_at]
+                else:
+                    entry[0] += count
+                    entry[1] = max(entry[1], used_at)
+            if oldest is not None:
+                current = self._oldest_pending
+                self._oldest_pending = oldest if current is None else min(oldest, current)
+
+    def start(self) -> None:
+        """Start the background flush thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="usage-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and flush what is left (shutdown)"""
+        if self._running:
+            self._running = False
+            self._wakeup.set()
+            if self._thread:
+                self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Usage buffer flush loop error: {e}")
+
+
+# Singleton instance
+usage_buffer = UsageBuffer()
@@ -0,0 +1,210 @@
+"""Usage counter service - atomic per-user daily quotas
+
+Ücretsiz plan limitleri (günlük analiz vb.) için tek atomik işlemle
+"artır ve kontrol et". Redis varsa Lua script ile INCR, yoksa
+UsageTracking tablosunda koşullu UPDATE kullanılır; COUNT(*) taraması yapılmaz.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.database import UsageTracking
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+# Resource types (UsageTracking.resource_type)
+RESOURCE_ANALYSIS = "analysis"
+RESOURCE_CHAT = "chat"
+RESOURCE_EXPORT = "export"
+
+# Redis keys outlive the day they count so late requests near midnight still see them
+REDIS_KEY_TTL_SECONDS = 2 * 24 * 3600
+
+# INCR, set expiry on first use, roll back and report when over the limit
+_CONSUME_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if count > tonumber(ARGV[1]) then
+    redis.call('DECR', KEYS[1])
+    return {0, count - 1}
+end
+return {1, count}
+"""
+
+
+def period_bounds(day: date) -> tuple[datetime, datetime]:
+    """UTC start/end of a daily period"""
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+class UsageCounter:
+    """Atomic increment-and-check counters per (user, resource, day)"""
+
+    def __init__(self):
+        self._consume_script = None
+
+    @property
+    def redis_client(self):
+        return cache_service.redis_client
+
+    def _redis_key(self, user_id: int, resource: str, day: date) -> str:
+        return f"usage:{resource}:{user_id}:{day.isoformat()}"
+
+    def try_consume(
+        self,
+        db: Session,
+        user_id: int,
+        resource: str,
+        limit: int,
+        day: Optional[date] = None,
+    ) -> tuple[bool, int]:
+        """
+        Kotadan bir birim düş (limit aşılmayacaksa)
+
+        Args:
+            db: Database session (Redis yoksa kullanılır)
+            user_id: User ID
+            resource: Resource type (RESOURCE_ANALYSIS, ...)
+            limit: Günlük maksimum
+            day: Period day (default: today, UTC)
+
+        Returns:
+            (allowed, count) - count is the usage after this call
+        """
+        day = day or datetime.now(timezone.utc).date()
+
+        if self.redis_client:
+            try:
+                return self._consume_redis(user_id, resource, limit, day)
+            except Exception as e:
+                logger.warning(f"Redis usage counter failed, falling back to database: {e}")
+
+        return self._consume_db(db, user_id, resource, limit, day)
+
+    def release(
+        self, db: Session, user_id: int, resource: str, day: Optional[date] = None
+    ) -> None:
+        """Give back one unit (e.g. the analysis failed after consuming quota)"""
+        day = day or datetime.now(timezone.utc).date()
+
+        if self.redis_client:
+            try:
+                key = self._redis_key(user_id, resource, day)
+                if self.redis_client.decr(key) < 0:
+                    self.redis_client.set(key, 0, ex=REDIS_KEY_TTL_SECONDS)
+                return
+            except Exception as e:
+                logger.warning(f"Redis usage release failed, falling back to database: {e}")
+
+        period_start, _ = period_bounds(day)
+        db.execute(
+            update(UsageTracking)
+            .where(
+                UsageTracking.user_id == user_id,
+                UsageTracking.resource_type == resource,
+                UsageTracking.period_start == period_start,
+                UsageTracking.count > 0,
+            )
+            .values(count=UsageTracking.count - 1)
+        )
+        db.commit()
+
+    def get_count(
+        self, db: Session, user_id: int, resource: str, day: Optional[date] = None
+    ) -> int:
+        """Current usage for a period (no side effects)"""
+        day = day or datetime.now(timezone.utc).date()
+
+        if self.redis_client:
+            try:
+                value = self.redis_client.get(self._redis_key(user_id, resource, day))
+                return int(value) if value else 0
+            except Exception as e:
+                logger.warning(f"Redis usage read failed, falling back to database: {e}")
+
+        return self._count_db(db, user_id, resource, day)
+
+    def _count_db(self, db: Session, user_id: int, resource: str, day: date) -> int:
+        period_start, _ = period_bounds(day)
+        row = (
+            db.query(UsageTracking.count)
+            .filter(
+                UsageTracking.user_id == user_id,
+                UsageTracking.resource_type == resource,
+                UsageTracking.period_start == period_start,
+            )
+            .first()
+        )
+        return row[0] if row else 0
+
+    def _consume_redis(
+        self, user_id: int, resource: str, limit: int, day: date
+    ) -> tuple[bool, int]:
+        if self._consume_script is None:
+            self._consume_script = self.redis_client.register_script(_CONSUME_SCRIPT)
+        allowed, count = self._consume_script(
+            keys=[self._redis_key(user_id, resource, day)],
+            args=[limit, REDIS_KEY_TTL_SECONDS],
+        )
+        return bool(allowed), int(count)
+
+    def _consume_db(
+        self, db: Session, user_id: int, resource: str, limit: int, day: date
+    ) -> tuple[bool, int]:
+        period_start, period_end = period_bounds(day)
+
+        # Second pass only runs when the INSERT lost a race with a concurrent request
+        for attempt in range(2):
+            # Conditional UPDATE is atomic: row lock + limit check in one statement
+            result = db.execute(
+                update(UsageTracking)
+                .where(
+                    UsageTracking.user_id == user_id,
+                    UsageTracking.resource_type == resource,
+                    UsageTracking.period_start == period_start,
+                    UsageTracking.count < limit,
+                )
+                .values(count=UsageTracking.count + 1)
+                .returning(UsageTracking.count)
+            )
+            row = result.first()
+            if row is not None:
+                db.commit()
+                return True, row[0]
+
+            if attempt or limit < 1:
+                break
+
+            # No row below the limit: either first use today or quota exhausted
+            try:
+                with db.begin_nested():
+                    db.add(
+                        UsageTracking(
+                            user_id=user_id,
+                            resource_type=resource,
+                            count=1,
+                            period_start=period_start,
+                            period_end=period_end,
+                        )
+                    )
+                db.commit()
+                return True, 1
+            except IntegrityError:
+                # Row already exists (uq_usage_tracking_user_resource_period)
+                pass
+
+        db.rollback()
+        return False, self._count_db(db, user_id, resource, day)
+
+
+# Singleton instance
+usage_counter = UsageCounter()
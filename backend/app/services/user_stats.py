@@ -0,0 +1,213 @@
+"""User stats rollup service
+
+/api/stats/user-stats için kullanıcı başına özet satırı (UserStats).
+Analiz ekleme/silme aynı transaction içinde satırı günceller; okuma
+tek bir primary-key sorgusudur. Satırı olmayan kullanıcılar için ilk
+okumada analizlerden yeniden hesaplanır (backfill ile aynı yol).
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.sqlite_profile import WRITER_OPTION
+from app.models.database import Analysis, UserStats
+
+logger = logging.getLogger(__name__)
+
+# Per-day buckets kept in the rollup (streak and weekly score never look further back)
+STATS_WINDOW_DAYS = 30
+WEEKLY_SCORE_DAYS = 7
+
+
+def _utc_date(value: Optional[datetime]) -> date:
+    """UTC calendar day of a timestamp (naive values are stored as UTC)"""
+    if value is None:
+        return datetime.now(timezone.utc).date()
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone.utc).date()
+
+
+def _bucket(value: list) -> tuple[float, int, int]:
+    """(score_sum, count, scored_count); eski 2 elemanlı kovalarda tüm analizler skorlu sayılır"""
+    score_sum, count = value[0], value[1]
+    return score_sum, count, value[2] if len(value) > 2 else count
+
+
+def _compute_streak(daily_scores: dict) -> tuple[int, Optional[date]]:
+    """Consecutive active days ending at the most recent active day"""
+    active = {
+        date.fromisoformat(day) for day, bucket in daily_scores.items() if _bucket(bucket)[1] > 0
+    }
+    if not active:
+        return 0, None
+
+    last = max(active)
+    streak = 0
+    check = last
+    while check in active:
+        streak += 1
+        check -= timedelta(days=1)
+    return streak, last
+
+
+def _trim(daily_scores: dict, today: date) -> dict:
+    cutoff = (today - timedelta(days=STATS_WINDOW_DAYS)).isoformat()
+    return {day: bucket for day, bucket in daily_scores.items() if day >= cutoff}
+
+
+class UserStatsService:
+    """Maintains and reads the per-user stats rollup"""
+
+    def record_analysis(
+        self,
+        db: Session,
+        user_id: int,
+        score: Optional[float],
+        created_at: Optional[datetime] = None,
+        delta: int = 1,
+    ) -> None:
+        """
+        Analiz eklendi (delta=1) / silindi (delta=-1): özeti güncelle
+
+        Commit yapmaz; çağıran analiz değişikliğiyle birlikte commit eder.
+        """
+        stats = self._get_for_update(db, user_id)
+        if stats is None:
+            # No rollup yet: rebuild after the caller's change is flushed
+            db.flush()
+            self.rebuild(db, user_id)
+            return
+
+        today = datetime.now(timezone.utc).date()
+        daily = dict(stats.daily_scores or {})
+        day = _utc_date(created_at)
+
+        if day.isoformat() in daily or delta > 0:
+            score_sum, count, scored = _bucket(daily.get(day.isoformat(), [0.0, 0, 0]))
+            count += delta
+            # NULL skorlar ortalamaya girmez (AVG gibi); seri için count yine artar
+            if score is not None:
+                score_sum += delta * score
+                scored += delta
+            if count > 0:
+                daily[day.isoformat()] = [score_sum, count, max(scored, 0)]
+            else:
+                daily.pop(day.isoformat(), None)
+
+        stats.total_analyses = max(0, (stats.total_analyses or 0) + delta)
+        stats.daily_scores = _trim(daily, today)
+        stats.current_streak, stats.last_active_date = _compute_streak(stats.daily_scores)
+        if delta > 0:
+            stats.last_activity_at = created_at or datetime.now(timezone.utc)
+
+    def get_stats(self, db: Session, user_id: int) -> dict:
+        """Haftalık skor, seri ve toplam analiz (tek PK okuması)"""
+        stats = db.get(UserStats, user_id)
+        if stats is None:
+            stats = self.rebuild(db, user_id)
+            db.commit()
+
+        today = datetime.now(timezone.utc).date()
+        week_start = (today - timedelta(days=WEEKLY_SCORE_DAYS)).isoformat()
+        score_sum = 0.0
+        scored = 0
+        for day, bucket in (stats.daily_scores or {}).items():
+            if day >= week_start:
+                day_sum, _, day_scored = _bucket(bucket)
+                score_sum += day_sum
+                scored += day_scored
+
+        # Seri bugün veya dün aktivite varsa geçerli
+        streak = 0
+        if stats.last_active_date and stats.last_active_date >= today - timedelta(days=1):
+            streak = stats.current_streak
+
+        return {
+            "total_analyses": stats.total_analyses,
+            "weekly_score": round(score_sum / scored, 1) if scored else 0.0,
+            "streak": streak,
+        }
+
+    def rebuild(self, db: Session, user_id: int) -> UserStats:
+        """Özeti analizlerden yeniden hesapla (commit yapmaz)"""
+        today = datetime.now(timezone.utc).date()
+        window_start = datetime.combine(
+            today - timedelta(days=STATS_WINDOW_DAYS), datetime.min.time(), tzinfo=timezone.utc
+        )
+
+        total, last_activity_at = (
+            db.query(func.count(Analysis.id), func.max(Analysis.created_at))
+            .filter(Analysis.user_id == user_id)
+            .one()
+        )
+        day_col = func.date(Analysis.created_at)
+        rows = (
+            db.query(
+                day_col,
+                func.sum(Analysis.overall_score),
+                func.count(Analysis.id),
+                func.count(Analysis.overall_score),
+            )
+            .filter(Analysis.user_id == user_id, Analysis.created_at >= window_start)
+            .group_by(day_col)
+            .all()
+        )
+        daily = {
+            str(day): [float(score_sum or 0.0), count, scored]
+            for day, score_sum, count, scored in rows
+        }
+
+        stats = db.get(UserStats, user_id)
+        if stats is None:
+            stats = UserStats(user_id=user_id)
+            try:
+                with db.begin_nested():
+                    db.add(stats)
+            except IntegrityError:
+                # Created concurrently; update that row instead
+                stats = db.get(UserStats, user_id, populate_existing=True)
+
+        stats.total_analyses = total or 0
+        stats.daily_scores = daily
+        stats.current_streak, stats.last_active_date = _compute_streak(daily)
+        stats.last_activity_at = last_activity_at
+        return stats
+
+    def backfill(self, db: Session, batch_size: int = 500) -> int:
+        """Analizi olan tüm kullanıcılar için özeti oluştur; işlenen kullanıcı sayısını döner"""
+        user_ids = [
+            row[0]
+            for row in db.query(Analysis.user_id)
+            .filter(Analysis.user_id.isnot(None))
+            .distinct()
+            .all()
+        ]
+        for i, user_id in enumerate(user_ids, start=1):
+            self.rebuild(db, user_id)
+            if i % batch_size == 0:
+                db.commit()
+        db.commit()
+        logger.info(f"User stats rollup rebuilt for {len(user_ids)} users")
+        return len(user_ids)
+
+    def _get_for_update(self, db: Session, user_id: int) -> Optional[UserStats]:
+        # Row lock on PostgreSQL so concurrent analyses of one user serialize here;
+        # the SQLite profile reads it on the single writer connection instead
+        return (
+            db.query(UserStats)
+            .filter(UserStats.user_id == user_id)
+            .with_for_update()
+            .execution_options(**{WRITER_OPTION: True})
+            .populate_existing()
+            .first()
+        )
+
+
+# Singleton instance
+user_stats_service = UserStatsService()
@@ -8,10 +8,6 @@ import base64
 import logging
 from typing import Any, Optional
 
-import google.generativeai as genai
-from anthropic import Anthropic
-from openai import OpenAI
-
 from app.core.config import settings
 from app.services.prompts import VISION_ANALYSIS_PROMPT
 
@@ -27,12 +23,18 @@ class VisionAnalysisService:
         self.gemini_client = None
         self.provider = settings.AI_PROVIDER
 
-        # API clients
+        # API clients (SDK'lar ağır: sadece seçilen provider'ınki import edilir)
         if self.provider == "openai" and settings.OPENAI_API_KEY:
+            from openai import OpenAI
+
             self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
         elif self.provider == "anthropic" and settings.ANTHROPIC_API_KEY:
+            from anthropic import Anthropic
+
             self.anthropic_client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
         elif self.provider == "gemini" and settings.GEMINI_API_KEY:
+            import google.generativeai as genai
+
             genai.configure(api_key=settings.GEMINI_API_KEY)
             self.gemini_client = genai
 
@@ -49,6 +51,15 @@ class VisionAnalysisService:
         Returns:
             Analiz sonucu (OCR + duygusal analiz)
         """
+        # Mock provider (yük testi) AIService.switch_provider ile çalışma zamanında seçilir
+        mock_client = _active_mock_client()
+        if mock_client is not None:
+            try:
+                return self._parse_vision_response(mock_client.analyze_image(image_data))
+            except Exception as e:
+                logger.error("Vision analysis failed", extra={"error": str(e), "provider": "mock"})
+                return self._fallback_analysis()
+
         if not self._is_vision_available():
             return self._fallback_analysis()
 
@@ -131,14 +142,14 @@ class VisionAnalysisService:
 
     def _analyze_with_gemini(self, image_data: bytes, image_format: str) -> dict[str, Any]:
         """Gemini Vision ile analiz"""
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = self.gemini_client.GenerativeModel("gemini-1.5-flash")
 
         # Gemini için image part oluştur
         image_part = {"mime_type": f"image/{image_format}", "data": image_data}
 
         response = model.generate_content(
             [VISION_ANALYSIS_PROMPT, image_part],
-            generation_config=genai.GenerationConfig(
+            generation_config=self.gemini_client.GenerationConfig(
                 max_output_tokens=1500, temperature=0.3
             ),
         )
@@ -200,6 +211,14 @@ class VisionAnalysisService:
         return result.get("cikarilan_metin", "")
 
 
+def _active_mock_client():
+    """AIService mock provider'daysa onun client'ı"""
+    from app.services.ai_service import get_ai_service
+
+    ai_service = get_ai_service()
+    return ai_service.mock_client if ai_service.provider == "mock" else None
+
+
 # Singleton instance
 _vision_service_instance: Optional[VisionAnalysisService] = None
 
@@ -0,0 +1,24 @@
+"""Compressed storage for large analysis reports"""
+
+import json
+import zlib
+from typing import Any
+
+CODEC_ZLIB = "zlib"
+
+
+def serialize_report(report: Any) -> bytes:
+    """Compact UTF-8 JSON (same shape the JSON column would store)"""
+    return json.dumps(report, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compress_report(raw: bytes, level: int = 6) -> bytes:
+    """zlib-compress a serialized report"""
+    return zlib.compress(raw, level)
+
+
+def decompress_report(data: bytes, codec: str = CODEC_ZLIB) -> Any:
+    """Inverse of compress_report(serialize_report(...))"""
+    if codec != CODEC_ZLIB:
+        raise ValueError(f"Unknown report codec: {codec}")
+    return json.loads(zlib.decompress(data).decode("utf-8"))
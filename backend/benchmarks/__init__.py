@@ -0,0 +1 @@
+"""ML pipeline benchmarks (python -m benchmarks)"""
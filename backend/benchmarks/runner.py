@@ -0,0 +1,250 @@
+"""ML pipeline benchmark suite
+
+Her aşama sentetik bir konuşma üzerinde ölçülür:
+
+  - throughput: mesaj/saniye (repeat çalıştırmanın en hızlısı)
+  - peak memory: çağrı süresince tracemalloc zirvesi (girdi hariç)
+
+Sonuçlar benchmarks/baselines.json ile karşılaştırılır; throughput düşüşü veya
+bellek artışı threshold'u aşarsa regresyon sayılır ve çıkış kodu 1 olur.
+Baseline'lar makineye bağlıdır: yeni makinede --update-baseline ile üretin.
+
+Usage (backend/ dizininden):
+    python -m benchmarks                        # 10k mesaj, baseline ile karşılaştır
+    python -m benchmarks --only parse --repeat 5
+    python -m benchmarks --update-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform as platform_info
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+# app kodu "backend.ml..." ile, ml kodu "ml..." ile import eder
+for path in (BACKEND_ROOT.parent, BACKEND_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from benchmarks.synthetic import PLATFORMS, generate_export  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines.json"
+
+# Bu değerin altındaki bellek farkları gürültü sayılır
+MEMORY_NOISE_MB = 0.5
+
+
+@dataclass
+class Case:
+    """One benchmarked call over a conversation of `messages` messages"""
+
+    name: str
+    run: Callable[[], Any]
+    messages: int
+
+
+def build_cases(messages: int, participants: int, seed: int) -> list[Case]:
+    """Sentetik konuşmaları üret ve ölçülecek çağrıları hazırla"""
+    from app.services.heatmap_service import ConversationHeatmap
+    from app.services.psychology_service import AttachmentStyleAnalyzer, LoveLanguageInferrer
+    from ml.analyzer import RelationshipAnalyzer
+    from ml.features.relationship_metrics import RelationshipMetrics
+    from ml.preprocessing.conversation_parser import ConversationParser
+
+    parser = ConversationParser()
+    exports = {p: generate_export(p, messages, participants, seed) for p in PLATFORMS}
+
+    cases = [
+        Case(f"parse.{p}", lambda p=p: parser.parse(exports[p], p), messages)
+        for p in PLATFORMS
+    ]
+
+    # Analiz aşamaları WhatsApp konuşması üzerinde
+    text = exports["whatsapp"]
+    parsed = parser.parse(text, "whatsapp")["messages"]
+    full_text = " ".join(m["content"] for m in parsed)
+    by_participant = parser.split_by_participant(parsed)
+
+    metrics = RelationshipMetrics()
+    heatmap = ConversationHeatmap()
+    attachment = AttachmentStyleAnalyzer()
+    love_language = LoveLanguageInferrer()
+    analyzer = RelationshipAnalyzer()
+
+    cases += [
+        Case("metrics.sentiment", lambda: metrics.calculate_sentiment_score(full_text), messages),
+        Case("metrics.empathy", lambda: metrics.calculate_empathy_score(full_text), messages),
+        Case("metrics.conflict", lambda: metrics.calculate_conflict_score(full_text), messages),
+        Case(
+            "metrics.we_language",
+            lambda: metrics.calculate_we_language_score(full_text),
+            messages,
+        ),
+        Case(
+            "metrics.communication_balance",
+            lambda: metrics.calculate_communication_balance(by_participant),
+            messages,
+        ),
+        Case("heatmap.analyze", lambda: heatmap.analyze_heatmap(parsed), messages),
+        Case("psychology.attachment", lambda: attachment.analyze(full_text), messages),
+        Case("psychology.love_language", lambda: love_language.infer(full_text), messages),
+        Case("analyzer.analyze_text", lambda: analyzer.analyze_text(text), messages),
+    ]
+    return cases
+
+
+def measure(case: Case, repeat: int) -> dict[str, float]:
+    """Throughput (best of `repeat`) and peak traced memory of one case"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run()
+        best = min(best, time.perf_counter() - start)
+
+    # Bellek ayrı çalıştırmada: tracemalloc süreyi bozar
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(best, 6),
+        "messages_per_second": round(case.messages / best, 1),
+        "peak_memory_mb": round((peak - before) / 1e6, 3),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> dict[str, list[str]]:
+    """Regressions per case: throughput below or memory above baseline by > threshold"""
+    regressions: dict[str, list[str]] = {}
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        problems = []
+        if result["messages_per_second"] < expected["messages_per_second"] * (1 - threshold):
+            problems.append("throughput")
+        memory = expected["peak_memory_mb"]
+        if result["peak_memory_mb"] > max(memory * (1 + threshold), memory + MEMORY_NOISE_MB):
+            problems.append("memory")
+        if problems:
+            regressions[name] = problems
+    return regressions
+
+
+def load_baseline(path: Path, config: dict[str, int]) -> Optional[dict[str, Any]]:
+    if not path.is_file():
+        return None
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    if stored.get("config") != config:
+        print(f"⚠️ Baseline config {stored.get('config')} != {config}, karşılaştırılmadı")
+        return None
+    return stored
+
+
+def _delta(value: float, expected: Optional[float]) -> str:
+    if not expected:
+        return "-"
+    return f"{(value - expected) / expected * 100:+.0f}%"
+
+
+def print_table(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    regressions: dict[str, list[str]],
+) -> None:
+    print(f"{'case':<32}{'msg/s':>12}{'Δ':>7}{'peak MB':>10}{'Δ':>7}")
+    for name, result in results.items():
+        expected = baseline.get(name, {})
+        flag = f"  REGRESSION ({', '.join(regressions[name])})" if name in regressions else ""
+        print(
+            f"{name:<32}{result['messages_per_second']:>12,.0f}"
+            f"{_delta(result['messages_per_second'], expected.get('messages_per_second')):>7}"
+            f"{result['peak_memory_mb']:>10.2f}"
+            f"{_delta(result['peak_memory_mb'], expected.get('peak_memory_mb')):>7}{flag}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+    # LLM çağrısı yok; .env'deki provider ayarları devre dışı (config import'undan önce)
+    os.environ["AI_ENABLED"] = "false"
+    os.environ["AI_PROVIDER"] = "none"
+    # Büyük girdilerde her çağrı "Slow operation" uyarısı üretir
+    logging.getLogger("app.core.performance").setLevel(logging.ERROR)
+    config = {"messages": args.messages, "participants": args.participants, "seed": args.seed}
+
+    cases = [
+        case
+        for case in build_cases(args.messages, args.participants, args.seed)
+        if not args.only or any(part in case.name for part in args.only)
+    ]
+    results = {case.name: measure(case, args.repeat) for case in cases}
+
+    stored = None if args.update_baseline else load_baseline(args.baseline, config)
+    baseline = stored["results"] if stored else {}
+    regressions = compare(results, baseline, args.threshold)
+    print_table(results, baseline, regressions)
+
+    if args.output:
+        args.output.write_text(
+            json.dumps({"config": config, "results": results}, indent=2), encoding="utf-8"
+        )
+    if args.update_baseline:
+        _write_baseline(args.baseline, config, results)
+        print(f"Baseline güncellendi: {args.baseline}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} regresyon (threshold {args.threshold:.0%})")
+        return 1
+    return 0
+
+
+def _write_baseline(path: Path, config: dict[str, int], results: dict[str, Any]) -> None:
+    # --only ile kısmi çalıştırma diğer case'lerin baseline'ını silmez
+    previous = {}
+    if path.is_file():
+        stored = json.loads(path.read_text(encoding="utf-8"))
+        if stored.get("config") == config:
+            previous = stored["results"]
+    data = {
+        "config": config,
+        "python": platform_info.python_version(),
+        "machine": platform_info.machine(),
+        "results": {**previous, **results},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--participants", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="izin verilen oran (0.25 = %%25)"
+    )
+    parser.add_argument("--only", nargs="*", help="isminde bu parçalardan biri geçen case'ler")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="sonuçları JSON olarak yaz")
+    return parser.parse_args(argv)
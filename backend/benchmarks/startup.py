@@ -0,0 +1,197 @@
+"""Startup benchmark: import time and cold start
+
+  - import: `python -X importtime -c "import app.main"` çıktısı paket bazında
+    toplanır (self = paketin kendi modülleri, inclusive = paketin çektiği her şey)
+  - cold start (--cold-start): uvicorn başlatılıp /health 200 dönene kadar geçen süre
+
+Her ölçüm ayrı ve temiz bir Python sürecinde yapılır; repeat çalıştırmanın
+en hızlısı raporlanır.
+
+Usage (backend/ dizininden):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --module app.services.ai_service --top 10
+    python -m benchmarks.startup --cold-start --output startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportRow:
+    """One line of -X importtime output (times in microseconds)"""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    children: list["ImportRow"] = field(default_factory=list)
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".")[0]
+
+
+def parse_importtime(output: str) -> list[ImportRow]:
+    """-X importtime stderr'ini ağaca çevir; kök satırları döner
+
+    Satırlar import bittiğinde yazılır (post-order): bir satırın çocukları ondan
+    önce gelen bir derin seviyedeki satırlardır.
+    """
+    pending: dict[int, list[ImportRow]] = {}
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = len(indent) // 2
+        row = ImportRow(name, int(self_us), int(cumulative_us), depth)
+        row.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(row)
+    return pending.get(0, [])
+
+
+def by_package(roots: list[ImportRow]) -> dict[str, dict[str, float]]:
+    """Paket başına self ve inclusive süre (ms)
+
+    inclusive: paketin dışarıdan ilk import edildiği noktaların kümülatif süresi
+    (paketin çektiği bağımlılıklar dahil); paketler arası toplam 100%'ü aşabilir.
+    """
+    packages: dict[str, dict[str, float]] = {}
+
+    def visit(row: ImportRow, ancestors: frozenset[str]) -> None:
+        stats = packages.setdefault(row.package, {"self_ms": 0.0, "inclusive_ms": 0.0})
+        stats["self_ms"] += row.self_us / 1000
+        if row.package not in ancestors:
+            stats["inclusive_ms"] += row.cumulative_us / 1000
+        for child in row.children:
+            visit(child, ancestors | {row.package})
+
+    for root in roots:
+        visit(root, frozenset())
+    return {
+        name: {key: round(value, 1) for key, value in stats.items()}
+        for name, stats in packages.items()
+    }
+
+
+def _env() -> dict[str, str]:
+    # app kodu "backend.ml..." ile, ml kodu "ml..." ile import eder
+    paths = [str(BACKEND_ROOT.parent), str(BACKEND_ROOT), os.environ.get("PYTHONPATH", "")]
+    # Kullanıcının .env/ortam ayarları korunur
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in paths if p)}
+
+
+def measure_imports(modules: list[str]) -> tuple[float, list[ImportRow]]:
+    """Temiz bir süreçte modülleri import et; (toplam ms, kök satırlar)"""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import failed:\n{result.stderr.splitlines()[-1]}")
+    roots = parse_importtime(result.stderr)
+    return sum(r.cumulative_us for r in roots) / 1000, roots
+
+
+def measure_cold_start(port: int, timeout: float = 60) -> float:
+    """uvicorn başlatılıp /health 200 dönene kadar geçen süre (ms)"""
+    import httpx
+
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ]  # fmt: skip
+    # Şema ölçümden önce hazırlanır: başlangıç sadece revision kontrolünü içerir
+    subprocess.run([sys.executable, "scripts/migrate.py"], cwd=BACKEND_ROOT, env=_env(), check=True)
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=BACKEND_ROOT, env=_env())
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+                if response.status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+        raise RuntimeError(f"/health not ready after {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=15)
+
+
+def print_report(
+    modules: list[str],
+    total_ms: float,
+    packages: dict[str, dict[str, float]],
+    top: int,
+    cold_start_ms: Optional[float],
+) -> None:
+    print(f"Import time ({', '.join(modules)}): {total_ms:,.0f} ms")
+    print(f"\n{'package':<28}{'self ms':>10}{'inclusive ms':>14}")
+    ranked = sorted(packages.items(), key=lambda item: item[1]["inclusive_ms"], reverse=True)
+    for name, stats in ranked[:top]:
+        print(f"{name:<28}{stats['self_ms']:>10,.1f}{stats['inclusive_ms']:>14,.1f}")
+    if cold_start_ms is not None:
+        print(f"\nCold start -> /health 200: {cold_start_ms:,.0f} ms")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+
+    total_ms, roots = min(
+        (measure_imports(args.module) for _ in range(args.repeat)), key=lambda run: run[0]
+    )
+    packages = by_package(roots)
+    cold_start_ms = None
+    if args.cold_start:
+        cold_start_ms = min(measure_cold_start(args.port) for _ in range(args.repeat))
+
+    print_report(args.module, total_ms, packages, args.top, cold_start_ms)
+
+    if args.output:
+        result: dict[str, Any] = {
+            "modules": args.module,
+            "import_ms": round(total_ms, 1),
+            "cold_start_ms": round(cold_start_ms, 1) if cold_start_ms is not None else None,
+            "packages": packages,
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("--module", nargs="+", default=["app.main"])
+    parser.add_argument("--top", type=int, default=25, help="gösterilecek paket sayısı")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cold-start", action="store_true", help="uvicorn -> /health süresi")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", type=Path, help="sonuçları JSON olarak yaz")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Deterministic synthetic chat exports
+
+Gerçek müşteri verisi olmadan parser ve analiz aşamalarını ölçmek için
+WhatsApp, Telegram ve Instagram export formatlarında sentetik konuşma üretir.
+Aynı (platform, mesaj sayısı, katılımcı sayısı, seed) her zaman aynı metni verir.
+
+İçerik, metrik sözlüklerine (sentiment, empati, çatışma, biz-dili, bağlanma,
+sevgi dili) değen ifadelerle nötr mesajların karışımıdır; arada parser'ın
+atladığı sistem mesajları da bulunur.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+PLATFORMS = ("whatsapp", "telegram", "instagram")
+
+NAMES = (
+    "Ahmet", "Ayşe", "Mehmet", "Zeynep", "Can", "Elif", "Burak", "Şule",
+    "Emre", "Gül", "Oğuz", "İrem",
+)  # fmt: skip
+
+PHRASES = (
+    # Nötr / günlük
+    "tamam", "olur", "akşam ne yapıyoruz", "eve geldim", "yoldayım", "toplantı uzadı",
+    "markete uğrar mısın", "annen aradı", "yarın erken kalkacağım", "kargo geldi mi",
+    # Pozitif / onaylayıcı
+    "seni seviyorum", "çok güzel olmuş", "teşekkür ederim canım", "harikasın",
+    "özledim seni", "birlikte çok mutluyum", "aferin sana",
+    # Empati
+    "seni anlıyorum", "haklısın", "nasıl hissediyorsun", "yanındayım merak etme",
+    # Çatışma / gerginlik
+    "yine mi geç kaldın", "hep böyle yapıyorsun", "bıktım artık", "neden cevap vermiyorsun",
+    "NEREDESİN", "asla dinlemiyorsun", "yeter ama",
+    # Biz-dili / kaliteli zaman
+    "biz bunu hallederiz", "hafta sonu birlikte gezmeye gidelim", "kahve içelim mi",
+    "film izleyelim akşam",
+    # Mesafe / kaçıngan
+    "biraz yalnız kalmam lazım", "şimdi konuşmak istemiyorum", "sonra konuşuruz",
+)  # fmt: skip
+
+EMOJIS = ("😊", "❤️", "😂", "😡", "🙄", "😢", "👍")
+
+# Parser'ın sistem mesajı olarak atladığı satırlar
+SYSTEM_MESSAGES = {
+    "whatsapp": "<Medya dahil edilmedi>",
+    "telegram": "mesajı sabitledi",
+    "instagram": "mesajı beğendi",
+}
+
+# Instagram İngilizce ay kısaltması kullanır (%b locale'e bağlı)
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+_SYSTEM_RATE = 0.02
+_START = datetime(2022, 3, 1, 8, 0)
+
+
+def _format_line(platform: str, stamp: datetime, sender: str, content: str) -> str:
+    if platform == "whatsapp":
+        return f"{stamp:%d.%m.%Y %H:%M} - {sender}: {content}"
+    if platform == "telegram":
+        # Desktop formatı: "[01.03.22 08:06] Ad:" WhatsApp iOS ile aynı, auto-detect şaşırır
+        return f"{stamp:%d.%m.%Y %H:%M:%S}, {sender}: {content}"
+    if platform == "instagram":
+        month = _MONTHS[stamp.month - 1]
+        return f"{sender}, {stamp:%d} {month} {stamp:%Y %H:%M:%S}: {content}"
+    raise ValueError(f"Unknown platform: {platform}")
+
+
+def _message(rng: random.Random) -> str:
+    words = rng.sample(PHRASES, rng.choice((1, 1, 1, 2, 3)))
+    content = " ".join(words)
+    if rng.random() < 0.25:
+        content += " " + rng.choice(EMOJIS)
+    if rng.random() < 0.1:
+        content += "!!"
+    return content
+
+
+def generate_export(
+    platform: str = "whatsapp",
+    messages: int = 1000,
+    participants: int = 2,
+    seed: int = 0,
+) -> str:
+    """
+    Sentetik export metni üret
+
+    Args:
+        platform: 'whatsapp', 'telegram' veya 'instagram'
+        messages: Parse edilecek (sistem dışı) mesaj sayısı
+        participants: Katılımcı sayısı (1..len(NAMES))
+        seed: Aynı seed aynı metni üretir
+
+    Returns:
+        Platform formatında, satır başına bir mesaj içeren metin
+    """
+    if platform not in PLATFORMS:
+        raise ValueError(f"Unknown platform: {platform}")
+    if not 1 <= participants <= len(NAMES):
+        raise ValueError(f"participants must be between 1 and {len(NAMES)}")
+
+    rng = random.Random(f"{platform}:{participants}:{seed}")
+    senders = NAMES[:participants]
+    # Katılımcılar eşit konuşmaz (iletişim dengesi metriği için)
+    weights = [1.0 / (rank + 1) ** 0.5 for rank in range(participants)]
+
+    stamp = _START
+    sender = senders[0]
+    lines: list[str] = []
+    written = 0
+    while written < messages:
+        # Çoğu mesaj dakikalar içinde, arada saatlerce sessizlik
+        gap = rng.expovariate(1 / 4) if rng.random() < 0.9 else rng.uniform(120, 900)
+        stamp += timedelta(minutes=gap)
+        if rng.random() < 0.35:
+            sender = rng.choices(senders, weights)[0]
+
+        if rng.random() < _SYSTEM_RATE:
+            lines.append(_format_line(platform, stamp, sender, SYSTEM_MESSAGES[platform]))
+            continue
+        lines.append(_format_line(platform, stamp, sender, _message(rng)))
+        written += 1
+
+    return "\n".join(lines)
@@ -0,0 +1 @@
+"""End-to-end load test harness (python -m loadtest)"""
@@ -0,0 +1,129 @@
+"""Server process CPU / RSS sampling
+
+psutil bağımlılığı eklememek için /proc okunur (Linux). Kök PID (uvicorn
+master) ve tüm alt süreçleri (worker'lar) her aralıkta yeniden keşfedilir;
+yeniden başlayan worker'lar da ölçüme girer.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PROC = Path("/proc")
+
+
+def _read_stat(pid: int) -> Optional[tuple[int, float]]:
+    """(ppid, utime + stime saniye); süreç yoksa None"""
+    try:
+        raw = (PROC / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    # comm parantez içinde ve boşluk içerebilir: son ')' sonrasını böl
+    fields = raw[raw.rindex(")") + 2 :].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    return int(fields[1]), (int(fields[11]) + int(fields[12])) / ticks
+
+
+def _read_rss(pid: int) -> Optional[int]:
+    try:
+        for line in (PROC / str(pid) / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return 0
+
+
+def process_tree(root: int) -> list[int]:
+    """root ve tüm torunları"""
+    children: dict[int, list[int]] = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        stat = _read_stat(int(entry.name))
+        if stat is not None:
+            children.setdefault(stat[0], []).append(int(entry.name))
+
+    tree, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, ()))
+    return tree
+
+
+class ResourceSampler:
+    """Background thread sampling CPU% and RSS of a process tree"""
+
+    def __init__(self, root_pid: int, interval: float = 0.5):
+        self.root_pid = root_pid
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cpu_start: dict[int, float] = {}
+        self._cpu_last: dict[int, float] = {}
+        self._rss_peak: dict[int, int] = {}
+        self._total_rss: list[int] = []
+        self._started = 0.0
+        self._stopped = 0.0
+
+    @staticmethod
+    def supported() -> bool:
+        return (PROC / "self" / "stat").exists()
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="loadtest-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict[str, Any]:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._sample()
+        self._stopped = time.perf_counter()
+        return self.summary()
+
+    def summary(self) -> dict[str, Any]:
+        elapsed = max(self._stopped - self._started, 1e-9)
+        processes = {
+            str(pid): {
+                "cpu_percent": round(
+                    (self._cpu_last[pid] - self._cpu_start[pid]) / elapsed * 100, 1
+                ),
+                "peak_rss_mb": round(self._rss_peak.get(pid, 0) / 1e6, 1),
+            }
+            for pid in self._cpu_last
+        }
+        return {
+            "cpu_percent": round(sum(p["cpu_percent"] for p in processes.values()), 1),
+            "peak_rss_mb": round(max(self._total_rss, default=0) / 1e6, 1),
+            "processes": processes,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+
+    def _sample(self) -> None:
+        total_rss = 0
+        for pid in process_tree(self.root_pid):
+            stat = _read_stat(pid)
+            rss = _read_rss(pid)
+            if stat is None or rss is None:
+                continue
+            # İlk görüldüğü andan itibaren CPU süresi (sonradan doğan worker'lar dahil)
+            self._cpu_start.setdefault(pid, stat[1])
+            self._cpu_last[pid] = stat[1]
+            self._rss_peak[pid] = max(self._rss_peak.get(pid, 0), rss)
+            total_rss += rss
+        self._total_rss.append(total_rss)
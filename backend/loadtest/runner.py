@@ -0,0 +1,417 @@
+"""End-to-end load test for the FastAPI app
+
+Sanal kullanıcılar analiz (/analyze, /analyze-v2, upload-and-analyze-v2),
+AI koç sohbeti ve geçmiş endpoint'lerini ağırlıklı bir karışımla çağırır.
+Varsayılan olarak uygulama mock LLM provider ile (AI_PROVIDER=mock) yerel
+bir uvicorn sürecinde başlatılır; ağ ve API kotası harcanmaz, LLM gecikmesi
+MOCK_LLM_* ayarlarıyla simüle edilir.
+
+Rapor: senaryo başına throughput, gecikme yüzdelikleri, hata oranı ve
+status dağılımı; sunucu süreçlerinin (master + worker'lar) CPU ve RSS'i.
+Sonuç JSON olarak kaydedilir, --compare ile önceki bir koşuyla kıyaslanır.
+
+Kullanıcılar doğrudan veritabanına (doğrulanmış, Pro) yazılır; harness ve
+sunucu aynı DATABASE_URL'i kullanmalıdır.
+
+Usage (backend/ dizininden):
+    python -m loadtest                                  # 20 kullanıcı, 60 sn
+    python -m loadtest --users 50 --workers 4 --mock-latency-ms 1500
+    python -m loadtest --mix analyze=1,chat=1 --compare data/loadtest/önceki.json
+    python -m loadtest --base-url http://127.0.0.1:8000 --pid 12345
+
+loadtest/baselines/mock-sqlite-5u.json referans koşudur (sqlite, tek worker):
+    python -m loadtest --users 5 --duration 20 --ramp-up 2 --think-time 0.5 \
+        --mock-latency-ms 50 --compare loadtest/baselines/mock-sqlite-5u.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+# app kodu "backend.ml..." ile, ml kodu "ml..." ile import eder
+for path in (BACKEND_ROOT.parent, BACKEND_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import httpx  # noqa: E402
+
+from loadtest.resources import ResourceSampler  # noqa: E402
+from loadtest.workload import (  # noqa: E402
+    Sample,
+    VirtualUser,
+    build_export_pool,
+    parse_mix,
+    run_user,
+)
+
+DEFAULT_OUTPUT_DIR = BACKEND_ROOT / "data" / "loadtest"
+USER_EMAIL = "loadtest-{}@example.com"
+PERCENTILES = (50, 90, 95, 99)
+
+# Argon2 havuzunu doldurmamak için login eşzamanlılığı
+LOGIN_CONCURRENCY = 4
+
+
+# ==================== Server ====================
+
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    """uvicorn'u mock LLM provider ile başlat"""
+    # app hem `app.*` hem `backend.*` yollarını import eder (bkz. benchmarks/startup.py)
+    paths = [str(BACKEND_ROOT.parent), str(BACKEND_ROOT), os.environ.get("PYTHONPATH", "")]
+    env = {
+        **os.environ,
+        "AI_ENABLED": "true",
+        "AI_PROVIDER": "mock",
+        "PYTHONPATH": os.pathsep.join(p for p in paths if p),
+    }
+    overrides = {
+        "MOCK_LLM_LATENCY_MS": args.mock_latency_ms,
+        "MOCK_LLM_ERROR_RATE": args.mock_error_rate,
+        "MOCK_LLM_RATE_LIMIT_RATE": args.mock_rate_limit_rate,
+    }
+    env.update({key: str(value) for key, value in overrides.items() if value is not None})
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]  # fmt: skip
+    # Şema worker'lardan önce tek seferde oluşturulur/yükseltilir (bkz. app/core/schema.py)
+    subprocess.run([sys.executable, "scripts/migrate.py"], cwd=BACKEND_ROOT, env=env, check=True)
+    return subprocess.Popen(command, cwd=BACKEND_ROOT, env=env)
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def wait_ready(base_url: str, server: Optional[subprocess.Popen], timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server not ready after {timeout:.0f}s: {base_url}")
+
+
+def server_provider(base_url: str) -> Optional[str]:
+    try:
+        return httpx.get(f"{base_url}/api/system/status", timeout=5).json().get("ai_provider")
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+# ==================== Users ====================
+
+
+def seed_users(count: int, password: str) -> list[str]:
+    """Doğrulanmış Pro test kullanıcılarını oluştur/güncelle (idempotent)"""
+    from app.core.database import SessionLocal
+    from app.core.security import get_password_hash
+    from app.models.database import User
+
+    emails = [USER_EMAIL.format(i) for i in range(count)]
+    # Argon2 pahalı: tüm kullanıcılar aynı hash'i paylaşır
+    hashed_password = get_password_hash(password)
+    db = SessionLocal()
+    try:
+        existing = {u.email: u for u in db.query(User).filter(User.email.in_(emails))}
+        for i, email in enumerate(emails):
+            user = existing.get(email) or User(email=email, full_name=f"Load Test {i}")
+            user.hashed_password = hashed_password
+            user.is_active = True
+            user.is_verified = True
+            # Ücretsiz plan günlük limitleri yük altında ölçümü bozar
+            user.is_pro = True
+            db.add(user)
+        db.commit()
+    finally:
+        db.close()
+    return emails
+
+
+async def _login_all(users: list[VirtualUser], emails: list[str], password: str) -> None:
+    semaphore = asyncio.Semaphore(LOGIN_CONCURRENCY)
+
+    async def login(user: VirtualUser, email: str) -> None:
+        async with semaphore:
+            for attempt in range(5):
+                try:
+                    await user.login(email, password)
+                    return
+                except RuntimeError:
+                    # Parola havuzu doluysa (429) kısa bekle
+                    if attempt == 4:
+                        raise
+                    await asyncio.sleep(0.5 * (attempt + 1))
+
+    await asyncio.gather(*(login(u, e) for u, e in zip(users, emails, strict=True)))
+
+
+# ==================== Load ====================
+
+
+async def run_load(
+    args: argparse.Namespace,
+    base_url: str,
+    mix: dict[str, float],
+    emails: list[str],
+    root_pid: Optional[int],
+) -> dict[str, Any]:
+    exports = build_export_pool(args.seed)
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        users = [
+            VirtualUser(i, client, exports, random.Random(f"{args.seed}:{i}"))
+            for i in range(args.users)
+        ]
+        await _login_all(users, emails, args.password)
+
+        sampler = None
+        if root_pid is not None and ResourceSampler.supported():
+            sampler = ResourceSampler(root_pid)
+            sampler.start()
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                run_user(u, mix, deadline, args.think_time, args.ramp_up * i / args.users)
+                for i, u in enumerate(users)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        resources = sampler.stop() if sampler else None
+
+    samples = [s for u in users for s in u.samples]
+    return {
+        "elapsed": round(elapsed, 3),
+        "results": summarize(samples, elapsed),
+        "resources": resources,
+    }
+
+
+# ==================== Report ====================
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank yüzdelik (sorted_values sıralı olmalı)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _summarize_group(samples: list[Sample], elapsed: float) -> dict[str, Any]:
+    latencies = sorted(s.latency * 1000 for s in samples)
+    statuses: dict[str, int] = {}
+    for s in samples:
+        key = str(s.status) if s.status else s.error or "error"
+        statuses[key] = statuses.get(key, 0) + 1
+    errors = sum(1 for s in samples if not 200 <= s.status < 300)
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 2),
+        "error_rate": round(errors / len(samples), 4),
+        "latency_ms": {
+            **{f"p{q}": round(percentile(latencies, q), 1) for q in PERCENTILES},
+            "mean": round(sum(latencies) / len(latencies), 1),
+            "max": round(latencies[-1], 1),
+        },
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict[str, dict[str, Any]]:
+    """Senaryo başına ve toplam istatistikler"""
+    groups: dict[str, list[Sample]] = {}
+    for s in samples:
+        groups.setdefault(s.scenario, []).append(s)
+    results = {name: _summarize_group(group, elapsed) for name, group in sorted(groups.items())}
+    if samples:
+        results["total"] = _summarize_group(samples, elapsed)
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    previous: dict[str, dict[str, Any]],
+    threshold: float,
+) -> dict[str, list[str]]:
+    """Regressions per scenario: throughput below or p95 above previous run by > threshold"""
+    regressions: dict[str, list[str]] = {}
+    for name, result in results.items():
+        expected = previous.get(name)
+        if expected is None:
+            continue
+        problems = []
+        if result["rps"] < expected["rps"] * (1 - threshold):
+            problems.append("throughput")
+        if result["latency_ms"]["p95"] > expected["latency_ms"]["p95"] * (1 + threshold):
+            problems.append("p95")
+        if result["error_rate"] > expected["error_rate"] + threshold / 10:
+            problems.append("errors")
+        if problems:
+            regressions[name] = problems
+    return regressions
+
+
+def _delta(value: float, expected: Optional[float]) -> str:
+    if not expected:
+        return ""
+    return f" ({(value - expected) / expected * 100:+.0f}%)"
+
+
+def print_report(
+    report: dict[str, Any],
+    previous: dict[str, Any],
+    regressions: dict[str, list[str]],
+) -> None:
+    previous_results = previous.get("results", {})
+    print(
+        f"\n{'scenario':<18}{'req':>7}{'rps':>16}{'p50':>9}{'p95':>16}{'p99':>9}{'err%':>8}"
+    )
+    for name, result in report["results"].items():
+        expected = previous_results.get(name, {})
+        latency = result["latency_ms"]
+        rps = f"{result['rps']:.1f}{_delta(result['rps'], expected.get('rps'))}"
+        p95 = f"{latency['p95']:.0f}"
+        p95 += _delta(latency["p95"], expected.get("latency_ms", {}).get("p95"))
+        flag = f"  REGRESSION ({', '.join(regressions[name])})" if name in regressions else ""
+        print(
+            f"{name:<18}{result['requests']:>7}{rps:>16}{latency['p50']:>9.0f}{p95:>16}"
+            f"{latency['p99']:>9.0f}{result['error_rate'] * 100:>8.1f}{flag}"
+        )
+        non_ok = {k: v for k, v in result["statuses"].items() if not k.startswith("2")}
+        if non_ok and name != "total":
+            print(f"{'':<18}  status: {non_ok}")
+
+    resources = report.get("resources")
+    if resources:
+        print(
+            f"\nServer: CPU {resources['cpu_percent']:.0f}% "
+            f"(toplam, {len(resources['processes'])} süreç), "
+            f"peak RSS {resources['peak_rss_mb']:.0f} MB"
+        )
+        for pid, proc in resources["processes"].items():
+            print(f"  pid {pid}: CPU {proc['cpu_percent']:.0f}%, RSS {proc['peak_rss_mb']:.0f} MB")
+
+
+# ==================== CLI ====================
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+    # seed_users harness sürecinde app config'ini import eder: geliştiricinin .env'indeki
+    # provider ayarları (ör. anahtarsız gemini) Settings doğrulamasını düşürmesin
+    os.environ["AI_ENABLED"] = "true"
+    os.environ["AI_PROVIDER"] = "mock"
+    mix = parse_mix(args.mix)
+    previous = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else {}
+
+    server = None
+    base_url = args.base_url
+    root_pid = args.pid
+    if base_url is None:
+        server = start_server(args)
+        base_url = f"http://127.0.0.1:{args.port}"
+        root_pid = server.pid
+
+    started_at = datetime.now(timezone.utc)
+    try:
+        wait_ready(base_url, server)
+        provider = server_provider(base_url)
+        if provider != "mock":
+            print(f"⚠️ Sunucu AI provider'ı '{provider}' (mock değil): LLM gecikmesi gerçek olur")
+        emails = (
+            [USER_EMAIL.format(i) for i in range(args.users)]
+            if args.no_seed
+            else seed_users(args.users, args.password)
+        )
+        print(f"{args.users} kullanıcı, {args.duration:.0f} sn, mix={mix} -> {base_url}")
+        report = asyncio.run(run_load(args, base_url, mix, emails, root_pid))
+    finally:
+        if server is not None:
+            stop_server(server)
+
+    report = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "config": {
+            "users": args.users,
+            "duration": args.duration,
+            "ramp_up": args.ramp_up,
+            "think_time": args.think_time,
+            "workers": args.workers if server is not None else None,
+            "mix": mix,
+            "seed": args.seed,
+            "ai_provider": provider,
+        },
+        **report,
+    }
+    regressions = compare(report["results"], previous.get("results", {}), args.threshold)
+    print_report(report, previous, regressions)
+
+    output = args.output or DEFAULT_OUTPUT_DIR / f"loadtest-{started_at:%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"\nSonuçlar: {output}")
+
+    if regressions:
+        print(f"{len(regressions)} regresyon (threshold {args.threshold:.0%})")
+        return 1
+    return 0
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("--users", type=int, default=20, help="eşzamanlı sanal kullanıcı")
+    parser.add_argument("--duration", type=float, default=60, help="saniye")
+    parser.add_argument("--ramp-up", type=float, default=5, help="kullanıcı başlatma süresi (sn)")
+    parser.add_argument(
+        "--think-time", type=float, default=1.0, help="istekler arası ortalama bekleme (sn)"
+    )
+    parser.add_argument("--mix", help="örn. analyze=3,chat=1 (varsayılan: tüm senaryolar)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="istek timeout'u (sn)")
+    parser.add_argument("--password", default="LoadTest123!")
+    parser.add_argument(
+        "--no-seed", action="store_true", help="kullanıcılar zaten var, DB'ye yazma"
+    )
+
+    server = parser.add_argument_group("server")
+    server.add_argument("--base-url", help="çalışan sunucu (verilmezse uvicorn başlatılır)")
+    server.add_argument("--pid", type=int, help="--base-url ile: CPU/RSS için kök PID")
+    server.add_argument("--port", type=int, default=8765)
+    server.add_argument("--workers", type=int, default=1)
+    server.add_argument("--mock-latency-ms", type=float)
+    server.add_argument("--mock-error-rate", type=float)
+    server.add_argument("--mock-rate-limit-rate", type=float)
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--output", type=Path, help="JSON (varsayılan: data/loadtest/)")
+    output.add_argument("--compare", type=Path, help="önceki koşunun JSON'u")
+    output.add_argument(
+        "--threshold", type=float, default=0.25, help="izin verilen oran (0.25 = %%25)"
+    )
+    return parser.parse_args(argv)
@@ -0,0 +1,210 @@
+"""Load test workload: virtual users and the request mix
+
+Her sanal kullanıcı kendi token'ı ve IP'si (X-Forwarded-For) ile döngüde
+ağırlıklı rastgele bir senaryo seçer. Rate limit'ler IP başına olduğu için
+kullanıcılar üretimdeki gibi birbirinden bağımsız sınırlanır; 429'lar
+raporda ayrı bir status olarak görünür.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+
+from benchmarks.synthetic import PLATFORMS, generate_export
+
+# Senaryo adı -> ağırlık (analiz ağırlıklı, geçmiş ve sohbet okumaları daha hafif)
+DEFAULT_MIX = {
+    "analyze": 3.0,
+    "analyze_v2": 2.0,
+    "upload_v2": 1.0,
+    "chat": 2.0,
+    "analysis_history": 1.5,
+    "chat_sessions": 0.5,
+}
+
+# Gerçek export boyutları geniş dağılır: çoğu küçük, az sayıda büyük sohbet
+EXPORT_SIZES = ((200, 0.5), (1000, 0.35), (5000, 0.15))
+
+COACH_MESSAGES = (
+    "Son zamanlarda çok tartışıyoruz, ne yapmalıyım?",
+    "Partnerim beni dinlemiyor gibi hissediyorum.",
+    "Birlikte daha fazla vakit geçirmek için önerin var mı?",
+    "Kavga sonrası nasıl barışabiliriz?",
+)
+
+
+@dataclass
+class Sample:
+    """One finished request"""
+
+    scenario: str
+    status: int  # 0 = bağlantı hatası / timeout
+    latency: float
+    started: float
+    error: Optional[str] = None
+
+
+def build_export_pool(seed: int, per_size: int = 2) -> list[tuple[str, str]]:
+    """(platform, text) listesi; boyut ağırlıkları tekrar sayısıyla yansıtılır"""
+    pool = []
+    for messages, weight in EXPORT_SIZES:
+        copies = max(1, round(weight * 20))
+        exports = [
+            (platform, generate_export(platform, messages, participants=2, seed=seed + i))
+            for platform in PLATFORMS
+            for i in range(per_size)
+        ]
+        pool += exports * copies
+    return pool
+
+
+def parse_mix(spec: Optional[str]) -> dict[str, float]:
+    """'analyze=3,chat=1' -> ağırlıklar (verilmeyen senaryolar çalışmaz)"""
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name} (choices: {', '.join(SCENARIOS)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+@dataclass
+class VirtualUser:
+    index: int
+    client: httpx.AsyncClient
+    exports: list[tuple[str, str]]
+    rng: random.Random
+    token: Optional[str] = None
+    chat_session_id: Optional[int] = None
+    samples: list[Sample] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        # Her kullanıcı ayrı istemci IP'si (limiter X-Forwarded-For'a bakar)
+        octets = (self.index >> 16 & 255, self.index >> 8 & 255, self.index & 255)
+        headers = {"X-Forwarded-For": "10.{}.{}.{}".format(*octets)}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    async def request(
+        self, scenario: str, method: str, url: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.samples.append(
+                Sample(scenario, 0, time.perf_counter() - started, started, type(e).__name__)
+            )
+            return None
+        self.samples.append(
+            Sample(scenario, response.status_code, time.perf_counter() - started, started)
+        )
+        return response
+
+    async def login(self, email: str, password: str) -> None:
+        # Ölçüm penceresinden önce; sample olarak kaydedilmez
+        response = await self.client.post(
+            "/api/auth/login",
+            headers=self.headers,
+            data={"username": email, "password": password},
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"Login failed for {email}: {response.status_code}")
+        self.token = response.json()["access_token"]
+
+    def pick_export(self) -> tuple[str, str]:
+        return self.rng.choice(self.exports)
+
+
+async def _analyze(user: VirtualUser) -> None:
+    _, text = user.pick_export()
+    await user.request(
+        "analyze",
+        "POST",
+        "/api/analysis/analyze",
+        json={"text": text, "format_type": "auto", "privacy_mode": True},
+    )
+
+
+async def _analyze_v2(user: VirtualUser) -> None:
+    platform, text = user.pick_export()
+    await user.request(
+        "analyze_v2",
+        "POST",
+        "/api/analysis/analyze-v2",
+        json={"text": text, "model_preference": "fast", "format_type": platform},
+    )
+
+
+async def _upload_v2(user: VirtualUser) -> None:
+    _, text = user.pick_export()
+    await user.request(
+        "upload_v2",
+        "POST",
+        "/api/upload/upload-and-analyze-v2",
+        files={"file": ("chat.txt", text.encode("utf-8"), "text/plain")},
+    )
+
+
+async def _chat(user: VirtualUser) -> None:
+    if user.chat_session_id is None:
+        response = await user.request(
+            "chat.session", "POST", "/api/chat/sessions", json={"title": "Load test"}
+        )
+        if response is None or response.status_code != 200:
+            return
+        user.chat_session_id = response.json()["id"]
+    await user.request(
+        "chat",
+        "POST",
+        f"/api/chat/sessions/{user.chat_session_id}/messages",
+        json={"role": "user", "content": user.rng.choice(COACH_MESSAGES)},
+    )
+
+
+async def _analysis_history(user: VirtualUser) -> None:
+    await user.request("analysis_history", "GET", "/api/analysis/history", params={"limit": 10})
+
+
+async def _chat_sessions(user: VirtualUser) -> None:
+    await user.request("chat_sessions", "GET", "/api/chat/sessions", params={"limit": 20})
+
+
+SCENARIOS: dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "analyze": _analyze,
+    "analyze_v2": _analyze_v2,
+    "upload_v2": _upload_v2,
+    "chat": _chat,
+    "analysis_history": _analysis_history,
+    "chat_sessions": _chat_sessions,
+}
+
+
+async def run_user(
+    user: VirtualUser,
+    mix: dict[str, float],
+    deadline: float,
+    think_time: float,
+    start_delay: float = 0.0,
+) -> None:
+    """Deadline'a kadar senaryo seç-çalıştır döngüsü (closed loop)"""
+    if start_delay:
+        await asyncio.sleep(start_delay)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        scenario = user.rng.choices(names, weights)[0]
+        await SCENARIOS[scenario](user)
+        if think_time > 0:
+            await asyncio.sleep(user.rng.expovariate(1 / think_time))
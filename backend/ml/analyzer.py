@@ -1,29 +1,36 @@
 """Ana İlişki Analiz Pipeline'ı"""
 
-# spaCy optional - fallback to simple preprocessor
-try:
-    from ml.preprocessing.turkish_nlp import get_preprocessor
-
-    USE_SPACY = True
-except (ImportError, OSError):
-    from ml.preprocessing.simple_preprocessor import get_simple_preprocessor as get_preprocessor
-
-    USE_SPACY = False
-
 from ml.features.relationship_metrics import RelationshipMetrics
 from ml.features.report_generator import ReportGenerator
 from ml.preprocessing.conversation_parser import ConversationParser
 
 
+def _load_preprocessor():
+    """spaCy optional - fallback to simple preprocessor
+
+    spaCy import'u ~1 sn sürer; modül import'unda değil ilk analyzer oluşturulurken yüklenir.
+
+    Returns:
+        (preprocessor, use_spacy)
+    """
+    try:
+        from ml.preprocessing.turkish_nlp import get_preprocessor
+
+        return get_preprocessor(), True
+    except (ImportError, OSError):
+        from ml.preprocessing.simple_preprocessor import get_simple_preprocessor
+
+        return get_simple_preprocessor(), False
+
+
 class RelationshipAnalyzer:
     """İlişki analizi ana sınıfı"""
 
     def __init__(self):
-        self.preprocessor = get_preprocessor()
+        self.preprocessor, self.use_spacy = _load_preprocessor()
         self.parser = ConversationParser()
         self.metrics_calculator = RelationshipMetrics()
         self.report_generator = ReportGenerator()
-        self.use_spacy = USE_SPACY
 
     def analyze_text(
         self,
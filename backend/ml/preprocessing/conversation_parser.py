@@ -17,6 +17,8 @@ import logging
 import re
 from typing import Any
 
+from .conversation_table import ConversationTable
+
 logger = logging.getLogger(__name__)
 
 # python-dateutil — esnek tarih parsing
@@ -383,9 +385,9 @@ class ConversationParser:
 
         return stats
 
-    def parse(self, text: str, format_type: str = "auto") -> dict[str, Any]:
+    def parse_messages(self, text: str, format_type: str = "auto") -> list[dict[str, Any]]:
         """
-        Konuşmayı parse et
+        Yalnızca mesaj listesini parse et (istatistik ve kişi gruplaması yok)
 
         Args:
             text: Ham metin
@@ -412,6 +414,21 @@ class ConversationParser:
         elif format_type == "simple":
             messages = self.parse_simple_format(text)
 
+        return messages
+
+    def parse_table(self, text: str, format_type: str = "auto") -> ConversationTable:
+        """Konuşmayı sütunlu ConversationTable olarak parse et"""
+        return ConversationTable.from_messages(self.parse_messages(text, format_type))
+
+    def parse(self, text: str, format_type: str = "auto") -> dict[str, Any]:
+        """
+        Konuşmayı parse et
+
+        Args:
+            text: Ham metin
+            format_type: 'auto', 'whatsapp', 'telegram', 'instagram', 'simple'
+        """
+        messages = self.parse_messages(text, format_type)
         stats = self.calculate_conversation_stats(messages)
         detected_format = messages[0].get("platform", "simple") if messages else "simple"
 
@@ -0,0 +1,201 @@
+"""Columnar conversation container
+
+Parser çıktısı her mesaj için bir dict tutar: tekrar eden gönderen ve
+platform string'leri, "YYYY-MM-DD HH:MM" timestamp string'i ve içerik.
+ConversationTable aynı veriyi sütunlar halinde saklar:
+
+  - gönderenler bir kez interned, mesaj başına int32 id
+  - timestamp'ler int64 epoch saniyesi (duvar saati, saat dilimsiz)
+  - içerikler tek bir UTF-8 buffer + offset dizisi
+  - küçük harfli içerik ilk ihtiyaçta bir kez üretilir
+
+Mevcut kodla uyum için iterasyon ve indeksleme parser'ın ürettiği dict'leri
+döndürür.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime, timedelta
+from typing import Any, Optional, Union
+
+import numpy as np
+
+# Timestamp'i olmayan mesajlar
+NO_TIMESTAMP = np.iinfo(np.int64).min
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_epoch(timestamp: str) -> Optional[int]:
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return int((dt.replace(tzinfo=None) - _EPOCH).total_seconds())
+
+
+def _pack(texts: Iterable[str]) -> tuple[bytes, np.ndarray]:
+    """UTF-8 buffer + offsets (len n + 1)"""
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+class ConversationTable(Sequence):
+    """Array-backed message list; indexing/iteration yield parser-style dicts"""
+
+    def __init__(
+        self,
+        senders: list[str],
+        sender_ids: np.ndarray,
+        timestamps: np.ndarray,
+        content_buffer: bytes,
+        content_offsets: np.ndarray,
+        platform: str,
+        raw_timestamps: Optional[dict[int, str]] = None,
+    ):
+        self.senders = senders
+        self.sender_ids = sender_ids
+        self.timestamps = timestamps
+        self.content_buffer = content_buffer
+        self.content_offsets = content_offsets
+        self.platform = platform
+        # Epoch'a çevrilemeyen timestamp'ler (parser orijinal string'i bırakır)
+        self.raw_timestamps = raw_timestamps or {}
+        self._lowered: Optional[tuple[bytes, np.ndarray]] = None
+
+    @classmethod
+    def from_messages(
+        cls, messages: list[dict[str, Any]], platform: Optional[str] = None
+    ) -> "ConversationTable":
+        """Parser mesaj listesinden tablo oluştur"""
+        if platform is None:
+            platform = messages[0].get("platform", "simple") if messages else "simple"
+
+        n = len(messages)
+        sender_index: dict[str, int] = {}
+        sender_ids = np.empty(n, dtype=np.int32)
+        timestamps = np.full(n, NO_TIMESTAMP, dtype=np.int64)
+        raw_timestamps: dict[int, str] = {}
+        # Aynı dakika damgası çok tekrarlanır; her biri bir kez parse edilir
+        parsed: dict[str, Optional[int]] = {}
+
+        for i, msg in enumerate(messages):
+            if msg.get("platform", platform) != platform:
+                raise ValueError("ConversationTable holds messages from a single platform")
+
+            sender = msg.get("sender") or "Unknown"
+            sender_ids[i] = sender_index.setdefault(sender, len(sender_index))
+
+            timestamp = msg.get("timestamp")
+            if timestamp is None:
+                continue
+            if timestamp not in parsed:
+                parsed[timestamp] = _to_epoch(timestamp)
+            seconds = parsed[timestamp]
+            if seconds is None:
+                raw_timestamps[i] = timestamp
+            else:
+                timestamps[i] = seconds
+
+        buffer, offsets = _pack(msg.get("content", "") or "" for msg in messages)
+        return cls(
+            senders=list(sender_index),
+            sender_ids=sender_ids,
+            timestamps=timestamps,
+            content_buffer=buffer,
+            content_offsets=offsets,
+            platform=platform,
+            raw_timestamps=raw_timestamps,
+        )
+
+    # ── Columns ───────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.sender_ids)
+
+    def sender(self, i: int) -> str:
+        return self.senders[self.sender_ids[i]]
+
+    def content(self, i: int) -> str:
+        start, end = self.content_offsets[i], self.content_offsets[i + 1]
+        return self.content_buffer[start:end].decode("utf-8")
+
+    def lowered(self, i: int) -> str:
+        buffer, offsets = self._lowered_column()
+        return buffer[offsets[i] : offsets[i + 1]].decode("utf-8")
+
+    def contents(self) -> list[str]:
+        return self._unpack(self.content_buffer, self.content_offsets)
+
+    def lowered_contents(self) -> list[str]:
+        return self._unpack(*self._lowered_column())
+
+    def timestamp(self, i: int) -> Optional[str]:
+        """Parser formatında timestamp ("YYYY-MM-DD HH:MM")"""
+        seconds = self.timestamps[i]
+        if seconds == NO_TIMESTAMP:
+            return self.raw_timestamps.get(i)
+        return (_EPOCH + timedelta(seconds=int(seconds))).strftime(TIMESTAMP_FORMAT)
+
+    def epoch_seconds(self) -> np.ndarray:
+        """float64 epoch column, NaN where the timestamp is unknown"""
+        epoch = self.timestamps.astype(float)
+        epoch[self.timestamps == NO_TIMESTAMP] = np.nan
+        return epoch
+
+    # ── Dict compatibility ───────────────────────────────────────────────
+
+    def message(self, i: int) -> dict[str, Any]:
+        return {
+            "timestamp": self.timestamp(i),
+            "sender": self.sender(i),
+            "content": self.content(i),
+            "platform": self.platform,
+        }
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[dict[str, Any], list[dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self.message(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return self.message(index)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.message(i)
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return list(self)
+
+    # ── Memory ───────────────────────────────────────────────────────────
+
+    def memory_bytes(self) -> int:
+        """Approximate resident size of the columns (lowered column included once built)"""
+        total = (
+            self.sender_ids.nbytes
+            + self.timestamps.nbytes
+            + self.content_offsets.nbytes
+            + len(self.content_buffer)
+            + sum(len(s.encode("utf-8")) for s in self.senders)
+        )
+        if self._lowered is not None:
+            total += len(self._lowered[0]) + self._lowered[1].nbytes
+        return total
+
+    def _lowered_column(self) -> tuple[bytes, np.ndarray]:
+        # lower() bazı harflerde uzunluğu değiştirir (İ -> i̇), ayrı offset gerekir
+        if self._lowered is None:
+            self._lowered = _pack(text.lower() for text in self.contents())
+        return self._lowered
+
+    @staticmethod
+    def _unpack(buffer: bytes, offsets: np.ndarray) -> list[str]:
+        bounds = offsets.tolist()
+        # zip(strict=) yok: ml paketi Python 3.9'u da destekler
+        return [buffer[bounds[i] : bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""Populate the user_stats rollup from existing analyses
+
+Usage: python scripts/backfill_user_stats.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services.user_stats import user_stats_service  # noqa: E402
+
+db = SessionLocal()
+try:
+    count = user_stats_service.backfill(db)
+    print(f"✅ Rebuilt stats rollup for {count} users")
+finally:
+    db.close()
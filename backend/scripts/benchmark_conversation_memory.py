@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Memory of parsed messages: list of dicts vs ConversationTable
+
+Sentetik bir WhatsApp export'u (benchmarks.synthetic) parse edilir; parser'ın
+dict listesi ile aynı mesajlardan kurulan ConversationTable'ın tuttuğu bellek
+tracemalloc ile ölçülür ve 100k mesaja ölçeklenir. "+ lowered" satırları, downstream
+aşamaların küçük harfli içerik kopyasını da tuttuğu durumu gösterir.
+
+Usage: python scripts/benchmark_conversation_memory.py [messages] (default: 100000)
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import generate_export  # noqa: E402
+from ml.preprocessing.conversation_parser import ConversationParser  # noqa: E402
+from ml.preprocessing.conversation_table import ConversationTable  # noqa: E402
+
+
+def measure(build) -> tuple[object, int]:
+    """Bytes retained by the object(s) build() returns"""
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def main(count: int) -> None:
+    text = generate_export("whatsapp", count, seed=7)
+    parser = ConversationParser()
+
+    start = time.perf_counter()
+    tracemalloc.start()
+    messages, dict_bytes = measure(lambda: parser.parse_messages(text, "whatsapp"))
+    parse_s = time.perf_counter() - start
+
+    _, lowered_bytes = measure(lambda: [m["content"].lower() for m in messages])
+
+    start = time.perf_counter()
+    table, table_bytes = measure(lambda: ConversationTable.from_messages(messages))
+    table_s = time.perf_counter() - start
+    # Küçük harfli sütun ilk erişimde tabloya eklenir
+    _, table_lowered_bytes = measure(lambda: table.lowered(0))
+    tracemalloc.stop()
+
+    scale = 100_000 / len(messages)
+    rows = [
+        ("list[dict]", dict_bytes),
+        ("list[dict] + lowered", dict_bytes + lowered_bytes),
+        ("ConversationTable", table_bytes),
+        ("ConversationTable + lowered", table_bytes + table_lowered_bytes),
+    ]
+
+    print(f"{len(messages)} messages (parse {parse_s:.1f}s, table build {table_s:.2f}s)")
+    print(f"{'representation':<30}{'MB / 100k msgs':>16}{'bytes / msg':>14}")
+    for name, size in rows:
+        print(f"{name:<30}{size * scale / 1e6:>16.1f}{size / len(messages):>14.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
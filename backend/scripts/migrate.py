@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""Create or upgrade the database schema once (DB_SCHEMA_BOOTSTRAP without the server)
+
+Çok worker'lı başlatmalardan önce tek süreçte çalıştırılır: boş veritabanı
+create_all + stamp, eski create_all şeması stamp + upgrade, geride kalan upgrade.
+
+Usage: python scripts/migrate.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import engine  # noqa: E402
+from app.core.schema import ensure_schema  # noqa: E402
+from app.models.database import Base  # noqa: E402
+
+result = ensure_schema(engine, Base.metadata, bootstrap=True)
+print(f"✅ Database schema {result}")
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Move existing large analysis reports into the compressed blob table
+
+Usage: python scripts/offload_analysis_reports.py [min_bytes]
+(default: ANALYSIS_REPORT_BLOB_MIN_BYTES, or 16384 when that is disabled)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.services.crud import AnalysisCRUD  # noqa: E402
+
+min_bytes = int(sys.argv[1]) if len(sys.argv) > 1 else settings.ANALYSIS_REPORT_BLOB_MIN_BYTES
+if min_bytes <= 0:
+    min_bytes = 16384
+
+db = SessionLocal()
+try:
+    moved = AnalysisCRUD.offload_large_reports(db, min_bytes)
+    print(f"✅ Moved {moved} reports (>= {min_bytes} bytes) to analysis_report_blobs")
+finally:
+    db.close()
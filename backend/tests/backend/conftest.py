@@ -0,0 +1,36 @@
+"""Shared fixtures for backend unit tests"""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# cache_service singleton'ı import'ta oluşur: testler disk cache dosyası bırakmasın
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+from app.models.database import Base  # noqa: E402
+
+
+@pytest.fixture
+def sqlite_engine():
+    """Empty in-memory SQLite database with every table (shared across threads)"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session_factory(sqlite_engine):
+    return sessionmaker(bind=sqlite_engine)
+
+
+@pytest.fixture
+def sqlite_session(sqlite_session_factory):
+    session = sqlite_session_factory()
+    yield session
+    session.close()
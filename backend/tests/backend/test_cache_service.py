@@ -0,0 +1,143 @@
+"""Unit tests for CacheService and the disk-backed fallback"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from app.core.config import settings
+from app.services.cache_service import (
+    _SET_WITH_TAGS_SCRIPT,
+    ANALYSES_LIST_TAG,
+    BACKEND_ROOT,
+    CacheService,
+    analysis_tag,
+    disk_cache_path,
+    user_tag,
+)
+from app.services.disk_cache import DiskCache
+
+
+def make_memory_cache() -> CacheService:
+    """CacheService forced onto the in-memory fallback"""
+    # CACHE_BACKEND=auto Redis'siz ortamda disk cache dosyası oluştururdu
+    with patch.object(settings, "CACHE_BACKEND", "memory"):
+        return CacheService()
+
+
+def make_disk_cache(tmp_path, max_bytes: int = 1024 * 1024) -> CacheService:
+    """CacheService backed by a DiskCache in a temp directory"""
+    service = make_memory_cache()
+    service.disk_cache = DiskCache(str(tmp_path / "cache.db"), max_bytes=max_bytes)
+    return service
+
+
+class TestCacheTags:
+    """Tag-based invalidation"""
+
+    def test_invalidate_user_tag_removes_only_tagged_keys(self):
+        cache = make_memory_cache()
+        cache.set("daily_analysis_count:1:2026-01-01", 3, tags=[user_tag(1)])
+        cache.set("user_stats:1:2026-01-01", {"total_analyses": 3}, tags=[user_tag(1)])
+        cache.set("user_stats:2:2026-01-01", {"total_analyses": 1}, tags=[user_tag(2)])
+        cache.set("untagged", "value")
+
+        removed = cache.invalidate_tags(user_tag(1))
+
+        assert removed == 2
+        assert cache.get("daily_analysis_count:1:2026-01-01") is None
+        assert cache.get("user_stats:1:2026-01-01") is None
+        assert cache.get("user_stats:2:2026-01-01") == {"total_analyses": 1}
+        assert cache.get("untagged") == "value"
+
+    def test_key_with_multiple_tags(self):
+        cache = make_memory_cache()
+        cache.set("analysis_detail:5", {"id": 5}, tags=[analysis_tag(5), ANALYSES_LIST_TAG])
+
+        assert cache.invalidate_tags(ANALYSES_LIST_TAG) == 1
+        assert cache.get("analysis_detail:5") is None
+        # Other tag index is now stale but harmless
+        assert cache.invalidate_tags(analysis_tag(5)) == 1
+
+    def test_invalidate_unknown_tag(self):
+        cache = make_memory_cache()
+        assert cache.invalidate_tags("user:999") == 0
+        assert cache.invalidate_tags() == 0
+
+    def test_cleanup_prunes_tag_index(self):
+        cache = make_memory_cache()
+        cache.set("short", 1, ttl_seconds=-1, tags=[user_tag(1)])
+        cache._cleanup_expired()
+
+        assert user_tag(1) not in cache.tags
+
+    def test_redis_tagged_set_uses_script(self):
+        # EXPIRE NX/GT (Redis >= 7.0) yok: tek Lua script, TTL karşılaştırmasıyla
+        cache = make_memory_cache()
+        cache.redis_client = MagicMock()
+        script = cache.redis_client.register_script.return_value
+
+        cache.set("analysis_detail:5", {"id": 5}, 60, tags=[analysis_tag(5), user_tag(1)])
+        cache.set("analysis_detail:6", {"id": 6}, 30, tags=[user_tag(1)])
+
+        cache.redis_client.register_script.assert_called_once_with(_SET_WITH_TAGS_SCRIPT)
+        assert script.call_args_list[0].kwargs == {
+            "keys": ["analysis_detail:5", "cache_tag:analysis:5", "cache_tag:user:1"],
+            "args": [60, '{"id": 5}'],
+        }
+        assert script.call_args_list[1].kwargs["keys"] == ["analysis_detail:6", "cache_tag:user:1"]
+        cache.redis_client.pipeline.assert_not_called()
+
+
+class TestDiskCache:
+    """Persistent SQLite backend"""
+
+    def test_values_survive_reopen(self, tmp_path):
+        cache = make_disk_cache(tmp_path)
+        cache.set("ai_relationship_report_v2:abc", {"genel_karne": {"skor": 80}}, ttl_seconds=3600)
+        cache.disk_cache.close()
+
+        reopened = make_disk_cache(tmp_path)
+        assert reopened.get("ai_relationship_report_v2:abc") == {"genel_karne": {"skor": 80}}
+
+    def test_expired_entries_are_dropped_on_reopen(self, tmp_path):
+        cache = make_disk_cache(tmp_path)
+        cache.set("stale", "x", ttl_seconds=-1)
+        cache.set("fresh", "y", ttl_seconds=3600)
+        cache.disk_cache.close()
+
+        disk = DiskCache(str(tmp_path / "cache.db"))
+        assert disk.get("stale") is None
+        assert disk.stats()["entries"] == 1
+
+    def test_size_bound_evicts_least_recently_used(self, tmp_path):
+        disk = DiskCache(str(tmp_path / "cache.db"), max_bytes=1000)
+        payload = "x" * 300
+        disk.set("a", payload, ttl_seconds=3600)
+        time.sleep(0.01)
+        disk.set("b", payload, ttl_seconds=3600)
+        time.sleep(0.01)
+        disk.set("c", payload, ttl_seconds=3600)
+        time.sleep(0.01)
+        disk.set("d", payload, ttl_seconds=3600)
+
+        assert disk.get("a") is None
+        assert disk.get("d") == payload
+        assert disk.stats()["bytes"] <= 1000
+
+    def test_tags_and_delete(self, tmp_path):
+        cache = make_disk_cache(tmp_path)
+        cache.set("user_stats:1:2026-01-01", {"streak": 2}, tags=[user_tag(1)])
+        cache.set("analysis_detail:7", {"id": 7}, tags=[analysis_tag(7)])
+
+        assert cache.invalidate_tags(user_tag(1)) == 1
+        assert cache.get("user_stats:1:2026-01-01") is None
+
+        cache.delete("analysis_detail:7")
+        assert cache.get("analysis_detail:7") is None
+        assert cache.disk_cache.stats()["bytes"] == 0
+
+
+def test_disk_cache_path_is_relative_to_backend_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert disk_cache_path("data/cache/cache.db") == str(BACKEND_ROOT / "data/cache/cache.db")
+    assert disk_cache_path(str(tmp_path / "c.db")) == str(tmp_path / "c.db")
@@ -0,0 +1,78 @@
+"""Unit tests for connection release and pool checkout instrumentation"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import POOL_WAIT_METRIC, InstrumentedQueuePool, release_connection
+from app.core.performance import perf_monitor
+from app.models.database import Base, User
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+class TestReleaseConnection:
+    def test_session_is_lazy_until_first_query(self, engine, session_factory):
+        db = session_factory()
+
+        assert engine.pool.checkedout() == 0
+        db.execute(text("SELECT 1"))
+        assert engine.pool.checkedout() == 1
+        db.close()
+
+    def test_release_returns_connection_and_keeps_loaded_objects(self, engine, session_factory):
+        db = session_factory()
+        db.add(User(email="pool@example.com", hashed_password="x"))
+        db.commit()
+        user = db.query(User).filter(User.email == "pool@example.com").one()
+        assert engine.pool.checkedout() == 1
+
+        release_connection(db)
+
+        # LLM phase: no connection held, the user is still readable
+        assert engine.pool.checkedout() == 0
+        assert user.email == "pool@example.com"
+
+        # Final persist re-acquires a connection on the same session
+        db.add(User(email="second@example.com", hashed_password="x"))
+        db.commit()
+        assert db.query(User).count() == 2
+        db.close()
+
+    def test_released_session_frees_pool_for_other_requests(self, engine, session_factory):
+        long_request = session_factory()
+        long_request.execute(text("SELECT 1"))
+        release_connection(long_request)
+
+        # pool_size=1, max_overflow=0: would time out if the connection were still held
+        other = session_factory()
+        assert other.execute(text("SELECT 1")).scalar() == 1
+        other.close()
+        long_request.close()
+
+
+class TestPoolWaitMetric:
+    def test_checkout_wait_is_recorded(self, engine):
+        before = perf_monitor.get_stats(POOL_WAIT_METRIC).get("count", 0)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert perf_monitor.get_stats(POOL_WAIT_METRIC)["count"] == before + 1
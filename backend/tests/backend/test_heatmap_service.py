@@ -0,0 +1,289 @@
+"""Unit tests for the conversation heatmap feature table"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.heatmap_service import (
+    MAX_TIMELINE_DAYS,
+    ConversationHeatmap,
+    TensionTimeline,
+    _top_k,
+)
+from backend.ml.preprocessing.conversation_table import ConversationTable
+
+
+@pytest.fixture
+def heatmap():
+    return ConversationHeatmap()
+
+
+def message(content: str, timestamp: str = "2024-01-15 14:30", sender: str = "A") -> dict:
+    return {"content": content, "timestamp": timestamp, "sender": sender}
+
+
+class TestFeatureTable:
+    def test_one_row_per_message(self, heatmap):
+        features = heatmap.build_feature_table(
+            [
+                message("para yine bitti 😡", "2024-01-15 14:30"),  # Pazartesi
+                message("olur", "2024-01-20T09:05:00"),  # Cumartesi
+                message("selam", None),
+            ]
+        )
+
+        assert features.tension.tolist() == [15 + 20 + 15, 0, 0]
+        assert features.hour.tolist() == [14, 9, -1]
+        assert features.weekday.tolist() == [0, 5, -1]
+        para = list(heatmap.SENSITIVE_TOPICS).index("para")
+        assert features.topic_hits[:, para].tolist() == [True, False, False]
+
+    def test_simple_time_format_has_hour_but_no_weekday(self, heatmap):
+        features = heatmap.build_feature_table([message("selam", "23:10")])
+
+        assert features.hour.tolist() == [23]
+        assert features.weekday.tolist() == [-1]
+
+    def test_shouting_counts_on_original_case(self, heatmap):
+        features = heatmap.build_feature_table([message("NEREDESİN SEN"), message("neredesin")])
+
+        assert features.tension[0] - features.tension[1] == 25
+
+
+class TestConversationTableInput:
+    def test_table_gives_same_features_as_dicts(self, heatmap):
+        messages = [
+            message("para yine bitti 😡", "2024-01-15 14:30"),
+            message("NEREDESİN SEN", "2024-01-20 09:05"),
+            message("olur", "23:10"),
+            message("selam", None),
+        ]
+
+        expected = heatmap.build_feature_table(messages)
+        features = heatmap.build_feature_table(ConversationTable.from_messages(messages))
+
+        for column in ("tension", "hour", "weekday", "topic_hits"):
+            assert np.array_equal(getattr(features, column), getattr(expected, column))
+        assert np.array_equal(features.epoch, expected.epoch, equal_nan=True)
+
+    def test_peak_moments_from_table(self, heatmap):
+        messages = [message("olur")] * 3 + [message("YINE HEP ASLA 😡!!", sender="B")]
+
+        peaks = heatmap.analyze_heatmap(ConversationTable.from_messages(messages))["peak_moments"]
+
+        assert peaks[0]["sender"] == "B"
+        assert len(peaks[0]["context"]) == 3
+
+
+class TestHeatmapViews:
+    def test_hourly_tension_from_parser_timestamps(self, heatmap):
+        result = heatmap.analyze_heatmap(
+            [message("yine mi", "2024-01-15 14:30"), message("olur", "2024-01-15 14:45")]
+        )
+
+        hour_14 = result["hourly_tension"][14]
+        assert hour_14 == {"hour": 14, "tension": 7.5, "message_count": 2}
+        assert result["overall_tension_score"] == 8
+
+    def test_topic_tension_is_weighted_and_sorted(self, heatmap):
+        result = heatmap.analyze_heatmap(
+            [message("annen aradı"), message("kimle konuştun yine?"), message("para")]
+        )
+
+        topics = [t["topic"] for t in result["topic_tension"]]
+        assert topics[0] == "kiskanclik"
+        kiskanclik = result["topic_tension"][0]
+        assert kiskanclik["tension"] == round((15 + 3) * 1.8, 2)
+        assert kiskanclik["mention_count"] == 1
+
+    def test_peak_moments_keep_top_five_in_order(self, heatmap):
+        messages = [message("olur", sender=str(i)) for i in range(20)]
+        for i in (3, 7, 11, 15, 17, 19):
+            messages[i] = message("yine hep asla 😡!!", sender=str(i))
+        # Same words, shouted: +25
+        messages[11] = message("YINE HEP ASLA 😡!!", sender="11")
+
+        peaks = heatmap.analyze_heatmap(messages)["peak_moments"]
+
+        # Highest first, ties in message order, limited to PEAK_LIMIT
+        assert [p["sender"] for p in peaks] == ["11", "3", "7", "15", "17"]
+        assert len(peaks[0]["context"]) == 5
+
+    def test_trend(self, heatmap):
+        calm = [message("olur")] * 10
+        angry = [message("bıktım yeter yine 😡")] * 10
+
+        assert heatmap.analyze_heatmap(calm + angry)["tension_trend"] == "artiyor"
+        assert heatmap.analyze_heatmap(angry + calm)["tension_trend"] == "azaliyor"
+        assert heatmap.analyze_heatmap(calm[:5])["tension_trend"] == "yetersiz_veri"
+
+    def test_empty(self, heatmap):
+        assert heatmap.analyze_heatmap([])["overall_tension_score"] == 0
+
+
+class TestTimeBuckets:
+    def test_epoch_column_keeps_local_wall_clock(self, heatmap):
+        features = heatmap.build_feature_table(
+            [
+                message("a", "2024-01-15T23:30:00+03:00"),
+                message("b", 1705329000),  # 2024-01-15 14:30 UTC
+                message("c", "23:10"),
+            ]
+        )
+
+        assert features.hour.tolist() == [23, 14, 23]
+        assert features.weekday.tolist() == [0, 0, -1]
+        assert np.isnan(features.epoch[2])
+
+    def test_weekday_hour_matrix(self, heatmap):
+        result = heatmap.analyze_heatmap(
+            [message("yine", "2024-01-15 14:30"), message("olur", "2024-01-20 09:05")]
+        )
+
+        matrix = result["weekday_hour_tension"]
+        assert matrix["tension"][0][14] == 15
+        assert matrix["message_count"][5][9] == 1
+        assert sum(map(sum, matrix["message_count"])) == 2
+
+    def test_daily_and_weekly_buckets(self, heatmap):
+        result = heatmap.analyze_heatmap(
+            [
+                message("yine", "2024-01-14 10:00"),  # Pazar
+                message("olur", "2024-01-15 10:00"),  # Pazartesi, yeni hafta
+                message("yine", "2024-01-15 11:00"),
+            ]
+        )
+
+        assert [d["date"] for d in result["daily_tension"]] == ["2024-01-14", "2024-01-15"]
+        assert result["daily_tension"][1]["tension"] == 7.5
+        weeks = result["weekly_tension"]
+        assert [(w["week_start"], w["message_count"]) for w in weeks] == [
+            ("2024-01-08", 1),
+            ("2024-01-15", 2),
+        ]
+
+    def test_range_query_matches_rescan(self, heatmap):
+        rng = np.random.default_rng(1)
+        start = datetime(2021, 3, 1)
+        minutes = rng.integers(0, 3 * 365 * 24 * 60, 2000)
+        stamps = sorted(start + timedelta(minutes=int(m)) for m in minutes)
+        words = ["olur", "yine", "bıktım yeter 😡", "selam"]
+        messages = [
+            message(words[i % len(words)], stamp.strftime("%Y-%m-%d %H:%M"))
+            for i, stamp in enumerate(stamps)
+        ]
+        timeline = TensionTimeline.from_dict(heatmap.analyze_heatmap(messages)["timeline"])
+
+        lo, hi = date(2022, 2, 10), date(2023, 6, 30)
+        summary = timeline.range_summary(lo, hi)
+
+        selected = [
+            heatmap._calculate_message_tension(m["content"])
+            for m, stamp in zip(messages, stamps)
+            if lo <= stamp.date() <= hi
+        ]
+        assert summary["message_count"] == len(selected)
+        assert summary["tension"] == round(sum(selected) / len(selected), 2)
+
+    def test_range_outside_history_is_empty(self, heatmap):
+        timeline = TensionTimeline.from_dict(
+            heatmap.analyze_heatmap([message("yine", "2024-01-15 10:00")])["timeline"]
+        )
+
+        assert timeline.range_summary(date(2020, 1, 1), date(2020, 12, 31))["message_count"] == 0
+        assert timeline.range_summary(date(2024, 1, 16), date(2024, 1, 15))["message_count"] == 0
+        assert timeline.range_summary()["tension"] == 15
+
+    def test_undated_messages_have_no_timeline(self, heatmap):
+        result = heatmap.analyze_heatmap([message("selam", "23:10")])
+
+        assert result["timeline"] is None
+        assert result["daily_tension"] == []
+
+
+class TestTimestampBounds:
+    """Client timestamps must not size the dense timeline arbitrarily"""
+
+    def test_out_of_window_timestamps_are_undated(self, heatmap):
+        features = heatmap.build_feature_table(
+            [
+                message("a", 0),
+                message("b", 1e11),  # ~5138 yılı; /1000 ile de 1973
+                message("c", "0001-01-01 10:00"),
+                message("d", float("inf")),
+                message("e", 1705329000),
+            ]
+        )
+
+        assert np.isnan(features.epoch[:4]).all()
+        assert features.weekday.tolist() == [-1, -1, -1, -1, 0]
+
+    @pytest.mark.parametrize("as_table", [False, True])
+    def test_out_of_range_hours_are_unknown(self, heatmap, as_table):
+        messages = [
+            message("a", "300:00"),
+            message("b", "24:00"),
+            message("c", "99:10"),
+            message("d", "-3:00"),
+            message("e", "2024-01-15T25:00"),
+            message("f", "23:59"),
+        ]
+        if as_table:
+            messages = ConversationTable.from_messages(messages)
+
+        assert heatmap.build_feature_table(messages).hour.tolist() == [-1, -1, -1, -1, -1, 23]
+        hourly = heatmap.analyze_heatmap(messages)["hourly_tension"]
+        assert len(hourly) == 24
+        assert sum(h["message_count"] for h in hourly) == 1
+
+    def test_unhashable_timestamps_are_undated(self, heatmap):
+        messages = [message("a", ["14:30"]), message("b", {"t": 1}), message("c", "14:30")]
+
+        features = heatmap.build_feature_table(messages)
+
+        assert np.isnan(features.epoch).all()
+        assert features.hour.tolist() == [-1, -1, 14]
+        assert heatmap.analyze_heatmap(messages)["hourly_tension"][14]["message_count"] == 1
+
+    def test_millisecond_epoch_is_scaled(self, heatmap):
+        features = heatmap.build_feature_table([message("a", 1705329000123)])
+
+        assert features.epoch[0] == pytest.approx(1705329000.123)
+        assert features.hour.tolist() == [14]
+
+    def test_long_span_falls_back_to_sparse_rows(self, heatmap):
+        start = datetime(1995, 1, 2, 10, 0)
+        end = start + timedelta(days=MAX_TIMELINE_DAYS + 10)
+        result = heatmap.analyze_heatmap(
+            [
+                message("yine", start.isoformat()),
+                message("olur", start.isoformat()),
+                message("yine", end.isoformat()),
+            ]
+        )
+
+        assert result["timeline"] is None
+        assert [(d["date"], d["message_count"]) for d in result["daily_tension"]] == [
+            ("1995-01-02", 2),
+            (end.date().isoformat(), 1),
+        ]
+        assert result["daily_tension"][0]["tension"] == 7.5
+        assert [w["message_count"] for w in result["weekly_tension"]] == [2, 1]
+        assert result["weekly_tension"][0]["week_start"] == "1995-01-02"
+
+
+class TestTopK:
+    def test_matches_stable_sort(self):
+        rng = np.random.default_rng(0)
+        values = rng.integers(60, 100, size=500).astype(float)
+        candidates = np.flatnonzero(values > 70)
+
+        expected = sorted(candidates, key=lambda i: -values[i])[:5]
+
+        assert _top_k(values, candidates, 5).tolist() == [int(i) for i in expected]
+
+    def test_fewer_candidates_than_k(self):
+        values = np.array([80.0, 10.0, 90.0])
+
+        assert _top_k(values, np.array([0, 2]), 5).tolist() == [2, 0]
@@ -0,0 +1,33 @@
+"""Heavy SDKs must not load at import time (cold start)"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ("openai", "anthropic", "google.generativeai", "stripe", "spacy", "reportlab")
+
+
+def test_app_modules_do_not_import_heavy_sdks():
+    code = (
+        "import sys;"
+        "import app.services.ai_service, app.services.vision_service,"
+        " app.services.audio_service, app.api.subscription, app.services.analysis_service;"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_ROOT,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join([str(BACKEND_ROOT.parent), str(BACKEND_ROOT)]),
+            "AI_PROVIDER": "none",
+        },
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,165 @@
+"""Unit tests for the Prometheus metrics registry, exporter and middleware"""
+
+import os
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import metrics as metrics_module
+from app.core.metrics import (
+    HTTP_DURATION,
+    HTTP_REQUESTS,
+    LLM_REQUESTS,
+    MetricsExporter,
+    MetricsRegistry,
+    merge_snapshots,
+    track_llm_call,
+)
+from app.middleware.metrics import MetricsMiddleware
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    monkeypatch.setattr(metrics_module, "metrics", registry)
+    monkeypatch.setattr("app.middleware.metrics.metrics", registry)
+    return registry
+
+
+def samples(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+class TestRegistry:
+    def test_counter_and_histogram_text_format(self, registry):
+        registry.describe("jobs_total", "counter", "Jobs")
+        registry.inc("jobs_total", kind="a")
+        registry.inc("jobs_total", 2, kind="a")
+        for value in (0.05, 0.5, 5.0):
+            registry.observe("job_seconds", value, kind="a")
+
+        text = registry.render(registry.snapshot())
+
+        assert "# HELP jobs_total Jobs\n# TYPE jobs_total counter" in text
+        assert "# TYPE job_seconds histogram" in text
+        values = samples(text)
+        assert values['jobs_total{kind="a"}'] == 3
+        assert values['job_seconds_bucket{kind="a",le="0.1"}'] == 1
+        assert values['job_seconds_bucket{kind="a",le="1.0"}'] == 2
+        assert values['job_seconds_bucket{kind="a",le="+Inf"}'] == 3
+        assert values['job_seconds_count{kind="a"}'] == 3
+        assert values['job_seconds_sum{kind="a"}'] == pytest.approx(5.55)
+
+    def test_label_values_are_escaped(self, registry):
+        registry.inc("x_total", path='a"b\\c')
+
+        assert 'x_total{path="a\\"b\\\\c"} 1' in registry.render(registry.snapshot())
+
+    def test_collectors_split_counters_and_gauges(self, registry):
+        registry.describe("hits_total", "counter", "")
+        registry.register_collector(lambda: [("hits_total", {}, 7), ("queue_depth", {}, 2)])
+
+        text = registry.render(registry.snapshot())
+
+        assert "# TYPE hits_total counter\nhits_total 7" in text
+        assert "# TYPE queue_depth gauge\nqueue_depth 2" in text
+
+    def test_failing_collector_does_not_break_scrape(self, registry):
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.register_collector(broken)
+        registry.inc("ok_total")
+
+        assert "ok_total 1" in registry.render(registry.snapshot())
+
+
+class TestMultiWorker:
+    def test_merge_sums_counters_and_drops_dead_worker_gauges(self, registry):
+        registry.inc("req_total", route="/a")
+        registry.observe("lat_seconds", 0.05)
+        registry.register_collector(lambda: [("in_flight", {}, 3)])
+        own = registry.snapshot()
+        dead = {**own, "pid": 2**22 + 12345}
+
+        merged = registry.render(merge_snapshots([own, dead]))
+
+        values = samples(merged)
+        assert values['req_total{route="/a"}'] == 2
+        assert values["lat_seconds_count"] == 2
+        assert values["in_flight"] == 3
+
+    def test_exporter_merges_snapshot_files(self, registry, tmp_path):
+        other = MetricsRegistry(buckets=(0.1, 1.0))
+        other.inc("req_total", 5)
+        snapshot = other.snapshot()
+        snapshot["pid"] = os.getppid()  # a live process
+        MetricsExporter(other, directory=str(tmp_path)).write_snapshot(snapshot)
+
+        registry.inc("req_total", 1)
+        exporter = MetricsExporter(registry, directory=str(tmp_path))
+
+        assert samples(exporter.render())["req_total"] == 6
+        assert (tmp_path / f"worker-{os.getpid()}.json").exists()
+
+    def test_single_process_without_directory(self, registry, tmp_path):
+        registry.inc("req_total")
+
+        assert samples(MetricsExporter(registry, directory="").render())["req_total"] == 1
+
+
+class TestMiddleware:
+    @pytest.fixture
+    def client(self, registry):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            if item_id == 0:
+                raise HTTPException(status_code=404)
+            return {"id": item_id}
+
+        return TestClient(app)
+
+    def test_route_template_and_status_labels(self, client, registry):
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/items/0")
+        client.get("/nope")
+
+        values = samples(registry.render(registry.snapshot()))
+        ok = f'{HTTP_REQUESTS}{{method="GET",route="/items/{{item_id}}",status="200"}}'
+        assert values[ok] == 2
+        missing = f'{HTTP_REQUESTS}{{method="GET",route="/items/{{item_id}}",status="404"}}'
+        assert values[missing] == 1
+        assert values[f'{HTTP_REQUESTS}{{method="GET",route="unmatched",status="404"}}'] == 1
+        count = f'{HTTP_DURATION}_count{{method="GET",route="/items/{{item_id}}"}}'
+        assert values[count] == 3
+
+
+class TestLLMTracking:
+    def test_outcome_per_provider(self, registry):
+        class FakeService:
+            provider = "ollama"
+
+            @track_llm_call("text")
+            def call(self, fail: bool):
+                if fail:
+                    raise RuntimeError("down")
+                return "ok"
+
+        service = FakeService()
+        service.call(False)
+        with pytest.raises(RuntimeError):
+            service.call(True)
+
+        values = samples(registry.render(registry.snapshot()))
+        labels = 'call="text",outcome="{}",provider="ollama"'
+        assert values[f"{LLM_REQUESTS}{{{labels.format('success')}}}"] == 1
+        assert values[f"{LLM_REQUESTS}{{{labels.format('error')}}}"] == 1
@@ -0,0 +1,136 @@
+"""Unit tests for the offline mock LLM provider"""
+
+import io
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.schemas import ai_responses, analysis
+from app.services import mock_llm
+from app.services.ai_service import AIService
+from app.services.mock_llm import MockLLMClient, MockLLMError, MockRateLimitError
+
+METRICS = {
+    "sentiment": {"score": 62},
+    "empathy": {"score": 55},
+    "conflict": {"score": 40},
+    "we_language": {"score": 48},
+}
+
+
+@pytest.fixture
+def service():
+    service = AIService()
+    result = service.switch_provider("mock", mock_options={"latency_ms": 0})
+    assert result["available"]
+    return service
+
+
+class TestCannedResponses:
+    def test_structured_responses_match_schemas(self):
+        ai_responses.InsightsResponse.model_validate(mock_llm.INSIGHTS)
+        ai_responses.RecommendationsResponse.model_validate(mock_llm.RECOMMENDATIONS)
+        ai_responses.RelationshipReport.model_validate(mock_llm.GOTTMAN_REPORT)
+
+    def test_gottman_report_matches_api_schema(self, service):
+        report = service._parse_relationship_report(
+            json.dumps(mock_llm.GOTTMAN_REPORT), METRICS
+        )
+
+        analysis.RelationshipReport.model_validate(report)
+
+
+class TestMockClient:
+    def test_latency_distribution(self):
+        client = MockLLMClient(latency_ms=100, latency_sigma=0.5, seed=1)
+
+        samples = sorted(client._sample_latency() for _ in range(2000))
+
+        assert samples[1000] == pytest.approx(0.1, rel=0.1)
+        assert samples[0] < 0.05 < 0.2 < samples[-1]
+
+    def test_injected_errors_and_rate_limits(self):
+        client = MockLLMClient(latency_ms=0, error_rate=0.2, rate_limit_rate=0.3, seed=7)
+
+        outcomes = []
+        for _ in range(1000):
+            try:
+                client.complete("özetle", max_tokens=100)
+                outcomes.append("ok")
+            except MockRateLimitError as e:
+                assert e.status_code == 429
+                outcomes.append("429")
+            except MockLLMError:
+                outcomes.append("error")
+
+        assert outcomes.count("429") == pytest.approx(300, abs=50)
+        assert outcomes.count("error") == pytest.approx(200, abs=50)
+        assert client.stats()["rate_limited"] == outcomes.count("429")
+
+    def test_stream_yields_tokens_with_delay(self):
+        client = MockLLMClient(latency_ms=0, stream_chunk_ms=2)
+
+        start = time.perf_counter()
+        chunks = list(client.stream("merhaba", max_tokens=20))
+
+        assert 1 < len(chunks) <= 20
+        assert all(len(chunk) <= mock_llm.CHARS_PER_TOKEN for chunk in chunks)
+        assert mock_llm.COACH_REPLY.startswith("".join(chunks))
+        assert time.perf_counter() - start >= (len(chunks) - 1) * 0.002
+
+
+@patch("app.services.ai_service.cache_service")
+class TestAIServiceWithMock:
+    def test_insights_and_recommendations_use_llm(self, mock_cache, service):
+        mock_cache.get.return_value = None
+
+        insights = service.generate_insights(METRICS, "özet")
+        recommendations = service.generate_recommendations(METRICS, insights)
+
+        assert [i["title"] for i in insights] == [
+            i["title"] for i in mock_llm.INSIGHTS["insights"]
+        ]
+        assert recommendations[0]["title"] == "Günlük Check-in Rutini"
+
+    def test_gottman_report(self, mock_cache, service):
+        mock_cache.get.return_value = None
+
+        report = service.generate_relationship_report("Ahmet: merhaba", METRICS)
+
+        assert report["meta_data"]["model"] == "mock"
+        assert report["genel_karne"]["iliskki_sagligi"] == 68
+
+    def test_text_paths(self, mock_cache, service):
+        assert service.chat_with_coach("ne yapmalıyım?", history=[]).startswith("Anlattıkların")
+        assert len(service.generate_reply_suggestions(METRICS, "özet")) == 3
+        assert service.suggest_conflict_action("yeter ama")["action"] == "Mola Verin"
+
+    def test_rate_limit_falls_back_and_is_counted(self, mock_cache, service):
+        mock_cache.get.return_value = None
+        service.switch_provider("mock", mock_options={"latency_ms": 0, "rate_limit_rate": 1})
+
+        insights = service.generate_insights(METRICS, "özet")
+
+        assert insights == service._fallback_insights(METRICS)
+        assert service.mock_client.stats()["rate_limited"] == 1
+
+    def test_switching_away_disables_mock(self, mock_cache, service):
+        service.switch_provider("none")
+
+        assert service.mock_client is None
+        assert not service._is_available()
+
+
+class TestVisionAndAudio:
+    def test_follow_runtime_mock_provider(self, service):
+        from app.services.audio_service import AudioService
+        from app.services.vision_service import VisionAnalysisService
+
+        with patch("app.services.ai_service.get_ai_service", return_value=service):
+            vision = VisionAnalysisService().analyze_screenshot(b"\x89PNG")
+            transcript = AudioService().transcribe_audio(io.BytesIO(b"RIFF"), "note.wav")
+
+        assert vision["katilimcilar"] == ["Ahmet", "Ayşe"]
+        assert transcript.startswith("Ahmet:")
@@ -0,0 +1,152 @@
+"""Unit tests for keyset (cursor) pagination"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+
+from app.core.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+from app.models.database import Analysis, ChatSession, DailyPulse, Feedback, User
+from app.repositories.feedback_repository import FeedbackRepository
+from app.services.crud import AnalysisCRUD
+
+START = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(sqlite_session):
+    sqlite_session.add_all(
+        [
+            User(id=1, email="pages@example.com", hashed_password="x"),
+            User(id=2, email="other@example.com", hashed_password="x"),
+        ]
+    )
+    # 25 analyses for user 1, pairs share a timestamp to exercise the id tie-breaker
+    for i in range(25):
+        created_at = START + timedelta(minutes=i // 2)
+        sqlite_session.add(Analysis(user_id=1, overall_score=float(i), created_at=created_at))
+    sqlite_session.add(Analysis(user_id=2, overall_score=0.0, created_at=START))
+    sqlite_session.commit()
+    return sqlite_session
+
+
+def walk(fetch, limit: int) -> list:
+    """Follow cursors until the last page"""
+    items, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        items.extend(page)
+        cursor = next_cursor(page, limit)
+        if cursor is None:
+            return items
+
+
+class TestCursorEncoding:
+    def test_roundtrip(self):
+        cursor = encode_cursor(START, 42)
+        assert decode_cursor(cursor) == (START, 42)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", "bm90aGluZw", "!!!"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestKeysetPagination:
+    def test_walks_all_rows_once_in_order(self, db):
+        items = walk(lambda c: AnalysisCRUD.get_user_analyses(db, 1, limit=4, cursor=c), 4)
+
+        assert len(items) == 25
+        assert len({a.id for a in items}) == 25
+        keys = [(a.created_at, a.id) for a in items]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_matches_offset_pagination(self, db):
+        offset_pages = [AnalysisCRUD.get_user_analyses(db, 1, skip=s, limit=5) for s in (0, 5, 10)]
+        keyset = walk(lambda c: AnalysisCRUD.get_user_analyses(db, 1, limit=5, cursor=c), 5)
+
+        assert [a.id for page in offset_pages for a in page] == [a.id for a in keyset[:15]]
+
+    def test_global_listing_includes_other_users(self, db):
+        items = walk(lambda c: AnalysisCRUD.get_recent_analyses(db, limit=10, cursor=c), 10)
+        assert len(items) == 26
+
+    def test_repository_cursor(self, db):
+        for i in range(3):
+            db.add(Feedback(user_id=1, rating=5, created_at=START + timedelta(minutes=i)))
+        db.commit()
+        repo = FeedbackRepository(db)
+
+        first = repo.get_by_user(1, limit=2)
+        rest = repo.get_by_user(1, limit=2, cursor=next_cursor(first, 2))
+
+        assert [f.rating for f in first + rest] == [5, 5, 5]
+        assert next_cursor(rest, 2) is None
+
+
+class TestServerDefaultTimestamps:
+    """SQLite: server_default=func.now() stores `YYYY-MM-DD HH:MM:SS` (no microseconds)"""
+
+    @pytest.fixture
+    def user(self, sqlite_session):
+        sqlite_session.add(User(id=1, email="defaults@example.com", hashed_password="x"))
+        sqlite_session.commit()
+        return sqlite_session
+
+    def walk_model(self, db, model, sort_column, limit: int = 2) -> list[int]:
+        def fetch(cursor):
+            stmt = apply_keyset(select(model), sort_column, model.id, cursor)
+            return list(db.scalars(stmt.limit(limit)))
+
+        sort_attr = sort_column.key
+        items, cursor = [], None
+        for _ in range(20):
+            page = fetch(cursor)
+            items.extend(page)
+            cursor = next_cursor(page, limit, sort_attr)
+            if cursor is None:
+                return [item.id for item in items]
+        pytest.fail(f"cursor did not advance: {[item.id for item in items]}")
+
+    @pytest.mark.parametrize(
+        "model, sort_attr, make",
+        [
+            (Analysis, "created_at", lambda: Analysis(user_id=1, overall_score=1.0)),
+            (Feedback, "created_at", lambda: Feedback(user_id=1, rating=5)),
+            (ChatSession, "updated_at", lambda: ChatSession(user_id=1, title="t")),
+            (
+                DailyPulse,
+                "created_at",
+                lambda: DailyPulse(user_id=1, date=START, mood_score=5, connection_score=5),
+            ),
+        ],
+    )
+    def test_cursor_advances_over_server_default_rows(self, user, model, sort_attr, make):
+        user.add_all([make() for _ in range(5)])
+        user.commit()
+        stored = user.execute(text(f"SELECT {sort_attr} FROM {model.__tablename__}")).scalar()
+        assert "." not in stored
+
+        assert self.walk_model(user, model, getattr(model, sort_attr)) == [5, 4, 3, 2, 1]
+
+    def test_mixed_storage_forms_of_the_same_second(self, user):
+        # Aynı saniye iki biçimde: server default (1-3) ve Python datetime (4-6)
+        for _ in range(3):
+            user.add(Analysis(user_id=1, overall_score=1.0))
+        user.commit()
+        user.execute(text("UPDATE analyses SET created_at = '2026-01-01 12:00:00'"))
+        for _ in range(3):
+            user.add(Analysis(user_id=1, overall_score=1.0, created_at=START.replace(tzinfo=None)))
+        user.add(Analysis(user_id=1, overall_score=1.0, created_at=START + timedelta(seconds=1)))
+        user.commit()
+
+        ids = self.walk_model(user, Analysis, Analysis.created_at)
+
+        assert sorted(ids) == list(range(1, 8))
+        assert ids[0] == 7
@@ -0,0 +1,83 @@
+"""Unit tests for the bounded password hashing pool"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.security import PasswordHasher, PasswordHasherBusyError
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(max_workers=2, max_pending=2)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_roundtrip(self, hasher):
+        hashed = await hasher.hash("S3cret-pass")
+
+        assert await hasher.verify("S3cret-pass", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self, hasher):
+        loop_thread = threading.get_ident()
+
+        worker_thread = await hasher.run(threading.get_ident)
+
+        assert worker_thread != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_loop_keeps_serving_while_hashing(self, hasher):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await hasher.run(time.sleep, 0.2)
+        task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self, hasher):
+        release = threading.Event()
+        busy = [asyncio.create_task(hasher.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.run(lambda: None)
+
+        release.set()
+        await asyncio.gather(*busy)
+        assert hasher.stats()["rejected"] == 1
+        # Slots are free again
+        assert await hasher.run(lambda: 42) == 42
+
+    @pytest.mark.asyncio
+    async def test_slot_held_until_thread_finishes_after_cancel(self, hasher):
+        release = threading.Event()
+        task = asyncio.create_task(hasher.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+
+        task.cancel()
+        await asyncio.sleep(0)
+        # Cancelled request: the thread is still hashing, so the slot stays taken
+        assert hasher.stats()["in_flight"] == 1
+
+        release.set()
+        for _ in range(50):
+            if hasher.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hasher.stats()["in_flight"] == 0
@@ -0,0 +1,195 @@
+"""Unit tests for the bounded, percentile-aware PerformanceMonitor"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import system
+from app.api.auth import get_current_principal
+from app.core import performance
+from app.core.config import settings
+from app.core.performance import (
+    HISTOGRAM_BUCKET_COUNT,
+    LatencyHistogram,
+    PerformanceMonitor,
+    time_operation,
+)
+from app.services.principal_cache import Principal
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_bucket_error(self):
+        rng = np.random.default_rng(0)
+        durations = rng.lognormal(mean=-4, sigma=1.5, size=20_000)
+        histogram = LatencyHistogram()
+        for d in durations:
+            histogram.record(float(d))
+
+        for q in (0.5, 0.95, 0.99):
+            exact = float(np.quantile(durations, q))
+            assert histogram.quantile(q) == pytest.approx(exact, rel=0.05)
+        assert histogram.min == durations.min()
+        assert histogram.max == durations.max()
+
+    def test_memory_is_fixed(self):
+        histogram = LatencyHistogram()
+        for i in range(10_000):
+            histogram.record(i * 1e-3)
+
+        assert len(histogram.counts) == HISTOGRAM_BUCKET_COUNT
+        assert histogram.count == 10_000
+
+    def test_extremes_are_clamped(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0)
+        histogram.record(1e9)
+
+        assert histogram.quantile(0.0) == 0.0
+        assert histogram.quantile(1.0) == 1e9
+
+    def test_merge_equals_single_histogram(self):
+        a, b, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1, 500):
+            (a if i % 2 else b).record(i / 1000)
+            combined.record(i / 1000)
+
+        a.merge(LatencyHistogram.from_snapshot(b.snapshot()))
+
+        assert a.counts == combined.counts
+        assert a.quantile(0.95) == combined.quantile(0.95)
+        assert a.total == pytest.approx(combined.total)
+
+
+class TestPerformanceMonitor:
+    def test_stats_keys(self):
+        monitor = PerformanceMonitor()
+        for d in (0.1, 0.2, 0.3):
+            monitor.record("op", d)
+
+        stats = monitor.get_stats("op")
+        assert stats["count"] == 3
+        assert stats["avg"] == pytest.approx(0.2)
+        assert stats["min"] == 0.1 and stats["max"] == 0.3
+        assert stats["p50"] == pytest.approx(0.2, rel=0.05)
+        assert monitor.get_stats("missing") == {}
+
+    def test_concurrent_records(self):
+        monitor = PerformanceMonitor()
+
+        def worker():
+            for _ in range(5_000):
+                monitor.record("op", 0.001)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert monitor.get_stats("op")["count"] == 20_000
+
+    def test_merge_snapshot_from_other_worker(self):
+        local, remote = PerformanceMonitor(), PerformanceMonitor()
+        local.record("op", 0.01)
+        remote.record("op", 0.02)
+        remote.record("other", 0.5)
+
+        local.merge_snapshot(remote.snapshot())
+
+        assert local.get_stats("op")["count"] == 2
+        assert local.get_stats("other")["count"] == 1
+
+
+class TestTimeOperation:
+    @pytest.fixture
+    def monitor(self, monkeypatch):
+        monitor = PerformanceMonitor()
+        monkeypatch.setattr(performance, "perf_monitor", monitor)
+        return monitor
+
+    def test_sync_function(self, monitor):
+        @time_operation("sync_op")
+        def add(a, b):
+            return a + b
+
+        assert add(1, 2) == 3
+        assert add.__name__ == "add"
+        assert monitor.get_stats("sync_op")["count"] == 1
+
+    def test_records_on_exception(self, monitor):
+        @time_operation("failing_op")
+        def fail():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            fail()
+        assert monitor.get_stats("failing_op")["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_function_measures_awaited_time(self, monitor):
+        @time_operation("async_op")
+        async def wait():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        assert await wait() == "done"
+        assert monitor.get_stats("async_op")["min"] >= 0.05
+
+
+class TestAnalyzerStages:
+    def test_service_times_ml_stages(self, monkeypatch):
+        from app.services.analysis_service import instrument_analyzer
+        from backend.ml.analyzer import RelationshipAnalyzer
+
+        monitor = PerformanceMonitor()
+        monkeypatch.setattr(performance, "perf_monitor", monitor)
+        analyzer = RelationshipAnalyzer()
+        instrument_analyzer(analyzer)
+        instrument_analyzer(analyzer)  # tekrar sarmaz
+
+        with patch.object(analyzer.report_generator, "generate_report", return_value={}):
+            analyzer.analyze_text("Ali: Seni seviyorum\nAyşe: Ben de seni", format_type="simple")
+
+        for operation in [
+            "parser.parse",
+            "preprocessing.preprocess",
+            "metrics.sentiment",
+            "metrics.communication_balance",
+        ]:
+            assert monitor.get_stats(operation)["count"] == 1
+
+
+class TestPerformanceEndpoint:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "admin@example.com")
+        principal = {"email": "admin@example.com"}
+
+        app = FastAPI()
+        app.include_router(system.router, prefix="/api/system")
+        app.dependency_overrides[get_current_principal] = lambda: Principal(
+            id=1, email=principal["email"], full_name=None, is_pro=False, is_active=True
+        )
+        return TestClient(app), principal
+
+    def test_admin_sees_percentiles(self, client):
+        client, _ = client
+        performance.perf_monitor.record("endpoint_test_op", 0.25)
+
+        response = client.get("/api/system/performance", params={"include_histograms": True})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["operations"]["endpoint_test_op"]["p99"] == pytest.approx(0.25)
+        assert "endpoint_test_op" in body["histograms"]
+
+    def test_non_admin_forbidden(self, client):
+        client, principal = client
+        principal["email"] = "user@example.com"
+
+        assert client.get("/api/system/performance").status_code == 403
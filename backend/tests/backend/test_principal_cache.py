@@ -0,0 +1,150 @@
+"""Unit tests for the authenticated-principal cache"""
+
+import time
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import auth
+from app.core.security import create_access_token
+from app.models.database import Base, User
+from app.repositories import AsyncUserRepository
+from app.services.principal_cache import Principal, PrincipalCache, token_digest
+
+
+def make_principal(user_id: int = 1, is_pro: bool = False) -> Principal:
+    return Principal(
+        id=user_id, email=f"u{user_id}@example.com", full_name=None, is_pro=is_pro, is_active=True
+    )
+
+
+def future_claims(seconds: float = 3600) -> dict:
+    return {"sub": "u1@example.com", "exp": time.time() + seconds}
+
+
+class TestPrincipalCache:
+    def test_hit_after_put(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+        principal = make_principal()
+
+        assert cache.get("token") is None
+        cache.put("token", future_claims(), principal)
+
+        assert cache.get("token") == principal
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_keys_are_token_digests(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+        cache.put("secret-token", future_claims(), make_principal())
+
+        assert "secret-token" not in cache._entries
+        assert token_digest("secret-token") in cache._entries
+
+    def test_entry_expires_after_ttl(self, monkeypatch):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+        now = time.monotonic()
+        monkeypatch.setattr("app.services.principal_cache.time.monotonic", lambda: now)
+        cache.put("token", future_claims(), make_principal())
+
+        monkeypatch.setattr("app.services.principal_cache.time.monotonic", lambda: now + 31)
+
+        assert cache.get("token") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_never_outlives_token_exp(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+
+        cache.put("expired", future_claims(-1), make_principal())
+
+        assert cache.get("expired") is None
+
+    def test_invalidate_user_drops_all_tokens(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+        cache.put("a", future_claims(), make_principal(1))
+        cache.put("b", future_claims(), make_principal(1))
+        cache.put("c", future_claims(), make_principal(2))
+
+        assert cache.invalidate_user(1) == 2
+        assert cache.get("a") is None and cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=2)
+        cache.put("a", future_claims(), make_principal(1))
+        cache.put("b", future_claims(), make_principal(2))
+        cache.get("a")
+        cache.put("c", future_claims(), make_principal(3))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert 2 not in cache._by_user
+
+    def test_disabled_with_zero_ttl(self):
+        cache = PrincipalCache(ttl_seconds=0, max_entries=10)
+        cache.put("token", future_claims(), make_principal())
+
+        assert cache.get("token") is None
+
+
+@pytest_asyncio.fixture
+async def user_repo():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        repo = AsyncUserRepository(db)
+        await repo.create(
+            User(email="cached@example.com", hashed_password="x", full_name="Cached", is_pro=True)
+        )
+        statements.clear()
+        yield repo, statements
+    await engine.dispose()
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = PrincipalCache(ttl_seconds=30, max_entries=100)
+    monkeypatch.setattr(auth, "principal_cache", cache)
+    return cache
+
+
+class TestGetCurrentPrincipal:
+    @pytest.mark.asyncio
+    async def test_second_request_skips_users_lookup(self, user_repo, fresh_cache):
+        repo, statements = user_repo
+        token = create_access_token({"sub": "cached@example.com"})
+
+        first = await auth.get_current_principal(token, repo)
+        lookups = len(statements)
+        second = await auth.get_current_principal(token, repo)
+
+        assert lookups == 1
+        assert len(statements) == lookups
+        assert first == second
+        assert first.is_pro is True and first.full_name == "Cached"
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self, user_repo, fresh_cache):
+        repo, _ = user_repo
+
+        with pytest.raises(HTTPException) as exc:
+            await auth.get_current_principal("not-a-jwt", repo)
+
+        assert exc.value.status_code == 401
+        assert fresh_cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_optional_principal_for_anonymous(self, user_repo, fresh_cache):
+        repo, statements = user_repo
+
+        assert await auth.get_optional_principal(None, repo) is None
+        assert await auth.get_optional_principal("not-a-jwt", repo) is None
+        assert not statements
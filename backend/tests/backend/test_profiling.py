@@ -0,0 +1,177 @@
+"""Unit tests for admin-triggered request profiling"""
+
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import system
+from app.api.auth import get_current_principal
+from app.core import profiling
+from app.core.config import settings
+from app.core.profiling import ProfileStore, RequestProfiler, SamplingProfiler, profile_key
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+from app.services.principal_cache import Principal
+
+
+def busy_loop(seconds: float) -> int:
+    total, end = 0, time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+class TestSamplingProfiler:
+    def test_samples_busy_thread(self):
+        sampler = SamplingProfiler(interval=0.001)
+        sampler.start()
+        busy_loop(0.1)
+        stacks = sampler.stop()
+
+        assert sampler.samples > 10
+        hot = [stack for stack in stacks if "busy_loop" in stack]
+        assert hot
+        # Kök frame thread adı, yaprak en içteki fonksiyon
+        assert hot[0].startswith("MainThread;")
+
+    def test_frame_label_without_qualname(self):
+        # Python 3.10 code nesnelerinde co_qualname yok
+        code = SimpleNamespace(co_name="handler", co_filename=__file__, co_firstlineno=7)
+
+        label = profiling._frame_label(SimpleNamespace(f_code=code))
+        assert label == "handler (tests/backend/test_profiling.py:7)"
+
+    def test_waiting_threads_are_skipped(self):
+        release = threading.Event()
+        waiter = threading.Thread(target=release.wait, name="waiter")
+        waiter.start()
+        sampler = SamplingProfiler(interval=0.001)
+        sampler.start()
+        busy_loop(0.05)
+        stacks = sampler.stop()
+        release.set()
+        waiter.join()
+
+        assert not [stack for stack in stacks if stack.startswith("waiter;")]
+
+
+class TestProfileStore:
+    def test_retention_keeps_newest(self, tmp_path):
+        store = ProfileStore(str(tmp_path), max_profiles=2)
+        for i in range(3):
+            stacks = Counter({"MainThread;f (a.py:1)": 3})
+            store.save(f"req-{i}", stacks, {"request_id": f"req-{i}"})
+            time.sleep(0.01)
+
+        assert [p["request_id"] for p in store.list()] == ["req-2", "req-1"]
+        assert store.folded("req-0") is None
+        assert store.folded("req-2") == "MainThread;f (a.py:1) 3\n"
+
+    def test_request_id_cannot_escape_directory(self, tmp_path):
+        assert profile_key("../../etc/passwd") == "______etc_passwd"
+        assert ProfileStore(str(tmp_path), 5).summary("../x") is None
+
+
+class TestRequestProfiler:
+    @pytest.fixture
+    def profiler(self, tmp_path):
+        return RequestProfiler(str(tmp_path), max_profiles=5, interval=0.001, token_ttl=60)
+
+    def test_token_is_single_use(self, profiler):
+        token = profiler.issue_token()
+
+        session = profiler.begin(token, "req-1")
+        assert session is not None
+        session.finish(200)
+
+        assert profiler.begin(token, "req-2") is None
+        assert profiler.begin("unknown", "req-3") is None
+
+    def test_expired_token_rejected(self, profiler):
+        profiler.token_ttl = -1
+
+        assert profiler.begin(profiler.issue_token(), "req-1") is None
+
+    def test_one_session_at_a_time(self, profiler):
+        first, second = profiler.issue_token(), profiler.issue_token()
+        session = profiler.begin(first, "req-1")
+
+        assert profiler.begin(second, "req-2") is None
+        session.finish(200)
+        # Meşgulken reddedilen token tüketilmez
+        other = profiler.begin(second, "req-2")
+        assert other is not None
+        other.finish(200)
+
+    def test_summary_lists_allocations(self, profiler):
+        session = profiler.begin(profiler.issue_token(), "req-1")
+        blocks = [bytearray(1024) for _ in range(1000)]
+        summary = session.finish(200)
+
+        assert len(blocks) == 1000
+        assert summary["peak_traced_bytes"] >= 1024 * 1000
+        top = summary["retained_allocations"][0]
+        assert top["location"].startswith("tests/backend/test_profiling.py:")
+        assert top["size_bytes"] >= 1024 * 1000
+        assert profiler.store.summary("req-1")["status_code"] == 200
+
+
+class TestProfilingEndpoints:
+    @pytest.fixture
+    def client(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "admin@example.com")
+        profiler = RequestProfiler(str(tmp_path), max_profiles=5, interval=0.001, token_ttl=60)
+        monkeypatch.setattr(profiling, "request_profiler", profiler)
+        monkeypatch.setattr(system, "request_profiler", profiler)
+        monkeypatch.setattr("app.middleware.profiling.request_profiler", profiler)
+        principal = {"email": "admin@example.com"}
+
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware)
+        app.add_middleware(RequestIDMiddleware)
+        app.include_router(system.router, prefix="/api/system")
+        app.dependency_overrides[get_current_principal] = lambda: Principal(
+            id=1, email=principal["email"], full_name=None, is_pro=False, is_active=True
+        )
+
+        @app.get("/work")
+        def work():
+            return {"total": busy_loop(0.05)}
+
+        return TestClient(app), principal
+
+    def test_profile_round_trip(self, client):
+        client, _ = client
+        token = client.post("/api/system/profiling").json()["token"]
+
+        response = client.get(
+            "/work", headers={"X-Profile-Token": token, "X-Request-ID": "slow-upload"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["X-Profile-Id"] == "slow-upload"
+        profiles = client.get("/api/system/profiles").json()["profiles"]
+        assert [p["request_id"] for p in profiles] == ["slow-upload"]
+        summary = client.get("/api/system/profiles/slow-upload").json()
+        assert summary["samples"] > 0 and summary["status_code"] == 200
+        folded = client.get("/api/system/profiles/slow-upload/flamegraph").text
+        assert "busy_loop" in folded
+
+    def test_requests_without_valid_token_are_not_profiled(self, client):
+        client, _ = client
+
+        assert "X-Profile-Id" not in client.get("/work").headers
+        assert "X-Profile-Id" not in client.get("/work", headers={"X-Profile-Token": "x"}).headers
+        assert client.get("/api/system/profiles").json()["profiles"] == []
+
+    def test_non_admin_cannot_arm_profiling(self, client):
+        client, principal = client
+        principal["email"] = "user@example.com"
+
+        assert client.post("/api/system/profiling").status_code == 403
+        assert client.get("/api/system/profiles").status_code == 403
@@ -0,0 +1,74 @@
+"""Unit tests for deferred full_report loading and compressed report blobs"""
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.database import Analysis, AnalysisReportBlob
+from app.services.crud import AnalysisCRUD
+
+BIG_REPORT = {"insights": [{"text": "İletişim güçlü " * 50}] * 40, "summary": "ok"}
+
+
+def capture_sql(engine) -> list[str]:
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestDeferredReport:
+    def test_list_queries_do_not_select_full_report(self, sqlite_engine, sqlite_session):
+        sqlite_session.add(Analysis(overall_score=70.0, summary="s", full_report=BIG_REPORT))
+        sqlite_session.commit()
+        sqlite_session.expunge_all()
+
+        statements = capture_sql(sqlite_engine)
+        analyses = AnalysisCRUD.get_recent_analyses(sqlite_session, limit=10)
+
+        assert analyses[0].overall_score == 70.0
+        assert not any("full_report" in sql for sql in statements)
+
+    def test_detail_loads_report(self, sqlite_session):
+        sqlite_session.add(Analysis(id=1, overall_score=70.0, full_report={"insights": ["a"]}))
+        sqlite_session.commit()
+        sqlite_session.expunge_all()
+
+        analysis = AnalysisCRUD.get_analysis_by_id(sqlite_session, 1, with_report=True)
+        assert analysis.full_report == {"insights": ["a"]}
+
+
+class TestReportBlob:
+    def test_large_report_is_compressed(self, sqlite_session, monkeypatch):
+        monkeypatch.setattr(settings, "ANALYSIS_REPORT_BLOB_MIN_BYTES", 1024)
+        sqlite_session.add(Analysis(id=1, overall_score=50.0, full_report=BIG_REPORT))
+        sqlite_session.add(Analysis(id=2, overall_score=50.0, full_report={"small": True}))
+        sqlite_session.commit()
+        sqlite_session.expunge_all()
+
+        blob = sqlite_session.get(AnalysisReportBlob, 1)
+        assert len(blob.data) < blob.raw_size / 10
+        assert sqlite_session.get(AnalysisReportBlob, 2) is None
+
+        large = AnalysisCRUD.get_analysis_by_id(sqlite_session, 1, with_report=True)
+        small = AnalysisCRUD.get_analysis_by_id(sqlite_session, 2, with_report=True)
+        assert large.full_report == BIG_REPORT
+        assert small.full_report == {"small": True}
+
+    def test_delete_removes_blob(self, sqlite_session, monkeypatch):
+        monkeypatch.setattr(settings, "ANALYSIS_REPORT_BLOB_MIN_BYTES", 1024)
+        sqlite_session.add(Analysis(id=1, overall_score=50.0, full_report=BIG_REPORT))
+        sqlite_session.commit()
+
+        assert AnalysisCRUD.delete_analysis(sqlite_session, 1)
+        assert sqlite_session.query(AnalysisReportBlob).count() == 0
+
+    def test_offload_existing_reports(self, sqlite_session):
+        sqlite_session.add(Analysis(id=1, overall_score=50.0, full_report=BIG_REPORT))
+        sqlite_session.add(Analysis(id=2, overall_score=50.0, full_report={"small": True}))
+        sqlite_session.commit()
+
+        assert AnalysisCRUD.offload_large_reports(sqlite_session, min_bytes=1024, batch_size=1) == 1
+        sqlite_session.expunge_all()
+
+        analysis = AnalysisCRUD.get_analysis_by_id(sqlite_session, 1, with_report=True)
+        assert analysis.full_report_json is None
+        assert analysis.full_report == BIG_REPORT
@@ -0,0 +1,145 @@
+"""Unit tests for the async repositories (aiosqlite)"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import get_async_database_url
+from app.core.pagination import next_cursor
+from app.models.database import Analysis, Base, Feedback, User, UserStats
+from app.repositories import (
+    AsyncAnalysisRepository,
+    AsyncFeedbackRepository,
+    AsyncUserRepository,
+)
+from app.services.cache_service import ANALYSES_LIST_TAG, analysis_tag, cache_service, user_tag
+
+BASE_TIME = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as db:
+        yield db
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def user(session):
+    return await AsyncUserRepository(session).create(
+        User(email="async@example.com", hashed_password="hashed", full_name="Async User")
+    )
+
+
+class TestAsyncDatabaseUrl:
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+            ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+            ("sqlite:///./data/app.db", "sqlite+aiosqlite:///./data/app.db"),
+            ("sqlite+aiosqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+        ],
+    )
+    def test_maps_sync_driver(self, url, expected):
+        assert get_async_database_url(url) == expected
+
+
+class TestAsyncUserRepository:
+    @pytest.mark.asyncio
+    async def test_get_by_email(self, session, user):
+        repo = AsyncUserRepository(session)
+
+        found = await repo.get_by_email("async@example.com")
+
+        assert found is not None
+        assert found.id == user.id
+        assert await repo.email_exists("async@example.com")
+        assert not await repo.email_exists("missing@example.com")
+
+    @pytest.mark.asyncio
+    async def test_delete(self, session, user):
+        repo = AsyncUserRepository(session)
+
+        assert await repo.delete(user.id)
+        assert await repo.get_by_id(user.id) is None
+        assert not await repo.delete(user.id)
+
+
+class TestAsyncAnalysisRepository:
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_all_rows(self, session, user):
+        repo = AsyncAnalysisRepository(session)
+        for i in range(5):
+            await repo.create(
+                Analysis(
+                    user_id=user.id,
+                    overall_score=50.0 + i,
+                    summary=f"s{i}",
+                    created_at=BASE_TIME + timedelta(minutes=i),
+                )
+            )
+
+        first = await repo.get_by_user(user.id, limit=3)
+        second = await repo.get_by_user(user.id, limit=3, cursor=next_cursor(first, 3))
+
+        assert [a.summary for a in first] == ["s4", "s3", "s2"]
+        assert [a.summary for a in second] == ["s1", "s0"]
+        assert [a.summary for a in await repo.get_all(skip=1, limit=2)] == ["s3", "s2"]
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_with_report(self, session, user):
+        repo = AsyncAnalysisRepository(session)
+        created = await repo.create(
+            Analysis(user_id=user.id, overall_score=70.0, summary="s", full_report={"a": 1})
+        )
+        session.expunge_all()
+
+        analysis = await repo.get_by_id(created.id, with_report=True)
+
+        # Eager-loaded: reading the report needs no further IO
+        assert analysis.full_report == {"a": 1}
+        assert await repo.get_by_id(created.id + 100) is None
+
+    @pytest.mark.asyncio
+    async def test_create_and_delete_update_stats_and_cache(self, session, user, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(
+            cache_service, "invalidate_tags", lambda *tags: invalidated.append(tags)
+        )
+        repo = AsyncAnalysisRepository(session)
+
+        first = await repo.create(Analysis(user_id=user.id, overall_score=60.0))
+        await repo.create(Analysis(user_id=user.id, overall_score=80.0))
+        assert (await session.get(UserStats, user.id)).total_analyses == 2
+
+        assert await repo.delete(first.id)
+        stats = await session.get(UserStats, user.id)
+        await session.refresh(stats)
+        assert stats.total_analyses == 1
+        assert invalidated[-1] == (ANALYSES_LIST_TAG, analysis_tag(first.id), user_tag(user.id))
+
+
+class TestAsyncFeedbackRepository:
+    @pytest.mark.asyncio
+    async def test_get_by_user(self, session, user):
+        repo = AsyncFeedbackRepository(session)
+        for i in range(3):
+            await repo.create(
+                Feedback(
+                    user_id=user.id,
+                    rating=i + 1,
+                    comment=f"c{i}",
+                    created_at=BASE_TIME + timedelta(minutes=i),
+                )
+            )
+
+        feedbacks = await repo.get_by_user(user.id, limit=2)
+
+        assert [f.comment for f in feedbacks] == ["c2", "c1"]
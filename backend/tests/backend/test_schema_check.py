@@ -0,0 +1,225 @@
+"""Unit tests for the startup Alembic revision check"""
+
+import textwrap
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.schema import (
+    ALEMBIC_DIR,
+    BOOTSTRAPPED,
+    CREATE_ALL_REVISIONS,
+    UP_TO_DATE,
+    UPGRADED,
+    SchemaOutOfDateError,
+    _alembic_config,
+    _upgrade,
+    current_revisions,
+    ensure_schema,
+    expected_heads,
+)
+from app.models.database import Base
+
+ENV_PY = """
+from alembic import context
+
+connection = context.config.attributes["connection"]
+context.configure(connection=connection)
+with context.begin_transaction():
+    context.run_migrations()
+"""
+
+REVISION = '''
+import sqlalchemy as sa
+from alembic import op
+
+revision = "{revision}"
+down_revision = {down_revision!r}
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("{table}", sa.Column("id", sa.Integer, primary_key=True))
+
+
+def downgrade():
+    op.drop_table("{table}")
+'''
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    """Minimal migration directory: r1 -> r2"""
+    location = tmp_path / "alembic"
+    (location / "versions").mkdir(parents=True)
+    (location / "env.py").write_text(textwrap.dedent(ENV_PY))
+    for revision, down_revision, table in [("r1", None, "first"), ("r2", "r1", "second")]:
+        (location / "versions" / f"{revision}.py").write_text(
+            REVISION.format(revision=revision, down_revision=down_revision, table=table)
+        )
+    return location
+
+
+def _stamp(engine, revision: str) -> None:
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+        connection.execute(text(f"INSERT INTO alembic_version VALUES ('{revision}')"))
+
+
+def _revisions(engine) -> set[str]:
+    with engine.connect() as connection:
+        return current_revisions(connection)
+
+
+def _schema_diff(engine) -> list:
+    """Model ile veritabanı arasındaki autogenerate farkları"""
+    from alembic.autogenerate import compare_metadata
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as connection:
+        return compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+
+def test_repository_migrations_have_a_single_head():
+    assert len(expected_heads(ALEMBIC_DIR)) == 1
+
+
+def test_up_to_date_database_passes(engine, scripts):
+    _stamp(engine, "r2")
+
+    assert ensure_schema(engine, Base.metadata, script_location=scripts) == UP_TO_DATE
+    # Kontrol tablo oluşturmaz
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+
+
+def test_behind_database_fails_fast(engine, scripts):
+    _stamp(engine, "r1")
+
+    with pytest.raises(SchemaOutOfDateError, match="at revision r1 but the code expects r2"):
+        ensure_schema(engine, Base.metadata, script_location=scripts)
+
+
+@pytest.mark.parametrize(
+    "create_tables, hint",
+    [(False, "to create the schema"), (True, "alembic stamp 20260111_1750 6c6b303caa39")],
+)
+def test_unversioned_database_fails_with_hint(engine, scripts, create_tables, hint):
+    if create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    with pytest.raises(SchemaOutOfDateError, match="no Alembic revision") as exc_info:
+        ensure_schema(engine, Base.metadata, script_location=scripts)
+    assert hint in str(exc_info.value)
+    assert "DB_SCHEMA_BOOTSTRAP" in str(exc_info.value)
+
+
+def test_unknown_revision_fails_even_in_bootstrap(engine, scripts):
+    _stamp(engine, "r9")
+
+    with pytest.raises(SchemaOutOfDateError, match="unknown revision r9"):
+        ensure_schema(engine, Base.metadata, bootstrap=True, script_location=scripts)
+
+
+def test_bootstrap_creates_and_stamps_empty_database(engine, scripts):
+    assert ensure_schema(engine, Base.metadata, bootstrap=True, script_location=scripts) == (
+        BOOTSTRAPPED
+    )
+
+    assert "users" in inspect(engine).get_table_names()
+    assert _revisions(engine) == {"r2"}
+    # Sonraki başlangıçlar sadece revision'ı okur
+    assert ensure_schema(engine, Base.metadata, script_location=scripts) == UP_TO_DATE
+
+
+def test_bootstrap_migrates_unversioned_database_with_tables(engine, scripts):
+    # create_all ile r1 zamanında oluşturulmuş şema
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE first (id INTEGER PRIMARY KEY)"))
+
+    result = ensure_schema(
+        engine, Base.metadata, bootstrap=True, script_location=scripts, create_all_revisions=("r1",)
+    )
+
+    assert result == UPGRADED
+    # create_all çalışmaz; eksikler migration'larla gelir
+    assert set(inspect(engine).get_table_names()) == {"alembic_version", "first", "second"}
+    assert _revisions(engine) == {"r2"}
+
+
+def test_bootstrap_runs_pending_migrations(engine, scripts):
+    _stamp(engine, "r1")
+
+    assert ensure_schema(engine, Base.metadata, bootstrap=True, script_location=scripts) == (
+        UPGRADED
+    )
+
+    assert "second" in inspect(engine).get_table_names()
+    assert _revisions(engine) == {"r2"}
+
+
+def test_missing_scripts(engine, tmp_path):
+    missing = tmp_path / "missing"
+
+    with pytest.raises(SchemaOutOfDateError, match="Alembic scripts not found"):
+        ensure_schema(engine, Base.metadata, script_location=missing)
+    # Bootstrap: migration'sız paketlerde create_all'a düşer
+    assert ensure_schema(engine, Base.metadata, bootstrap=True, script_location=missing) == (
+        BOOTSTRAPPED
+    )
+    assert "users" in inspect(engine).get_table_names()
+
+
+class TestRepositoryMigrations:
+    def test_upgrade_from_empty_database_matches_models(self, engine):
+        with engine.begin() as connection:
+            _upgrade(connection, ALEMBIC_DIR)
+
+        assert _schema_diff(engine) == []
+
+    def test_bootstrap_of_create_all_database_runs_series(self, engine):
+        Base.metadata.create_all(bind=engine)
+
+        assert ensure_schema(engine, Base.metadata, bootstrap=True) == UPGRADED
+
+        assert _revisions(engine) == expected_heads()
+        assert _schema_diff(engine) == []
+
+    def test_create_all_revisions_are_the_pre_alembic_heads(self):
+        from alembic.script import ScriptDirectory
+
+        script = ScriptDirectory(str(ALEMBIC_DIR))
+        merge = script.get_revision("a3f1c2d4e5b6")
+
+        assert set(merge.down_revision) == set(CREATE_ALL_REVISIONS)
+
+    def test_duplicate_usage_rows_are_summed_before_collapse(self, engine):
+        from alembic import command
+
+        with engine.begin() as connection:
+            for head in CREATE_ALL_REVISIONS:
+                command.upgrade(_alembic_config(connection, ALEMBIC_DIR), head)
+            for user_id, count in [(1, 2), (1, 3), (1, 4), (2, 5)]:
+                connection.execute(
+                    text(
+                        "INSERT INTO usage_tracking (user_id, resource_type, count, "
+                        "period_start, period_end, created_at) VALUES (:user_id, 'chat', "
+                        ":count, '2026-01-01', '2026-02-01', '2026-01-01')"
+                    ),
+                    {"user_id": user_id, "count": count},
+                )
+            command.upgrade(_alembic_config(connection, ALEMBIC_DIR), "a3f1c2d4e5b6")
+
+        with engine.connect() as connection:
+            rows = connection.execute(
+                text("SELECT id, user_id, count FROM usage_tracking ORDER BY id")
+            ).all()
+        # MIN(id) tutulur, grubun toplamını alır
+        assert [tuple(row) for row in rows] == [(1, 1, 9), (4, 2, 5)]
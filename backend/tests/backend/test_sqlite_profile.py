@@ -0,0 +1,160 @@
+"""Unit tests for the SQLite engine profile (pragmas, writer/reader routing)"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.core.sqlite_profile import (
+    WRITER_OPTION,
+    SQLiteRoutingSession,
+    apply_sqlite_profile,
+    is_file_database,
+)
+from app.models.database import Base, User
+
+
+@pytest.fixture
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    connect_args = {"check_same_thread": False}
+    writer = create_engine(
+        url, connect_args=connect_args, poolclass=QueuePool, pool_size=1, max_overflow=0
+    )
+    reader = create_engine(url, connect_args=connect_args, poolclass=QueuePool, pool_size=2)
+    apply_sqlite_profile(writer)
+    apply_sqlite_profile(reader)
+    Base.metadata.create_all(bind=writer)
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+@pytest.fixture
+def session_factory(engines):
+    writer, reader = engines
+    return sessionmaker(
+        class_=SQLiteRoutingSession, autoflush=False, info={"writer": writer, "reader": reader}
+    )
+
+
+def track(engine) -> list[str]:
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestIsFileDatabase:
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("sqlite:///./iliski_analiz.db", True),
+            ("sqlite:////var/data/app.db", True),
+            ("sqlite://", False),
+            ("sqlite:///:memory:", False),
+            ("sqlite:///file:x?mode=memory&cache=shared&uri=true", False),
+            ("postgresql://u:p@db/app", False),
+        ],
+    )
+    def test_detects_on_disk_sqlite(self, url, expected):
+        assert is_file_database(url) is expected
+
+
+class TestPragmas:
+    def test_connections_use_wal_and_tuned_pragmas(self, engines):
+        for engine in engines:
+            with engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                # NORMAL = 1
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+                assert conn.execute(text("PRAGMA cache_size")).scalar() == -20000
+
+
+class TestRoutingSession:
+    def test_reads_use_reader_and_flush_uses_writer(self, engines, session_factory):
+        writer, reader = engines
+        writer_sql, reader_sql = track(writer), track(reader)
+        db = session_factory()
+
+        db.query(User).count()
+        assert reader_sql and not writer_sql
+
+        db.add(User(email="w@example.com", hashed_password="x"))
+        db.commit()
+        assert any(s.startswith("INSERT") for s in writer_sql)
+        assert not any(s.startswith("INSERT") for s in reader_sql)
+        db.close()
+
+    def test_transaction_reads_its_own_writes_until_commit(self, engines, session_factory):
+        writer, reader = engines
+        db = session_factory()
+        db.add(User(email="own@example.com", hashed_password="x"))
+        db.flush()
+
+        reader_sql = track(reader)
+        # Uncommitted row is only visible on the writer connection
+        assert db.query(User).filter(User.email == "own@example.com").count() == 1
+        assert not reader_sql
+
+        db.commit()
+        db.query(User).count()
+        assert reader_sql
+        db.close()
+
+    def test_writer_option_reads_go_to_writer(self, engines, session_factory):
+        writer, reader = engines
+        writer_sql, reader_sql = track(writer), track(reader)
+        db = session_factory()
+
+        db.query(User).with_for_update().execution_options(**{WRITER_OPTION: True}).all()
+
+        assert writer_sql and not reader_sql
+        db.rollback()
+        db.close()
+
+    def test_core_dml_and_text_writes_go_to_writer(self, engines, session_factory):
+        writer, reader = engines
+        reader_sql = track(reader)
+        db = session_factory()
+
+        db.execute(insert(User).values(email="core@example.com", hashed_password="x"))
+        db.commit()
+        db.execute(text("UPDATE users SET full_name = 'c' WHERE email = 'core@example.com'"))
+        db.commit()
+
+        assert not reader_sql
+        assert db.query(User.full_name).scalar() == "c"
+        db.close()
+
+    def test_writers_are_serialized(self, engines, session_factory):
+        writer, _ = engines
+        first = session_factory()
+        first.add(User(email="first@example.com", hashed_password="x"))
+        first.flush()
+        assert writer.pool.checkedout() == 1
+
+        done = threading.Event()
+
+        def second_writer():
+            db = session_factory()
+            db.add(User(email="second@example.com", hashed_password="x"))
+            db.commit()
+            db.close()
+            done.set()
+
+        thread = threading.Thread(target=second_writer)
+        thread.start()
+        # Waits for the single writer connection instead of failing with SQLITE_BUSY
+        assert not done.wait(0.2)
+
+        first.commit()
+        first.close()
+        thread.join(timeout=5)
+        assert done.is_set()
+
+        db = session_factory()
+        assert db.query(User).count() == 2
+        db.close()
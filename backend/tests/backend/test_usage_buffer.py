@@ -0,0 +1,171 @@
+"""Unit tests for the write-behind usage buffer"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.models.database import APIKey, UsageTracking, User
+from app.services import usage_buffer
+from app.services.usage_buffer import UsageBuffer
+from app.services.usage_counter import RESOURCE_CHAT, RESOURCE_EXPORT
+
+NOON = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session_factory(sqlite_session_factory):
+    db = sqlite_session_factory()
+    db.add(User(id=1, email="buffer@example.com", hashed_password="x"))
+    db.add(APIKey(id=1, user_id=1, key="k1", requests_count=0))
+    db.commit()
+    db.close()
+    return sqlite_session_factory
+
+
+def usage_counts(factory) -> dict:
+    db = factory()
+    try:
+        return {
+            (row.resource_type, row.period_start.date()): row.count
+            for row in db.query(UsageTracking).all()
+        }
+    finally:
+        db.close()
+
+
+class TestUsageBuffer:
+    """Coalescing and batched flush"""
+
+    def test_increments_are_coalesced(self, session_factory):
+        buffer = UsageBuffer(flush_interval=60, max_pending=100, session_factory=session_factory)
+        for _ in range(5):
+            buffer.record_usage(1, RESOURCE_CHAT, when=NOON)
+        buffer.record_usage(1, RESOURCE_EXPORT, when=NOON)
+        buffer.record_usage(1, RESOURCE_CHAT, when=NOON + timedelta(days=1))
+
+        assert buffer.pending == 3
+        assert buffer.flush() == 3
+        assert buffer.pending == 0
+        assert buffer.lag_seconds() == 0.0
+        assert usage_counts(session_factory) == {
+            (RESOURCE_CHAT, date(2026, 1, 1)): 5,
+            (RESOURCE_EXPORT, date(2026, 1, 1)): 1,
+            (RESOURCE_CHAT, date(2026, 1, 2)): 1,
+        }
+
+    def test_flush_adds_to_existing_rows(self, session_factory):
+        buffer = UsageBuffer(flush_interval=60, max_pending=100, session_factory=session_factory)
+        buffer.record_usage(1, RESOURCE_CHAT, amount=2, when=NOON)
+        buffer.flush()
+        buffer.record_usage(1, RESOURCE_CHAT, amount=3, when=NOON)
+        buffer.flush()
+
+        assert usage_counts(session_factory) == {(RESOURCE_CHAT, date(2026, 1, 1)): 5}
+
+    def test_portable_fallback_without_on_conflict(self, session_factory, monkeypatch):
+        # ON CONFLICT desteklemeyen dialect'ler UPDATE-then-INSERT yoluna düşer
+        monkeypatch.setattr(usage_buffer, "_upsert_usage", usage_buffer._update_or_insert_usage)
+        buffer = UsageBuffer(flush_interval=60, max_pending=100, session_factory=session_factory)
+        buffer.record_usage(1, RESOURCE_CHAT, amount=2, when=NOON)
+        assert buffer.flush() == 1
+        buffer.record_usage(1, RESOURCE_CHAT, amount=3, when=NOON)
+        buffer.record_usage(1, RESOURCE_EXPORT, when=NOON)
+        assert buffer.flush() == 2
+
+        assert buffer.pending == 0
+        assert usage_counts(session_factory) == {
+            (RESOURCE_CHAT, date(2026, 1, 1)): 5,
+            (RESOURCE_EXPORT, date(2026, 1, 1)): 1,
+        }
+
+    def test_api_key_counters(self, session_factory):
+        buffer = UsageBuffer(flush_interval=60, max_pending=100, session_factory=session_factory)
+        buffer.record_api_key_use(1, when=NOON + timedelta(minutes=5))
+        buffer.record_api_key_use(1, when=NOON)
+        buffer.flush()
+
+        db = session_factory()
+        key = db.query(APIKey).get(1)
+        assert key.requests_count == 2
+        assert key.last_used_at.replace(tzinfo=timezone.utc) == NOON + timedelta(minutes=5)
+        db.close()
+
+    def test_failed_flush_keeps_entries(self, session_factory):
+        def broken_factory():
+            raise RuntimeError("database down")
+
+        buffer = UsageBuffer(flush_interval=60, max_pending=100, session_factory=broken_factory)
+        buffer.record_usage(1, RESOURCE_CHAT, when=NOON)
+
+        assert buffer.flush() == 0
+        assert buffer.pending == 1
+        assert buffer.stats()["flush_failures"] == 1
+
+        buffer.session_factory = session_factory
+        buffer.record_usage(1, RESOURCE_CHAT, when=NOON)
+        buffer.flush()
+        assert usage_counts(session_factory) == {(RESOURCE_CHAT, date(2026, 1, 1)): 2}
+
+    def test_poisoned_row_is_dropped_after_max_retries(self, session_factory, monkeypatch):
+        upsert = usage_buffer._upsert_usage
+
+        def reject_user_2(db, rows):
+            if any(row["user_id"] == 2 for row in rows):
+                raise ValueError("bad row")
+            upsert(db, rows)
+
+        monkeypatch.setattr(usage_buffer, "_upsert_usage", reject_user_2)
+        buffer = UsageBuffer(
+            flush_interval=60, max_pending=100, session_factory=session_factory, max_retries=2
+        )
+        buffer.record_usage(1, RESOURCE_CHAT, when=NOON)
+        buffer.record_usage(2, RESOURCE_CHAT, when=NOON)
+        buffer.record_api_key_use(1, when=NOON)
+
+        # İlk hata: batch geri konur
+        assert buffer.flush() == 0
+        assert buffer.pending == 3
+        # Sınıra ulaşıldı: satır satır yazılır, bozuk satır atılır
+        assert buffer.flush() == 2
+        assert buffer.pending == 0
+
+        stats = buffer.stats()
+        assert stats["flush_failures"] == 2
+        assert stats["dropped_total"] == 1
+        assert usage_counts(session_factory) == {(RESOURCE_CHAT, date(2026, 1, 1)): 1}
+
+        # Sayaç sıfırlandı: sonraki hata yine önce batch'i korur
+        buffer.record_usage(2, RESOURCE_CHAT, when=NOON)
+        assert buffer.flush() == 0
+        assert buffer.pending == 1
+
+    def test_success_resets_consecutive_failures(self, session_factory):
+        def broken_factory():
+            raise RuntimeError("database down")
+
+        buffer = UsageBuffer(
+            flush_interval=60, max_pending=100, session_factory=broken_factory, max_retries=2
+        )
+        buffer.record_usage(1, RESOURCE_CHAT, when=NOON)
+        assert buffer.flush() == 0
+
+        buffer.session_factory = session_factory
+        assert buffer.flush() == 1
+
+        buffer.session_factory = broken_factory
+        buffer.record_usage(1, RESOURCE_CHAT, when=NOON)
+        assert buffer.flush() == 0
+        assert buffer.pending == 1
+        assert buffer.stats()["dropped_total"] == 0
+
+    def test_threshold_flushes_in_background_and_stop_drains(self, session_factory):
+        buffer = UsageBuffer(flush_interval=60, max_pending=2, session_factory=session_factory)
+        buffer.start()
+        try:
+            buffer.record_usage(1, RESOURCE_CHAT, when=NOON)
+            buffer.record_usage(1, RESOURCE_EXPORT, when=NOON)
+        finally:
+            buffer.stop()
+
+        assert buffer.pending == 0
+        assert buffer.stats()["flushed_total"] == 2
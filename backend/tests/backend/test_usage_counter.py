@@ -0,0 +1,92 @@
+"""Unit tests for the atomic daily usage counter (database path)"""
+
+import asyncio
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.api import analysis
+from app.models.database import User
+from app.schemas.analysis import AnalysisRequest
+from app.services.principal_cache import Principal
+from app.services.usage_counter import RESOURCE_ANALYSIS, RESOURCE_CHAT, UsageCounter
+
+DAY = date(2026, 1, 1)
+
+
+@pytest.fixture
+def db(sqlite_session):
+    sqlite_session.add(User(id=1, email="quota@example.com", hashed_password="x"))
+    sqlite_session.commit()
+    return sqlite_session
+
+
+@pytest.fixture
+def counter(monkeypatch):
+    counter = UsageCounter()
+    monkeypatch.setattr(UsageCounter, "redis_client", property(lambda self: None))
+    return counter
+
+
+class TestUsageCounterDatabase:
+    """Conditional UPDATE / INSERT fallback without Redis"""
+
+    def test_consume_until_limit(self, db, counter):
+        results = [counter.try_consume(db, 1, RESOURCE_ANALYSIS, 3, day=DAY) for _ in range(4)]
+
+        assert results == [(True, 1), (True, 2), (True, 3), (False, 3)]
+        assert counter.get_count(db, 1, RESOURCE_ANALYSIS, day=DAY) == 3
+
+    def test_release_returns_quota(self, db, counter):
+        counter.try_consume(db, 1, RESOURCE_ANALYSIS, 1, day=DAY)
+        assert counter.try_consume(db, 1, RESOURCE_ANALYSIS, 1, day=DAY) == (False, 1)
+
+        counter.release(db, 1, RESOURCE_ANALYSIS, day=DAY)
+
+        assert counter.try_consume(db, 1, RESOURCE_ANALYSIS, 1, day=DAY) == (True, 1)
+
+    def test_release_never_goes_negative(self, db, counter):
+        counter.release(db, 1, RESOURCE_ANALYSIS, day=DAY)
+        counter.try_consume(db, 1, RESOURCE_ANALYSIS, 5, day=DAY)
+        counter.release(db, 1, RESOURCE_ANALYSIS, day=DAY)
+        counter.release(db, 1, RESOURCE_ANALYSIS, day=DAY)
+
+        assert counter.get_count(db, 1, RESOURCE_ANALYSIS, day=DAY) == 0
+
+    def test_periods_and_resources_are_isolated(self, db, counter):
+        counter.try_consume(db, 1, RESOURCE_ANALYSIS, 1, day=DAY)
+
+        assert counter.try_consume(db, 1, RESOURCE_ANALYSIS, 1, day=date(2026, 1, 2)) == (True, 1)
+        assert counter.try_consume(db, 1, RESOURCE_CHAT, 1, day=DAY) == (True, 1)
+
+    def test_zero_limit_denies(self, db, counter):
+        assert counter.try_consume(db, 1, RESOURCE_ANALYSIS, 0, day=DAY) == (False, 0)
+
+
+class TestAnalyzeQuota:
+    """/analyze kotası analiz başarısız olursa iade edilir"""
+
+    def test_quota_released_when_analysis_raises(self, db, counter, monkeypatch):
+        service = MagicMock()
+        service.validate_text.return_value = (True, None)
+        service.analyze_text.side_effect = RuntimeError("analyzer crashed")
+        monkeypatch.setattr(analysis, "get_analysis_service", lambda: service)
+        monkeypatch.setattr(analysis, "usage_counter", counter)
+        user = Principal(
+            id=1, email="quota@example.com", full_name=None, is_pro=False, is_active=True
+        )
+
+        # limiter dekoratörünü atla
+        endpoint = analysis.analyze_text.__wrapped__
+        with pytest.raises(RuntimeError):
+            asyncio.run(
+                endpoint(
+                    request=MagicMock(),
+                    analysis_request=AnalysisRequest(text="Ali: merhaba\nAyşe: selam"),
+                    db=db,
+                    current_user=user,
+                )
+            )
+
+        assert counter.get_count(db, 1, RESOURCE_ANALYSIS) == 0
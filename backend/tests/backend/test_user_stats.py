@@ -0,0 +1,139 @@
+"""Unit tests for the per-user stats rollup"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.models.database import Analysis, User, UserStats
+from app.repositories import AnalysisRepository
+from app.services.cache_service import ANALYSES_LIST_TAG, analysis_tag, cache_service, user_tag
+from app.services.crud import AnalysisCRUD
+from app.services.user_stats import user_stats_service
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def db(sqlite_session):
+    sqlite_session.add(User(id=1, email="stats@example.com", hashed_password="x"))
+    sqlite_session.commit()
+    return sqlite_session
+
+
+def add_old_analysis(db, score: float, days_ago: int) -> Analysis:
+    """Insert directly (bypassing the rollup) like pre-existing data"""
+    analysis = Analysis(user_id=1, overall_score=score, created_at=NOW - timedelta(days=days_ago))
+    db.add(analysis)
+    db.commit()
+    return analysis
+
+
+class TestUserStatsRollup:
+    def test_create_and_delete_update_rollup(self, db):
+        first = AnalysisCRUD.create_analysis(db, {"overall_score": 60.0}, user_id=1)
+        AnalysisCRUD.create_analysis(db, {"overall_score": 80.0}, user_id=1)
+
+        assert AnalysisCRUD.get_user_stats(db, 1) == {
+            "total_analyses": 2,
+            "weekly_score": 70.0,
+            "streak": 1,
+        }
+
+        AnalysisCRUD.delete_analysis(db, first.id)
+
+        assert AnalysisCRUD.get_user_stats(db, 1) == {
+            "total_analyses": 1,
+            "weekly_score": 80.0,
+            "streak": 1,
+        }
+
+    def test_repository_updates_rollup_and_cache(self, db, monkeypatch):
+        # AnalysisRepository, AnalysisCRUD ile aynı kancaları çalıştırır
+        invalidated = []
+        monkeypatch.setattr(
+            cache_service, "invalidate_tags", lambda *tags: invalidated.append(tags)
+        )
+        repo = AnalysisRepository(db)
+
+        first = repo.create(Analysis(user_id=1, overall_score=60.0))
+        repo.create(Analysis(user_id=1, overall_score=80.0))
+        assert AnalysisCRUD.get_user_stats(db, 1)["total_analyses"] == 2
+        assert invalidated[0] == (ANALYSES_LIST_TAG, user_tag(1))
+
+        assert repo.delete(first.id)
+        assert AnalysisCRUD.get_user_stats(db, 1) == {
+            "total_analyses": 1,
+            "weekly_score": 80.0,
+            "streak": 1,
+        }
+        assert invalidated[-1] == (ANALYSES_LIST_TAG, analysis_tag(first.id), user_tag(1))
+
+    def test_missing_rollup_is_rebuilt_from_analyses(self, db):
+        for days_ago in (0, 1, 2, 5, 40):
+            add_old_analysis(db, 50.0 + days_ago, days_ago)
+
+        stats = AnalysisCRUD.get_user_stats(db, 1)
+
+        assert stats["total_analyses"] == 5
+        assert stats["streak"] == 3
+        assert stats["weekly_score"] == round((50 + 51 + 52 + 55) / 4, 1)
+        assert db.get(UserStats, 1) is not None
+
+    def test_null_scores_count_for_streak_but_not_average(self, db):
+        AnalysisCRUD.create_analysis(db, {"overall_score": 80.0}, user_id=1)
+        # Skorsuz analiz (AVG() NULL'ları saymaz): seriye girer, ortalamaya girmez
+        user_stats_service.record_analysis(db, 1, None, NOW - timedelta(days=1))
+        db.commit()
+
+        assert AnalysisCRUD.get_user_stats(db, 1) == {
+            "total_analyses": 2,
+            "weekly_score": 80.0,
+            "streak": 2,
+        }
+
+        user_stats_service.record_analysis(db, 1, None, NOW - timedelta(days=1), delta=-1)
+        db.commit()
+        assert AnalysisCRUD.get_user_stats(db, 1) == {
+            "total_analyses": 1,
+            "weekly_score": 80.0,
+            "streak": 1,
+        }
+
+    def test_legacy_buckets_without_scored_count(self, db):
+        AnalysisCRUD.create_analysis(db, {"overall_score": 60.0}, user_id=1)
+        stats = db.get(UserStats, 1)
+        stats.daily_scores = {day: bucket[:2] for day, bucket in stats.daily_scores.items()}
+        db.commit()
+
+        AnalysisCRUD.create_analysis(db, {"overall_score": 80.0}, user_id=1)
+
+        assert AnalysisCRUD.get_user_stats(db, 1)["weekly_score"] == 70.0
+
+    def test_stale_streak_is_reported_as_zero(self, db):
+        add_old_analysis(db, 70.0, 3)
+        add_old_analysis(db, 70.0, 4)
+
+        assert AnalysisCRUD.get_user_stats(db, 1)["streak"] == 0
+
+    def test_read_is_single_primary_key_query(self, sqlite_engine, db):
+        AnalysisCRUD.create_analysis(db, {"overall_score": 60.0}, user_id=1)
+        db.expunge_all()
+
+        statements = []
+        event.listen(
+            sqlite_engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+        AnalysisCRUD.get_user_stats(db, 1)
+
+        assert len(statements) == 1
+        assert "FROM user_stats" in statements[0]
+
+    def test_backfill(self, db):
+        add_old_analysis(db, 40.0, 0)
+        add_old_analysis(db, 60.0, 1)
+
+        assert user_stats_service.backfill(db) == 1
+        stats = db.get(UserStats, 1)
+        assert stats.total_analyses == 2
+        assert stats.current_streak == 2
@@ -0,0 +1,158 @@
+"""Unit tests for the background warm-up and readiness status"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import warmup as warmup_module
+from app.core.warmup import SAMPLE_CONVERSATION, Component, SkipWarmup, Warmup
+
+
+def _skip():
+    raise SkipWarmup("not configured")
+
+
+def _fail():
+    raise RuntimeError("model missing")
+
+
+class TestWarmup:
+    def test_disabled_until_started(self):
+        warmup = Warmup([Component("a", lambda: None)])
+
+        assert warmup.status() == {"status": "disabled", "components": {"a": {"status": "pending"}}}
+        assert warmup.is_ready()
+
+    def test_warming_until_all_components_finish(self):
+        release = threading.Event()
+        entered = threading.Event()
+
+        def slow():
+            entered.set()
+            release.wait(5)
+            return "loaded"
+
+        warmup = Warmup([Component("fast", lambda: None), Component("slow", slow)])
+        warmup.start()
+        assert entered.wait(5)
+
+        status = warmup.status()
+        assert status["status"] == "warming"
+        assert status["components"]["fast"]["status"] == "ready"
+        assert status["components"]["slow"] == {"status": "running"}
+        assert not warmup.is_ready()
+
+        release.set()
+        assert warmup.wait(5)
+
+        status = warmup.status()
+        assert status["status"] == "ready"
+        assert status["components"]["slow"]["detail"] == "loaded"
+        assert status["components"]["slow"]["duration_ms"] >= 0
+
+    def test_skipped_and_failed_components(self):
+        warmup = Warmup(
+            [Component("ollama", _skip), Component("nlp", _fail), Component("ok", lambda: None)]
+        )
+        warmup.start()
+        warmup.wait(5)
+
+        status = warmup.status()
+        assert status["status"] == "degraded"
+        assert status["components"]["ollama"]["status"] == "skipped"
+        assert status["components"]["nlp"] == {
+            "status": "failed",
+            "duration_ms": status["components"]["nlp"]["duration_ms"],
+            "detail": "model missing",
+        }
+        # Başarısız bileşen hazır olmayı engellemez, sonrakiler yine çalışır
+        assert status["components"]["ok"]["status"] == "ready"
+        assert warmup.is_ready()
+
+    def test_stop_skips_remaining_components(self):
+        entered, release = threading.Event(), threading.Event()
+        calls = []
+
+        def first():
+            entered.set()
+            release.wait(5)
+
+        warmup = Warmup([Component("first", first), Component("second", lambda: calls.append(1))])
+        warmup.start()
+        assert entered.wait(5)
+        release.set()
+        warmup.stop()
+
+        assert calls == []
+        assert warmup.status()["components"]["second"] == {"status": "pending"}
+
+    def test_start_is_idempotent(self):
+        calls = []
+        warmup = Warmup([Component("a", lambda: calls.append(1))])
+
+        warmup.start()
+        warmup.start()
+        warmup.wait(5)
+
+        assert calls == [1]
+
+
+class TestComponents:
+    def test_analyzer_runs_sample_conversation(self):
+        detail = warmup_module._warm_analyzer()
+
+        assert detail in ("spacy", "simple preprocessor")
+
+    def test_analyzer_warmup_skips_llm_report(self):
+        from app.services.analysis_service import get_analysis_service
+
+        report_generator = get_analysis_service().analyzer.report_generator
+        with (
+            patch.object(report_generator, "generate_report") as generate_report,
+            patch.object(report_generator, "_get_ai_service") as get_ai_service,
+        ):
+            warmup_module._warm_analyzer()
+
+        generate_report.assert_not_called()
+        get_ai_service.assert_not_called()
+
+    def test_ai_service_warms_analyzer_singleton(self):
+        import backend.app.services.ai_service as ai_service_module
+
+        service = MagicMock(provider="mock")
+        with patch.object(ai_service_module, "get_ai_service", return_value=service):
+            assert warmup_module._warm_ai_service() == "mock"
+
+    def test_heatmap_and_psychology(self):
+        warmup_module._warm_heatmap()
+        warmup_module._warm_psychology()
+
+    def test_ollama_skipped_unless_configured(self):
+        with pytest.raises(SkipWarmup):
+            warmup_module._warm_ollama()
+
+    def test_ollama_keep_alive_ping(self, monkeypatch):
+        service = MagicMock(provider="ollama", ollama_base_url="http://ollama:11434")
+        monkeypatch.setattr(warmup_module.settings, "OLLAMA_KEEP_ALIVE", "30m")
+        monkeypatch.setattr(warmup_module.settings, "OLLAMA_MODEL", "llama3")
+
+        with (
+            patch("backend.app.services.ai_service.get_ai_service", return_value=service),
+            patch.object(warmup_module.httpx, "post") as post,
+        ):
+            assert warmup_module._warm_ollama() == "llama3"
+
+        post.assert_called_once_with(
+            "http://ollama:11434/api/generate",
+            json={"model": "llama3", "keep_alive": "30m"},
+            timeout=120.0,
+        )
+
+    def test_sample_is_parsed_as_whatsapp(self):
+        from ml.preprocessing.conversation_parser import ConversationParser
+
+        parsed = ConversationParser().parse(SAMPLE_CONVERSATION)
+
+        assert parsed["format_detected"] == "whatsapp"
+        assert len(parsed["messages"]) == 6
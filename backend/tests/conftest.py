@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
@@ -13,6 +14,9 @@ root_dir = Path(__file__).parent.parent
 if str(root_dir) not in sys.path:
     sys.path.insert(0, str(root_dir))
 
+# cache_service singleton'ı import'ta oluşur: testler disk cache dosyası bırakmasın
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
 from backend.app.core.database import Base, get_db
 from backend.app.main import app
 from backend.app.models.database import User
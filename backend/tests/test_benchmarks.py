@@ -0,0 +1,97 @@
+"""Synthetic conversation generator and benchmark regression check"""
+
+import pytest
+
+from benchmarks.runner import compare
+from benchmarks.startup import by_package, parse_importtime
+from benchmarks.synthetic import PLATFORMS, generate_export
+from ml.preprocessing.conversation_parser import ConversationParser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return ConversationParser()
+
+
+class TestSyntheticExports:
+    @pytest.mark.parametrize("platform", PLATFORMS)
+    def test_parses_to_requested_size(self, parser, platform):
+        text = generate_export(platform, messages=300, participants=4, seed=3)
+
+        parsed = parser.parse(text)
+
+        assert parsed["format_detected"] == platform
+        assert len(parsed["messages"]) == 300
+        assert parsed["stats"]["participant_count"] == 4
+        timestamps = [m["timestamp"] for m in parsed["messages"]]
+        assert timestamps == sorted(timestamps)
+
+    def test_deterministic(self):
+        assert generate_export("telegram", 200, 3, seed=1) == generate_export(
+            "telegram", 200, 3, seed=1
+        )
+        assert generate_export("telegram", 200, 3, seed=1) != generate_export(
+            "telegram", 200, 3, seed=2
+        )
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            generate_export("sms")
+        with pytest.raises(ValueError):
+            generate_export("whatsapp", participants=0)
+
+
+class TestRegressionCheck:
+    BASELINE = {"parse": {"messages_per_second": 1000.0, "peak_memory_mb": 10.0}}
+
+    def test_within_threshold(self):
+        results = {"parse": {"messages_per_second": 800.0, "peak_memory_mb": 12.0}}
+
+        assert compare(results, self.BASELINE, threshold=0.25) == {}
+
+    def test_flags_slower_and_bigger(self):
+        results = {"parse": {"messages_per_second": 700.0, "peak_memory_mb": 13.0}}
+
+        assert compare(results, self.BASELINE, threshold=0.25) == {
+            "parse": ["throughput", "memory"]
+        }
+
+    def test_small_memory_noise_ignored(self):
+        baseline = {"tiny": {"messages_per_second": 1.0, "peak_memory_mb": 0.01}}
+        results = {"tiny": {"messages_per_second": 1.0, "peak_memory_mb": 0.2}}
+
+        assert compare(results, baseline, threshold=0.25) == {}
+
+    def test_new_cases_have_no_baseline(self):
+        results = {"new": {"messages_per_second": 1.0, "peak_memory_mb": 1.0}}
+
+        assert compare(results, self.BASELINE, threshold=0.25) == {}
+
+
+class TestImportTimeReport:
+    # -X importtime post-order yazar: çocuklar ebeveynden önce, bir seviye içeride
+    OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | encodings
+import time:       300 |        300 |       httpx._models
+import time:       200 |        500 |     httpx
+import time:       900 |        900 |       anthropic._client
+import time:      1000 |       2400 |     anthropic
+import time:        50 |       2950 |   app.services.ai_service
+import time:        50 |       3000 | app
+"""
+
+    def test_parse_tree(self):
+        roots = parse_importtime(self.OUTPUT)
+
+        assert [r.name for r in roots] == ["encodings", "app"]
+        service = roots[1].children[0]
+        assert [c.name for c in service.children] == ["httpx", "anthropic"]
+        assert service.children[1].children[0].name == "anthropic._client"
+
+    def test_by_package(self):
+        packages = by_package(parse_importtime(self.OUTPUT))
+
+        assert packages["anthropic"] == {"self_ms": 1.9, "inclusive_ms": 2.4}
+        assert packages["httpx"] == {"self_ms": 0.5, "inclusive_ms": 0.5}
+        assert packages["app"] == {"self_ms": 0.1, "inclusive_ms": 3.0}
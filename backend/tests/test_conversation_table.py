@@ -0,0 +1,78 @@
+"""Unit tests for the columnar ConversationTable"""
+
+import numpy as np
+import pytest
+
+from ml.preprocessing.conversation_parser import ConversationParser
+from ml.preprocessing.conversation_table import NO_TIMESTAMP, ConversationTable
+
+EXPORT = """22.01.2024 12:30 - Ahmet: Merhaba İSTANBUL
+22.01.2024 12:31 - Ayşe: Selam 😊
+23.01.2024 08:05 - Ahmet: Günaydın"""
+
+
+@pytest.fixture
+def messages():
+    return ConversationParser().parse_messages(EXPORT, "whatsapp")
+
+
+class TestConversationTable:
+    def test_roundtrip_matches_parser_dicts(self, messages):
+        table = ConversationTable.from_messages(messages)
+
+        assert len(table) == 3
+        assert list(table) == messages
+        assert table[-1] == messages[-1]
+        assert table[0:2] == messages[0:2]
+
+    def test_columns(self, messages):
+        table = ConversationTable.from_messages(messages)
+
+        assert table.senders == ["Ahmet", "Ayşe"]
+        assert table.sender_ids.tolist() == [0, 1, 0]
+        assert table.timestamps.dtype == np.int64
+        assert table.timestamps[2] - table.timestamps[0] == 86400 - 4 * 3600 - 25 * 60
+        assert table.platform == "whatsapp"
+
+    def test_lowered_text_is_lazy(self, messages):
+        table = ConversationTable.from_messages(messages)
+        assert table._lowered is None
+
+        # İ.lower() iki karakter: offset'ler ayrı tutulur
+        assert table.lowered(0) == "merhaba i̇stanbul"
+        assert table.lowered_contents()[1:] == ["selam 😊", "günaydın"]
+
+    def test_missing_and_unparsed_timestamps(self):
+        table = ConversationTable.from_messages(
+            [
+                {"timestamp": None, "sender": "A", "content": "x", "platform": "simple"},
+                {"timestamp": "dün", "sender": "B", "content": "y", "platform": "simple"},
+            ]
+        )
+
+        assert table.timestamps.tolist() == [NO_TIMESTAMP, NO_TIMESTAMP]
+        assert [m["timestamp"] for m in table] == [None, "dün"]
+        assert np.isnan(table.epoch_seconds()).all()
+
+    def test_mixed_platforms_rejected(self):
+        with pytest.raises(ValueError):
+            ConversationTable.from_messages(
+                [
+                    {"timestamp": None, "sender": "A", "content": "x", "platform": "simple"},
+                    {"timestamp": None, "sender": "A", "content": "y", "platform": "whatsapp"},
+                ]
+            )
+
+    def test_parse_table(self):
+        table = ConversationParser().parse_table(EXPORT)
+
+        assert isinstance(table, ConversationTable)
+        assert table.content(1) == "Selam 😊"
+        assert table.memory_bytes() > 0
+
+    def test_empty(self):
+        table = ConversationTable.from_messages([])
+
+        assert len(table) == 0
+        assert table.contents() == []
+        assert not table
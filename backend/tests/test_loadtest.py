@@ -0,0 +1,154 @@
+"""Load test harness: workload mix, statistics and resource sampling"""
+
+import asyncio
+import os
+import random
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from loadtest.resources import ResourceSampler
+from loadtest.runner import compare, percentile, summarize
+from loadtest.workload import (
+    DEFAULT_MIX,
+    SCENARIOS,
+    Sample,
+    VirtualUser,
+    build_export_pool,
+    parse_mix,
+    run_user,
+)
+
+
+def _fake_app() -> tuple[FastAPI, list[tuple[str, str, dict]]]:
+    app = FastAPI()
+    calls = []
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def endpoint(path: str, request: Request):
+        calls.append((request.method, f"/{path}", dict(request.headers)))
+        if path == "api/auth/login":
+            return {"access_token": "token", "token_type": "bearer"}
+        if path == "api/chat/sessions" and request.method == "POST":
+            return {"id": 7}
+        if path == "api/analysis/analyze-v2":
+            return JSONResponse({"detail": "Rate limit exceeded"}, status_code=429)
+        return {}
+
+    return app, calls
+
+
+class TestWorkload:
+    def test_parse_mix(self):
+        assert parse_mix(None) == DEFAULT_MIX
+        assert parse_mix("analyze=3, chat") == {"analyze": 3.0, "chat": 1.0}
+        with pytest.raises(ValueError):
+            parse_mix("unknown=1")
+
+    def test_export_pool_mixes_platforms_and_sizes(self):
+        pool = build_export_pool(seed=0, per_size=1)
+
+        assert {platform for platform, _ in pool} == {"whatsapp", "telegram", "instagram"}
+        sizes = sorted({text.count("\n") for _, text in pool})
+        assert len(sizes) == 9
+        # Küçük export'lar daha sık seçilir
+        small = sum(1 for _, text in pool if text.count("\n") < 500)
+        assert small > len(pool) / 3
+
+    def test_virtual_user_runs_every_scenario(self):
+        app, calls = _fake_app()
+        exports = [("whatsapp", "01.03.2022 08:00 - Ahmet: merhaba")]
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                user = VirtualUser(3, client, exports, random.Random(0))
+                await user.login("a@example.com", "pw")
+                for run in SCENARIOS.values():
+                    await run(user)
+                await SCENARIOS["chat"](user)
+                return user
+
+        user = asyncio.run(scenario())
+
+        assert [s.scenario for s in user.samples] == [
+            "analyze", "analyze_v2", "upload_v2", "chat.session", "chat",
+            "analysis_history", "chat_sessions", "chat",
+        ]  # fmt: skip
+        assert user.samples[1].status == 429
+        assert calls[-1][1] == "/api/chat/sessions/7/messages"
+        assert calls[-1][2]["authorization"] == "Bearer token"
+        assert calls[-1][2]["x-forwarded-for"] == "10.0.0.3"
+
+    def test_run_user_stops_at_deadline(self):
+        app, _ = _fake_app()
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                user = VirtualUser(0, client, [("whatsapp", "x")], random.Random(0))
+                deadline = time.perf_counter() + 0.2
+                await run_user(user, {"analysis_history": 1.0}, deadline, think_time=0.01)
+                return user
+
+        user = asyncio.run(scenario())
+
+        assert len(user.samples) > 3
+        assert all(s.started < user.samples[0].started + 0.2 for s in user.samples)
+
+
+class TestReport:
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([5.0], 95) == 5
+        assert percentile([], 95) == 0
+
+    def test_summarize(self):
+        samples = [Sample("analyze", 200, 0.1 * i, 0) for i in range(1, 10)]
+        samples += [Sample("analyze", 429, 0.01, 0), Sample("chat", 0, 5.0, 0, "ReadTimeout")]
+
+        results = summarize(samples, elapsed=2.0)
+
+        assert results["analyze"]["requests"] == 10
+        assert results["analyze"]["rps"] == 5
+        assert results["analyze"]["error_rate"] == 0.1
+        assert results["analyze"]["latency_ms"]["p50"] == 400
+        assert results["analyze"]["statuses"] == {"200": 9, "429": 1}
+        assert results["chat"]["statuses"] == {"ReadTimeout": 1}
+        assert results["total"]["requests"] == 11
+
+    def test_compare_flags_regressions(self):
+        previous = {
+            "analyze": {"rps": 10, "error_rate": 0.0, "latency_ms": {"p95": 1000}},
+            "chat": {"rps": 5, "error_rate": 0.0, "latency_ms": {"p95": 500}},
+        }
+        results = {
+            "analyze": {"rps": 7, "error_rate": 0.0, "latency_ms": {"p95": 1100}},
+            "chat": {"rps": 5, "error_rate": 0.1, "latency_ms": {"p95": 900}},
+            "history": {"rps": 1, "error_rate": 0.0, "latency_ms": {"p95": 10}},
+        }
+
+        assert compare(results, previous, threshold=0.25) == {
+            "analyze": ["throughput"],
+            "chat": ["p95", "errors"],
+        }
+
+
+@pytest.mark.skipif(not ResourceSampler.supported(), reason="requires /proc")
+def test_resource_sampler_measures_own_process():
+    sampler = ResourceSampler(os.getpid(), interval=0.05)
+    sampler.start()
+    end = time.perf_counter() + 0.3
+    while time.perf_counter() < end:
+        pass
+    summary = sampler.stop()
+
+    assert summary["cpu_percent"] > 30
+    assert summary["peak_rss_mb"] > 10
+    assert str(os.getpid()) in summary["processes"]
@@ -173,6 +173,8 @@ class BackendManager {
           ...process.env,
           PYTHONUNBUFFERED: "1",
           PORT: this.port.toString(),
+          // Local SQLite: create the schema / run pending migrations on startup
+          DB_SCHEMA_BOOTSTRAP: "true",
         },
       });
 
@@ -237,6 +237,11 @@ export const analysisApi = {
   generateHeatmap: (messages: any[]) =>
     api.post("/api/analysis/heatmap", { messages }),
 
+  getHeatmapRange: (analysisId: number, start?: string, end?: string) =>
+    api.get(`/api/analysis/history/${analysisId}/heatmap`, {
+      params: { start, end },
+    }),
+
   shiftTone: (message: string, target_tone: string, context = "") =>
     api.post("/api/analysis/tone-shift", {
       message,
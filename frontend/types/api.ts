@@ -269,6 +269,43 @@ export interface HeatmapData {
   }>;
   overall_tension_score: number;
   tension_trend: string;
+  // 7 x 24, satır 0 = Pazartesi
+  weekday_hour_tension?: {
+    tension: number[][];
+    message_count: number[][];
+  };
+  daily_tension?: Array<{
+    date: string;
+    tension: number;
+    message_count: number;
+  }>;
+  weekly_tension?: Array<{
+    week_start: string;
+    tension: number;
+    message_count: number;
+  }>;
+  // Kümülatif günlük diziler: [start, end] aralığı = cumulative[end + 1] - cumulative[start]
+  timeline?: HeatmapTimeline | null;
+}
+
+export interface HeatmapTimeline {
+  start_date: string;
+  end_date: string;
+  cumulative_tension: number[];
+  cumulative_count: number[];
+}
+
+export interface HeatmapRangeSummary {
+  start_date: string;
+  end_date: string;
+  message_count: number;
+  tension: number;
+  active_days: number;
+  daily_tension: Array<{
+    date: string;
+    tension: number;
+    message_count: number;
+  }>;
 }
 
 // --- Tone Shifter ---
@@ -12,16 +12,10 @@ echo "🐍 PYTHONPATH: $PYTHONPATH"
 echo "🐍 Python version: $(python3 --version)"
 
 # Run database migrations
+# scripts/migrate.py: upgrade head; eski create_all veritabanlarını da stamp + upgrade eder
+# (uygulama başlangıçta sadece revision'ı kontrol eder, şema geride ise başlamaz)
 echo "📦 Running database migrations..."
-if [ -d "backend/alembic" ] || [ -d "alembic" ]; then
-    if [ -d "backend/alembic" ]; then
-        cd backend && python3 -m alembic upgrade head && cd .. || echo "⚠️  Migration failed"
-    else
-        python3 -m alembic upgrade head || echo "⚠️  Migration failed"
-    fi
-else
-    echo "ℹ️  Alembic directory not found, skipping migrations (this is normal for fresh deployments)"
-fi
+python3 backend/scripts/migrate.py
 
 # Start uvicorn from backend directory
 echo "✨ Starting uvicorn server..."